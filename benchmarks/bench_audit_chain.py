@@ -0,0 +1,91 @@
+"""Benchmark for checkpointed audit segments.
+
+Measures append throughput with and without Merkle checkpoints, and the
+throughput of full and time-range verification with threads and processes.
+
+Run with ``python -m benchmarks.bench_audit_chain``.
+"""
+
+import logging
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+from src.infrastructure.logging.audit_chain import AuditChainVerifier
+from src.infrastructure.logging.audit_event import AuditEvent
+from src.infrastructure.logging.jsonl_segments import JsonLinesSegmentHandler
+
+RECORD_COUNT = 200_000
+BATCH_SIZE = 512
+
+
+def _records(count: int) -> List[logging.LogRecord]:
+    """Build audit records one millisecond apart."""
+    records = []
+    for index in range(count):
+        event = AuditEvent(
+            "operation",
+            "",
+            {"operation": "delete", "path": f"/Users/me/Library/Caches/{index}"},
+        )
+        record = logging.LogRecord("audit", logging.INFO, "", 0, event, (), None)
+        record.created = 1_700_000_000 + index / 1000
+        records.append(record)
+    return records
+
+
+def _append(directory: str, checkpoint_every: Optional[int]) -> float:
+    """Write every record and return records per second."""
+    records = _records(RECORD_COUNT)
+    handler = JsonLinesSegmentHandler(
+        directory, max_bytes=16 * 1024 * 1024, checkpoint_every=checkpoint_every
+    )
+    start = time.perf_counter()
+    for offset in range(0, RECORD_COUNT, BATCH_SIZE):
+        handler.emit_batch(records[offset : offset + BATCH_SIZE])
+    handler.close()
+    return RECORD_COUNT / (time.perf_counter() - start)
+
+
+def _directory_bytes(directory: str) -> int:
+    """Total size of the segment files in ``directory``."""
+    return sum(
+        os.path.getsize(os.path.join(directory, name))
+        for name in os.listdir(directory)
+        if name.endswith(".jsonl")
+    )
+
+
+def main() -> None:
+    """Run the benchmark and print append and verification throughput."""
+    with tempfile.TemporaryDirectory() as plain:
+        with tempfile.TemporaryDirectory() as sealed:
+            base = _append(plain, None)
+            chained = _append(sealed, 1024)
+            print(f"append without checkpoints {base:>12,.0f} records/s")
+            print(
+                f"append with checkpoints    {chained:>12,.0f} records/s "
+                f"({(base / chained - 1) * 100:.1f}% overhead)"
+            )
+
+            megabytes = _directory_bytes(sealed) / 1e6
+            verifier = AuditChainVerifier(sealed)
+            for label, use_processes in (("threads", False), ("processes", True)):
+                start = time.perf_counter()
+                report = verifier.verify(use_processes=use_processes)
+                elapsed = time.perf_counter() - start
+                assert report.ok, report.failures
+                print(f"full verify ({label:<9}) {megabytes / elapsed:>10,.1f} MB/s")
+
+            start = time.perf_counter()
+            report = verifier.verify(start=1_700_000_100, end=1_700_000_101)
+            elapsed = time.perf_counter() - start
+            print(
+                f"range verify (1s window)    {elapsed * 1000:>8.1f} ms, "
+                f"{report.records_verified} records rehashed"
+            )
+
+
+if __name__ == "__main__":
+    main()
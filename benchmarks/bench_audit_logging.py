@@ -0,0 +1,46 @@
+"""Microbenchmark for the caller-side cost of audit logging.
+
+Run with ``python -m benchmarks.bench_audit_logging``.
+"""
+
+import logging
+import os
+import time
+
+from src.infrastructure.logging.audit_logging_system import AuditLoggingSystem
+from src.infrastructure.logging.audit_pipeline import BatchStreamHandler
+
+EVENT_COUNT = 200_000
+
+
+def main() -> None:
+    """Log many events and report per-call latency and drain time."""
+    with open(os.devnull, "w", encoding="utf-8") as sink:
+        audit = AuditLoggingSystem(
+            handlers=[BatchStreamHandler(sink)],
+            logger_name="audit.benchmark",
+            queue_size=EVENT_COUNT,
+        )
+        start = time.perf_counter()
+        for index in range(EVENT_COUNT):
+            audit.log_system_event("deleted cache file")
+        enqueued = time.perf_counter() - start
+        audit.shutdown()
+        drained = time.perf_counter() - start
+
+        direct = logging.getLogger("audit.benchmark.direct")
+        direct.propagate = False
+        direct.setLevel(logging.INFO)
+        direct.addHandler(logging.StreamHandler(sink))
+        start = time.perf_counter()
+        for index in range(EVENT_COUNT):
+            direct.info("System Event: %s", "deleted cache file")
+        synchronous = time.perf_counter() - start
+
+    print(f"queued call       {enqueued / EVENT_COUNT * 1e6:8.2f} us/event")
+    print(f"synchronous call  {synchronous / EVENT_COUNT * 1e6:8.2f} us/event")
+    print(f"total incl. drain {drained:8.2f} s for {EVENT_COUNT:,} events")
+
+
+if __name__ == "__main__":
+    main()
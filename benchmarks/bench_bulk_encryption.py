@@ -0,0 +1,47 @@
+"""Benchmark for bulk record encryption.
+
+Compares per-call ``encrypt_data`` against ``encrypt_many`` and
+``decrypt_many`` at several worker counts.
+
+Run with ``python -m benchmarks.bench_bulk_encryption [record_count]``.
+"""
+
+import os
+import sys
+import time
+
+from src.infrastructure.security.data_protection_mechanisms import (
+    DataProtectionMechanisms,
+)
+
+
+def main() -> None:
+    """Print records per second for each encryption path."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    protection = DataProtectionMechanisms()
+    records = [
+        f'{{"path": "/Users/me/Library/Caches/file{index}", "size": {index}}}'
+        for index in range(count)
+    ]
+
+    start = time.perf_counter()
+    for record in records:
+        protection.encrypt_data(record)
+    elapsed = time.perf_counter() - start
+    print(f"encrypt_data loop:            {count / elapsed:>10,.0f} records/s")
+
+    for workers in sorted({1, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        tokens = protection.encrypt_many(records, workers=workers)
+        encrypt_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        protection.decrypt_many(tokens, workers=workers)
+        decrypt_elapsed = time.perf_counter() - start
+        print(
+            f"encrypt_many, {workers:>2} worker(s): {count / encrypt_elapsed:>10,.0f} "
+            f"records/s; decrypt_many {count / decrypt_elapsed:,.0f} records/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Benchmark for the CPU cost of the live dashboard.
+
+Runs the standard dashboard against an in-memory terminal and reports
+the share of one core it used, with the number of frames drawn and of
+panel renders. The target is under 1% of a core.
+
+Run with ``python -m benchmarks.bench_dashboard [seconds] [max_fps]``.
+"""
+
+import io
+import sys
+import time
+
+from rich.console import Console
+
+from src.presentation.dashboard import default_dashboard
+
+
+def main() -> None:
+    """Print the dashboard's CPU use over the run."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 20.0
+    max_fps = float(sys.argv[2]) if len(sys.argv) > 2 else 4.0
+    console = Console(file=io.StringIO(), force_terminal=True, width=120, height=40)
+    dashboard = default_dashboard(max_fps=max_fps, console=console)
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    dashboard.run(seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    renders = ", ".join(f"{panel.name} {panel.renders}" for panel in dashboard.panels)
+    print(f"cpu:     {100 * cpu / wall:.2f}% of a core over {wall:.1f} s")
+    print(f"frames:  {dashboard.frames} (cap {max_fps * wall:.0f})")
+    print(f"renders: {renders}")
+
+
+if __name__ == "__main__":
+    main()
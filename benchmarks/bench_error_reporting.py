@@ -0,0 +1,53 @@
+"""Benchmark for error reporting during error-heavy scans.
+
+Compares logging every ``PermissionError`` with its stack trace against
+``ErrorHandlingSystem.handle_error``, which aggregates repeated errors.
+
+Run with ``python -m benchmarks.bench_error_reporting [error_count]``.
+"""
+
+import errno
+import logging
+import sys
+import time
+import traceback
+
+from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
+
+
+def _raise(path: str) -> None:
+    """Fail the way an unreadable directory does."""
+    raise PermissionError(errno.EACCES, "Permission denied", path)
+
+
+def main() -> None:
+    """Print errors handled per second for both approaches."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    logging.basicConfig(stream=open("/dev/null", "w"), level=logging.INFO)
+    paths = [f"/Users/me/Library/Containers/app{i % 50}/Data/{i}" for i in range(count)]
+    logger = logging.getLogger("naive")
+
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            _raise(path)
+        except OSError as error:
+            logger.error("%s\n%s", error, traceback.format_exc())
+    naive = time.perf_counter() - start
+
+    system = ErrorHandlingSystem()
+    start = time.perf_counter()
+    for path in paths:
+        try:
+            _raise(path)
+        except OSError as error:
+            system.handle_error(error, {"path": path})
+    system.flush_error_summary()
+    aggregated = time.perf_counter() - start
+
+    print(f"log every error:  {count / naive:>10,.0f} errors/s")
+    print(f"aggregated:       {count / aggregated:>10,.0f} errors/s")
+
+
+if __name__ == "__main__":
+    main()
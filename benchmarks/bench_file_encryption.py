@@ -0,0 +1,37 @@
+"""Benchmark for streaming file encryption throughput.
+
+Run with ``python -m benchmarks.bench_file_encryption [size_mb]``.
+"""
+
+import os
+import sys
+import tempfile
+
+from src.infrastructure.security.data_protection_mechanisms import (
+    DataProtectionMechanisms,
+)
+
+
+def main() -> None:
+    """Encrypt and decrypt a random file and print MB/s for each direction."""
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    protection = DataProtectionMechanisms()
+    with tempfile.TemporaryDirectory() as directory:
+        plain = os.path.join(directory, "plain")
+        with open(plain, "wb") as handle:
+            for _ in range(size_mb):
+                handle.write(os.urandom(1024 * 1024))
+        for workers in (1, os.cpu_count() or 1):
+            encrypted = protection.encrypt_file(plain, plain + ".enc", workers=workers)
+            decrypted = protection.decrypt_file(
+                plain + ".enc", plain + ".dec", workers=workers
+            )
+            print(
+                f"{size_mb} MB, {workers} worker(s): "
+                f"encrypt {encrypted.throughput_mb_s:,.0f} MB/s, "
+                f"decrypt {decrypted.throughput_mb_s:,.0f} MB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
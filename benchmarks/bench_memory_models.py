@@ -0,0 +1,106 @@
+"""Microbenchmark for memory model construction and serialization.
+
+Compares the validated ``ProcessMemoryInfo`` path against lightweight
+``ProcessMemoryRecord`` tuples converted lazily at the API boundary, and
+per-record serialization against bulk ``dump_many``/``dump_many_json``.
+
+Run with ``python -m benchmarks.bench_memory_models``.
+"""
+
+import time
+from typing import Callable, List, Tuple
+
+from src.domain.models.memory_info import (
+    ProcessMemoryInfo,
+    ProcessMemoryRecord,
+    dump_many,
+    dump_many_json,
+)
+
+RECORD_COUNT = 10_000
+
+Row = Tuple[int, str, float, int, int]
+
+
+def _sample_rows(count: int) -> List[Row]:
+    """Build raw rows resembling a process table."""
+    return [
+        (pid, f"proc-{pid}", pid / count, pid * 4096, pid * 8192)
+        for pid in range(count)
+    ]
+
+
+def _rate(label: str, count: int, func: Callable[[], object]) -> float:
+    """Time ``func`` and print records processed per second."""
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else float("inf")
+    print(f"{label:<32} {rate:>14,.0f} records/s")
+    return rate
+
+
+def _build_models(rows: List[Row]) -> List[ProcessMemoryInfo]:
+    """Validated construction of every row."""
+    return [
+        ProcessMemoryInfo(
+            pid=pid, name=name, memory_percent=pct, rss_bytes=rss, vms_bytes=vms
+        )
+        for pid, name, pct, rss, vms in rows
+    ]
+
+
+def _build_records(rows: List[Row]) -> List[ProcessMemoryRecord]:
+    """Unvalidated construction of every row."""
+    return [ProcessMemoryRecord(*row) for row in rows]
+
+
+def main() -> None:
+    """Run the benchmark and print throughput for both paths."""
+    rows = _sample_rows(RECORD_COUNT)
+
+    print("-- creation")
+    _rate("validated ProcessMemoryInfo", RECORD_COUNT, lambda: _build_models(rows))
+    _rate("ProcessMemoryRecord", RECORD_COUNT, lambda: _build_records(rows))
+
+    models = _build_models(rows)
+    records = _build_records(rows)
+
+    print("-- serialization to dicts")
+    _rate(
+        "per-model model_dump", RECORD_COUNT, lambda: [m.model_dump() for m in models]
+    )
+    _rate("dump_many(models)", RECORD_COUNT, lambda: dump_many(models))
+    _rate("dump_many(records)", RECORD_COUNT, lambda: dump_many(records))
+
+    print("-- serialization to JSON")
+    _rate(
+        "per-model model_dump_json",
+        RECORD_COUNT,
+        lambda: [m.model_dump_json() for m in models],
+    )
+    _rate("dump_many_json(models)", RECORD_COUNT, lambda: dump_many_json(models))
+    _rate("dump_many_json(records)", RECORD_COUNT, lambda: dump_many_json(records))
+
+    print("-- top-N sampling (sort all, convert 10)")
+    _rate(
+        "models",
+        RECORD_COUNT,
+        lambda: sorted(
+            _build_models(rows), key=lambda m: m.memory_percent, reverse=True
+        )[:10],
+    )
+    _rate(
+        "records + lazy to_model",
+        RECORD_COUNT,
+        lambda: [
+            r.to_model()
+            for r in sorted(
+                _build_records(rows), key=lambda r: r.memory_percent, reverse=True
+            )[:10]
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Deterministic fixtures for the benchmark suite.
+
+``build_tree`` creates a synthetic directory tree and ``mock_process_table``
+replaces ``psutil.process_iter`` with a fixed table of fake processes, so
+benchmark runs measure the code rather than the machine's current state.
+"""
+
+import os
+import random
+import tempfile
+from collections import namedtuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+from unittest.mock import patch
+
+# (size in bytes, relative weight)
+DEFAULT_SIZES: Tuple[Tuple[int, int], ...] = (
+    (0, 5),
+    (512, 40),
+    (4096, 35),
+    (64 * 1024, 17),
+    (1024 * 1024, 3),
+)
+
+_MemoryInfo = namedtuple("_MemoryInfo", ["rss", "vms"])
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """Shape of a synthetic tree.
+
+    The tree has ``fanout ** level`` directories at each level up to
+    ``depth``, each holding ``files_per_dir`` files whose sizes are drawn
+    from ``sizes``. A ``hardlink_ratio`` share of the files are hard links
+    to files created earlier.
+    """
+
+    depth: int = 4
+    fanout: int = 4
+    files_per_dir: int = 8
+    sizes: Tuple[Tuple[int, int], ...] = DEFAULT_SIZES
+    hardlink_ratio: float = 0.05
+    seed: int = 1234
+
+
+@dataclass
+class TreeStats:
+    """What ``build_tree`` created."""
+
+    root: str
+    directories: int = 0
+    files: int = 0
+    hardlinks: int = 0
+    bytes_written: int = 0
+    paths: List[str] = field(default_factory=list)
+
+    @property
+    def entries(self) -> int:
+        """Directories plus files."""
+        return self.directories + self.files
+
+
+def default_workdir() -> str:
+    """Return a tmpfs directory when available, else the temp directory."""
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return tempfile.gettempdir()
+
+
+def build_tree(root: str, spec: TreeSpec) -> TreeStats:
+    """Create the tree described by ``spec`` under ``root``.
+
+    The same spec always produces the same names, sizes and contents.
+    """
+    rng = random.Random(spec.seed)
+    sizes = [size for size, _ in spec.sizes]
+    weights = [weight for _, weight in spec.sizes]
+    content = rng.randbytes(max(sizes)) if max(sizes) else b""
+    stats = TreeStats(root=root)
+
+    level = [root]
+    os.makedirs(root, exist_ok=True)
+    for depth in range(spec.depth + 1):
+        following = []
+        for directory in level:
+            stats.directories += 1
+            for index in range(spec.files_per_dir):
+                path = os.path.join(directory, f"file{index:03d}.dat")
+                if stats.paths and rng.random() < spec.hardlink_ratio:
+                    os.link(rng.choice(stats.paths), path)
+                    stats.hardlinks += 1
+                else:
+                    size = rng.choices(sizes, weights)[0]
+                    offset = rng.randrange(len(content) - size + 1) if size else 0
+                    with open(path, "wb") as handle:
+                        handle.write(content[offset : offset + size])
+                    stats.bytes_written += size
+                    stats.paths.append(path)
+                stats.files += 1
+            if depth < spec.depth:
+                for index in range(spec.fanout):
+                    child = os.path.join(directory, f"dir{index:02d}")
+                    os.mkdir(child)
+                    following.append(child)
+        level = following
+    return stats
+
+
+class FakeProcess:
+    """Stand-in for ``psutil.Process`` with fixed attributes."""
+
+    def __init__(self, pid: int, rng: random.Random) -> None:
+        """Create process ``pid`` with random but reproducible attributes."""
+        self.pid = pid
+        self._create_time = 1_700_000_000.0 + pid
+        self._name = f"proc-{pid}"
+        self._rss = rng.randrange(1, 4096) * 1024 * 1024
+        self._vms = self._rss * 4
+
+    def create_time(self) -> float:
+        """Return the creation time."""
+        return self._create_time
+
+    def name(self) -> str:
+        """Return the process name."""
+        return self._name
+
+    def exe(self) -> str:
+        """Return the executable path."""
+        return f"/Applications/{self._name}.app/Contents/MacOS/{self._name}"
+
+    def cmdline(self) -> List[str]:
+        """Return the command line."""
+        return [self.exe(), "--flag"]
+
+    def username(self) -> str:
+        """Return the owner."""
+        return "user"
+
+    def memory_info(self) -> _MemoryInfo:
+        """Return resident and virtual sizes."""
+        return _MemoryInfo(self._rss, self._vms)
+
+    def memory_percent(self) -> float:
+        """Return resident size as a share of 64 GiB."""
+        return self._rss / (64 * 1024**3) * 100
+
+
+@contextmanager
+def mock_process_table(count: int, seed: int = 1234) -> Iterator[List[FakeProcess]]:
+    """Make ``psutil.process_iter`` yield ``count`` fake processes."""
+    rng = random.Random(seed)
+    processes = [FakeProcess(pid, rng) for pid in range(1, count + 1)]
+    with patch("psutil.process_iter", side_effect=lambda *a, **k: iter(processes)):
+        yield processes
@@ -0,0 +1,228 @@
+"""Performance regression suite for the analyzers.
+
+Each case runs in a fresh worker process, so its peak RSS is its own.
+Results are compared with a JSON baseline, and the run fails when any
+metric regresses by more than the threshold.
+
+Run with ``python -m benchmarks.suite [--quick] [--update-baseline]``.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.fixtures import (
+    TreeSpec,
+    build_tree,
+    default_workdir,
+    mock_process_table,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+
+Metrics = Dict[str, float]
+
+# Metrics where a larger value is better; all others are better smaller.
+HIGHER_IS_BETTER_SUFFIX = "_per_s"
+
+
+def _peak_rss_mb() -> float:
+    """Return this process's peak resident set size in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _latencies(function: Callable[[], object], repeat: int) -> List[float]:
+    """Call ``function`` ``repeat`` times and return each duration."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Return the ``fraction`` percentile of ``values``."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def case_disk_scan(quick: bool) -> Metrics:
+    """Scan a synthetic tree with ``DiskAnalyzer.scan_directory``."""
+    from src.domain.services.disk_analyzer import DiskAnalyzer
+
+    spec = TreeSpec(depth=3) if quick else TreeSpec()
+    analyzer = DiskAnalyzer()
+    with tempfile.TemporaryDirectory(dir=default_workdir()) as directory:
+        tree = build_tree(os.path.join(directory, "tree"), spec)
+        analyzer.scan_directory(tree.root)
+        durations = _latencies(lambda: analyzer.scan_directory(tree.root), 5)
+    median = statistics.median(durations)
+    return {
+        "entries_per_s": tree.entries / median,
+        "latency_ms_p50": median * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def case_audit_verify(quick: bool) -> Metrics:
+    """Hash checkpointed audit segments with ``AuditChainVerifier``."""
+    from src.infrastructure.logging.audit_chain import AuditChainVerifier
+    from src.infrastructure.logging.audit_event import AuditEvent
+    from src.infrastructure.logging.jsonl_segments import JsonLinesSegmentHandler
+
+    count = 20_000 if quick else 100_000
+    records = []
+    for index in range(count):
+        event = AuditEvent("operation", "", {"path": f"/Users/me/Caches/{index}"})
+        record = logging.LogRecord("audit", logging.INFO, "", 0, event, (), None)
+        record.created = 1_700_000_000 + index / 1000
+        records.append(record)
+    with tempfile.TemporaryDirectory(dir=default_workdir()) as directory:
+        handler = JsonLinesSegmentHandler(
+            directory, max_bytes=8 * 1024 * 1024, checkpoint_every=1024
+        )
+        for offset in range(0, count, 512):
+            handler.emit_batch(records[offset : offset + 512])
+        handler.close()
+        verifier = AuditChainVerifier(directory)
+        reports = []
+        durations = _latencies(lambda: reports.append(verifier.verify()), 3)
+    median = statistics.median(durations)
+    return {
+        "bytes_hashed_per_s": reports[-1].bytes_verified / median,
+        "latency_ms_p50": median * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def case_memory_top(quick: bool) -> Metrics:
+    """Rank a mocked table of processes with ``MemoryAnalyzer``."""
+    from src.domain.services.memory_analyzer import MemoryAnalyzer
+
+    count = 500 if quick else 2000
+    analyzer = MemoryAnalyzer()
+    with mock_process_table(count):
+        analyzer.get_top_memory_processes(10)
+        durations = _latencies(lambda: analyzer.get_top_memory_processes(10), 50)
+    median = statistics.median(durations)
+    return {
+        "processes_per_s": count / median,
+        "latency_ms_p50": median * 1000,
+        "latency_ms_p99": _percentile(durations, 0.99) * 1000,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+CASES: Dict[str, Callable[[bool], Metrics]] = {
+    "disk_scan": case_disk_scan,
+    "audit_verify": case_audit_verify,
+    "memory_top": case_memory_top,
+}
+
+
+def run_case(name: str, quick: bool) -> Metrics:
+    """Run one case in a fresh worker process."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(CASES[name], quick).result()
+
+
+def compare(
+    results: Dict[str, Metrics], baseline: Dict[str, Metrics], threshold: float
+) -> List[str]:
+    """Return one message per metric that regressed beyond ``threshold``.
+
+    A metric missing from the baseline is reported too: the gate cannot
+    vouch for it until the baseline is updated.
+    """
+    regressions = []
+    for case, metrics in results.items():
+        for metric, value in metrics.items():
+            reference = baseline.get(case, {}).get(metric)
+            if reference is None:
+                regressions.append(f"{case}.{metric}: not in the baseline")
+                continue
+            if not reference:
+                continue
+            change = (value - reference) / reference
+            if metric.endswith(HIGHER_IS_BETTER_SUFFIX):
+                change = -change
+            if change > threshold:
+                regressions.append(
+                    f"{case}.{metric}: {value:,.2f} vs baseline {reference:,.2f} "
+                    f"({change:+.0%} worse)"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; return 1 if a metric regressed or there is no baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="smaller fixtures")
+    parser.add_argument("cases", nargs="*", help=f"any of: {', '.join(CASES)}")
+    args = parser.parse_args(argv)
+    unknown = set(args.cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+
+    results = {}
+    for name in args.cases or CASES:
+        results[name] = run_case(name, args.quick)
+        print(name)
+        for metric, value in results[name].items():
+            print(f"  {metric:<22} {value:>16,.2f}")
+
+    if args.update_baseline:
+        document = {
+            "machine": {
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "cpus": os.cpu_count(),
+            },
+            "quick": args.quick,
+            "cases": results,
+        }
+        with open(args.baseline, "w") as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        # Baselines are machine-specific and not committed; passing without
+        # one would let every regression through.
+        print(
+            f"No baseline at {args.baseline}; record one on this machine "
+            "with --update-baseline",
+            file=sys.stderr,
+        )
+        return 1
+    with open(args.baseline) as handle:
+        document = json.load(handle)
+    if document.get("quick") != args.quick:
+        print("Baseline was recorded with a different --quick setting")
+        return 1
+    regressions = compare(results, document["cases"], args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
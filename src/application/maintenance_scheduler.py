@@ -0,0 +1,303 @@
+"""Scheduler for background maintenance jobs.
+
+Scans, cleanups and compactions are queued by priority and run on
+worker threads. A job submitted while an identical one (same kind and
+path) is still waiting is merged into it. Each resource class has its
+own concurrency limit, so a disk-bound job never competes with more
+than the allowed number of other disk-bound jobs, and heavy jobs wait
+until the host is idle. How long each job waited and ran is recorded.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, replace
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from src.shared.spans import Instrumentation, SpanSummary
+
+if TYPE_CHECKING:
+    from src.domain.services.idle_detector import IdleDetector
+
+DISK = "disk"
+CPU = "cpu"
+
+JobKey = Tuple[str, str]
+
+
+@dataclass(frozen=True)
+class MaintenanceJob:
+    """One piece of maintenance work on one path."""
+
+    kind: str
+    path: str
+    action: Callable[[], Any]
+    priority: int = 10
+    resource: str = DISK
+    heavy: bool = False
+
+    @property
+    def key(self) -> JobKey:
+        """Return the identity used to merge duplicate submissions."""
+        return self.kind, self.path
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """Timing and outcome of one finished job."""
+
+    kind: str
+    path: str
+    resource: str
+    waited_seconds: float
+    run_seconds: float
+    coalesced: int
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the job finished without raising."""
+        return self.error is None
+
+
+class _Pending:
+    """A queued job with its queue entry and merge count."""
+
+    __slots__ = ("job", "submitted_at", "coalesced", "entry")
+
+    def __init__(self, job: MaintenanceJob, submitted_at: float, entry: list) -> None:
+        """Record a newly queued job."""
+        self.job = job
+        self.submitted_at = submitted_at
+        self.coalesced = 0
+        self.entry = entry
+
+
+class MaintenanceScheduler:
+    """Run maintenance jobs by priority within per-resource limits."""
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, int]] = None,
+        idle_detector: Optional["IdleDetector"] = None,
+        idle_check_interval: float = 5.0,
+        history_size: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            limits: Most jobs running at once per resource class; classes
+                not listed allow one. Defaults to one disk-bound job and
+                half the CPUs for CPU-bound jobs.
+            idle_detector: Decides when heavy jobs may run; without one,
+                heavy jobs run like any other.
+            idle_check_interval: Seconds between idleness checks while
+                heavy jobs wait.
+            history_size: Finished jobs kept in ``history``.
+            clock: Monotonic clock.
+        """
+        if limits is None:
+            limits = {DISK: 1, CPU: max(1, (os.cpu_count() or 2) // 2)}
+        self.limits = dict(limits)
+        self.idle_detector = idle_detector
+        self.idle_check_interval = idle_check_interval
+        self.history: Deque[JobRecord] = deque(maxlen=history_size)
+        self.instrumentation = Instrumentation(enabled=True, clock=clock)
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._heap: List[list] = []
+        self._sequence = itertools.count()
+        self._pending: Dict[JobKey, _Pending] = {}
+        self._running: Counter = Counter()
+        self._running_keys: Set[JobKey] = set()
+        self._idle: Optional[Tuple[float, bool]] = None
+        self._idle_wanted = False
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending_count(self) -> int:
+        """Return the number of queued jobs."""
+        with self._condition:
+            return len(self._pending)
+
+    def submit(self, job: MaintenanceJob) -> bool:
+        """Queue ``job``.
+
+        If a job with the same kind and path is already waiting, the two
+        are merged: the newer job replaces it, keeping the more urgent
+        priority and the original place in the queue.
+
+        Returns:
+            False if the job was merged into a waiting one.
+        """
+        with self._condition:
+            pending = self._pending.get(job.key)
+            if pending is None:
+                entry = [job.priority, next(self._sequence), job.key]
+                heapq.heappush(self._heap, entry)
+                self._pending[job.key] = _Pending(job, self._clock(), entry)
+                self._condition.notify_all()
+                return True
+            pending.coalesced += 1
+            priority = min(job.priority, pending.job.priority)
+            pending.job = replace(job, priority=priority)
+            if priority < pending.entry[0]:
+                pending.entry[2] = None
+                pending.entry = [priority, pending.entry[1], job.key]
+                heapq.heappush(self._heap, pending.entry)
+                self._condition.notify_all()
+            return False
+
+    def _host_idle(self) -> bool:
+        """Return whether heavy jobs may run, per a reading under an interval old.
+
+        Without a fresh reading this answers no and asks the dispatcher
+        for one, which it takes outside the lock: the detector may be slow,
+        and submitters must not wait for it.
+        """
+        if self.idle_detector is None:
+            return True
+        idle = self._idle
+        if idle is None or self._clock() - idle[0] >= self.idle_check_interval:
+            self._idle_wanted = True
+            return False
+        return idle[1]
+
+    def _check_idle(self) -> None:
+        """Take the idleness reading ``_host_idle`` asked for, if any."""
+        if self._idle_wanted and self.idle_detector is not None:
+            self._idle_wanted = False
+            self._idle = (self._clock(), self.idle_detector.is_idle())
+
+    def _take_runnable(self) -> Optional[_Pending]:
+        """Remove and return the most urgent job that may start now."""
+        skipped = []
+        chosen = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            key = entry[2]
+            if key is None:
+                continue
+            job = self._pending[key].job
+            if (
+                self._running[job.resource] >= self.limits.get(job.resource, 1)
+                or key in self._running_keys
+                or (job.heavy and not self._host_idle())
+            ):
+                skipped.append(entry)
+                continue
+            chosen = self._pending.pop(key)
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return chosen
+
+    def _dispatch(self) -> None:
+        """Start jobs as slots free up until stopped."""
+        while True:
+            self._check_idle()
+            with self._condition:
+                if self._stopping:
+                    return
+                pending = self._take_runnable()
+                if pending is None:
+                    if not self._idle_wanted:
+                        timeout = self.idle_check_interval if self._pending else None
+                        self._condition.wait(timeout)
+                    continue
+                job = pending.job
+                self._running[job.resource] += 1
+                self._running_keys.add(job.key)
+                threading.Thread(
+                    target=self._execute,
+                    args=(pending,),
+                    name=f"maintenance-{job.kind}",
+                    daemon=True,
+                ).start()
+
+    def _execute(self, pending: _Pending) -> None:
+        """Run one job and record how long it waited and ran."""
+        job = pending.job
+        started = self._clock()
+        error = None
+        try:
+            job.action()
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        finished = self._clock()
+        waited = started - pending.submitted_at
+        self.instrumentation.record(
+            f"maintenance.{job.kind}", finished - started, error is not None
+        )
+        self.instrumentation.record(f"maintenance.{job.kind}.wait", waited)
+        with self._condition:
+            self.history.append(
+                JobRecord(
+                    job.kind,
+                    job.path,
+                    job.resource,
+                    waited,
+                    finished - started,
+                    pending.coalesced,
+                    error,
+                )
+            )
+            self._running[job.resource] -= 1
+            self._running_keys.discard(job.key)
+            self._condition.notify_all()
+
+    def start(self) -> None:
+        """Start dispatching jobs from a background thread."""
+        with self._condition:
+            if self._thread is not None:
+                return
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._dispatch, name="maintenance", daemon=True
+            )
+            self._thread.start()
+
+    def wait_until_done(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no job is queued or running.
+
+        Returns:
+            False if jobs remained when ``timeout`` expired.
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._running_keys, timeout
+            )
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop starting jobs and wait for running ones to finish.
+
+        Queued jobs stay queued and run if the scheduler is started again.
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+        with self._condition:
+            self._condition.wait_for(lambda: not self._running_keys, timeout)
+
+    def timings(self) -> Dict[str, SpanSummary]:
+        """Return run and wait time statistics per job kind."""
+        return self.instrumentation.snapshot()
@@ -0,0 +1,222 @@
+"""Disk, memory, CPU, process and scan metrics in Prometheus text format.
+
+The exporter watches the samplers' snapshot versions and renders the
+whole exposition only when one of them changed. Scrapes and textfile
+readers get the last rendered bytes, so serving a scrape never samples
+or formats anything.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, List, Mapping, Optional, Tuple
+
+from src.infrastructure.monitoring.prometheus import format_family
+
+PREFIX = "mac_cleaner"
+
+
+def _memory_families(record: Any) -> List[str]:
+    """Render a ``MemoryRecord``."""
+    return [
+        format_family(
+            f"{PREFIX}_memory_{field}",
+            "gauge",
+            f"System memory {field.replace('_', ' ')}.",
+            [({}, getattr(record, field))],
+        )
+        for field in ("total_bytes", "available_bytes", "used_bytes")
+    ]
+
+
+def _cpu_families(sample: Any) -> List[str]:
+    """Render a ``CpuSample``."""
+    cpu = sample.cpu
+    return [
+        format_family(
+            f"{PREFIX}_cpu_{field}",
+            "gauge",
+            description,
+            [({}, getattr(cpu, field))],
+        )
+        for field, description in (
+            ("busy_percent", "Share of CPU time not idle since the last sample."),
+            ("iowait_percent", "Share of CPU time idle waiting for I/O."),
+            ("cpu_count", "Number of logical CPUs."),
+        )
+    ] + [
+        format_family(
+            f"{PREFIX}_process_cpu_percent",
+            "gauge",
+            "CPU use of the busiest processes; 100 is one full core.",
+            [
+                ({"pid": str(record.pid), "name": record.name}, record.cpu_percent)
+                for record in sample.processes
+            ],
+        )
+    ]
+
+
+def _process_families(records: Any) -> List[str]:
+    """Render the top ``ProcessMemoryRecord`` values."""
+    labels = [{"pid": str(record.pid), "name": record.name} for record in records]
+    return [
+        format_family(
+            f"{PREFIX}_process_resident_bytes",
+            "gauge",
+            "Resident set size of the largest processes.",
+            [(label, record.rss_bytes) for label, record in zip(labels, records)],
+        ),
+        format_family(
+            f"{PREFIX}_process_virtual_bytes",
+            "gauge",
+            "Virtual memory size of the largest processes.",
+            [(label, record.vms_bytes) for label, record in zip(labels, records)],
+        ),
+    ]
+
+
+def _disk_families(disks: Any) -> List[str]:
+    """Render ``DiskInfo`` values."""
+    return [
+        format_family(
+            f"{PREFIX}_disk_{name}_bytes",
+            "gauge",
+            f"{name.capitalize()} space of the disk holding the path.",
+            [({"path": info.path}, getattr(info, f"{name}_space")) for info in disks],
+        )
+        for name in ("total", "used", "free")
+    ]
+
+
+def _scan_families(progress: Any) -> List[str]:
+    """Render a ``ScanProgress``."""
+    labels = {"root": progress.root}
+    return [
+        format_family(
+            f"{PREFIX}_scan_{field}",
+            "gauge",
+            description,
+            [(labels, getattr(progress, field))],
+        )
+        for field, description in (
+            ("bytes", "Bytes counted by the latest scan."),
+            ("files", "Files counted by the latest scan."),
+            ("directories", "Directories counted by the latest scan."),
+            ("errors", "Unreadable entries met by the latest scan."),
+            ("done", "Whether the latest scan finished (1) or is running (0)."),
+        )
+    ]
+
+
+RENDERERS = {
+    "memory": _memory_families,
+    "cpu": _cpu_families,
+    "processes": _process_families,
+    "disks": _disk_families,
+    "scan": _scan_families,
+}
+
+
+class MetricsExporter:
+    """Keep a rendered exposition of the samplers' latest snapshots."""
+
+    def __init__(
+        self,
+        sources: Mapping[str, Any],
+        interval: float = 1.0,
+        on_render: Optional[Callable[[bytes], None]] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Initialize the exporter.
+
+        Args:
+            sources: Samplers keyed by ``memory``, ``cpu``,
+                ``processes``, ``disks`` or ``scan``.
+            interval: Seconds between checks for new snapshots.
+            on_render: Called with each newly rendered payload, for
+                example to write a textfile.
+            clock: Wall clock for the last-update timestamp.
+
+        Raises:
+            ValueError: If a source name has no renderer.
+        """
+        unknown = set(sources) - set(RENDERERS)
+        if unknown:
+            raise ValueError(f"No metrics for sources: {', '.join(sorted(unknown))}")
+        self.sources = dict(sources)
+        self.interval = interval
+        self.on_render = on_render
+        self._clock = clock
+        self.logger = logging.getLogger("exporter")
+        self._versions: Optional[Tuple[int, ...]] = None
+        self.renders = 0
+        self.payload = b""
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def current(self) -> bytes:
+        """Return the latest rendered payload."""
+        return self.payload
+
+    def refresh(self) -> bool:
+        """Render again if any source published; return whether it did."""
+        snapshots = [(name, source.snapshot) for name, source in self.sources.items()]
+        versions = tuple(snapshot.version for _, snapshot in snapshots)
+        if versions == self._versions:
+            return False
+        parts = []
+        up = []
+        for name, snapshot in snapshots:
+            up.append(({"source": name}, snapshot.error is None))
+            if snapshot.value is not None:
+                parts.extend(RENDERERS[name](snapshot.value))
+        parts.append(
+            format_family(
+                f"{PREFIX}_source_up",
+                "gauge",
+                "Whether the source's latest sample succeeded (1).",
+                up,
+            )
+        )
+        parts.append(
+            format_family(
+                f"{PREFIX}_last_update_timestamp_seconds",
+                "gauge",
+                "When the metrics were last rendered.",
+                [({}, round(self._clock(), 3))],
+            )
+        )
+        self.payload = "".join(parts).encode()
+        self.renders += 1
+        if self.on_render is not None:
+            self.on_render(self.payload)
+        # Only now, so a failed ``on_render`` is retried on the next refresh.
+        self._versions = versions
+        return True
+
+    def _run(self) -> None:
+        """Refresh until stopped; a failed refresh is logged and retried."""
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                self.logger.exception("Metrics refresh failed")
+
+    def start(self) -> None:
+        """Start the sources and refresh from a daemon thread."""
+        for source in self.sources.values():
+            source.start()
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="exporter", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop refreshing and stop the sources."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        for source in self.sources.values():
+            source.stop(timeout=1.0)
@@ -0,0 +1,338 @@
+"""Read-only queries about disks and memory, answered from warm caches.
+
+The same service backs one-off CLI invocations and the resident daemon;
+in the daemon its scan indexes, process metadata cache and memory samples
+outlive individual requests. Results are plain JSON-compatible values so
+they can cross the daemon socket unchanged.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from src.domain.models.disk_info import ScanIndex
+    from src.domain.models.memory_info import ProcessMemoryRecord
+    from src.domain.services.disk_analyzer import DiskAnalyzer
+    from src.domain.services.memory_analyzer import MemoryAnalyzer
+    from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
+
+
+class _CachedScan:
+    """A scan index with its children lookup and the time it was taken."""
+
+    def __init__(self, index: "ScanIndex", taken_at: float) -> None:
+        """Index ``index`` by parent directory."""
+        self.index = index
+        self.taken_at = taken_at
+        self.children: Dict[str, List[str]] = {}
+        for path in index.dir_sizes:
+            if path != index.root:
+                self.children.setdefault(os.path.dirname(path), []).append(path)
+
+
+class QueryService:
+    """Answer disk and memory queries, reusing earlier work where valid."""
+
+    def __init__(
+        self,
+        disk_analyzer: Optional["DiskAnalyzer"] = None,
+        memory_analyzer: Optional["MemoryAnalyzer"] = None,
+        max_scan_age: float = 300.0,
+        process_sample_ttl: float = 1.0,
+        max_diff_baselines: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+        error_handler: Optional["ErrorHandlingSystem"] = None,
+    ) -> None:
+        """Initialize the service.
+
+        Analyzers are created on first use, so a service answering disk
+        queries never imports the memory models.
+
+        Args:
+            disk_analyzer: Analyzer used for usage queries and scans. The
+                default one attributes bytes to applications using the
+                built-in rules and those named by ``MAC_CLEANER_APP_RULES``.
+            memory_analyzer: Analyzer used for memory queries.
+            max_scan_age: Seconds a scan index is reused before rescanning;
+                older indexes are dropped.
+            process_sample_ttl: Seconds a process table sample is reused.
+            max_diff_baselines: Roots whose last ``diff`` scan is kept as
+                the baseline for the next one; the least recently diffed
+                are forgotten first.
+            clock: Monotonic clock.
+            error_handler: Error handler of the default disk analyzer, which
+                retries disk I/O and aggregates unreadable entries.
+        """
+        self._disk_analyzer = disk_analyzer
+        self.error_handler = error_handler
+        self._memory_analyzer = memory_analyzer
+        self.max_scan_age = max_scan_age
+        self.process_sample_ttl = process_sample_ttl
+        self._clock = clock
+        self._scans: Dict[str, _CachedScan] = {}
+        self._scan_locks: Dict[str, threading.Lock] = {}
+        self.max_diff_baselines = max_diff_baselines
+        self._baselines: "OrderedDict[str, _CachedScan]" = OrderedDict()
+        self._state_lock = threading.Lock()
+        self._memory_lock = threading.Lock()
+        self._process_sample: Optional[Tuple[float, List["ProcessMemoryRecord"]]] = None
+        self._handlers: Dict[str, Callable[..., Any]] = {
+            "disk_usage": self.disk_usage,
+            "memory": self.memory,
+            "top_processes": self.top_processes,
+            "subtree_sizes": self.subtree_sizes,
+            "diff": self.diff,
+            "app_sizes": self.app_sizes,
+            "rescan": self.rescan,
+        }
+
+    @property
+    def disk_analyzer(self) -> "DiskAnalyzer":
+        """Return the disk analyzer, creating it on first use."""
+        if self._disk_analyzer is None:
+            from src.domain.services.app_attribution import AppAttributor
+            from src.domain.services.disk_analyzer import DiskAnalyzer
+
+            self._disk_analyzer = DiskAnalyzer(
+                error_handler=self.error_handler,
+                attributor=AppAttributor.from_environment(),
+            )
+        return self._disk_analyzer
+
+    @property
+    def memory_analyzer(self) -> "MemoryAnalyzer":
+        """Return the memory analyzer, creating it on first use."""
+        if self._memory_analyzer is None:
+            from src.domain.services.memory_analyzer import MemoryAnalyzer
+
+            self._memory_analyzer = MemoryAnalyzer()
+        return self._memory_analyzer
+
+    def handle(self, op: str, params: Dict[str, Any]) -> Any:
+        """Run query ``op`` with keyword ``params``.
+
+        Raises:
+            ValueError: If ``op`` is not a known query.
+        """
+        handler = self._handlers.get(op)
+        if handler is None:
+            raise ValueError(f"Unknown query: {op}")
+        return handler(**params)
+
+    def disk_usage(self, paths: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Return usage of the disks holding ``paths`` (default: all disks)."""
+        analyzer = self.disk_analyzer
+        disks = (
+            [analyzer.get_disk_usage(path) for path in paths]
+            if paths
+            else analyzer.get_all_disks()
+        )
+        return [
+            {
+                "path": info.path,
+                "total_space": info.total_space,
+                "used_space": info.used_space,
+                "free_space": info.free_space,
+                "used_percentage": info.used_percentage,
+            }
+            for info in disks
+        ]
+
+    def memory(self) -> Dict[str, Any]:
+        """Return system memory usage."""
+        return self.memory_analyzer.sample_memory()._asdict()
+
+    def top_processes(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Return the ``limit`` processes with the largest resident size.
+
+        The process table is sampled at most once per
+        ``process_sample_ttl``; the analyzer's metadata cache stays warm
+        between samples.
+        """
+        with self._memory_lock:
+            now = self._clock()
+            sample = self._process_sample
+            if sample is None or now - sample[0] >= self.process_sample_ttl:
+                records = self.memory_analyzer.sample_process_memory()
+                records.sort(key=lambda record: record.rss_bytes, reverse=True)
+                sample = self._process_sample = (now, records)
+        return [record._asdict() for record in sample[1][:limit]]
+
+    def _scan_lock(self, root: str) -> threading.Lock:
+        """Return the lock serializing scans of ``root``."""
+        with self._state_lock:
+            return self._scan_locks.setdefault(root, threading.Lock())
+
+    def _evict_expired(self, now: float) -> None:
+        """Drop expired scans, and idle locks of roots no longer cached.
+
+        Called with ``_state_lock`` held.
+        """
+        for root, scan in list(self._scans.items()):
+            if now - scan.taken_at >= self.max_scan_age:
+                del self._scans[root]
+        for root, lock in list(self._scan_locks.items()):
+            if root not in self._scans and not lock.locked():
+                del self._scan_locks[root]
+
+    def _cached_scan_covering(self, path: str) -> Optional[_CachedScan]:
+        """Return a fresh cached scan whose tree contains ``path``."""
+        now = self._clock()
+        with self._state_lock:
+            self._evict_expired(now)
+            scans = list(self._scans.values())
+        best = None
+        for scan in scans:
+            root = scan.index.root
+            if path == root or path.startswith(root.rstrip(os.sep) + os.sep):
+                if best is None or len(root) > len(best.index.root):
+                    best = scan
+        return best
+
+    def _scan(self, root: str, refresh: bool) -> _CachedScan:
+        """Return a scan of ``root``, scanning unless a fresh one is cached.
+
+        Concurrent requests for the same root wait for one scan instead of
+        each walking the tree.
+        """
+        requested_at = self._clock()
+        if not refresh:
+            cached = self._cached_scan_covering(root)
+            if cached is not None:
+                return cached
+        with self._scan_lock(root):
+            with self._state_lock:
+                current = self._scans.get(root)
+            if current is not None and current.taken_at > requested_at:
+                return current
+            if not refresh:
+                cached = self._cached_scan_covering(root)
+                if cached is not None:
+                    return cached
+            if not os.path.isdir(root):
+                raise ValueError(f"Not a directory: {root}")
+            index = self.disk_analyzer.scan_directory(root)
+            scan = _CachedScan(index, self._clock())
+            with self._state_lock:
+                self._scans[root] = scan
+                self._evict_expired(scan.taken_at)
+            return scan
+
+    def subtree_sizes(
+        self, root: str, top: int = 10, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Return the size of ``root`` and of its largest subdirectories.
+
+        A fresh scan of a directory containing ``root`` is reused; the
+        counts then describe that whole scan, named by ``scan_root``.
+        """
+        root = os.path.abspath(root)
+        scan = self._scan(root, refresh)
+        index = scan.index
+        children = sorted(
+            ((index.dir_sizes[path], path) for path in scan.children.get(root, ())),
+            reverse=True,
+        )[:top]
+        return {
+            "root": root,
+            "scan_root": index.root,
+            "total_bytes": index.size_of(root),
+            "file_count": index.file_count,
+            "dir_count": index.dir_count,
+            "error_count": index.error_count,
+            "seconds": index.seconds,
+            "age_seconds": self._clock() - scan.taken_at,
+            "children": [[path, size] for size, path in children],
+        }
+
+    def diff(self, root: str, top: int = 10) -> Dict[str, Any]:
+        """Rescan ``root`` and report how its directories changed in size.
+
+        The baseline is the previous ``diff`` scan of ``root``, or else a
+        cached scan of it; without either, this scan becomes the baseline
+        and no changes are reported. Baselines outlive the scan cache, but
+        only for the ``max_diff_baselines`` most recently diffed roots.
+        """
+        root = os.path.abspath(root)
+        with self._state_lock:
+            before = self._baselines.pop(root, None) or self._scans.get(root)
+        after = self._scan(root, refresh=True)
+        with self._state_lock:
+            self._baselines[root] = after
+            while len(self._baselines) > self.max_diff_baselines:
+                self._baselines.popitem(last=False)
+        if before is None or before is after:
+            return {
+                "root": root,
+                "baseline": True,
+                "before_bytes": after.index.total_bytes,
+                "after_bytes": after.index.total_bytes,
+                "changes": [],
+            }
+        old_sizes = before.index.dir_sizes
+        new_sizes = after.index.dir_sizes
+        changes = [
+            (new_sizes.get(path, 0) - old_sizes.get(path, 0), path)
+            for path in old_sizes.keys() | new_sizes.keys()
+            if new_sizes.get(path, 0) != old_sizes.get(path, 0) and path != root
+        ]
+        changes.sort(key=lambda change: (-abs(change[0]), change[1]))
+        return {
+            "root": root,
+            "baseline": False,
+            "before_bytes": before.index.total_bytes,
+            "after_bytes": after.index.total_bytes,
+            "changes": [[path, delta] for delta, path in changes[:top]],
+        }
+
+    def app_sizes(
+        self, root: str, top: int = 10, refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Return the applications owning the most bytes below ``root``.
+
+        Totals come from the scan index, so a cached scan answers without
+        walking the tree again.
+        """
+        root = os.path.abspath(root)
+        scan = self._scan(root, refresh)
+        index = scan.index
+        apps = sorted(
+            index.app_sizes(root).items(), key=lambda item: (-item[1], item[0])
+        )
+        return {
+            "root": root,
+            "scan_root": index.root,
+            "total_bytes": index.size_of(root),
+            "age_seconds": self._clock() - scan.taken_at,
+            "apps": [[app, size] for app, size in apps[:top]],
+        }
+
+    def rescan(self, path: str) -> Dict[str, Any]:
+        """Rescan ``path`` and fold the result into the cached scan covering it.
+
+        Only ``path`` is walked; sizes and application totals of the
+        enclosing scan are updated from the difference. Without a cached
+        scan covering it, ``path`` is scanned in full.
+        """
+        path = os.path.abspath(path)
+        cached = self._cached_scan_covering(path)
+        if cached is None or path not in cached.index.dir_sizes:
+            scan = self._scan(path, refresh=True)
+        else:
+            root = cached.index.root
+            with self._scan_lock(root):
+                with self._state_lock:
+                    current = self._scans.get(root, cached)
+                index = self.disk_analyzer.rescan(current.index, path)
+                scan = _CachedScan(index, current.taken_at)
+                with self._state_lock:
+                    self._scans[root] = scan
+        return {
+            "root": path,
+            "scan_root": scan.index.root,
+            "total_bytes": scan.index.size_of(path),
+            "seconds": scan.index.seconds,
+        }
@@ -0,0 +1,233 @@
+"""Background samplers publishing immutable snapshots.
+
+Each sampler owns one thread and one ``SnapshotCell``. It replaces the
+cell's snapshot with a new frozen object after every sample, so readers
+such as the dashboard take a consistent view with a single attribute
+read and never wait for, or slow down, a sampler.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from src.domain.models.disk_info import ScanIndex
+    from src.domain.services.cpu_analyzer import CpuAnalyzer
+    from src.domain.services.disk_analyzer import DiskAnalyzer
+    from src.domain.services.memory_analyzer import MemoryAnalyzer
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One published value.
+
+    ``version`` only increases when ``value`` or ``error`` changes, so a
+    reader can tell whether anything is new by comparing versions.
+    """
+
+    version: int = 0
+    taken_at: float = 0.0
+    value: Any = None
+    error: Optional[str] = None
+
+
+class SnapshotCell:
+    """Holds the latest snapshot of one value.
+
+    There is one writer per cell. Publishing builds a new ``Snapshot``
+    and rebinds ``snapshot``, which is atomic, so readers need no lock.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize an empty cell at version 0."""
+        self._clock = clock
+        self.snapshot = Snapshot()
+
+    def publish(self, value: Any, error: Optional[str] = None) -> None:
+        """Publish ``value``, bumping the version only if it changed."""
+        current = self.snapshot
+        version = current.version
+        if value != current.value or error != current.error:
+            version += 1
+        self.snapshot = Snapshot(version, self._clock(), value, error)
+
+    def fail(self, error: BaseException) -> None:
+        """Record a failed sample, keeping the last good value."""
+        self.publish(self.snapshot.value, f"{type(error).__name__}: {error}")
+
+
+class Sampler:
+    """Call a sampling function periodically from a background thread."""
+
+    def __init__(
+        self,
+        sample: Callable[[], Any],
+        interval: float,
+        name: str = "sampler",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the sampler.
+
+        Args:
+            sample: Returns the value to publish. It should return
+                comparable values so unchanged samples are detected.
+            interval: Seconds between the starts of two samples.
+            name: Thread name.
+            clock: Monotonic clock.
+
+        Raises:
+            ValueError: If ``interval`` is not positive.
+        """
+        if interval <= 0:
+            raise ValueError("Sampling interval must be positive")
+        self._sample = sample
+        self.interval = interval
+        self.name = name
+        self._clock = clock
+        self.cell = SnapshotCell(clock)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """Return the latest snapshot."""
+        return self.cell.snapshot
+
+    def sample_once(self) -> None:
+        """Take one sample and publish it, or record why it failed."""
+        try:
+            value = self._sample()
+        except Exception as error:
+            self.cell.fail(error)
+        else:
+            self.cell.publish(value)
+
+    def _run(self) -> None:
+        """Sample until stopped, keeping to the interval."""
+        while not self._stop.is_set():
+            started = self._clock()
+            self.sample_once()
+            elapsed = self._clock() - started
+            self._stop.wait(max(0.0, self.interval - elapsed))
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop sampling and wait for the thread to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+
+class ScanTask:
+    """Scan a directory in a background thread, publishing its progress."""
+
+    def __init__(
+        self,
+        root: str,
+        analyzer: Optional["DiskAnalyzer"] = None,
+        progress_every: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the task.
+
+        Args:
+            root: Directory to scan.
+            analyzer: Analyzer to scan with; created on start if omitted.
+            progress_every: Directories between progress snapshots.
+            clock: Monotonic clock.
+        """
+        self.root = root
+        self._analyzer = analyzer
+        self.progress_every = progress_every
+        self.cell = SnapshotCell(clock)
+        self.index: Optional["ScanIndex"] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def snapshot(self) -> Snapshot:
+        """Return the latest progress snapshot."""
+        return self.cell.snapshot
+
+    def run(self) -> None:
+        """Scan in the calling thread."""
+        if self._analyzer is None:
+            from src.domain.services.disk_analyzer import DiskAnalyzer
+
+            self._analyzer = DiskAnalyzer()
+        try:
+            self.index = self._analyzer.scan_directory(
+                self.root,
+                progress=self.cell.publish,
+                progress_every=self.progress_every,
+            )
+        except Exception as error:
+            self.cell.fail(error)
+
+    def start(self) -> None:
+        """Scan in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run, name="scan", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Wait up to ``timeout`` seconds for the scan to finish.
+
+        Scans cannot be interrupted; the thread is a daemon thread, so an
+        unfinished scan does not keep the process alive.
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def default_sources(
+    scan_root: Optional[str] = None,
+    top: int = 10,
+    memory_analyzer: Optional["MemoryAnalyzer"] = None,
+    disk_analyzer: Optional["DiskAnalyzer"] = None,
+    cpu_analyzer: Optional["CpuAnalyzer"] = None,
+) -> Dict[str, Any]:
+    """Create the standard samplers, keyed by name.
+
+    Memory and CPU usage, with the ``top`` CPU consumers, are sampled
+    every second, the ``top`` processes by resident size every 3 seconds
+    and disk usage every 5 seconds. With ``scan_root``, a ``scan`` task
+    reports the progress of one scan.
+    """
+    if memory_analyzer is None:
+        from src.domain.services.memory_analyzer import MemoryAnalyzer
+
+        memory_analyzer = MemoryAnalyzer()
+    if disk_analyzer is None:
+        from src.domain.services.disk_analyzer import DiskAnalyzer
+
+        disk_analyzer = DiskAnalyzer()
+    if cpu_analyzer is None:
+        from src.domain.services.cpu_analyzer import CpuAnalyzer
+
+        cpu_analyzer = CpuAnalyzer()
+    analyzer = memory_analyzer
+    cpu = cpu_analyzer
+
+    def top_processes() -> List[Any]:
+        records = analyzer.sample_process_memory()
+        records.sort(key=lambda record: record.rss_bytes, reverse=True)
+        return records[:top]
+
+    sources: Dict[str, Any] = {
+        "memory": Sampler(memory_analyzer.sample_memory, 1.0, name="memory"),
+        "cpu": Sampler(lambda: cpu.sample(top=top), 1.0, name="cpu"),
+        "processes": Sampler(top_processes, 3.0, name="processes"),
+        "disks": Sampler(disk_analyzer.get_all_disks, 5.0, name="disks"),
+    }
+    if scan_root is not None:
+        sources["scan"] = ScanTask(scan_root, disk_analyzer)
+    return sources
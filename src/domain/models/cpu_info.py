@@ -0,0 +1,60 @@
+"""CPU usage models."""
+
+from typing import List, NamedTuple
+
+from pydantic import BaseModel, Field
+
+
+class CpuInfo(BaseModel):
+    """System CPU usage over the interval between two samples."""
+
+    busy_percent: float = Field(..., description="Share of CPU time not idle")
+    user_percent: float = Field(..., description="Share spent in user mode")
+    system_percent: float = Field(..., description="Share spent in kernel mode")
+    iowait_percent: float = Field(..., description="Share idle waiting for I/O")
+    cpu_count: int = Field(..., description="Number of logical CPUs")
+
+
+class ProcessCpuInfo(BaseModel):
+    """Process CPU usage model."""
+
+    pid: int = Field(..., description="Process ID")
+    name: str = Field(..., description="Process name")
+    cpu_percent: float = Field(
+        ..., description="CPU use over the interval; 100 is one full core"
+    )
+    cpu_seconds: float = Field(..., description="User plus system CPU time so far")
+
+
+class CpuRecord(NamedTuple):
+    """Lightweight, unvalidated system CPU sample for trusted internal data."""
+
+    busy_percent: float
+    user_percent: float
+    system_percent: float
+    iowait_percent: float
+    cpu_count: int
+
+    def to_model(self) -> CpuInfo:
+        """Convert to the validated API model."""
+        return CpuInfo(**self._asdict())
+
+
+class ProcessCpuRecord(NamedTuple):
+    """Lightweight, unvalidated process CPU sample for trusted internal data."""
+
+    pid: int
+    name: str
+    cpu_percent: float
+    cpu_seconds: float
+
+    def to_model(self) -> ProcessCpuInfo:
+        """Convert to the validated API model."""
+        return ProcessCpuInfo(**self._asdict())
+
+
+class CpuSample(NamedTuple):
+    """System and per-process CPU usage taken in one pass."""
+
+    cpu: CpuRecord
+    processes: List[ProcessCpuRecord]
@@ -1,6 +1,8 @@
 """Disk information models."""
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional
 
 
 @dataclass
@@ -18,3 +20,54 @@ class DiskInfo:
         return (
             (self.used_space / self.total_space) * 100 if self.total_space > 0 else 0.0
         )
+
+
+class ScanProgress(NamedTuple):
+    """How far a directory scan has got."""
+
+    root: str
+    directories: int
+    files: int
+    bytes: int
+    errors: int
+    done: bool = False
+
+
+@dataclass
+class ScanIndex:
+    """Sizes gathered by one directory scan."""
+
+    root: str
+    total_bytes: int = 0
+    file_count: int = 0
+    dir_count: int = 0
+    error_count: int = 0
+    skipped_dirs: int = 0
+    seconds: float = 0.0
+    dir_sizes: Dict[str, int] = field(default_factory=dict)
+    app_claims: Dict[str, str] = field(default_factory=dict)
+    claim_bytes: Dict[str, int] = field(default_factory=dict)
+
+    def size_of(self, path: str) -> int:
+        """Return the bytes under directory ``path`` (0 if not scanned)."""
+        return self.dir_sizes.get(os.path.abspath(path), 0)
+
+    def app_sizes(self, path: Optional[str] = None) -> Dict[str, int]:
+        """Return the bytes attributed to each application.
+
+        ``app_claims`` maps each path a rule assigned to an application;
+        ``claim_bytes`` holds the bytes below it that no deeper rule
+        claimed, so the totals add up without counting anything twice.
+
+        Args:
+            path: Only count claims at or below this path.
+        """
+        prefix = None
+        if path is not None:
+            path = os.path.abspath(path)
+            prefix = path.rstrip(os.sep) + os.sep
+        totals: Dict[str, int] = {}
+        for claim, app in self.app_claims.items():
+            if prefix is None or claim == path or claim.startswith(prefix):
+                totals[app] = totals.get(app, 0) + self.claim_bytes.get(claim, 0)
+        return totals
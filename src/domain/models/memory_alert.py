@@ -0,0 +1,42 @@
+"""Memory alert rule and event models."""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ThresholdRule:
+    """Alert on a metric level, with hysteresis.
+
+    The alert raises when the metric reaches ``raise_at`` and clears only once
+    it falls back to ``clear_at``, so a value hovering around the threshold
+    does not flap. For metrics where low values are bad (for example
+    ``available_bytes``) set ``below=True`` and ``clear_at > raise_at``.
+    """
+
+    name: str
+    metric: str
+    raise_at: float
+    clear_at: float
+    below: bool = False
+
+
+@dataclass(frozen=True)
+class RateRule:
+    """Alert on a metric's rate of change per second, with hysteresis."""
+
+    name: str
+    metric: str
+    raise_at: float
+    clear_at: float
+    below: bool = False
+
+
+@dataclass(frozen=True)
+class MemoryAlert:
+    """A transition of an alert rule into or out of the active state."""
+
+    rule: str
+    metric: str
+    value: float
+    active: bool
+    timestamp: float
@@ -1,6 +1,9 @@
 """Memory information models."""
 
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel, Field, TypeAdapter
 
 
 class MemoryInfo(BaseModel):
@@ -24,3 +27,111 @@ class ProcessMemoryInfo(BaseModel):
     vms_bytes: int = Field(
         ..., description="Virtual Memory Size (VMS) - virtual memory used by process"
     )
+
+
+class MemoryPressureInfo(BaseModel):
+    """Memory pressure, swap activity and reclaimable cache breakdown."""
+
+    timestamp: float = Field(..., description="Monotonic sample time in seconds")
+    available_bytes: int = Field(..., description="Memory available without swapping")
+    cached_bytes: int = Field(..., description="Page cache size in bytes")
+    buffers_bytes: int = Field(..., description="Block device buffers in bytes")
+    reclaimable_bytes: int = Field(
+        ..., description="File-backed pages plus reclaimable slab, in bytes"
+    )
+    dirty_bytes: int = Field(..., description="Pages waiting to be written back")
+    swap_total_bytes: int = Field(..., description="Total swap space in bytes")
+    swap_free_bytes: int = Field(..., description="Free swap space in bytes")
+    swap_in_bytes_per_sec: float = Field(..., description="Swap-in rate")
+    swap_out_bytes_per_sec: float = Field(..., description="Swap-out rate")
+    psi_some_avg10: Optional[float] = Field(
+        None, description="Share of time some tasks stalled on memory (10s avg)"
+    )
+    psi_some_avg60: Optional[float] = Field(
+        None, description="Share of time some tasks stalled on memory (60s avg)"
+    )
+    psi_full_avg10: Optional[float] = Field(
+        None, description="Share of time all tasks stalled on memory (10s avg)"
+    )
+    psi_full_avg60: Optional[float] = Field(
+        None, description="Share of time all tasks stalled on memory (60s avg)"
+    )
+
+
+class MemoryRecord(NamedTuple):
+    """Lightweight, unvalidated system memory sample for trusted internal data."""
+
+    total_bytes: int
+    available_bytes: int
+    used_bytes: int
+    used_percent: float
+
+    def to_model(self) -> MemoryInfo:
+        """Convert to the validated API model."""
+        return MemoryInfo(**self._asdict())
+
+
+class ProcessMemoryRecord(NamedTuple):
+    """Lightweight, unvalidated process memory sample for trusted internal data."""
+
+    pid: int
+    name: str
+    memory_percent: float
+    rss_bytes: int
+    vms_bytes: int
+
+    def to_model(self) -> ProcessMemoryInfo:
+        """Convert to the validated API model."""
+        return ProcessMemoryInfo(**self._asdict())
+
+
+class MemoryPressureRecord(NamedTuple):
+    """Lightweight, unvalidated memory pressure sample for trusted internal data."""
+
+    timestamp: float
+    available_bytes: int
+    cached_bytes: int
+    buffers_bytes: int
+    reclaimable_bytes: int
+    dirty_bytes: int
+    swap_total_bytes: int
+    swap_free_bytes: int
+    swap_in_bytes_per_sec: float
+    swap_out_bytes_per_sec: float
+    psi_some_avg10: Optional[float] = None
+    psi_some_avg60: Optional[float] = None
+    psi_full_avg10: Optional[float] = None
+    psi_full_avg60: Optional[float] = None
+
+    def to_model(self) -> MemoryPressureInfo:
+        """Convert to the validated API model."""
+        return MemoryPressureInfo(**self._asdict())
+
+
+Record = Union[BaseModel, MemoryRecord, ProcessMemoryRecord, MemoryPressureRecord]
+
+_DICT_LIST_ADAPTER: TypeAdapter = TypeAdapter(List[Dict[str, Any]])
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Build (once per model class) an adapter for lists of that model."""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+
+def dump_many(records: Sequence[Record]) -> List[Dict[str, Any]]:
+    """Serialize many records of the same type to dicts in a single call."""
+    if not records:
+        return []
+    if isinstance(records[0], BaseModel):
+        return _list_adapter(type(records[0])).dump_python(list(records))
+    return [record._asdict() for record in records]  # type: ignore[union-attr]
+
+
+def dump_many_json(records: Sequence[Record]) -> bytes:
+    """Serialize many records of the same type to a JSON array in one pass."""
+    if not records:
+        return b"[]"
+    if isinstance(records[0], BaseModel):
+        return _list_adapter(type(records[0])).dump_json(list(records))
+    return _DICT_LIST_ADAPTER.dump_json(dump_many(records))
@@ -0,0 +1,16 @@
+"""Process metadata models."""
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class ProcessMetadata:
+    """Attributes of a process that do not change during its lifetime."""
+
+    pid: int
+    create_time: float
+    name: str
+    exe: Optional[str] = None
+    cmdline: List[str] = field(default_factory=list)
+    username: Optional[str] = None
@@ -0,0 +1,231 @@
+"""Attribute paths on disk to the applications that own them.
+
+Rules name a path, optionally with ``*`` and ``?`` wildcards in its
+last component, and the application owning everything below it. The
+rules are compiled into a table keyed by parent directory, so a scan
+asks about the entries of a directory only when some rule names one of
+them, and the answer is a dictionary lookup plus, for wildcard rules, a
+single precompiled regular expression. Everything below a matched path
+belongs to its application unless a deeper rule says otherwise.
+
+On case-insensitive volumes, the default on macOS, rules match paths
+regardless of case, as the filesystem does.
+"""
+
+import fnmatch
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+from src.shared.paths import CASE_INSENSITIVE
+
+RULES_ENV = "MAC_CLEANER_APP_RULES"
+
+
+@dataclass(frozen=True)
+class AttributionRule:
+    """Paths matching ``pattern`` belong to application ``app``.
+
+    ``pattern`` may start with ``~`` and may use ``*`` and ``?`` in its
+    last component. ``app`` may contain ``{name}``, the matched file or
+    directory name, or ``{stem}``, that name without its extension.
+    """
+
+    pattern: str
+    app: str = "{name}"
+
+
+_LIBRARY = "~/Library"
+
+DEFAULT_RULES: Tuple[AttributionRule, ...] = (
+    AttributionRule("/Applications/*.app", "{stem}"),
+    AttributionRule("~/Applications/*.app", "{stem}"),
+    AttributionRule(f"{_LIBRARY}/Application Support/*"),
+    AttributionRule(f"{_LIBRARY}/Application Support/Google/Chrome", "Google Chrome"),
+    AttributionRule(f"{_LIBRARY}/Caches/*"),
+    AttributionRule(f"{_LIBRARY}/Containers/*"),
+    AttributionRule(f"{_LIBRARY}/Group Containers/*"),
+    AttributionRule(f"{_LIBRARY}/HTTPStorages/*"),
+    AttributionRule(f"{_LIBRARY}/Logs/*"),
+    AttributionRule(f"{_LIBRARY}/Preferences/*.plist", "{stem}"),
+    AttributionRule(f"{_LIBRARY}/Saved Application State/*", "{stem}"),
+    AttributionRule(f"{_LIBRARY}/WebKit/*"),
+)
+
+DEFAULT_ALIASES: Dict[str, str] = {
+    "Code": "Visual Studio Code",
+    "com.apple.Safari": "Safari",
+    "com.apple.dt.Xcode": "Xcode",
+    "com.google.Chrome": "Google Chrome",
+    "com.microsoft.VSCode": "Visual Studio Code",
+    "com.spotify.client": "Spotify",
+    "com.tinyspeck.slackmacgap": "Slack",
+    "org.mozilla.firefox": "Firefox",
+}
+
+
+class AppAttributor:
+    """Compiled lookup from directory entries to owning applications."""
+
+    def __init__(
+        self,
+        rules: Iterable[AttributionRule] = (),
+        aliases: Optional[Mapping[str, str]] = None,
+        home: Optional[str] = None,
+        case_insensitive: bool = CASE_INSENSITIVE,
+    ) -> None:
+        """Compile ``rules``.
+
+        Where two rules name the same path, or two wildcard rules in one
+        directory both match, the earlier rule wins. A rule naming an
+        exact path wins over a wildcard rule.
+
+        Args:
+            rules: Rules to apply, most specific first.
+            aliases: Maps names produced by rules (bundle identifiers,
+                folder names) to application names, so an application's
+                caches, containers and settings add up under one name.
+            home: Directory substituted for ``~``.
+            case_insensitive: Match paths regardless of case; defaults to
+                the platform's default volume behavior.
+
+        Raises:
+            ValueError: If a pattern is relative or has wildcards outside
+                its last component, or an application name uses an
+                unknown placeholder.
+        """
+        self.home = home if home is not None else os.path.expanduser("~")
+        self.aliases = dict(aliases or {})
+        self.case_insensitive = case_insensitive
+        # Alias keys are names taken from paths, so they fold like paths.
+        self._aliases = {self._key(name): app for name, app in self.aliases.items()}
+        self._exact: Dict[str, Dict[str, str]] = {}
+        wildcards: Dict[str, List[Tuple[str, str]]] = {}
+        for rule in rules:
+            parent, name = self._split(rule.pattern)
+            parent = self._key(parent)
+            try:
+                rule.app.format(name="", stem="")
+            except (IndexError, KeyError, ValueError) as e:
+                raise ValueError(f"Invalid application name: {rule.app}") from e
+            if any(char in name for char in "*?["):
+                wildcards.setdefault(parent, []).append((name, rule.app))
+            else:
+                self._exact.setdefault(parent, {}).setdefault(self._key(name), rule.app)
+        self._wildcards: Dict[str, Tuple[Pattern[str], List[str]]] = {}
+        flags = re.IGNORECASE if case_insensitive else 0
+        for parent, entries in wildcards.items():
+            # One alternation per directory; the group that matched tells
+            # which rule it was.
+            regex = "|".join(
+                f"(?P<r{number}>{fnmatch.translate(name)})"
+                for number, (name, _) in enumerate(entries)
+            )
+            self._wildcards[parent] = (
+                re.compile(regex, flags),
+                [app for _, app in entries],
+            )
+        # Directories some rule names an entry of, as lookup keys.
+        self.watched = frozenset(self._exact) | frozenset(self._wildcards)
+
+    @classmethod
+    def default(
+        cls,
+        rules: Iterable[AttributionRule] = (),
+        aliases: Optional[Mapping[str, str]] = None,
+        home: Optional[str] = None,
+        case_insensitive: bool = CASE_INSENSITIVE,
+    ) -> "AppAttributor":
+        """Return an attributor for the standard macOS locations.
+
+        ``rules`` and ``aliases`` are added to the built-in ones and take
+        precedence over them.
+        """
+        merged = dict(DEFAULT_ALIASES)
+        merged.update(aliases or {})
+        return cls([*rules, *DEFAULT_RULES], merged, home, case_insensitive)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        home: Optional[str] = None,
+        case_insensitive: bool = CASE_INSENSITIVE,
+    ) -> "AppAttributor":
+        """Return the default attributor extended by the rules in ``path``.
+
+        The file holds a JSON object with an optional ``rules`` list of
+        ``{"path": ..., "app": ...}`` objects and an optional ``aliases``
+        object.
+
+        Raises:
+            ValueError: If the file cannot be read or is not valid JSON of
+                that shape.
+        """
+        try:
+            with open(path, encoding="utf-8") as handle:
+                document = json.load(handle)
+            rules = [
+                AttributionRule(entry["path"], entry.get("app", "{name}"))
+                for entry in document.get("rules", [])
+            ]
+            aliases = dict(document.get("aliases", {}))
+        except OSError as e:
+            raise ValueError(f"Cannot read attribution rules {path}: {e}") from e
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid attribution rules in {path}: {e}") from e
+        return cls.default(rules, aliases, home, case_insensitive)
+
+    @classmethod
+    def from_environment(cls) -> "AppAttributor":
+        """Return the default attributor, extended by ``MAC_CLEANER_APP_RULES``."""
+        path = os.environ.get(RULES_ENV)
+        return cls.from_file(path) if path else cls.default()
+
+    def _key(self, path: str) -> str:
+        """Return the lookup key of a path or name."""
+        return path.casefold() if self.case_insensitive else path
+
+    def watches(self, directory: str) -> bool:
+        """Whether some rule names an entry of ``directory``."""
+        return self._key(directory) in self.watched
+
+    def _split(self, pattern: str) -> Tuple[str, str]:
+        """Split a rule pattern into its absolute parent and last component."""
+        if pattern == "~" or pattern.startswith("~/"):
+            pattern = self.home + pattern[1:]
+        pattern = os.path.normpath(pattern)
+        if not os.path.isabs(pattern):
+            raise ValueError(f"Attribution rule must be an absolute path: {pattern}")
+        parent, name = os.path.split(pattern)
+        if any(char in parent for char in "*?["):
+            raise ValueError(
+                f"Wildcards are only allowed in the last component: {pattern}"
+            )
+        return parent, name
+
+    def match(self, parent: str, name: str) -> Optional[str]:
+        """Return the application owning entry ``name`` of ``parent``, if any.
+
+        Only entries matched by a rule get an answer; callers carry the
+        owner of an enclosing match down to entries below it.
+        """
+        parent = self._key(parent)
+        template = self._exact.get(parent, {}).get(self._key(name))
+        if template is None:
+            compiled = self._wildcards.get(parent)
+            if compiled is None:
+                return None
+            found = compiled[0].match(name)
+            if found is None:
+                return None
+            template = compiled[1][int(found.lastgroup[1:])]
+        app = template.format(name=name, stem=os.path.splitext(name)[0])
+        return self._aliases.get(self._key(app), app)
+
+    def match_path(self, path: str) -> Optional[str]:
+        """Return the application a rule assigns to ``path`` itself."""
+        parent, name = os.path.split(os.path.abspath(path))
+        return self.match(parent, name) if name else None
@@ -0,0 +1,329 @@
+"""CPU analyzer service backed by procfs tick counters."""
+
+import heapq
+import os
+import resource
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import psutil
+
+from src.shared.spans import timed
+
+from ..models.cpu_info import (
+    CpuInfo,
+    CpuRecord,
+    CpuSample,
+    ProcessCpuInfo,
+    ProcessCpuRecord,
+)
+
+# Most process stat files held open between samples by default, and the
+# share of the open file limit they may use at most.
+DEFAULT_MAX_OPEN_FILES = 256
+_OPEN_FILE_SHARE = 8
+
+# Kernel CPU time accounting unit (USER_HZ) used in /proc.
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+_STAT_READ_SIZE = 1024
+_SYSTEM_READ_SIZE = 64 * 1024
+
+# Total, idle (with iowait), user (with nice), system and iowait seconds.
+SystemTimes = Tuple[float, float, float, float, float]
+
+
+def parse_system_stat(data: bytes) -> Tuple[SystemTimes, int]:
+    """Parse the aggregate ``cpu`` line of ``/proc/stat``.
+
+    Returns:
+        The system times in seconds and the number of CPUs listed.
+    """
+    end = data.find(b"\n")
+    fields = [int(value) for value in data[:end].split()[1:9]]
+    fields += [0] * (8 - len(fields))
+    user, nice, system, idle, iowait = fields[:5]
+    total = sum(fields) / CLOCK_TICKS
+    times = (
+        total,
+        (idle + iowait) / CLOCK_TICKS,
+        (user + nice) / CLOCK_TICKS,
+        system / CLOCK_TICKS,
+        iowait / CLOCK_TICKS,
+    )
+    return times, max(1, data.count(b"\ncpu"))
+
+
+def parse_process_stat(data: bytes) -> Tuple[bytes, float, float]:
+    """Parse a ``/proc/<pid>/stat`` line.
+
+    The command name is in parentheses and may itself contain spaces and
+    parentheses, so fields are counted from the last ``)``.
+
+    Returns:
+        The raw command name, the start time and the user plus system
+        CPU time, both in seconds.
+    """
+    close = data.rfind(b")")
+    name = data[data.find(b"(") + 1 : close]
+    fields = data[close + 2 :].split(None, 20)
+    cpu_ticks = int(fields[11]) + int(fields[12])
+    return name, int(fields[19]) / CLOCK_TICKS, cpu_ticks / CLOCK_TICKS
+
+
+class ProcessTickTable:
+    """CPU time of every process at the previous sample.
+
+    Three parallel arrays sorted by pid hold the pid, the start time and
+    the CPU seconds, about 24 bytes per process. The start time tells a
+    recycled pid apart from the process that had it before. Each sample
+    is matched against the previous one in a single merge pass.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self.pids = array("q")
+        self.starts = array("d")
+        self.times = array("d")
+
+    def __len__(self) -> int:
+        """Return the number of processes recorded."""
+        return len(self.pids)
+
+    def advance(
+        self, pids: Sequence[int], starts: Sequence[float], times: Sequence[float]
+    ) -> array:
+        """Record a new sample and return each process's CPU seconds since the last.
+
+        Args:
+            pids: Process ids in increasing order.
+            starts: Start time of each process.
+            times: Cumulative CPU seconds of each process.
+
+        Returns:
+            The CPU seconds used since the previous sample. A process that
+            was not in the previous sample started since, so all of its
+            CPU time counts.
+        """
+        deltas = array("d", times)
+        old_pids, old_starts, old_times = self.pids, self.starts, self.times
+        count = len(old_pids)
+        j = 0
+        for i, pid in enumerate(pids):
+            while j < count and old_pids[j] < pid:
+                j += 1
+            if j < count and old_pids[j] == pid and old_starts[j] == starts[i]:
+                deltas[i] -= old_times[j]
+        self.pids = array("q", pids)
+        self.starts = array("d", starts)
+        self.times = array("d", times)
+        return deltas
+
+
+class CpuAnalyzer:
+    """Service for analyzing system and per-process CPU usage.
+
+    Each sample reads ``/proc/stat`` and every ``/proc/<pid>/stat`` once
+    and compares the tick counts with the previous sample, so CPU
+    percentages never require sleeping inside the call. A bounded number
+    of procfs files are kept open and re-read with ``pread``, sparing
+    those processes a path lookup per sample; the rest are reopened on
+    every sample, so the analyzer never ties up a large share of the
+    process's file descriptors. On systems without
+    procfs (macOS) psutil supplies the same counters.
+    """
+
+    def __init__(
+        self, proc_root: str = "/proc", max_open_files: int = DEFAULT_MAX_OPEN_FILES
+    ) -> None:
+        """Initialize the analyzer.
+
+        Args:
+            proc_root: Mount point of procfs.
+            max_open_files: Most process stat files kept open between
+                samples; further processes are opened on every sample.
+                Capped at an eighth of the open file limit.
+        """
+        self.proc_root = proc_root
+        self.use_procfs = os.path.exists(os.path.join(proc_root, "stat"))
+        self.max_open_files = max_open_files
+        soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        if soft_limit != resource.RLIM_INFINITY:
+            self.max_open_files = min(max_open_files, soft_limit // _OPEN_FILE_SHARE)
+        self.table = ProcessTickTable()
+        self._previous_system: Optional[SystemTimes] = None
+        self._stat_fd: Optional[int] = None
+        self._process_fds: Dict[int, int] = {}
+
+    def __enter__(self) -> "CpuAnalyzer":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the procfs files."""
+        self.close()
+
+    def close(self) -> None:
+        """Close every procfs file held open between samples."""
+        if self._stat_fd is not None:
+            os.close(self._stat_fd)
+            self._stat_fd = None
+        for fd in self._process_fds.values():
+            os.close(fd)
+        self._process_fds.clear()
+
+    @timed("cpu.sample")
+    def sample(self, top: Optional[int] = None) -> CpuSample:
+        """Sample system and process CPU usage since the previous call.
+
+        The first sample has nothing to compare with: system figures are
+        then averages since boot and process percentages are zero.
+
+        Args:
+            top: Only build records for this many busiest processes.
+
+        Returns:
+            CpuSample: System usage and process usage, busiest first.
+        """
+        if self.use_procfs:
+            system, cpu_count = self._read_system()
+            pids, names, starts, times = self._read_processes()
+        else:
+            system, cpu_count = self._psutil_system()
+            pids, names, starts, times = self._psutil_processes()
+
+        previous = self._previous_system or (0.0, 0.0, 0.0, 0.0, 0.0)
+        first = self._previous_system is None
+        self._previous_system = system
+        delta = [now - before for now, before in zip(system, previous)]
+        total = delta[0] or 1.0
+        cpu = CpuRecord(
+            100.0 * (1.0 - delta[1] / total),
+            100.0 * delta[2] / total,
+            100.0 * delta[3] / total,
+            100.0 * delta[4] / total,
+            cpu_count,
+        )
+
+        used = self.table.advance(pids, starts, times)
+        per_core = 0.0 if first else 100.0 * cpu_count / total
+        indices = range(len(pids))
+        if top is None:
+            order = sorted(indices, key=used.__getitem__, reverse=True)
+        else:
+            order = heapq.nlargest(top, indices, key=used.__getitem__)
+        processes = [
+            ProcessCpuRecord(
+                pids[i],
+                names[i].decode("utf-8", "replace"),
+                used[i] * per_core,
+                times[i],
+            )
+            for i in order
+        ]
+        return CpuSample(cpu, processes)
+
+    def get_cpu_usage(self) -> CpuInfo:
+        """Get system CPU usage since the previous sample.
+
+        Returns:
+            CpuInfo: System CPU usage information.
+        """
+        return self.sample(top=0).cpu.to_model()
+
+    def get_top_cpu_processes(self, limit: int = 5) -> List[ProcessCpuInfo]:
+        """Get the processes that used the most CPU since the previous sample.
+
+        Args:
+            limit: Maximum number of processes to return.
+
+        Returns:
+            List[ProcessCpuInfo]: Busiest processes first.
+        """
+        return [record.to_model() for record in self.sample(top=limit).processes]
+
+    def _read_system(self) -> Tuple[SystemTimes, int]:
+        """Read the system times from ``/proc/stat``."""
+        if self._stat_fd is None:
+            self._stat_fd = os.open(os.path.join(self.proc_root, "stat"), os.O_RDONLY)
+        return parse_system_stat(os.pread(self._stat_fd, _SYSTEM_READ_SIZE, 0))
+
+    def _read_processes(
+        self,
+    ) -> Tuple[List[int], List[bytes], List[float], List[float]]:
+        """Read the name, start time and CPU time of every process.
+
+        Stat files stay open between samples and are re-read with
+        ``pread``. A held descriptor belongs to one process: once that
+        process exits, reading it fails even if its pid is reused.
+        """
+        pids = sorted(
+            int(name) for name in os.listdir(self.proc_root) if name.isdigit()
+        )
+        fds = self._process_fds
+        gone = fds.keys() - set(pids)
+        for pid in gone:
+            os.close(fds.pop(pid))
+        live, names, starts, times = [], [], [], []
+        path = os.path.join(self.proc_root, "%d", "stat")
+        for pid in pids:
+            fd = fds.get(pid)
+            try:
+                if fd is not None:
+                    data = os.pread(fd, _STAT_READ_SIZE, 0)
+                else:
+                    fd = os.open(path % pid, os.O_RDONLY)
+                    data = os.read(fd, _STAT_READ_SIZE)
+                    if len(fds) < self.max_open_files:
+                        fds[pid] = fd
+                    else:
+                        os.close(fd)
+            except OSError:
+                # The process exited; its descriptor can never be read again.
+                if fd is not None:
+                    os.close(fd)
+                fds.pop(pid, None)
+                continue
+            try:
+                name, start, cpu_seconds = parse_process_stat(data)
+            except (IndexError, ValueError):
+                continue
+            live.append(pid)
+            names.append(name)
+            starts.append(start)
+            times.append(cpu_seconds)
+        return live, names, starts, times
+
+    @staticmethod
+    def _psutil_system() -> Tuple[SystemTimes, int]:
+        """Read the system times through psutil."""
+        cpu = psutil.cpu_times()
+        guest = getattr(cpu, "guest", 0.0) + getattr(cpu, "guest_nice", 0.0)
+        iowait = getattr(cpu, "iowait", 0.0)
+        times = (
+            sum(cpu) - guest,
+            cpu.idle + iowait,
+            cpu.user + getattr(cpu, "nice", 0.0),
+            cpu.system,
+            iowait,
+        )
+        return times, psutil.cpu_count() or 1
+
+    @staticmethod
+    def _psutil_processes() -> Tuple[List[int], List[bytes], List[float], List[float]]:
+        """Read the name, start time and CPU time of every process via psutil."""
+        rows = []
+        for proc in psutil.process_iter(["name", "create_time", "cpu_times"]):
+            info = proc.info
+            cpu = info["cpu_times"]
+            if cpu is None or info["create_time"] is None:
+                continue
+            name = (info["name"] or "").encode("utf-8", "replace")
+            rows.append((proc.pid, name, info["create_time"], cpu.user + cpu.system))
+        rows.sort()
+        return (
+            [row[0] for row in rows],
+            [row[1] for row in rows],
+            [row[2] for row in rows],
+            [row[3] for row in rows],
+        )
@@ -2,43 +2,285 @@
 
 import os
 import shutil
-from typing import List
+import time
+from dataclasses import replace
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
 
-from ..models.disk_info import DiskInfo
+from src.shared.spans import timed
+
+from ..models.disk_info import DiskInfo, ScanIndex, ScanProgress
+
+if TYPE_CHECKING:
+    from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
+
+    from .app_attribution import AppAttributor
 
 
 class DiskAnalyzer:
     """Service for analyzing disk usage."""
 
+    def __init__(
+        self,
+        error_handler: Optional["ErrorHandlingSystem"] = None,
+        attributor: Optional["AppAttributor"] = None,
+    ) -> None:
+        """Initialize the analyzer.
+
+        Args:
+            error_handler: When given, disk I/O goes through its retry
+                policy and per-mount circuit breakers.
+            attributor: When given, scans also total bytes per owning
+                application.
+        """
+        self.error_handler = error_handler
+        self.attributor = attributor
+
+    @timed("disk.get_disk_usage")
     def get_disk_usage(self, path: str) -> DiskInfo:
-        """Get disk usage information for a given path."""
-        try:
-            if not os.path.exists(path):
-                raise ValueError(f"Path does not exist: {path}")
-
-            if not os.access(path, os.R_OK):
-                raise PermissionError(f"Permission denied: {path}")
-
-            total, used, free = shutil.disk_usage(path)
-            return DiskInfo(
-                path=path,
-                total_space=total,
-                used_space=used,
-                free_space=free,
-            )
-        except Exception as e:
-            raise ValueError(f"Error getting disk usage for {path}: {str(e)}") from e
+        """Get disk usage information for a given path.
+
+        Errors propagate unchanged, so callers can tell a missing path
+        (ValueError) from a permission problem or an unavailable mount
+        (OSError).
+        """
+        if self.error_handler is not None:
+            return self.error_handler.call(path, self._read_disk_usage, path)
+        return self._read_disk_usage(path)
+
+    def _read_disk_usage(self, path: str) -> DiskInfo:
+        """Read disk usage for ``path``."""
+        if not os.path.exists(path):
+            raise ValueError(f"Path does not exist: {path}")
+
+        if not os.access(path, os.R_OK):
+            raise PermissionError(f"Permission denied: {path}")
+
+        total, used, free = shutil.disk_usage(path)
+        return DiskInfo(
+            path=path,
+            total_space=total,
+            used_space=used,
+            free_space=free,
+        )
 
     def get_all_disks(self) -> List[DiskInfo]:
         """Get disk usage information for all mounted disks."""
-        try:
-            disks = []
-            for path in self._get_mount_points():
-                if os.path.exists(path):
-                    disks.append(self.get_disk_usage(path))
-            return disks
-        except Exception as e:
-            raise ValueError(f"Error getting all disks: {str(e)}") from e
+        disks = []
+        for path in self._get_mount_points():
+            if os.path.exists(path):
+                disks.append(self.get_disk_usage(path))
+        return disks
+
+    @timed("disk.scan_directory")
+    def scan_directory(
+        self,
+        root: str,
+        progress: Optional[Callable[[ScanProgress], None]] = None,
+        progress_every: int = 256,
+    ) -> ScanIndex:
+        """Walk ``root`` and total file sizes per directory.
+
+        Symlinks are not followed. Unreadable entries are counted and
+        passed to the error handler, which aggregates them, instead of
+        aborting the scan; directories on mounts whose circuit is open are
+        skipped. With an attributor, bytes are also attributed to
+        applications in the same pass.
+
+        Args:
+            root: Directory to scan.
+            progress: Called every ``progress_every`` directories and once
+                when the scan is done.
+            progress_every: Directories between progress reports.
+        """
+        return self._walk(os.path.abspath(root), progress, progress_every, None)
+
+    def _walk(
+        self,
+        root: str,
+        progress: Optional[Callable[[ScanProgress], None]],
+        progress_every: int,
+        inherited_claim: Optional[str],
+    ) -> ScanIndex:
+        """Scan ``root``, whose unclaimed bytes belong to ``inherited_claim``."""
+        start = time.perf_counter()
+        index = ScanIndex(root=root)
+        handler = self.error_handler
+        attributor = self.attributor
+        claims = index.app_claims
+        claim_bytes = index.claim_bytes
+        # Claim owning each directory still on the stack, if any.
+        owners: Dict[str, str] = {}
+        if attributor is not None:
+            app = attributor.match_path(root)
+            if app is not None:
+                claims[root] = app
+                inherited_claim = root
+            if inherited_claim is not None:
+                owners[root] = inherited_claim
+        own_sizes: Dict[str, int] = {}
+        scanned_bytes = 0
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            owner = owners.pop(directory, None) if owners else None
+            breaker = handler.breaker_for(directory) if handler is not None else None
+            if breaker is not None and not breaker.allow():
+                index.skipped_dirs += 1
+                continue
+            ruled = attributor is not None and attributor.watches(directory)
+            size = 0
+            claimed = 0
+            listed = False
+            try:
+                with os.scandir(directory) as entries:
+                    listed = True
+                    for entry in entries:
+                        try:
+                            app = (
+                                attributor.match(directory, entry.name)
+                                if ruled
+                                else None
+                            )
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                                if app is not None:
+                                    claims[entry.path] = app
+                                    owners[entry.path] = entry.path
+                                elif owner is not None:
+                                    owners[entry.path] = owner
+                            else:
+                                file_size = entry.stat(follow_symlinks=False).st_size
+                                size += file_size
+                                index.file_count += 1
+                                if app is not None:
+                                    claims[entry.path] = app
+                                    claim_bytes[entry.path] = file_size
+                                    claimed += file_size
+                        except OSError as error:
+                            self._scan_error(index, error, entry.path)
+            except OSError as error:
+                self._scan_error(index, error, directory)
+                if not listed:
+                    continue
+                # Listing failed partway: keep what was read, since the
+                # subdirectories already found are still scanned.
+            else:
+                if breaker is not None:
+                    breaker.record_success()
+            own_sizes[directory] = size
+            if owner is not None:
+                claim_bytes[owner] = claim_bytes.get(owner, 0) + size - claimed
+            scanned_bytes += size
+            if progress is not None and len(own_sizes) % progress_every == 0:
+                progress(
+                    ScanProgress(
+                        root,
+                        len(own_sizes),
+                        index.file_count,
+                        scanned_bytes,
+                        index.error_count,
+                    )
+                )
+
+        dir_sizes = dict(own_sizes)
+        for directory in sorted(
+            own_sizes, key=lambda path: path.count(os.sep), reverse=True
+        ):
+            if directory != root:
+                dir_sizes[os.path.dirname(directory)] += dir_sizes[directory]
+        index.dir_sizes = dir_sizes
+        index.dir_count = len(dir_sizes)
+        index.total_bytes = dir_sizes.get(root, 0)
+        index.seconds = time.perf_counter() - start
+        if handler is not None:
+            # Report errors counted since the last summary now rather than
+            # whenever the next error happens to arrive.
+            handler.flush_error_summary()
+        if progress is not None:
+            progress(
+                ScanProgress(
+                    root,
+                    index.dir_count,
+                    index.file_count,
+                    index.total_bytes,
+                    index.error_count,
+                    done=True,
+                )
+            )
+        return index
+
+    @timed("disk.rescan")
+    def rescan(self, index: ScanIndex, path: str) -> ScanIndex:
+        """Return ``index`` with the subtree at ``path`` scanned again.
+
+        Only ``path`` is walked. Directory sizes above it are adjusted by
+        the change in its size, and application totals by the change in
+        what its claims hold, so the result matches a full scan of
+        ``index.root`` without walking the rest of the tree. ``index``
+        itself is left unchanged for readers still holding it.
+        ``file_count`` and ``error_count`` keep counting the original
+        scan, since the index does not record them per directory.
+
+        Raises:
+            ValueError: If ``path`` is not a directory of ``index``.
+        """
+        path = os.path.abspath(path)
+        if path not in index.dir_sizes:
+            raise ValueError(f"Not a scanned directory of {index.root}: {path}")
+        # Unclaimed bytes in the subtree belong to the nearest claim above.
+        inherited = None
+        parent = path
+        while parent != index.root and inherited is None:
+            parent = os.path.dirname(parent)
+            if parent in index.app_claims:
+                inherited = parent
+        fresh = self._walk(path, None, 256, inherited)
+
+        prefix = path.rstrip(os.sep) + os.sep
+        dir_sizes = {
+            directory: size
+            for directory, size in index.dir_sizes.items()
+            if directory != path and not directory.startswith(prefix)
+        }
+        dir_sizes.update(fresh.dir_sizes)
+        delta = fresh.total_bytes - index.dir_sizes[path]
+        parent = path
+        while parent != index.root:
+            parent = os.path.dirname(parent)
+            dir_sizes[parent] += delta
+
+        app_claims: Dict[str, str] = {}
+        claim_bytes: Dict[str, int] = {}
+        old_claimed = 0
+        for claim, app in index.app_claims.items():
+            if claim == path or claim.startswith(prefix):
+                old_claimed += index.claim_bytes.get(claim, 0)
+            else:
+                app_claims[claim] = app
+                claim_bytes[claim] = index.claim_bytes.get(claim, 0)
+        inherited_bytes = fresh.claim_bytes.pop(inherited, 0) if inherited else 0
+        app_claims.update(fresh.app_claims)
+        claim_bytes.update(fresh.claim_bytes)
+        if inherited is not None:
+            old_unclaimed = index.dir_sizes[path] - old_claimed
+            claim_bytes[inherited] += inherited_bytes - old_unclaimed
+
+        return replace(
+            index,
+            total_bytes=dir_sizes[index.root],
+            dir_count=len(dir_sizes),
+            skipped_dirs=index.skipped_dirs + fresh.skipped_dirs,
+            seconds=fresh.seconds,
+            dir_sizes=dir_sizes,
+            app_claims=app_claims,
+            claim_bytes=claim_bytes,
+        )
+
+    def _scan_error(self, index: ScanIndex, error: OSError, path: str) -> None:
+        """Count a scan error and pass it to the error handler."""
+        index.error_count += 1
+        if self.error_handler is not None:
+            self.error_handler.handle_error(error, {"path": path})
 
     def _get_mount_points(self) -> List[str]:
         """Get all mount points."""
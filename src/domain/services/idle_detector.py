@@ -0,0 +1,71 @@
+"""Decide whether the host is quiet enough for heavy background work."""
+
+import os
+import time
+from typing import Callable, Optional, Tuple
+
+import psutil
+
+
+def _disk_io_bytes() -> Optional[int]:
+    """Return the bytes read and written by all disks since boot."""
+    counters = psutil.disk_io_counters()
+    if counters is None:
+        return None
+    return counters.read_bytes + counters.write_bytes
+
+
+class IdleDetector:
+    """Report the host idle when both CPU load and disk I/O are low.
+
+    CPU load is the one-minute load average per CPU. Disk throughput is
+    measured between consecutive checks, so the first check only looks
+    at the load average.
+    """
+
+    def __init__(
+        self,
+        max_load_per_cpu: float = 0.5,
+        max_io_bytes_per_second: float = 8 * 1024 * 1024,
+        load_average: Callable[[], Tuple[float, float, float]] = os.getloadavg,
+        io_bytes: Callable[[], Optional[int]] = _disk_io_bytes,
+        cpu_count: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the detector.
+
+        Args:
+            max_load_per_cpu: Highest one-minute load average per CPU
+                considered idle.
+            max_io_bytes_per_second: Highest disk throughput considered
+                idle.
+            load_average: Returns the 1, 5 and 15 minute load averages.
+            io_bytes: Returns cumulative disk bytes, or None if unknown.
+            cpu_count: Number of CPUs; detected if omitted.
+            clock: Monotonic clock.
+        """
+        self.max_load_per_cpu = max_load_per_cpu
+        self.max_io_bytes_per_second = max_io_bytes_per_second
+        self._load_average = load_average
+        self._io_bytes = io_bytes
+        self.cpu_count = cpu_count or os.cpu_count() or 1
+        self._clock = clock
+        self._previous_io: Optional[Tuple[float, int]] = None
+        self.load_per_cpu = 0.0
+        self.io_bytes_per_second = 0.0
+
+    def is_idle(self) -> bool:
+        """Measure load and disk throughput and return whether both are low."""
+        self.load_per_cpu = self._load_average()[0] / self.cpu_count
+        now = self._clock()
+        total = self._io_bytes()
+        self.io_bytes_per_second = 0.0
+        if total is not None:
+            previous = self._previous_io
+            if previous is not None and now > previous[0]:
+                self.io_bytes_per_second = (total - previous[1]) / (now - previous[0])
+            self._previous_io = (now, total)
+        return (
+            self.load_per_cpu <= self.max_load_per_cpu
+            and self.io_bytes_per_second <= self.max_io_bytes_per_second
+        )
@@ -0,0 +1,88 @@
+"""Threshold and rate-of-change alert engine for memory samples."""
+
+from operator import attrgetter
+from typing import Any, Callable, List, Optional, Sequence, Union
+
+from ..models.memory_alert import MemoryAlert, RateRule, ThresholdRule
+
+Rule = Union[ThresholdRule, RateRule]
+
+
+class _RuleState:
+    """Compiled rule with its mutable evaluation state."""
+
+    __slots__ = ("rule", "read", "is_rate", "active", "last_value", "last_time")
+
+    def __init__(self, rule: Rule) -> None:
+        """Compile the metric accessor for a rule."""
+        self.rule = rule
+        self.read: Callable[[Any], Optional[float]] = attrgetter(rule.metric)
+        self.is_rate = isinstance(rule, RateRule)
+        self.active = False
+        self.last_value: Optional[float] = None
+        self.last_time = 0.0
+
+
+class MemoryAlertEngine:
+    """Evaluate alert rules against a stream of memory samples.
+
+    Samples are any objects exposing the rule metrics and a ``timestamp``
+    attribute, such as ``MemoryPressureRecord``. Only state transitions are
+    returned, and evaluation is a handful of comparisons per rule, so the
+    engine can run on every sub-second sample.
+    """
+
+    def __init__(self, rules: Sequence[Rule]) -> None:
+        """Initialize the engine with its rules."""
+        for rule in rules:
+            if (rule.below and rule.clear_at < rule.raise_at) or (
+                not rule.below and rule.clear_at > rule.raise_at
+            ):
+                raise ValueError(f"Rule {rule.name} clears on the wrong side")
+        self._states = [_RuleState(rule) for rule in rules]
+
+    @property
+    def active_rules(self) -> List[str]:
+        """Names of the rules currently raised."""
+        return [state.rule.name for state in self._states if state.active]
+
+    def evaluate(self, sample: Any) -> List[MemoryAlert]:
+        """Evaluate every rule against a sample.
+
+        Args:
+            sample: Object exposing ``timestamp`` and the rule metrics.
+
+        Returns:
+            List[MemoryAlert]: Alerts that were raised or cleared by this sample.
+        """
+        now = sample.timestamp
+        alerts: List[MemoryAlert] = []
+        for state in self._states:
+            value = state.read(sample)
+            if value is None:
+                continue
+            if state.is_rate:
+                previous, previous_time = state.last_value, state.last_time
+                state.last_value, state.last_time = value, now
+                if previous is None or now <= previous_time:
+                    continue
+                value = (value - previous) / (now - previous_time)
+
+            rule = state.rule
+            if state.active:
+                cleared = (
+                    value >= rule.clear_at if rule.below else value <= rule.clear_at
+                )
+                if cleared:
+                    state.active = False
+                    alerts.append(
+                        MemoryAlert(rule.name, rule.metric, value, False, now)
+                    )
+            else:
+                raised = (
+                    value <= rule.raise_at if rule.below else value >= rule.raise_at
+                )
+                if raised:
+                    state.active = True
+                    alerts.append(MemoryAlert(rule.name, rule.metric, value, True, now))
+        return alerts
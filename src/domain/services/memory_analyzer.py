@@ -1,28 +1,72 @@
 """Memory analyzer service."""
 
-from typing import List
+from typing import Dict, List, Optional
 
 import psutil
 
-from src.domain.models.memory_info import MemoryInfo, ProcessMemoryInfo
+from src.domain.models.memory_info import (
+    MemoryInfo,
+    MemoryPressureInfo,
+    MemoryPressureRecord,
+    MemoryRecord,
+    ProcessMemoryInfo,
+    ProcessMemoryRecord,
+)
+from src.domain.services.memory_pressure import MemoryPressureReader
+from src.domain.services.process_metadata_cache import ProcessMetadataCache
+from src.shared.spans import timed
 
 
 class MemoryAnalyzer:
-    """Service for analyzing system and process memory usage."""
+    """Service for analyzing system and process memory usage.
 
+    Static process attributes are kept in a ``ProcessMetadataCache`` so each
+    sampling cycle only reads the volatile memory counters.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the analyzer with an empty process metadata cache."""
+        self.metadata_cache = ProcessMetadataCache()
+        self._pressure_reader: Optional[MemoryPressureReader] = None
+
+    @timed("memory.get_memory_usage")
     def get_memory_usage(self) -> MemoryInfo:
         """Get system memory usage information.
 
         Returns:
             MemoryInfo: System memory usage information.
         """
+        return self.sample_memory().to_model()
+
+    def sample_memory(self) -> MemoryRecord:
+        """Sample system memory without model validation.
+
+        Returns:
+            MemoryRecord: Lightweight system memory sample.
+        """
         memory = psutil.virtual_memory()
-        return MemoryInfo(
-            total_bytes=memory.total,
-            available_bytes=memory.available,
-            used_bytes=memory.used,
-            used_percent=memory.percent,
-        )
+        return MemoryRecord(memory.total, memory.available, memory.used, memory.percent)
+
+    @timed("memory.get_memory_pressure")
+    def get_memory_pressure(self) -> MemoryPressureInfo:
+        """Get memory pressure, swap activity and reclaimable cache metrics.
+
+        Returns:
+            MemoryPressureInfo: Memory pressure information.
+        """
+        return self.sample_memory_pressure().to_model()
+
+    def sample_memory_pressure(self) -> MemoryPressureRecord:
+        """Sample memory pressure without model validation.
+
+        Swap rates are measured since the previous call on this analyzer.
+
+        Returns:
+            MemoryPressureRecord: Lightweight memory pressure sample.
+        """
+        if self._pressure_reader is None:
+            self._pressure_reader = MemoryPressureReader()
+        return self._pressure_reader.sample()
 
     def get_process_memory(self, pid: int) -> ProcessMemoryInfo:
         """Get memory usage information for a specific process.
@@ -39,11 +83,11 @@ class MemoryAnalyzer:
         try:
             process = psutil.Process(pid)
             memory_info = process.memory_info()
-            process_name = process.name()  # Call name() once and store result
+            metadata = self.metadata_cache.get(process)
             memory_percent = process.memory_percent()  # Call memory_percent() once
             return ProcessMemoryInfo(
                 pid=process.pid,
-                name=process_name,
+                name=metadata.name,
                 memory_percent=memory_percent,
                 rss_bytes=memory_info.rss,
                 vms_bytes=memory_info.vms,
@@ -51,6 +95,7 @@ class MemoryAnalyzer:
         except psutil.NoSuchProcess as exc:
             raise ValueError(f"Process with ID {pid} not found") from exc
 
+    @timed("memory.get_top_memory_processes")
     def get_top_memory_processes(self, limit: int = 5) -> List[ProcessMemoryInfo]:
         """Get list of top memory-consuming processes.
 
@@ -60,24 +105,50 @@ class MemoryAnalyzer:
         Returns:
             List[ProcessMemoryInfo]: List of process memory information, sorted by memory usage.
         """
+        processes = self.sample_process_memory()
+
+        # Sort by memory percentage in descending order
+        processes.sort(key=lambda x: x.memory_percent, reverse=True)
+        return [record.to_model() for record in processes[:limit]]
+
+    @timed("memory.sample_process_memory")
+    def sample_process_memory(self) -> List[ProcessMemoryRecord]:
+        """Sample memory usage of every accessible process without validation.
+
+        Only records that reach the API boundary need converting to
+        ``ProcessMemoryInfo``, so bulk samplers should use this method.
+
+        Returns:
+            List[ProcessMemoryRecord]: One lightweight record per process.
+        """
         processes = []
+        live_keys = []
+        cache = self.metadata_cache
         for proc in psutil.process_iter():
             try:
                 memory_info = proc.memory_info()
-                process_name = proc.name()  # Call name() once and store result
+                key = cache.key_for(proc)
+                metadata = cache.get(proc, key)
                 memory_percent = proc.memory_percent()  # Call memory_percent() once
+                live_keys.append(key)
                 processes.append(
-                    ProcessMemoryInfo(
-                        pid=proc.pid,
-                        name=process_name,
-                        memory_percent=memory_percent,
-                        rss_bytes=memory_info.rss,
-                        vms_bytes=memory_info.vms,
+                    ProcessMemoryRecord(
+                        proc.pid,
+                        metadata.name,
+                        memory_percent,
+                        memory_info.rss,
+                        memory_info.vms,
                     )
                 )
             except (psutil.NoSuchProcess, psutil.AccessDenied):
                 continue
+        cache.retain(live_keys)
+        return processes
 
-        # Sort by memory percentage in descending order
-        processes.sort(key=lambda x: x.memory_percent, reverse=True)
-        return processes[:limit]
+    def metadata_cache_stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction statistics of the process metadata cache.
+
+        Returns:
+            Dict[str, int]: Cache counters and current size.
+        """
+        return self.metadata_cache.stats()
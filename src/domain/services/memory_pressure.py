@@ -0,0 +1,185 @@
+"""Memory pressure sampler backed by procfs."""
+
+import mmap
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+import psutil
+
+from ..models.memory_info import MemoryPressureRecord
+
+_READ_SIZE = 64 * 1024
+
+_MEMINFO_FIELDS = frozenset(
+    {
+        b"MemAvailable",
+        b"Cached",
+        b"Buffers",
+        b"Active(file)",
+        b"Inactive(file)",
+        b"SReclaimable",
+        b"Dirty",
+        b"SwapTotal",
+        b"SwapFree",
+    }
+)
+
+PsiAverages = Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]
+
+
+def parse_meminfo(data: bytes) -> Dict[bytes, int]:
+    """Parse the ``/proc/meminfo`` fields used for pressure metrics, in bytes."""
+    values: Dict[bytes, int] = {}
+    for line in data.split(b"\n"):
+        key, _, rest = line.partition(b":")
+        if key in _MEMINFO_FIELDS:
+            values[key] = int(rest.split()[0]) * 1024
+    return values
+
+
+def parse_vmstat_swap(data: bytes) -> Tuple[int, int]:
+    """Extract the cumulative ``pswpin``/``pswpout`` page counters."""
+    counters = []
+    for name in (b"\npswpin ", b"\npswpout "):
+        start = data.find(name)
+        if start < 0:
+            counters.append(0)
+            continue
+        start += len(name)
+        end = data.find(b"\n", start)
+        counters.append(int(data[start : end if end >= 0 else None]))
+    return counters[0], counters[1]
+
+
+def parse_psi(data: bytes) -> PsiAverages:
+    """Parse ``some``/``full`` avg10 and avg60 from ``/proc/pressure/memory``."""
+    averages: Dict[bytes, Tuple[float, float]] = {}
+    for line in data.split(b"\n"):
+        parts = line.split()
+        if len(parts) >= 3:
+            averages[parts[0]] = (
+                float(parts[1].partition(b"=")[2]),
+                float(parts[2].partition(b"=")[2]),
+            )
+    some = averages.get(b"some", (None, None))
+    full = averages.get(b"full", (None, None))
+    return some[0], some[1], full[0], full[1]
+
+
+def _open(path: str) -> Optional[int]:
+    """Open a procfs file for repeated reads, or return None if unavailable."""
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+
+def _pread(fd: int) -> bytes:
+    """Re-read a procfs file from the start without reopening it."""
+    return os.pread(fd, _READ_SIZE, 0)
+
+
+class MemoryPressureReader:
+    """Sampler for PSI, swap rates and reclaimable cache metrics.
+
+    The procfs files are opened once and re-read with ``pread`` on every
+    sample, so a sample costs three reads and no path lookups. On systems
+    without procfs (macOS) the reader falls back to psutil and leaves the
+    PSI fields empty.
+    """
+
+    def __init__(self, proc_root: str = "/proc") -> None:
+        """Open the procfs sources under ``proc_root``."""
+        self._meminfo_fd = _open(os.path.join(proc_root, "meminfo"))
+        self._vmstat_fd = _open(os.path.join(proc_root, "vmstat"))
+        self._psi_fd = _open(os.path.join(proc_root, "pressure", "memory"))
+        self._previous: Optional[Tuple[float, int, int]] = None
+
+    def __enter__(self) -> "MemoryPressureReader":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the procfs sources."""
+        self.close()
+
+    @property
+    def has_psi(self) -> bool:
+        """Whether pressure stall information is available."""
+        return self._psi_fd is not None
+
+    def close(self) -> None:
+        """Close any open procfs file descriptors."""
+        for attr in ("_meminfo_fd", "_vmstat_fd", "_psi_fd"):
+            fd = getattr(self, attr)
+            if fd is not None:
+                os.close(fd)
+                setattr(self, attr, None)
+
+    def sample(self) -> MemoryPressureRecord:
+        """Take one memory pressure sample.
+
+        Swap rates are computed against the previous sample and are zero on
+        the first call.
+
+        Returns:
+            MemoryPressureRecord: Lightweight pressure sample.
+        """
+        now = time.monotonic()
+        if self._meminfo_fd is not None:
+            meminfo = parse_meminfo(_pread(self._meminfo_fd))
+            swap_in, swap_out = (
+                parse_vmstat_swap(_pread(self._vmstat_fd))
+                if self._vmstat_fd is not None
+                else (0, 0)
+            )
+            swap_in *= mmap.PAGESIZE
+            swap_out *= mmap.PAGESIZE
+            available = meminfo.get(b"MemAvailable", 0)
+            cached = meminfo.get(b"Cached", 0)
+            buffers = meminfo.get(b"Buffers", 0)
+            reclaimable = (
+                meminfo.get(b"Active(file)", 0)
+                + meminfo.get(b"Inactive(file)", 0)
+                + meminfo.get(b"SReclaimable", 0)
+            )
+            dirty = meminfo.get(b"Dirty", 0)
+            swap_total = meminfo.get(b"SwapTotal", 0)
+            swap_free = meminfo.get(b"SwapFree", 0)
+        else:
+            memory = psutil.virtual_memory()
+            swap = psutil.swap_memory()
+            swap_in, swap_out = swap.sin, swap.sout
+            available = memory.available
+            cached = getattr(memory, "cached", 0)
+            buffers = getattr(memory, "buffers", 0)
+            reclaimable = getattr(memory, "inactive", 0)
+            dirty = 0
+            swap_total, swap_free = swap.total, swap.free
+
+        psi: PsiAverages = (None, None, None, None)
+        if self._psi_fd is not None:
+            psi = parse_psi(_pread(self._psi_fd))
+
+        in_rate = out_rate = 0.0
+        if self._previous is not None:
+            elapsed = now - self._previous[0]
+            if elapsed > 0:
+                in_rate = (swap_in - self._previous[1]) / elapsed
+                out_rate = (swap_out - self._previous[2]) / elapsed
+        self._previous = (now, swap_in, swap_out)
+
+        return MemoryPressureRecord(
+            now,
+            available,
+            cached,
+            buffers,
+            reclaimable,
+            dirty,
+            swap_total,
+            swap_free,
+            in_rate,
+            out_rate,
+            *psi,
+        )
@@ -0,0 +1,103 @@
+"""Cache of static process attributes shared across sampling cycles."""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import psutil
+
+from ..models.process_metadata import ProcessMetadata
+
+ProcessKey = Tuple[int, float]
+
+
+def _optional(getter: Callable[[], Any]) -> Any:
+    """Fetch an attribute that some processes do not let us read."""
+    try:
+        return getter()
+    except (psutil.AccessDenied, psutil.ZombieProcess):
+        return None
+
+
+class ProcessMetadataCache:
+    """Cache of name, exe, cmdline and user keyed by ``(pid, create_time)``.
+
+    The creation time disambiguates recycled PIDs, so an entry can never be
+    served for a different process that happens to reuse the same PID.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self._entries: Dict[ProcessKey, ProcessMetadata] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Return the number of cached processes."""
+        return len(self._entries)
+
+    @staticmethod
+    def key_for(process: psutil.Process) -> ProcessKey:
+        """Build the cache key for a process.
+
+        Raises:
+            psutil.NoSuchProcess: If the process has exited.
+        """
+        return (process.pid, process.create_time())
+
+    def get(
+        self, process: psutil.Process, key: Optional[ProcessKey] = None
+    ) -> ProcessMetadata:
+        """Return cached metadata for a process, fetching it on a miss.
+
+        Args:
+            process: Process to look up.
+            key: Precomputed key for the process, if the caller has one.
+
+        Raises:
+            psutil.NoSuchProcess: If the process exits during a miss.
+            psutil.AccessDenied: If the process name cannot be read.
+        """
+        if key is None:
+            key = self.key_for(process)
+        metadata = self._entries.get(key)
+        if metadata is not None:
+            self.hits += 1
+            return metadata
+
+        self.misses += 1
+        metadata = ProcessMetadata(
+            pid=key[0],
+            create_time=key[1],
+            name=process.name(),
+            exe=_optional(process.exe),
+            cmdline=_optional(process.cmdline) or [],
+            username=_optional(process.username),
+        )
+        self._entries[key] = metadata
+        return metadata
+
+    def retain(self, live_keys: Iterable[ProcessKey]) -> int:
+        """Evict entries for processes not present in ``live_keys``.
+
+        Returns:
+            int: Number of evicted entries.
+        """
+        live = set(live_keys)
+        stale = [key for key in self._entries if key not in live]
+        for key in stale:
+            del self._entries[key]
+        self.evictions += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop every cached entry, keeping the statistics."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,162 @@
+"""Circuit breaker and retry policy for filesystem I/O."""
+
+import errno
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, FrozenSet, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+TRANSIENT_ERRNOS = frozenset({errno.EAGAIN, errno.EINTR, errno.EBUSY})
+
+# Errors meaning the device or mount itself is unavailable, as opposed to
+# a problem with one file.
+UNAVAILABLE_ERRNOS = frozenset(
+    {
+        errno.EIO,
+        errno.ESTALE,
+        errno.ETIMEDOUT,
+        errno.ENOTCONN,
+        errno.EHOSTDOWN,
+        errno.EHOSTUNREACH,
+        errno.ENETDOWN,
+        errno.ENETUNREACH,
+    }
+)
+
+
+class CircuitOpenError(OSError):
+    """Raised instead of issuing I/O against a mount whose circuit is open."""
+
+    def __init__(self, key: str) -> None:
+        """Create the error for breaker ``key``."""
+        super().__init__(errno.EHOSTDOWN, f"Circuit open for {key}; skipping I/O")
+        self.key = key
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded retry with exponential backoff and full jitter."""
+
+    max_attempts: int = 4
+    base_delay: float = 0.05
+    max_delay: float = 2.0
+    transient_errnos: FrozenSet[int] = TRANSIENT_ERRNOS
+
+    def is_transient(self, error: BaseException) -> bool:
+        """Whether ``error`` is worth retrying."""
+        return isinstance(error, OSError) and error.errno in self.transient_errnos
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """Return the sleep before retry number ``attempt`` (0-based)."""
+        return rng() * min(self.max_delay, self.base_delay * 2**attempt)
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures, then probe before closing again.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    ``allow`` returns False without touching the device. Once
+    ``reset_timeout`` seconds have passed, up to ``half_open_probes``
+    calls are let through; a success closes the circuit and a failure
+    reopens it for another ``reset_timeout``. A probe whose outcome is
+    never reported is given up on after another ``reset_timeout``, so a
+    caller that forgets to report cannot keep the circuit half-open
+    forever.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        half_open_probes: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create a closed breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once due."""
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _refresh(self) -> None:
+        """Enter half-open once the reset timeout has elapsed."""
+        if (
+            self._state == OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probes = 0
+
+    def allow(self) -> bool:
+        """Whether a call may be issued now."""
+        with self._lock:
+            self._refresh()
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN:
+                now = self._clock()
+                if (
+                    self._probes >= self.half_open_probes
+                    and now - self._probed_at >= self.reset_timeout
+                ):
+                    self._probes = 0
+                if self._probes < self.half_open_probes:
+                    self._probes += 1
+                    self._probed_at = now
+                    return True
+            return False
+
+    def release(self) -> None:
+        """Return a probe admitted by ``allow`` without reporting an outcome.
+
+        Used when the caller ended up not touching the device, or got an
+        error that says nothing about it.
+        """
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+
+
+def is_unavailable(error: BaseException, policy: Optional[RetryPolicy] = None) -> bool:
+    """Whether ``error`` indicates an unavailable device rather than one file.
+
+    Transient errors that outlived their retries also count.
+    """
+    if isinstance(error, TimeoutError):
+        return True
+    if not isinstance(error, OSError):
+        return False
+    return error.errno in UNAVAILABLE_ERRNOS or (
+        policy is not None and policy.is_transient(error)
+    )
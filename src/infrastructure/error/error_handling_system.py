@@ -1,16 +1,121 @@
 """Error handling system implementation."""
 
 import logging
+import os
+import random
+import re
+import threading
+import time
 import traceback
-from typing import Any, Dict, Optional
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from .circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    is_unavailable,
+)
+
+_T = TypeVar("_T")
+
+ErrorKey = Tuple[str, Optional[int], str]
+
+_PROC_MOUNTS = "/proc/self/mounts"
+_MOUNT_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _mount_points() -> List[str]:
+    """Return every mount point, longest first.
+
+    Linux lists them in ``/proc``, which is cheaper than importing psutil
+    in short-lived CLI commands; other systems ask psutil.
+    """
+    try:
+        with open(_PROC_MOUNTS, encoding="utf-8", errors="surrogateescape") as handle:
+            mounts = [
+                _MOUNT_ESCAPE.sub(lambda match: chr(int(match.group(1), 8)), fields[1])
+                for fields in (line.split() for line in handle)
+                if len(fields) > 1
+            ]
+    except OSError:
+        import psutil
+
+        mounts = [
+            partition.mountpoint for partition in psutil.disk_partitions(all=True)
+        ]
+    return sorted(mounts, key=len, reverse=True)
+
+
+@dataclass
+class ErrorAggregate:
+    """Occurrences of one class of error: type, errno and path prefix."""
+
+    error_type: str
+    errno: Optional[int]
+    prefix: str
+    count: int = 0
+    reported: int = 0
+    samples: List[str] = field(default_factory=list)
+    stack_trace: str = ""
+
+    @property
+    def unreported(self) -> int:
+        """Occurrences not yet included in a summary."""
+        return self.count - self.reported
 
 
 class ErrorHandlingSystem:
-    """Central error handling system."""
+    """Central error handling system.
+
+    Owns the recovery policy for filesystem I/O: transient errors are
+    retried with backoff, and each mount has a circuit breaker so that a
+    stale mount fails fast instead of making every operation wait for its
+    own timeout. Mounts are resolved from the path string alone, so
+    consulting a breaker never touches the (possibly hung) device.
+    """
 
-    def __init__(self) -> None:
-        """Initialize error handling system."""
+    def __init__(
+        self,
+        retry_policy: Optional[RetryPolicy] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+        summary_interval: float = 10.0,
+        prefix_depth: int = 3,
+        max_samples: int = 3,
+    ) -> None:
+        """Initialize error handling system.
+
+        Args:
+            retry_policy: Retry policy for transient errors.
+            failure_threshold: Failures that open a mount's circuit.
+            reset_timeout: Seconds before an open circuit admits a probe.
+            clock: Monotonic clock.
+            sleep: Sleep function used between retries.
+            rng: Source of jitter in [0, 1).
+            summary_interval: Minimum seconds between error summaries.
+            prefix_depth: Path components that group errors together.
+            max_samples: Example paths kept per error class.
+        """
         self.logger = logging.getLogger("error_handler")
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._mounts: Optional[List[str]] = None
+        self.summary_interval = summary_interval
+        self.prefix_depth = prefix_depth
+        self.max_samples = max_samples
+        self.aggregates: Dict[ErrorKey, ErrorAggregate] = {}
+        self._aggregates_lock = threading.Lock()
+        self._last_summary = clock()
         self.setup_logger()
 
     def setup_logger(self) -> None:
@@ -18,19 +123,179 @@ class ErrorHandlingSystem:
         # TODO: Implement logger setup
         pass
 
+    def mount_of(self, path: str) -> str:
+        """Return the mount point containing ``path`` without any I/O."""
+        if self._mounts is None:
+            self._mounts = _mount_points()
+        path = os.path.abspath(path)
+        for mountpoint in self._mounts:
+            if path == mountpoint or path.startswith(
+                mountpoint.rstrip(os.sep) + os.sep
+            ):
+                return mountpoint
+        return os.sep
+
+    def breaker_for(self, path: str) -> CircuitBreaker:
+        """Return the circuit breaker of the mount containing ``path``."""
+        key = self.mount_of(path)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._breakers_lock:
+                breaker = self._breakers.setdefault(
+                    key,
+                    CircuitBreaker(
+                        self.failure_threshold, self.reset_timeout, clock=self._clock
+                    ),
+                )
+        return breaker
+
+    def breaker_states(self) -> List[Tuple[str, str]]:
+        """Return ``(mount, state)`` for every breaker created so far."""
+        return sorted((key, breaker.state) for key, breaker in self._breakers.items())
+
+    def allows(self, path: str) -> bool:
+        """Whether I/O on ``path`` may be issued now.
+
+        In the half-open state this admits a probe, so the caller must
+        report its outcome via ``call``, ``record_success`` or
+        ``handle_error``, or give it back with ``release``.
+        """
+        return self.breaker_for(path).allow()
+
+    def record_success(self, path: str) -> None:
+        """Report that I/O on ``path`` succeeded."""
+        self.breaker_for(path).record_success()
+
+    def release(self, path: str) -> None:
+        """Give back a probe admitted by ``allows`` without issuing I/O."""
+        self.breaker_for(path).release()
+
+    def call(
+        self, path: str, operation: Callable[..., _T], *args: Any, **kwargs: Any
+    ) -> _T:
+        """Run an I/O ``operation`` on ``path`` under the recovery policy.
+
+        Transient errors are retried with exponential backoff and jitter.
+        The mount's breaker is consulted first and updated with the
+        outcome: errors meaning the device is unavailable count as
+        failures, while other errors (e.g. a missing file) show that the
+        device responded.
+
+        Raises:
+            CircuitOpenError: If the mount's circuit is open.
+            OSError: The last error once retries are exhausted.
+        """
+        breaker = self.breaker_for(path)
+        if not breaker.allow():
+            raise CircuitOpenError(self.mount_of(path))
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            try:
+                result = operation(*args, **kwargs)
+            except Exception as error:
+                if self.recover_from_error(error) and attempt + 1 < policy.max_attempts:
+                    self._sleep(policy.delay(attempt, self._rng))
+                    attempt += 1
+                    continue
+                if is_unavailable(error, policy):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                raise
+            breaker.record_success()
+            return result
+
     def handle_error(
         self, error: Exception, context: Optional[Dict[str, Any]] = None
     ) -> None:
-        """Handle an error with context."""
-        # TODO: Implement error handling
-        pass
+        """Handle an error with context.
 
-    def log_error(self, error: Exception, stack_trace: str) -> None:
+        Errors are aggregated by (type, errno, path prefix). Only the first
+        occurrence of each class formats a stack trace and is logged
+        individually; later ones are counted and a few sample paths kept,
+        and summaries are logged at most every ``summary_interval``
+        seconds. When ``context`` names a ``path`` and the error means its
+        device is unavailable, the mount's breaker counts a failure; any
+        other error releases a probe the path may have been admitted as.
+        """
+        path = context.get("path") if context else None
+        if path is not None:
+            if is_unavailable(error, self.retry_policy):
+                self.breaker_for(path).record_failure()
+            else:
+                self.breaker_for(path).release()
+
+        key = (
+            type(error).__name__,
+            getattr(error, "errno", None),
+            self._prefix(path) if path is not None else "",
+        )
+        with self._aggregates_lock:
+            aggregate = self.aggregates.get(key)
+            first = aggregate is None
+            if first:
+                aggregate = self.aggregates[key] = ErrorAggregate(*key)
+            aggregate.count += 1
+            if path is not None and len(aggregate.samples) < self.max_samples:
+                aggregate.samples.append(path)
+        if first:
+            aggregate.stack_trace = "".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            )
+            with self._aggregates_lock:
+                aggregate.reported += 1
+            self.log_error(error, aggregate.stack_trace, context)
+        if self._clock() - self._last_summary >= self.summary_interval:
+            self.flush_error_summary()
+
+    def _prefix(self, path: str) -> str:
+        """Return the first ``prefix_depth`` components of ``path``."""
+        parts = path.split(os.sep, self.prefix_depth + 1)
+        return os.sep.join(parts[: self.prefix_depth + 1])
+
+    def flush_error_summary(self) -> List[ErrorAggregate]:
+        """Log one summary line per error class with unreported occurrences.
+
+        Returns:
+            List[ErrorAggregate]: The classes that were summarized.
+        """
+        self._last_summary = self._clock()
+        summarized = []
+        with self._aggregates_lock:
+            for aggregate in self.aggregates.values():
+                if aggregate.unreported:
+                    summarized.append((aggregate, aggregate.unreported))
+                    aggregate.reported = aggregate.count
+        for aggregate, new in summarized:
+            self.logger.warning(
+                "%d more %s (errno %s) under %s; %d in total, e.g. %s",
+                new,
+                aggregate.error_type,
+                aggregate.errno,
+                aggregate.prefix or "<no path>",
+                aggregate.count,
+                ", ".join(aggregate.samples),
+            )
+        return [aggregate for aggregate, _ in summarized]
+
+    def error_counts(self) -> Dict[ErrorKey, int]:
+        """Return the number of occurrences of each error class."""
+        with self._aggregates_lock:
+            return {key: aggregate.count for key, aggregate in self.aggregates.items()}
+
+    def log_error(
+        self,
+        error: Exception,
+        stack_trace: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> None:
         """Log an error with its stack trace."""
-        # TODO: Implement error logging
-        pass
+        details = " ".join(f"{key}={value!r}" for key, value in (context or {}).items())
+        self.logger.error(
+            "%s: %s %s\n%s", type(error).__name__, error, details, stack_trace
+        )
 
     def recover_from_error(self, error: Exception) -> bool:
-        """Attempt to recover from an error."""
-        # TODO: Implement error recovery
-        return False
+        """Whether retrying the failed operation may succeed."""
+        return self.retry_policy.is_transient(error)
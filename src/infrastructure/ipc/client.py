@@ -0,0 +1,95 @@
+"""Client for the local daemon socket."""
+
+import socket
+from typing import Any, Optional
+
+from .protocol import (
+    DaemonRequestError,
+    DaemonUnavailableError,
+    ProtocolError,
+    default_socket_path,
+    recv_frame,
+    send_frame,
+)
+
+
+class DaemonClient:
+    """Send requests to a running daemon over one persistent connection."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        connect_timeout: float = 0.5,
+        timeout: Optional[float] = 120.0,
+    ) -> None:
+        """Initialize the client; the connection is opened on first use.
+
+        Args:
+            socket_path: Daemon socket; defaults to ``default_socket_path()``.
+            connect_timeout: Seconds to wait for the connection.
+            timeout: Seconds to wait for each reply, or None to wait forever.
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.connect_timeout = connect_timeout
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+
+    def _connect(self) -> socket.socket:
+        """Return the open connection, connecting if needed."""
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.connect_timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as error:
+                sock.close()
+                raise DaemonUnavailableError(
+                    f"No daemon at {self.socket_path}: {error}"
+                ) from error
+            sock.settimeout(self.timeout)
+            self._sock = sock
+        return self._sock
+
+    def is_running(self) -> bool:
+        """Whether a daemon answers on the socket."""
+        try:
+            self.request("ping")
+        except (DaemonUnavailableError, ProtocolError, OSError):
+            return False
+        return True
+
+    def request(self, op: str, **params: Any) -> Any:
+        """Send one request and return its result.
+
+        Raises:
+            DaemonUnavailableError: If no daemon is listening.
+            DaemonRequestError: If the daemon failed to serve the request.
+            ProtocolError: If the reply is malformed.
+        """
+        sock = self._connect()
+        try:
+            send_frame(sock, {"op": op, "params": params})
+            reply = recv_frame(sock)
+        except (OSError, ProtocolError):
+            self.close()
+            raise
+        if reply is None:
+            self.close()
+            raise DaemonUnavailableError("Daemon closed the connection")
+        if not reply.get("ok"):
+            raise DaemonRequestError(reply.get("error", "request failed"))
+        return reply.get("result")
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self) -> "DaemonClient":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the connection."""
+        self.close()
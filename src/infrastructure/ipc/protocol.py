@@ -0,0 +1,87 @@
+"""Framed request/response protocol for the local daemon socket.
+
+Every message is a 4-byte big-endian length followed by that many bytes
+of compact JSON. Requests are ``{"op": name, "params": {...}}``; replies
+are ``{"ok": true, "result": ...}`` or ``{"ok": false, "error": message}``.
+"""
+
+import json
+import os
+import socket
+import struct
+import tempfile
+from typing import Any, Optional
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 * 1024 * 1024
+SOCKET_ENV = "MAC_CLEANER_SOCKET"
+
+
+class ProtocolError(ValueError):
+    """A peer sent a malformed or oversized frame."""
+
+
+class DaemonUnavailableError(ConnectionError):
+    """No daemon is listening on the socket."""
+
+
+class DaemonRequestError(ValueError):
+    """The daemon could not serve a request."""
+
+
+def default_socket_path() -> str:
+    """Return the daemon socket path for the current user.
+
+    ``MAC_CLEANER_SOCKET`` overrides it. The default lives in a directory
+    that only the user can enter.
+    """
+    override = os.environ.get(SOCKET_ENV)
+    if override:
+        return override
+    directory = os.path.join(tempfile.gettempdir(), f"mac_cleaner-{os.getuid()}")
+    return os.path.join(directory, "daemon.sock")
+
+
+def encode_frame(message: Any) -> bytes:
+    """Serialize ``message`` into one frame."""
+    payload = json.dumps(message, separators=(",", ":")).encode()
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"Frame of {len(payload)} bytes exceeds {MAX_FRAME}")
+    return HEADER.pack(len(payload)) + payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    """Read ``size`` bytes, or None if the peer closed before sending any."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if not count:
+            if received:
+                raise ProtocolError("Connection closed mid-frame")
+            return None
+        received += count
+    return bytes(buffer)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Any]:
+    """Read one message, or None when the peer closed the connection."""
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ProtocolError(f"Frame of {length} bytes exceeds {MAX_FRAME}")
+    payload = _recv_exactly(sock, length) if length else b""
+    if payload is None:
+        raise ProtocolError("Connection closed mid-frame")
+    try:
+        return json.loads(payload)
+    except ValueError as error:
+        raise ProtocolError(f"Invalid frame payload: {error}") from error
+
+
+def send_frame(sock: socket.socket, message: Any) -> None:
+    """Write one message."""
+    sock.sendall(encode_frame(message))
@@ -0,0 +1,184 @@
+"""Threaded Unix domain socket server for the local daemon."""
+
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from .protocol import ProtocolError, recv_frame, send_frame
+
+Handler = Callable[[str, Dict[str, Any]], Any]
+
+
+class _Connection(socketserver.BaseRequestHandler):
+    """Serve the requests of one client connection in order."""
+
+    server: "_ThreadingUnixServer"
+
+    def handle(self) -> None:
+        """Answer frames until the client disconnects."""
+        daemon = self.server.daemon
+        while True:
+            try:
+                request = recv_frame(self.request)
+            except (ProtocolError, OSError) as error:
+                daemon.logger.warning("Dropping client: %s", error)
+                return
+            if request is None:
+                return
+            try:
+                self._reply(daemon.dispatch(request))
+            except OSError as error:
+                daemon.logger.warning("Dropping client: %s", error)
+                return
+
+    def _reply(self, reply: Dict[str, Any]) -> None:
+        """Send ``reply``, or an error reply if it cannot be encoded.
+
+        Encoding fails before anything is written, so the connection stays
+        usable for the client's next request.
+        """
+        try:
+            send_frame(self.request, reply)
+        except (TypeError, ValueError) as error:
+            self.server.daemon.logger.warning("Reply could not be sent: %s", error)
+            send_frame(
+                self.request,
+                {"ok": False, "error": f"Reply could not be sent: {error}"},
+            )
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix stream server with one thread per connection."""
+
+    daemon_threads = True
+    daemon: "DaemonServer"
+
+
+class DaemonServer:
+    """Serve requests from local clients over a Unix domain socket.
+
+    Each connection gets its own thread, so a slow request (such as a
+    first scan of a large tree) never delays other clients. The socket
+    is created inside a directory only the owner can enter, and is itself
+    owner-only.
+    """
+
+    def __init__(self, socket_path: str, handler: Handler) -> None:
+        """Initialize the server.
+
+        Args:
+            socket_path: Path to listen on.
+            handler: Called with ``(op, params)``; its return value is the
+                reply's result. ValueError and OSError become error replies.
+        """
+        self.socket_path = socket_path
+        self.handler = handler
+        self.logger = logging.getLogger("daemon")
+        self._server: Optional[_ThreadingUnixServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _prepare_socket_path(self) -> None:
+        """Create the private directory and remove a stale socket."""
+        directory = os.path.dirname(os.path.abspath(self.socket_path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        info = os.stat(directory)
+        if info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) & 0o077:
+            raise PermissionError(f"Socket directory is not private: {directory}")
+        try:
+            existing = os.lstat(self.socket_path)
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(existing.st_mode):
+            raise FileExistsError(
+                f"Not a socket, refusing to replace: {self.socket_path}"
+            )
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.unlink(self.socket_path)
+        else:
+            raise FileExistsError(
+                f"A daemon is already listening on {self.socket_path}"
+            )
+        finally:
+            probe.close()
+
+    def bind(self) -> None:
+        """Start listening."""
+        self._prepare_socket_path()
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _ThreadingUnixServer(self.socket_path, _Connection)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon = self
+
+    def dispatch(self, request: Any) -> Dict[str, Any]:
+        """Run one request and build its reply."""
+        if not isinstance(request, dict) or not isinstance(request.get("op"), str):
+            return {"ok": False, "error": "Malformed request"}
+        op = request["op"]
+        params = request.get("params") or {}
+        if op == "ping":
+            return {"ok": True, "result": {"pid": os.getpid()}}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True, "result": None}
+        try:
+            return {"ok": True, "result": self.handler(op, params)}
+        except (ValueError, TypeError, OSError) as error:
+            return {"ok": False, "error": str(error)}
+        except Exception as error:
+            self.logger.exception("Request %s failed", op)
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+
+    def serve_forever(self) -> None:
+        """Serve until ``shutdown`` is called."""
+        if self._server is None:
+            self.bind()
+        assert self._server is not None
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        self.bind()
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="daemon", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop serving and wait for the serving loop to exit."""
+        if self._server is not None:
+            self._server.shutdown()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def close(self) -> None:
+        """Close the listening socket and remove its file."""
+        if self._server is not None:
+            self._server.server_close()
+            self._server = None
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "DaemonServer":
+        """Start serving in the background."""
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop serving."""
+        self.shutdown()
+        self.close()
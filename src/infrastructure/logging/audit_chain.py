@@ -0,0 +1,417 @@
+"""Tamper evidence for audit segments via chained Merkle checkpoints."""
+
+import hashlib
+import json
+import os
+import re
+import struct
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+GENESIS = "0" * 64
+SEGMENT_PATTERN = r"^{prefix}-(\d{{6}})\.jsonl$"
+
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+_CHAIN_LAYOUT = struct.Struct(">QQQdd")
+
+
+def leaf_hash(line: bytes) -> bytes:
+    """Hash one serialized audit line (including its newline)."""
+    return hashlib.sha256(_LEAF_PREFIX + line).digest()
+
+
+def merkle_root(leaves: List[bytes]) -> bytes:
+    """Compute the Merkle root of leaf hashes.
+
+    Leaves and interior nodes use distinct prefixes, and an odd node is
+    promoted unchanged to the next level.
+    """
+    if not leaves:
+        return hashlib.sha256(b"").digest()
+    level = leaves
+    while len(level) > 1:
+        parents = [
+            hashlib.sha256(_NODE_PREFIX + level[i] + level[i + 1]).digest()
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parents.append(level[-1])
+        level = parents
+    return level[0]
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """Seal over a contiguous byte range of one audit segment."""
+
+    segment: int
+    start_offset: int
+    end_offset: int
+    count: int
+    first_ts: float
+    last_ts: float
+    root: str
+    previous: str
+    chain: str
+
+    def expected_chain(self) -> str:
+        """Recompute the chain hash from this checkpoint's own fields."""
+        return chain_hash(
+            self.previous,
+            bytes.fromhex(self.root),
+            self.start_offset,
+            self.end_offset,
+            self.count,
+            self.first_ts,
+            self.last_ts,
+        )
+
+
+def chain_hash(
+    previous: str,
+    root: bytes,
+    start_offset: int,
+    end_offset: int,
+    count: int,
+    first_ts: float,
+    last_ts: float,
+) -> str:
+    """Link a checkpoint to its predecessor."""
+    layout = _CHAIN_LAYOUT.pack(start_offset, end_offset, count, first_ts, last_ts)
+    return hashlib.sha256(bytes.fromhex(previous) + root + layout).hexdigest()
+
+
+def load_checkpoints(path: str) -> List[Checkpoint]:
+    """Load the checkpoints of one segment, oldest first."""
+    checkpoints = []
+    try:
+        with open(path, "rb") as handle:
+            for line in handle:
+                if line.endswith(b"\n"):
+                    checkpoints.append(Checkpoint(**json.loads(line)))
+    except FileNotFoundError:
+        pass
+    return checkpoints
+
+
+def head_path(directory: str, prefix: str) -> str:
+    """Return the path of the file recording the latest chain hash."""
+    return os.path.join(directory, f"{prefix}.head")
+
+
+@dataclass(frozen=True)
+class ChainHead:
+    """Latest chain hash and the oldest segment the writer still keeps."""
+
+    chain: str
+    first: int
+
+
+def load_head(path: str) -> Optional[ChainHead]:
+    """Return the head recorded in head file ``path``, if any."""
+    try:
+        with open(path, "rb") as handle:
+            document = json.load(handle)
+        return ChainHead(str(document["chain"]), int(document["first"]))
+    except FileNotFoundError:
+        return None
+    except (KeyError, TypeError, ValueError):
+        # An unreadable head cannot vouch for any checkpoint or segment.
+        return ChainHead("", 1)
+
+
+def write_head(path: str, chain: str, first: int) -> None:
+    """Atomically record ``chain`` and the oldest kept segment ``first``."""
+    fd, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), prefix=".head-"
+    )
+    try:
+        with os.fdopen(fd, "w") as handle:
+            json.dump({"chain": chain, "first": first}, handle)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class MerkleCheckpointer:
+    """Accumulate leaf hashes and emit a checkpoint every ``every`` records.
+
+    Appending a record costs one SHA-256 of its line; the Merkle tree and
+    chain link are computed once per checkpoint.
+    """
+
+    def __init__(self, every: int, previous: str = GENESIS) -> None:
+        """Start a checkpointer linked to the ``previous`` chain hash."""
+        self.every = every
+        self.previous = previous
+        self._leaves: List[bytes] = []
+        self._start = 0
+        self._first_ts = 0.0
+        self._last_ts = 0.0
+
+    @property
+    def pending(self) -> int:
+        """Number of records not yet covered by a checkpoint."""
+        return len(self._leaves)
+
+    def reset(self, offset: int) -> None:
+        """Start accumulating at ``offset`` of a (new) segment."""
+        self._leaves = []
+        self._start = offset
+
+    def add(self, line: bytes, timestamp: float) -> None:
+        """Add one written line."""
+        if not self._leaves:
+            self._first_ts = timestamp
+        self._last_ts = timestamp
+        self._leaves.append(leaf_hash(line))
+
+    def due(self) -> bool:
+        """Whether a full batch of records is waiting to be sealed."""
+        return len(self._leaves) >= self.every
+
+    def seal(self, segment: int, end_offset: int) -> Optional[Checkpoint]:
+        """Seal the pending records ending at ``end_offset``, if any."""
+        if not self._leaves:
+            return None
+        root = merkle_root(self._leaves)
+        count = len(self._leaves)
+        chain = chain_hash(
+            self.previous,
+            root,
+            self._start,
+            end_offset,
+            count,
+            self._first_ts,
+            self._last_ts,
+        )
+        checkpoint = Checkpoint(
+            segment=segment,
+            start_offset=self._start,
+            end_offset=end_offset,
+            count=count,
+            first_ts=self._first_ts,
+            last_ts=self._last_ts,
+            root=root.hex(),
+            previous=self.previous,
+            chain=chain,
+        )
+        self.previous = chain
+        self.reset(end_offset)
+        return checkpoint
+
+
+def checkpoint_line(checkpoint: Checkpoint) -> bytes:
+    """Serialize a checkpoint as one JSON line."""
+    return json.dumps(asdict(checkpoint), separators=(",", ":")).encode() + b"\n"
+
+
+def verify_checkpoints(path: str, checkpoints: List[Checkpoint]) -> List[str]:
+    """Recompute the Merkle roots of ``checkpoints`` over segment ``path``.
+
+    Returns:
+        List[str]: One message per checkpoint whose records do not match.
+    """
+    failures = []
+    try:
+        with open(path, "rb") as segment:
+            for checkpoint in checkpoints:
+                segment.seek(checkpoint.start_offset)
+                data = segment.read(checkpoint.end_offset - checkpoint.start_offset)
+                lines = data.splitlines(keepends=True)
+                root = merkle_root([leaf_hash(line) for line in lines]).hex()
+                if len(lines) != checkpoint.count or root != checkpoint.root:
+                    failures.append(
+                        f"segment {checkpoint.segment} bytes "
+                        f"{checkpoint.start_offset}-{checkpoint.end_offset}: "
+                        "records do not match checkpoint"
+                    )
+    except FileNotFoundError:
+        failures.append(f"segment file missing: {path}")
+    return failures
+
+
+@dataclass
+class ChainVerification:
+    """Outcome of verifying audit segments."""
+
+    checkpoints_verified: int = 0
+    records_verified: int = 0
+    bytes_verified: int = 0
+    unsealed_bytes: int = 0
+    head: str = GENESIS
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether no tampering was detected."""
+        return not self.failures
+
+
+class AuditChainVerifier:
+    """Verify the checkpoints written alongside JSON-lines audit segments.
+
+    The chain of checkpoint hashes is always checked end to end, which only
+    touches checkpoint metadata. Record contents are rehashed per selected
+    checkpoint, with segments verified in parallel.
+
+    Removing checkpoints must not quietly turn sealed records back into
+    unsealed ones. The writer records the latest chain hash in
+    ``<prefix>.head``, and a chain that no longer reaches it fails. The head
+    also records the oldest segment the writer keeps, so deleting the
+    oldest segments fails too; without a head, checkpointed segments must
+    start at the first one. When
+    ``checkpoint_every`` is known, records that the writer would already
+    have sealed (any in a rotated segment, or a full batch in the newest
+    one) fail as well.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "audit",
+        checkpoint_every: Optional[int] = None,
+    ) -> None:
+        """Create a verifier for the segments ``<prefix>-NNNNNN`` in ``directory``.
+
+        Args:
+            directory: Directory holding the segments.
+            prefix: Segment file name prefix.
+            checkpoint_every: Records per checkpoint the segments were
+                written with, if known.
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.checkpoint_every = checkpoint_every
+        self._pattern = re.compile(SEGMENT_PATTERN.format(prefix=re.escape(prefix)))
+
+    def _path(self, sequence: int, suffix: str) -> str:
+        """Return the path of a segment file with ``suffix``."""
+        return os.path.join(self.directory, f"{self.prefix}-{sequence:06d}{suffix}")
+
+    def _sequences(self) -> List[int]:
+        """Return the segment sequence numbers present on disk."""
+        sequences = []
+        for name in os.listdir(self.directory):
+            match = self._pattern.match(name)
+            if match:
+                sequences.append(int(match.group(1)))
+        return sorted(sequences)
+
+    def _missing_seal(
+        self, sequence: int, sealed_end: int, newest: bool
+    ) -> Optional[str]:
+        """Describe records past ``sealed_end`` the writer would have sealed."""
+        assert self.checkpoint_every is not None
+        if not newest:
+            return f"segment {sequence}: records after offset {sealed_end} are unsealed"
+        with open(self._path(sequence, ".jsonl"), "rb") as segment:
+            segment.seek(sealed_end)
+            records = sum(1 for line in segment if line.endswith(b"\n"))
+        if records < self.checkpoint_every:
+            return None
+        return (
+            f"segment {sequence}: {records} records after offset {sealed_end} "
+            "are unsealed"
+        )
+
+    def verify(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> ChainVerification:
+        """Verify all records, or only checkpoints overlapping ``[start, end]``.
+
+        Args:
+            start: Earliest timestamp of interest (None for unbounded).
+            end: Latest timestamp of interest (None for unbounded).
+            max_workers: Worker count for parallel segment verification.
+            use_processes: Use processes instead of threads, which scales
+                better because hashing short lines holds the GIL.
+
+        Returns:
+            ChainVerification: Verification report, including the head hash
+            that can be recorded elsewhere to anchor the chain.
+        """
+        report = ChainVerification()
+        selected: Dict[int, List[Checkpoint]] = {}
+        chains: Set[str] = set()
+        sequences = self._sequences()
+        first = sequences[0] if sequences else None
+        # The chain starts at GENESIS unless older segments were pruned.
+        previous: Optional[str] = GENESIS if first == 1 else None
+        for sequence in sequences:
+            checkpoints = load_checkpoints(self._path(sequence, ".chk"))
+            for checkpoint in checkpoints:
+                if previous is not None and checkpoint.previous != previous:
+                    report.failures.append(
+                        f"segment {sequence}: checkpoint chain broken at "
+                        f"offset {checkpoint.start_offset}"
+                    )
+                if checkpoint.expected_chain() != checkpoint.chain:
+                    report.failures.append(
+                        f"segment {sequence}: checkpoint at offset "
+                        f"{checkpoint.start_offset} was altered"
+                    )
+                previous = checkpoint.chain
+                chains.add(checkpoint.chain)
+                if (start is None or checkpoint.last_ts >= start) and (
+                    end is None or checkpoint.first_ts <= end
+                ):
+                    selected.setdefault(sequence, []).append(checkpoint)
+
+            sealed_end = checkpoints[-1].end_offset if checkpoints else 0
+            size = os.path.getsize(self._path(sequence, ".jsonl"))
+            unsealed = max(0, size - sealed_end)
+            report.unsealed_bytes += unsealed
+            if unsealed and self.checkpoint_every is not None:
+                failure = self._missing_seal(
+                    sequence, sealed_end, sequence == sequences[-1]
+                )
+                if failure is not None:
+                    report.failures.append(failure)
+        if previous is not None:
+            report.head = previous
+        head = load_head(head_path(self.directory, self.prefix))
+        if head is not None and head.chain not in chains:
+            report.failures.append(
+                "checkpoints are missing: the chain no longer reaches the "
+                "last recorded head"
+            )
+        oldest = head.first if head is not None else 1
+        if (head is not None or chains) and (first is None or first > oldest):
+            report.failures.append(
+                "segments are missing: the oldest kept segment is "
+                f"{oldest}, but the oldest present is {first}"
+            )
+
+        jobs: List[Tuple[str, List[Checkpoint]]] = [
+            (self._path(sequence, ".jsonl"), checkpoints)
+            for sequence, checkpoints in selected.items()
+        ]
+        executor: Executor = (
+            ProcessPoolExecutor(max_workers)
+            if use_processes
+            else ThreadPoolExecutor(max_workers)
+        )
+        with executor:
+            results = executor.map(
+                verify_checkpoints,
+                [path for path, _ in jobs],
+                [checkpoints for _, checkpoints in jobs],
+            )
+            for (_, checkpoints), failures in zip(jobs, results):
+                report.failures.extend(failures)
+                report.checkpoints_verified += len(checkpoints)
+                for checkpoint in checkpoints:
+                    report.records_verified += checkpoint.count
+                    report.bytes_verified += (
+                        checkpoint.end_offset - checkpoint.start_offset
+                    )
+        return report
@@ -0,0 +1,55 @@
+"""Structured audit event payloads."""
+
+import json
+import logging
+from typing import Any, Dict
+
+
+class AuditEvent:
+    """Structured payload carried as the ``msg`` of an audit log record.
+
+    Nothing is formatted when the event is created. Text handlers render the
+    human-readable ``template`` through ``str()``, and JSON handlers call
+    ``to_json``, which serializes the payload once per record.
+    """
+
+    __slots__ = ("event_type", "template", "fields")
+
+    def __init__(self, event_type: str, template: str, fields: Dict[str, Any]) -> None:
+        """Create an event from its type, text template and payload."""
+        self.event_type = event_type
+        self.template = template
+        self.fields = fields
+
+    def __str__(self) -> str:
+        """Render the human-readable message."""
+        return self.template.format(**self.fields)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the payload with its event type."""
+        return {"type": self.event_type, **self.fields}
+
+
+def record_to_json(record: logging.LogRecord, timestamp: float) -> str:
+    """Serialize a record as one JSON line (without newline), once.
+
+    The ``ts`` key is always written first so readers can extract it without
+    parsing the whole line. The result is cached on the record so several
+    handlers can share it.
+    """
+    cached = getattr(record, "audit_json", None)
+    if cached is not None:
+        return cached
+    msg = record.msg
+    if isinstance(msg, AuditEvent):
+        payload = {"ts": timestamp, "level": record.levelname, **msg.to_dict()}
+    else:
+        payload = {
+            "ts": timestamp,
+            "level": record.levelname,
+            "type": "message",
+            "message": record.getMessage(),
+        }
+    line = json.dumps(payload, default=str, separators=(",", ":"))
+    record.audit_json = line
+    return line
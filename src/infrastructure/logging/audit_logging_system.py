@@ -1,49 +1,282 @@
 """Audit logging system for tracking system activities."""
 
+import atexit
 import logging
+import queue
+import weakref
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from .audit_chain import AuditChainVerifier, ChainVerification
+from .audit_event import AuditEvent
+from .audit_pipeline import (
+    OVERFLOW_BLOCK,
+    AuditQueueHandler,
+    BatchingQueueListener,
+    BatchStreamHandler,
+)
+from .jsonl_segments import JsonLinesSegmentHandler
+from .metrics_aggregator import MetricsAggregator, MetricSummary
+
+
+class _PrivateLogger(logging.Logger):
+    """A logger outside the global hierarchy, owned by one audit system.
+
+    ``logging.getLogger`` hands every caller the same logger for a name,
+    so two audit systems would each receive the other's events.
+    """
+
+    def setLevel(self, level: Union[int, str]) -> None:
+        """Set the level and drop cached ``isEnabledFor`` answers.
+
+        The logging manager only clears the caches of loggers it knows.
+        """
+        super().setLevel(level)
+        self._cache.clear()
+
+
+# Systems still running at exit; weak, so registering does not keep an
+# abandoned system alive.
+_RUNNING: "weakref.WeakSet[AuditLoggingSystem]" = weakref.WeakSet()
+
+
+@atexit.register
+def _shutdown_running() -> None:
+    """Write what every still-running audit system has queued."""
+    for system in list(_RUNNING):
+        system.shutdown()
+
+
+def _to_epoch(value: Union[datetime, float]) -> float:
+    """Convert a datetime or epoch seconds to epoch seconds."""
+    return value.timestamp() if isinstance(value, datetime) else float(value)
 
 
 class AuditLoggingSystem:
-    """System for logging audit events."""
+    """System for logging audit events.
 
-    def __init__(self) -> None:
+    Logging calls only enqueue the record; a background writer delivers
+    records to ``handlers`` in batches. Call ``shutdown`` (also done at
+    exit for systems still running) to guarantee everything queued has
+    been written. Each system logs through its own logger, named
+    ``logger_name`` but not registered with ``logging``, so events never
+    reach another system's handlers.
+
+    Events are structured: each record carries an ``AuditEvent`` payload that
+    is only rendered or serialized by the writer thread, and nothing is
+    built at all when the level is disabled. With ``log_dir`` the events are
+    stored as size-rotated JSON-lines segments that ``query_events`` can
+    search by time range, sealed every ``checkpoint_every`` records by
+    chained Merkle checkpoints that ``verify_integrity`` checks.
+
+    Performance metrics are not logged one line per measurement: they are
+    aggregated in memory and written as one summary event per metric every
+    ``metrics_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        handlers: Optional[Sequence[logging.Handler]] = None,
+        logger_name: str = "audit",
+        queue_size: int = 10000,
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+        overflow_policy: str = OVERFLOW_BLOCK,
+        log_dir: Optional[str] = None,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        checkpoint_every: Optional[int] = 1024,
+        metrics_interval: float = 10.0,
+    ) -> None:
         """Initialize the audit logging system."""
-        self.logger = logging.getLogger("audit")
+        self.logger: logging.Logger = _PrivateLogger(logger_name)
+        self.segments: Optional[JsonLinesSegmentHandler] = None
+        if log_dir is not None:
+            self.segments = JsonLinesSegmentHandler(
+                log_dir,
+                max_bytes=max_segment_bytes,
+                checkpoint_every=checkpoint_every,
+            )
+        if handlers is not None:
+            self.handlers = list(handlers)
+        elif self.segments is not None:
+            self.handlers = []
+        else:
+            self.handlers = [BatchStreamHandler()]
+        if self.segments is not None:
+            self.handlers.append(self.segments)
+        self.queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+        self.queue_handler = AuditQueueHandler(self.queue, queue_size, overflow_policy)
+        self.listener = BatchingQueueListener(
+            self.queue, self.handlers, batch_size, flush_interval
+        )
+        self.metrics = MetricsAggregator(self._log_metric_summaries, metrics_interval)
         self.setup_logger()
 
     def setup_logger(self) -> None:
         """Set up logging configuration."""
-        # TODO: Implement logger setup
-        pass
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.addHandler(self.queue_handler)
+        self.listener.start()
+        self.metrics.start()
+        _RUNNING.add(self)
+
+    @property
+    def dropped_events(self) -> int:
+        """Number of events dropped because the queue was full."""
+        return self.queue_handler.dropped
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every event logged so far has been written."""
+        return self.listener.flush(timeout)
+
+    def shutdown(self) -> None:
+        """Stop accepting events and write everything still queued."""
+        _RUNNING.discard(self)
+        self.metrics.stop()
+        self.logger.removeHandler(self.queue_handler)
+        self.listener.stop()
+        if self.segments is not None:
+            self.segments.close()
+
+    def __enter__(self) -> "AuditLoggingSystem":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Flush and stop the background writer."""
+        self.shutdown()
+
+    def query_events(
+        self, start: Union[datetime, float], end: Union[datetime, float]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield stored events whose timestamp lies in ``[start, end]``.
+
+        Raises:
+            RuntimeError: If the system was created without ``log_dir``.
+        """
+        if self.segments is None:
+            raise RuntimeError("Audit events are only stored when log_dir is set")
+        self.flush()
+        return self.segments.read_range(_to_epoch(start), _to_epoch(end))
+
+    def verify_integrity(
+        self,
+        start: Optional[Union[datetime, float]] = None,
+        end: Optional[Union[datetime, float]] = None,
+    ) -> ChainVerification:
+        """Check stored events against their checkpoints.
+
+        Records written since the last checkpoint are reported as
+        ``unsealed_bytes``; they are sealed on rotation and shutdown.
+
+        Raises:
+            RuntimeError: If the system was created without ``log_dir``.
+        """
+        if self.segments is None:
+            raise RuntimeError("Audit events are only stored when log_dir is set")
+        self.flush()
+        verifier = AuditChainVerifier(
+            self.segments.directory,
+            self.segments.prefix,
+            self.segments.checkpoint_every,
+        )
+        return verifier.verify(
+            None if start is None else _to_epoch(start),
+            None if end is None else _to_epoch(end),
+        )
+
+    def _log(self, level: int, event_type: str, template: str, **fields: Any) -> None:
+        """Create and dispatch a structured record if ``level`` is enabled.
+
+        The record is built without walking the caller's stack, and its
+        payload is neither formatted nor serialized on this thread.
+        """
+        logger = self.logger
+        if logger.isEnabledFor(level):
+            event = AuditEvent(event_type, template, fields)
+            logger.handle(
+                logger.makeRecord(logger.name, level, "(audit)", 0, event, (), None)
+            )
 
     def log_system_event(self, event: str) -> None:
         """Log a system event."""
-        self.logger.info(f"System Event: {event}")
+        self._log(logging.INFO, "system_event", "System Event: {event}", event=event)
 
     def log_user_action(self, user: str, action: str) -> None:
         """Log a user action."""
-        self.logger.info(f"User Action: {user} - {action}")
+        self._log(
+            logging.INFO,
+            "user_action",
+            "User Action: {user} - {action}",
+            user=user,
+            action=action,
+        )
 
     def log_security_event(self, event: str, severity: str) -> None:
         """Log a security event."""
-        self.logger.warning(f"Security Event: {event} (Severity: {severity})")
+        self._log(
+            logging.WARNING,
+            "security_event",
+            "Security Event: {event} (Severity: {severity})",
+            event=event,
+            severity=severity,
+        )
 
     def log_error(self, error: Any) -> None:
         """Log an error event."""
-        self.logger.error(f"Error: {str(error)}")
+        self._log(logging.ERROR, "error", "Error: {error}", error=error)
 
     def log_operation(
         self, operation: str, status: str, details: Dict[str, Any]
     ) -> None:
-        """Log an operation."""
-        # TODO: Implement operation logging
-        pass
+        """Log an operation.
+
+        ``details`` is copied, so the caller may change it afterwards; the
+        values themselves must not be mutated until the event is written.
+        """
+        self._log(
+            logging.INFO,
+            "operation",
+            "Operation: {operation} - {status}",
+            operation=operation,
+            status=status,
+            details=dict(details),
+        )
 
     def log_performance_metric(
         self, metric_name: str, value: float, timestamp: datetime
     ) -> None:
-        """Log a performance metric."""
-        # TODO: Implement performance metric logging
-        pass
+        """Log a performance metric.
+
+        The value is added to an in-memory histogram for ``metric_name``;
+        ``timestamp`` is accepted for API compatibility, and summaries are
+        stamped with their flush time instead.
+        """
+        self.metrics.record(metric_name, value)
+
+    def _log_metric_summaries(
+        self, summaries: List[MetricSummary], counters: Dict[str, float]
+    ) -> None:
+        """Write one summary event per metric and one for all counters."""
+        for summary in summaries:
+            self._log(
+                logging.INFO,
+                "metric_summary",
+                "Metric: {metric} count={count} p50={p50:.6g} p99={p99:.6g}",
+                metric=summary.name,
+                count=summary.count,
+                min=summary.minimum,
+                max=summary.maximum,
+                mean=summary.mean,
+                p50=summary.p50,
+                p99=summary.p99,
+                window_seconds=summary.window_seconds,
+            )
+        if counters:
+            self._log(
+                logging.INFO,
+                "counter_summary",
+                "Counters: {counters}",
+                counters=counters,
+            )
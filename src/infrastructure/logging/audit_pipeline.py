@@ -0,0 +1,254 @@
+"""Non-blocking, batched delivery of audit log records."""
+
+import logging
+import logging.handlers
+import queue
+import threading
+import time
+from typing import List, Optional, Sequence
+
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICIES = (OVERFLOW_BLOCK, OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST)
+
+_STOP = object()
+_BLOCK_POLL_INTERVAL = 0.0005
+
+
+class _FlushRequest:
+    """Marker asking the writer to flush everything queued before it."""
+
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        """Create an unsignalled request."""
+        self.done = threading.Event()
+
+
+class BatchStreamHandler(logging.StreamHandler):
+    """Stream handler that writes a whole batch with a single flush."""
+
+    def emit_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        """Format and write several records at once."""
+        if not records:
+            return
+        try:
+            text = self.terminator.join(self.format(record) for record in records)
+            self.stream.write(text + self.terminator)
+            self.flush()
+        except Exception:
+            self.handleError(records[-1])
+
+
+class AuditQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler with an explicit policy for a full queue.
+
+    The queue is a lock-free ``queue.SimpleQueue`` with a soft ``maxsize``
+    bound (concurrent producers may briefly overshoot it by a few records).
+    Records are queued unformatted: formatting happens on the writer thread,
+    which keeps the caller's cost to record creation plus one queue put.
+    Arguments passed to the logging call must therefore not be mutated
+    afterwards.
+
+    Policies:
+        ``block``: wait for space (up to ``block_timeout``, then drop).
+        ``drop_newest``: drop the record being logged.
+        ``drop_oldest``: discard the oldest queued record to make room.
+    """
+
+    def __init__(
+        self,
+        record_queue: "queue.SimpleQueue[object]",
+        maxsize: int,
+        overflow_policy: str = OVERFLOW_BLOCK,
+        block_timeout: Optional[float] = None,
+    ) -> None:
+        """Initialize the handler with its queue and overflow policy."""
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        super().__init__(record_queue)  # type: ignore[arg-type]
+        self.maxsize = maxsize
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Queue the record as-is; the writer thread does the formatting."""
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """Put a record on the queue, applying the overflow policy if full."""
+        record_queue = self.queue
+        if record_queue.qsize() < self.maxsize:
+            record_queue.put_nowait(record)
+            return
+
+        if self.overflow_policy == OVERFLOW_BLOCK:
+            deadline = (
+                None
+                if self.block_timeout is None
+                else time.monotonic() + self.block_timeout
+            )
+            while record_queue.qsize() >= self.maxsize:
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.dropped += 1
+                    return
+                time.sleep(_BLOCK_POLL_INTERVAL)
+            record_queue.put_nowait(record)
+        elif self.overflow_policy == OVERFLOW_DROP_NEWEST:
+            self.dropped += 1
+        else:
+            try:
+                oldest = record_queue.get_nowait()
+            except queue.Empty:
+                oldest = None
+            if oldest is _STOP:
+                self._keep_stop_first()
+                return
+            if isinstance(oldest, logging.LogRecord):
+                self.dropped += 1
+            elif oldest is not None:
+                record_queue.put_nowait(oldest)
+            record_queue.put_nowait(record)
+
+    def _keep_stop_first(self) -> None:
+        """Requeue a dequeued stop marker ahead of every record.
+
+        The writer stops at the marker, so records behind it, including
+        the one being logged, would never be written; they are dropped
+        instead of delaying the stop. Flush requests stay behind it.
+        """
+        record_queue = self.queue
+        controls = []
+        while True:
+            try:
+                item = record_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, logging.LogRecord):
+                self.dropped += 1
+            else:
+                controls.append(item)
+        self.dropped += 1
+        record_queue.put_nowait(_STOP)
+        for item in controls:
+            record_queue.put_nowait(item)
+
+
+class BatchingQueueListener:
+    """Background writer that drains the audit queue in batches.
+
+    A batch is written once it reaches ``batch_size`` records or once the
+    oldest pending record has waited ``flush_interval`` seconds. Handlers
+    that implement ``emit_batch`` receive the whole batch in one call;
+    others get each record through ``handle``.
+    """
+
+    def __init__(
+        self,
+        record_queue: "queue.SimpleQueue[object]",
+        handlers: Sequence[logging.Handler],
+        batch_size: int = 512,
+        flush_interval: float = 0.5,
+    ) -> None:
+        """Initialize the listener; call ``start`` to launch the thread."""
+        self.queue = record_queue
+        self.handlers = list(handlers)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batches_written = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far has been written.
+
+        Returns:
+            bool: True if the writer confirmed the flush within ``timeout``.
+        """
+        if self._thread is None:
+            return True
+        request = _FlushRequest()
+        self.queue.put(request)
+        return request.done.wait(timeout)
+
+    def stop(self) -> None:
+        """Write all queued records, then stop the writer thread."""
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        for handler in self.handlers:
+            handler.flush()
+
+    def _run(self) -> None:
+        """Writer loop: collect records into batches and write them."""
+        pending: List[logging.LogRecord] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            stop = False
+            while item is not None:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    self._write(pending)
+                    pending = []
+                    item.done.set()
+                else:
+                    if not pending:
+                        deadline = time.monotonic() + self.flush_interval
+                    pending.append(item)  # type: ignore[arg-type]
+                    if len(pending) >= self.batch_size:
+                        break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            if (
+                stop
+                or len(pending) >= self.batch_size
+                or (pending and time.monotonic() >= deadline)
+            ):
+                self._write(pending)
+                pending = []
+            if stop:
+                return
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        """Hand one batch to every handler."""
+        if not records:
+            return
+        for handler in self.handlers:
+            emit_batch = getattr(handler, "emit_batch", None)
+            if emit_batch is None:
+                for record in records:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+                continue
+            accepted = [
+                record
+                for record in records
+                if record.levelno >= handler.level and handler.filter(record)
+            ]
+            handler.acquire()
+            try:
+                emit_batch(accepted)
+            finally:
+                handler.release()
+        self.batches_written += 1
@@ -0,0 +1,332 @@
+"""Size-rotated JSON-lines audit segments with a sparse time index."""
+
+import bisect
+import json
+import logging
+import os
+import re
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .audit_chain import (
+    GENESIS,
+    SEGMENT_PATTERN,
+    Checkpoint,
+    MerkleCheckpointer,
+    checkpoint_line,
+    head_path,
+    load_checkpoints,
+    load_head,
+    write_head,
+)
+from .audit_event import record_to_json
+
+
+def _timestamp_of(line: bytes) -> float:
+    """Read the leading ``ts`` value of a JSON line without full parsing."""
+    return float(line[6 : line.index(b",", 6)])
+
+
+class SegmentIndex:
+    """Sparse ``timestamp -> byte offset`` index of one segment.
+
+    Each entry records the timestamp of the first event starting at that
+    offset. Entries are kept in parallel arrays so lookups are a bisect.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty index."""
+        self.timestamps = array("d")
+        self.offsets = array("Q")
+
+    def __len__(self) -> int:
+        """Return the number of index entries."""
+        return len(self.timestamps)
+
+    def add(self, timestamp: float, offset: int) -> None:
+        """Append an entry."""
+        self.timestamps.append(timestamp)
+        self.offsets.append(offset)
+
+    def seek_offset(self, start: float) -> int:
+        """Return the offset of the last entry strictly before ``start``."""
+        position = bisect.bisect_left(self.timestamps, start)
+        return self.offsets[position - 1] if position > 0 else 0
+
+    @classmethod
+    def load(cls, path: str) -> "SegmentIndex":
+        """Load an index file written by ``JsonLinesSegmentHandler``."""
+        index = cls()
+        try:
+            with open(path, "rb") as handle:
+                for line in handle:
+                    timestamp, _, offset = line.partition(b" ")
+                    if offset.endswith(b"\n"):
+                        index.add(float(timestamp), int(offset))
+        except FileNotFoundError:
+            pass
+        return index
+
+
+class JsonLinesSegmentHandler(logging.Handler):
+    """Write audit records as JSON lines to size-rotated segment files.
+
+    Segments are named ``<prefix>-NNNNNN.jsonl``; each has a companion
+    ``.idx`` file with one ``"<timestamp> <offset>"`` line roughly every
+    ``index_interval`` bytes. Timestamps are clamped to be non-decreasing,
+    so records that reached the queue slightly out of order from
+    concurrent threads are stamped with the latest time seen. This lets
+    ``read_range`` bisect the index and stop at the first later event.
+
+    With ``checkpoint_every`` set, every N records (and the tail of a segment
+    on rotation or close) are sealed by a Merkle checkpoint appended to a
+    ``.chk`` file, chained to the previous checkpoint, and the latest
+    chain hash and oldest kept segment are recorded in ``<prefix>.head``;
+    see ``AuditChainVerifier``.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        prefix: str = "audit",
+        max_bytes: int = 64 * 1024 * 1024,
+        index_interval: int = 64 * 1024,
+        max_segments: Optional[int] = None,
+        checkpoint_every: Optional[int] = None,
+    ) -> None:
+        """Open (or continue) the newest segment in ``directory``."""
+        super().__init__()
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.index_interval = index_interval
+        self.max_segments = max_segments
+        self.checkpoint_every = checkpoint_every
+        self.head_path = head_path(directory, prefix)
+        self._pattern = re.compile(SEGMENT_PATTERN.format(prefix=re.escape(prefix)))
+        self._checkpointer = (
+            MerkleCheckpointer(checkpoint_every) if checkpoint_every else None
+        )
+        os.makedirs(directory, exist_ok=True)
+
+        sequences = self.segment_sequences()
+        self._sequence = sequences[-1] if sequences else 1
+        head = load_head(self.head_path) if self._checkpointer is not None else None
+        # Keep the recorded oldest segment across restarts, so segments
+        # deleted while the writer was down stay visible to the verifier.
+        self._first_sequence = (
+            head.first if head is not None else sequences[0] if sequences else 1
+        )
+        self._last_timestamp = 0.0
+        self._open_segment()
+
+    def segment_path(self, sequence: int) -> str:
+        """Return the path of segment ``sequence``."""
+        return os.path.join(self.directory, f"{self.prefix}-{sequence:06d}.jsonl")
+
+    def index_path(self, sequence: int) -> str:
+        """Return the path of the index of segment ``sequence``."""
+        return os.path.join(self.directory, f"{self.prefix}-{sequence:06d}.idx")
+
+    def checkpoint_path(self, sequence: int) -> str:
+        """Return the path of the checkpoints of segment ``sequence``."""
+        return os.path.join(self.directory, f"{self.prefix}-{sequence:06d}.chk")
+
+    def segment_sequences(self) -> List[int]:
+        """Return the sequence numbers of existing segments, oldest first."""
+        sequences = []
+        for name in os.listdir(self.directory):
+            match = self._pattern.match(name)
+            if match:
+                sequences.append(int(match.group(1)))
+        return sorted(sequences)
+
+    def _open_segment(self) -> None:
+        """Open the current segment and its index for appending."""
+        path = self.segment_path(self._sequence)
+        self._segment = open(path, "ab")
+        self._index = open(self.index_path(self._sequence), "ab")
+        self._size = self._segment.tell()
+        existing = SegmentIndex.load(self.index_path(self._sequence))
+        self._last_indexed = existing.offsets[-1] if len(existing) else -1
+        if len(existing):
+            self._last_timestamp = max(self._last_timestamp, existing.timestamps[-1])
+        self._checkpoints = (
+            open(self.checkpoint_path(self._sequence), "ab")
+            if self._checkpointer is not None
+            else None
+        )
+        if self._checkpointer is not None:
+            self._resume_chain(path)
+
+    def _resume_chain(self, path: str) -> None:
+        """Link to the latest checkpoint and re-read records not yet sealed."""
+        assert self._checkpointer is not None
+        checkpoints = load_checkpoints(self.checkpoint_path(self._sequence))
+        earlier: List[Checkpoint] = []
+        if checkpoints:
+            self._checkpointer.previous = checkpoints[-1].chain
+        elif self._sequence > 1 and self._checkpointer.previous == GENESIS:
+            earlier = load_checkpoints(self.checkpoint_path(self._sequence - 1))
+            if earlier:
+                self._checkpointer.previous = earlier[-1].chain
+        head = load_head(self.head_path)
+        if (
+            head is not None
+            and head.chain
+            and head.chain != self._checkpointer.previous
+            and head.chain not in {c.chain for c in checkpoints + earlier}
+        ):
+            # Checkpoints up to the recorded head were removed: chain the
+            # next seal to the head so the gap stays visible instead of
+            # sealing the exposed records afresh.
+            self._checkpointer.previous = head.chain
+        sealed = checkpoints[-1].end_offset if checkpoints else 0
+        self._checkpointer.reset(sealed)
+        if sealed < self._size:
+            with open(path, "rb") as segment:
+                segment.seek(sealed)
+                for line in segment:
+                    if line.endswith(b"\n"):
+                        self._checkpointer.add(line, _timestamp_of(line))
+
+    def _seal(self) -> List[bytes]:
+        """Seal pending records of the current segment into a checkpoint."""
+        if self._checkpointer is None:
+            return []
+        checkpoint = self._checkpointer.seal(self._sequence, self._size)
+        return [checkpoint_line(checkpoint)] if checkpoint else []
+
+    def _close_files(self) -> None:
+        """Close the files of the current segment."""
+        self._segment.close()
+        self._index.close()
+        if self._checkpoints is not None:
+            self._checkpoints.close()
+
+    def _rotate(self) -> None:
+        """Close the current segment and start the next one."""
+        self._write([], [], self._seal())
+        self._close_files()
+        self._sequence += 1
+        self._open_segment()
+        if self.max_segments is not None:
+            pruned = self.segment_sequences()[: -self.max_segments]
+            if pruned:
+                self._first_sequence = pruned[-1] + 1
+                # Record the new oldest segment before removing any, so a
+                # crash in between leaves extra segments, not missing ones.
+                self._write_head()
+            for sequence in pruned:
+                for path in (
+                    self.segment_path(sequence),
+                    self.index_path(sequence),
+                    self.checkpoint_path(sequence),
+                ):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Write a single record."""
+        self.emit_batch([record])
+
+    def emit_batch(self, records: Sequence[logging.LogRecord]) -> None:
+        """Write a batch of records with one write per touched segment."""
+        try:
+            chunks: List[bytes] = []
+            index_lines: List[bytes] = []
+            checkpoint_lines: List[bytes] = []
+            checkpointer = self._checkpointer
+            for record in records:
+                timestamp = max(record.created, self._last_timestamp)
+                self._last_timestamp = timestamp
+                line = record_to_json(record, timestamp).encode() + b"\n"
+                if self._size and self._size + len(line) > self.max_bytes:
+                    self._write(chunks, index_lines, checkpoint_lines)
+                    chunks, index_lines, checkpoint_lines = [], [], []
+                    self._rotate()
+                if (
+                    self._last_indexed < 0
+                    or self._size - self._last_indexed >= self.index_interval
+                ):
+                    index_lines.append(f"{timestamp!r} {self._size}\n".encode())
+                    self._last_indexed = self._size
+                chunks.append(line)
+                self._size += len(line)
+                if checkpointer is not None:
+                    checkpointer.add(line, timestamp)
+                    if checkpointer.due():
+                        checkpoint_lines.extend(self._seal())
+            self._write(chunks, index_lines, checkpoint_lines)
+        except Exception:
+            self.handleError(records[-1])
+
+    def _write(
+        self,
+        chunks: List[bytes],
+        index_lines: List[bytes],
+        checkpoint_lines: Sequence[bytes] = (),
+    ) -> None:
+        """Append lines, then index entries and checkpoints covering them."""
+        if chunks:
+            self._segment.write(b"".join(chunks))
+            self._segment.flush()
+        if index_lines:
+            self._index.write(b"".join(index_lines))
+            self._index.flush()
+        if checkpoint_lines and self._checkpoints is not None:
+            self._checkpoints.write(b"".join(checkpoint_lines))
+            self._checkpoints.flush()
+            self._write_head()
+
+    def _write_head(self) -> None:
+        """Record the latest chain hash and the oldest kept segment."""
+        if self._checkpointer is not None:
+            write_head(
+                self.head_path, self._checkpointer.previous, self._first_sequence
+            )
+
+    def close(self) -> None:
+        """Seal and close the current segment."""
+        self.acquire()
+        try:
+            if not self._segment.closed:
+                self._write([], [], self._seal())
+                self._close_files()
+        finally:
+            self.release()
+        super().close()
+
+    def read_range(self, start: float, end: float) -> Iterator[Dict[str, Any]]:
+        """Yield events with ``start <= ts <= end`` in write order.
+
+        Segments entirely outside the range are skipped using their first
+        index entry, and each remaining segment is entered at the sparse
+        index offset closest to ``start``, so only a small window around the
+        range is read.
+        """
+        bounds: List[Tuple[int, SegmentIndex]] = []
+        for sequence in self.segment_sequences():
+            index = SegmentIndex.load(self.index_path(sequence))
+            if len(index):
+                bounds.append((sequence, index))
+
+        for position, (sequence, index) in enumerate(bounds):
+            if index.timestamps[0] > end:
+                break
+            following = bounds[position + 1][1] if position + 1 < len(bounds) else None
+            if following is not None and following.timestamps[0] < start:
+                continue
+            with open(self.segment_path(sequence), "rb") as segment:
+                segment.seek(index.seek_offset(start))
+                for line in segment:
+                    if not line.endswith(b"\n"):
+                        break
+                    timestamp = _timestamp_of(line)
+                    if timestamp < start:
+                        continue
+                    if timestamp > end:
+                        return
+                    yield json.loads(line)
@@ -0,0 +1,193 @@
+"""In-process aggregation of performance metrics into log-bucketed histograms."""
+
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.shared.histogram import LogHistogram
+
+
+@dataclass(frozen=True)
+class MetricSummary:
+    """Compact summary of one metric over a flush window."""
+
+    name: str
+    count: int
+    minimum: float
+    maximum: float
+    mean: float
+    p50: float
+    p99: float
+    window_seconds: float
+
+
+class _Shard:
+    """Per-thread metric storage guarded by an uncontended lock.
+
+    Storage is double-buffered: the owning thread records into one set of
+    histograms while the previous window's set is merged and reset, so a
+    steady set of metric names allocates nothing after the first windows.
+    """
+
+    __slots__ = ("lock", "owner", "histograms", "counters", "spare", "spare_counters")
+
+    def __init__(self) -> None:
+        """Create an empty shard owned by the calling thread."""
+        self.lock = threading.Lock()
+        self.owner = weakref.ref(threading.current_thread())
+        self.histograms: Dict[str, LogHistogram] = {}
+        self.counters: Dict[str, float] = {}
+        self.spare: Dict[str, LogHistogram] = {}
+        self.spare_counters: Dict[str, float] = {}
+
+    def swap(self) -> Tuple[Dict[str, LogHistogram], Dict[str, float]]:
+        """Start recording into the spare buffers; return the filled ones."""
+        with self.lock:
+            filled = self.histograms, self.counters
+            self.histograms, self.spare = self.spare, self.histograms
+            self.counters, self.spare_counters = self.spare_counters, self.counters
+        return filled
+
+    @property
+    def orphaned(self) -> bool:
+        """Whether the owning thread has exited."""
+        owner = self.owner()
+        return owner is None or not owner.is_alive()
+
+
+class MetricsAggregator:
+    """Aggregate metrics in memory and periodically emit summaries.
+
+    Each recording thread writes to its own shard, so recording takes an
+    uncontended lock and updates preallocated histogram slots. ``flush``
+    swaps every shard's buffers, merges them per metric and passes the
+    summaries (and counter totals) to ``sink``. Shards of threads that have
+    exited are dropped once drained.
+    """
+
+    def __init__(
+        self,
+        sink: Callable[[List[MetricSummary], Dict[str, float]], None],
+        flush_interval: float = 10.0,
+    ) -> None:
+        """Initialize the aggregator; call ``start`` for periodic flushing."""
+        self.sink = sink
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._merged: Dict[str, LogHistogram] = {}
+        self._window_start = time.monotonic()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _shard(self) -> _Shard:
+        """Return the calling thread's shard, registering it on first use."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, name: str, value: float) -> None:
+        """Record one observation of metric ``name``."""
+        shard = self._shard()
+        with shard.lock:
+            histogram = shard.histograms.get(name)
+            if histogram is None:
+                histogram = shard.histograms[name] = LogHistogram()
+            histogram.record(value)
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        """Add ``amount`` to counter ``name``."""
+        shard = self._shard()
+        with shard.lock:
+            shard.counters[name] = shard.counters.get(name, 0) + amount
+
+    def start(self) -> None:
+        """Start flushing every ``flush_interval`` seconds."""
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="metrics-flush", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop periodic flushing and emit a final summary."""
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        """Flush loop."""
+        while not self._stopped.wait(self.flush_interval):
+            self.flush()
+
+    def _collect(self) -> Tuple[Dict[str, LogHistogram], Dict[str, float]]:
+        """Swap every shard's buffers and merge the filled ones.
+
+        Must be called with ``_flush_lock`` held: the merged histograms are
+        reused by the next call.
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged = self._merged
+        for histogram in merged.values():
+            histogram.reset()
+        counters: Dict[str, float] = {}
+        orphans = []
+        for shard in shards:
+            # Check before swapping: a thread seen exited records no more.
+            if shard.orphaned:
+                orphans.append(shard)
+            histograms, shard_counters = shard.swap()
+            for name, histogram in histograms.items():
+                if histogram.count:
+                    target = merged.get(name)
+                    if target is None:
+                        target = merged[name] = LogHistogram()
+                    target.merge(histogram)
+                    histogram.reset()
+            for name, amount in shard_counters.items():
+                counters[name] = counters.get(name, 0) + amount
+            shard_counters.clear()
+        if orphans:
+            with self._shards_lock:
+                self._shards = [shard for shard in self._shards if shard not in orphans]
+        return merged, counters
+
+    def flush(self) -> List[MetricSummary]:
+        """Emit summaries for the current window and start a new one."""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> List[MetricSummary]:
+        """Flush with ``_flush_lock`` held."""
+        now = time.monotonic()
+        window = now - self._window_start
+        self._window_start = now
+        histograms, counters = self._collect()
+        summaries = [
+            MetricSummary(
+                name=name,
+                count=histogram.count,
+                minimum=histogram.minimum,
+                maximum=histogram.maximum,
+                mean=histogram.total / histogram.count,
+                p50=histogram.quantile(0.5),
+                p99=histogram.quantile(0.99),
+                window_seconds=window,
+            )
+            for name, histogram in sorted(histograms.items())
+            if histogram.count
+        ]
+        if summaries or counters:
+            self.sink(summaries, counters)
+        return summaries
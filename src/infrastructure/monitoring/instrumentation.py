@@ -0,0 +1,134 @@
+"""Opt-in profiling mode, reporting alongside the spans of ``src.shared.spans``.
+
+A profiling session runs a block under cProfile and tracemalloc, enables
+span recording for its duration, and writes the results to files
+readable only by the owner.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator
+
+from src.shared.spans import INSTRUMENTATION, Instrumentation, SpanSummary
+
+if TYPE_CHECKING:
+    import cProfile
+    import tracemalloc
+
+
+@dataclass
+class ProfileResult:
+    """Files written by a profiling session."""
+
+    stats_path: str
+    memory_path: str
+    report_path: str
+    seconds: float = 0.0
+    peak_memory_bytes: int = 0
+
+
+def format_spans(summaries: Dict[str, SpanSummary]) -> str:
+    """Render span aggregates as a text table."""
+    lines = [
+        f"{'span':<40} {'count':>8} {'errors':>6} {'total s':>10} "
+        f"{'p50 ms':>10} {'p99 ms':>10}"
+    ]
+    for summary in summaries.values():
+        lines.append(
+            f"{summary.name:<40} {summary.count:>8} {summary.errors:>6} "
+            f"{summary.total_seconds:>10.3f} {summary.p50 * 1000:>10.3f} "
+            f"{summary.p99 * 1000:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def _private_open(path: str, mode: str = "w") -> Any:
+    """Open ``path`` for writing, readable only by the owner."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    return os.fdopen(fd, mode)
+
+
+@contextmanager
+def profiling(
+    prefix: str,
+    instrumentation: Instrumentation = INSTRUMENTATION,
+    memory_frames: int = 16,
+    top: int = 30,
+) -> Iterator[ProfileResult]:
+    """Profile the block with cProfile and tracemalloc.
+
+    Spans are enabled for the duration. On exit three owner-only files are
+    written next to each other: ``<prefix>.prof`` (pstats data),
+    ``<prefix>.tracemalloc`` (a tracemalloc snapshot) and ``<prefix>.txt``
+    (spans, the hottest functions and the largest allocation sites).
+    """
+    # Imported here so that instrumented modules load without them.
+    import cProfile
+    import tracemalloc
+
+    result = ProfileResult(
+        stats_path=f"{prefix}.prof",
+        memory_path=f"{prefix}.tracemalloc",
+        report_path=f"{prefix}.txt",
+    )
+    was_enabled = instrumentation.enabled
+    started_tracing = not tracemalloc.is_tracing()
+    instrumentation.reset()
+    instrumentation.enabled = True
+    if started_tracing:
+        tracemalloc.start(memory_frames)
+    else:
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        yield result
+    finally:
+        profiler.disable()
+        result.seconds = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot()
+        result.peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        instrumentation.enabled = was_enabled
+        _write_profile(result, profiler, snapshot, instrumentation.snapshot(), top)
+
+
+def _write_profile(
+    result: ProfileResult,
+    profiler: "cProfile.Profile",
+    snapshot: "tracemalloc.Snapshot",
+    spans: Dict[str, SpanSummary],
+    top: int,
+) -> None:
+    """Write the files of a profiling session."""
+    import io
+    import marshal
+    import pickle
+    import pstats
+    import tracemalloc
+
+    stats = pstats.Stats(profiler)
+    # The formats read by pstats.Stats(path) and tracemalloc.Snapshot.load.
+    with _private_open(result.stats_path, "wb") as handle:
+        marshal.dump(stats.stats, handle)  # type: ignore[attr-defined]
+    with _private_open(result.memory_path, "wb") as handle:
+        pickle.dump(snapshot, handle, pickle.HIGHEST_PROTOCOL)
+
+    hottest = io.StringIO()
+    pstats.Stats(profiler, stream=hottest).sort_stats("cumulative").print_stats(top)
+    allocations = snapshot.filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    ).statistics("lineno")[:top]
+    with _private_open(result.report_path) as handle:
+        handle.write(
+            f"wall time: {result.seconds:.3f} s\n"
+            f"peak traced memory: {result.peak_memory_bytes / 1024**2:.1f} MB\n\n"
+        )
+        handle.write(format_spans(spans) + "\n\n")
+        handle.write(hottest.getvalue() + "\n")
+        handle.write("largest allocation sites:\n")
+        handle.writelines(f"  {statistic}\n" for statistic in allocations)
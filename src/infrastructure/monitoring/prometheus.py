@@ -0,0 +1,177 @@
+"""Prometheus text exposition: formatting, a localhost server and textfiles.
+
+The server never computes anything while answering a scrape. It calls a
+payload function that must return an already rendered ``bytes`` object,
+so a scrape costs one attribute read and a socket write.
+"""
+
+import http.server
+import math
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Dict[str, str]
+Sample = Tuple[Labels, float]
+
+
+def escape_label_value(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def escape_help(text: str) -> str:
+    """Escape HELP text, where only backslashes and newlines are special."""
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value; integers are written without a fraction.
+
+    Infinities and NaN use the spellings Prometheus parses, not Python's.
+    """
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value)
+
+
+def format_family(
+    name: str, kind: str, help_text: str, samples: Iterable[Sample]
+) -> str:
+    """Render one metric family with its HELP and TYPE lines.
+
+    Args:
+        name: Metric name.
+        kind: ``gauge``, ``counter`` or another Prometheus type.
+        help_text: One-line description.
+        samples: ``(labels, value)`` pairs.
+    """
+    lines = [f"# HELP {name} {escape_help(help_text)}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if labels:
+            pairs = ",".join(
+                f'{key}="{escape_label_value(str(label))}"'
+                for key, label in labels.items()
+            )
+            lines.append(f"{name}{{{pairs}}} {format_value(value)}")
+        else:
+            lines.append(f"{name} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, payload: bytes) -> None:
+    """Replace ``path`` with ``payload`` atomically.
+
+    The node exporter's textfile collector may read the file at any
+    time, so it must never see a partly written one.
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as handle:
+            handle.write(payload)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """Answer ``GET /metrics`` with the current payload."""
+
+    server: "_MetricsHTTPServer"
+
+    def do_GET(self) -> None:
+        """Send the payload, or 404 for any other path."""
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.payload()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        """Do not log every scrape."""
+
+
+class _MetricsHTTPServer(http.server.ThreadingHTTPServer):
+    """HTTP server holding the payload function."""
+
+    daemon_threads = True
+    payload: Callable[[], bytes]
+
+
+class MetricsServer:
+    """Serve a pre-rendered payload at ``/metrics`` over HTTP."""
+
+    def __init__(
+        self,
+        payload: Callable[[], bytes],
+        host: str = "127.0.0.1",
+        port: int = 9163,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            payload: Returns the rendered exposition; called per scrape.
+            host: Address to listen on; loopback by default.
+            port: Port to listen on; 0 picks a free one.
+        """
+        self.payload = payload
+        self.host = host
+        self.port = port
+        self._server: Optional[_MetricsHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Return the bound host and port."""
+        if self._server is None:
+            return self.host, self.port
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def bind(self) -> None:
+        """Start listening."""
+        self._server = _MetricsHTTPServer((self.host, self.port), _MetricsHandler)
+        self._server.payload = self.payload
+
+    def serve_forever(self) -> None:
+        """Serve until ``shutdown`` is called."""
+        if self._server is None:
+            self.bind()
+        assert self._server is not None
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> None:
+        """Serve from a background thread."""
+        self.bind()
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="metrics", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        """Stop serving and wait for the serving thread."""
+        if self._server is not None:
+            self._server.shutdown()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
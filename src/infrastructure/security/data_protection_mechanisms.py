@@ -1,24 +1,166 @@
 """Data protection mechanisms implementation."""
 
 import base64
+import json
 import os
-from typing import Any, Dict, Optional
+import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    TypeVar,
+)
 
 from cryptography.fernet import Fernet
 
+from src.shared.spans import timed
+
+from .encrypted_store import EncryptedKeyValueStore
+from .streaming_cipher import (
+    DEFAULT_CHUNK_SIZE,
+    FileCryptoResult,
+    StreamingFileCipher,
+    derive_file_key,
+)
+
+DEFAULT_BATCH_CHUNK = 512
+KEY_SUFFIX = ".key"
+
+_In = TypeVar("_In")
+_Out = TypeVar("_Out")
+
+
+def _map_chunked(
+    function: Callable[[_In], _Out],
+    items: Iterable[_In],
+    workers: Optional[int],
+    chunk_size: int,
+) -> Iterator[_Out]:
+    """Apply ``function`` to ``items`` in chunks on a thread pool, in order.
+
+    Items are consumed lazily and at most ``2 * workers`` chunks are in
+    flight. With a single worker the chunks are processed inline.
+    """
+    workers = workers or os.cpu_count() or 1
+    iterator = iter(items)
+
+    def run(chunk: List[_In]) -> List[_Out]:
+        return [function(item) for item in chunk]
+
+    if workers == 1:
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                return
+            yield from run(chunk)
+
+    window: Deque["Future[List[_Out]]"] = deque()
+    with ThreadPoolExecutor(workers) as pool:
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if chunk:
+                window.append(pool.submit(run, chunk))
+            if window and (not chunk or len(window) >= 2 * workers):
+                yield from window.popleft().result()
+            if not chunk and not window:
+                return
+
 
 class DataProtectionMechanisms:
     """Data protection implementation."""
 
-    def __init__(self) -> None:
-        """Initialize data protection."""
-        self.key = self._generate_key()
+    def __init__(
+        self, store_path: Optional[str] = None, key: Optional[bytes] = None
+    ) -> None:
+        """Initialize data protection.
+
+        Args:
+            store_path: File backing ``secure_store``; values are kept
+                encrypted in memory when omitted.
+            key: Fernet key to use, e.g. from ``load_or_create_key``. When
+                omitted, the key is loaded from ``<store_path>.key`` (created
+                on first use) so the store can be reopened, or a new random
+                key is generated if there is no store.
+        """
+        if key is None and store_path:
+            key = self.load_or_create_key(store_path + KEY_SUFFIX)
+        self.key = key or self._generate_key()
         self.cipher_suite = Fernet(self.key)
+        self.store: Optional[EncryptedKeyValueStore] = (
+            EncryptedKeyValueStore(store_path, self.key) if store_path else None
+        )
+        self._memory_store: Dict[str, bytes] = {}
 
     def _generate_key(self) -> bytes:
         """Generate a new encryption key."""
         return base64.urlsafe_b64encode(os.urandom(32))
 
+    @staticmethod
+    def load_key(path: str) -> bytes:
+        """Load a key written by ``save_key``.
+
+        Raises:
+            ValueError: If the file does not hold a valid Fernet key.
+        """
+        with open(path, "rb") as handle:
+            key = handle.read().strip()
+        try:
+            Fernet(key)
+        except ValueError as exc:
+            raise ValueError(f"Invalid key file: {path}") from exc
+        return key
+
+    def save_key(self, path: str, overwrite: bool = True) -> None:
+        """Atomically write the current key to ``path`` with mode 0600.
+
+        Raises:
+            FileExistsError: If ``overwrite`` is false and ``path`` exists.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".mc-key-")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(self.key)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.chmod(temp_path, 0o600)
+            if overwrite:
+                os.replace(temp_path, path)
+                return
+            # Linking fails if the name exists, so a key another process
+            # published first is never replaced, and is never seen half
+            # written.
+            os.link(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        os.unlink(temp_path)
+
+    @classmethod
+    def load_or_create_key(cls, path: str) -> bytes:
+        """Load the key at ``path``, creating and persisting one if absent.
+
+        If several processes race to create the key, the first one to
+        publish it wins and the others load that key.
+        """
+        try:
+            return cls.load_key(path)
+        except FileNotFoundError:
+            protection = cls()
+            try:
+                protection.save_key(path, overwrite=False)
+            except FileExistsError:
+                return cls.load_key(path)
+            return protection.key
+
     def encrypt_data(self, data: str) -> bytes:
         """Encrypt data using Fernet."""
         return self.cipher_suite.encrypt(data.encode())
@@ -27,15 +169,113 @@ class DataProtectionMechanisms:
         """Decrypt data using Fernet."""
         return self.cipher_suite.decrypt(encrypted_data).decode()
 
+    def iter_encrypt(
+        self,
+        records: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_BATCH_CHUNK,
+    ) -> Iterator[bytes]:
+        """Lazily encrypt ``records``, yielding tokens in input order."""
+        encrypt = self.cipher_suite.encrypt
+        return _map_chunked(
+            lambda record: encrypt(record.encode()), records, workers, chunk_size
+        )
+
+    def iter_decrypt(
+        self,
+        tokens: Iterable[bytes],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_BATCH_CHUNK,
+    ) -> Iterator[str]:
+        """Lazily decrypt ``tokens``, yielding records in input order."""
+        decrypt = self.cipher_suite.decrypt
+        return _map_chunked(
+            lambda token: decrypt(token).decode(), tokens, workers, chunk_size
+        )
+
+    @timed("crypto.encrypt_many")
+    def encrypt_many(
+        self,
+        records: Iterable[str],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_BATCH_CHUNK,
+    ) -> List[bytes]:
+        """Encrypt many records with one cipher and a worker pool."""
+        return list(self.iter_encrypt(records, workers, chunk_size))
+
+    @timed("crypto.decrypt_many")
+    def decrypt_many(
+        self,
+        tokens: Iterable[bytes],
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_BATCH_CHUNK,
+    ) -> List[str]:
+        """Decrypt many tokens with one cipher and a worker pool.
+
+        Raises:
+            cryptography.fernet.InvalidToken: If any token is invalid.
+        """
+        return list(self.iter_decrypt(tokens, workers, chunk_size))
+
+    def _file_cipher(
+        self, chunk_size: int, workers: Optional[int]
+    ) -> StreamingFileCipher:
+        """Build a streaming cipher keyed from the current key."""
+        file_key = derive_file_key(base64.urlsafe_b64decode(self.key))
+        return StreamingFileCipher(file_key, chunk_size, workers)
+
+    def encrypt_file(
+        self,
+        source_path: str,
+        target_path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: Optional[int] = None,
+    ) -> FileCryptoResult:
+        """Encrypt a file of any size with constant memory use."""
+        return self._file_cipher(chunk_size, workers).encrypt_file(
+            source_path, target_path
+        )
+
+    def decrypt_file(
+        self,
+        source_path: str,
+        target_path: str,
+        workers: Optional[int] = None,
+    ) -> FileCryptoResult:
+        """Decrypt a file written by ``encrypt_file``.
+
+        Raises:
+            ValueError: If the file is not in this format or was modified.
+        """
+        return self._file_cipher(DEFAULT_CHUNK_SIZE, workers).decrypt_file(
+            source_path, target_path
+        )
+
     def secure_store(self, key: str, value: Any) -> None:
-        """Store data securely."""
-        # TODO: Implement secure storage
-        pass
+        """Store a JSON-serializable value encrypted under ``key``."""
+        if self.store is not None:
+            self.store.put(key, value)
+        else:
+            self._memory_store[key] = self.encrypt_data(json.dumps(value))
 
     def secure_retrieve(self, key: str) -> Optional[Any]:
-        """Retrieve data securely."""
-        # TODO: Implement secure retrieval
-        pass
+        """Retrieve the value stored under ``key``, or None."""
+        if self.store is not None:
+            return self.store.get(key)
+        token = self._memory_store.get(key)
+        return json.loads(self.decrypt_data(token)) if token is not None else None
+
+    def secure_delete(self, key: str) -> None:
+        """Remove the value stored under ``key``."""
+        if self.store is not None:
+            self.store.delete(key)
+        else:
+            self._memory_store.pop(key, None)
+
+    def close(self) -> None:
+        """Close the backing store, if any."""
+        if self.store is not None:
+            self.store.close()
 
     def get_key(self) -> bytes:
         """Get the current encryption key."""
@@ -0,0 +1,318 @@
+"""Single-file, append-structured encrypted key-value store."""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+MAGIC = b"MCKV\x01"
+OP_PUT = 1
+OP_DELETE = 2
+
+_RECORD = struct.Struct(">B32sI")
+
+_MISSING = object()
+_DELETED = object()
+
+
+class EncryptedKeyValueStore:
+    """Encrypted store with an in-memory offset index and a decrypted LRU cache.
+
+    Each record is ``op | HMAC(key) | length | Fernet token``. Keys are only
+    stored as keyed HMAC digests, and the token holds both key and value as
+    JSON, so the file reveals neither. Opening the store reads record
+    headers only. A torn record left by a crash at the end of the file is
+    truncated away; a damaged record before the end makes opening fail
+    rather than discard the records after it.
+
+    Reads are served from an LRU cache of decrypted values bounded by
+    ``cache_entries`` and ``cache_bytes``; only misses pay for decryption.
+    The cache holds each value's JSON text and decodes it on every read,
+    so callers always get their own copy and mutating a value after
+    ``put`` or ``get`` never changes what the store returns.
+    Writes inside ``batch()`` are appended with a single write and a
+    single ``fsync``. Superseded records are reclaimed by ``compact()``,
+    which copies live tokens without re-encrypting them.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        key: bytes,
+        cache_entries: int = 1024,
+        cache_bytes: int = 16 * 1024 * 1024,
+    ) -> None:
+        """Open or create the store at ``path`` with a Fernet ``key``."""
+        self.path = path
+        self._fernet = Fernet(key)
+        self._index_key = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"mac_cleaner store index v1",
+        ).derive(base64.urlsafe_b64decode(key))
+        self.cache_entries = cache_entries
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[bytes, Tuple[str, int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._index: Dict[bytes, Tuple[int, int]] = {}
+        self._dead_bytes = 0
+        self._pending: Optional[List[bytes]] = None
+        self._pending_values: Dict[bytes, Any] = {}
+        self._lock = threading.RLock()
+        self._file = self._open()
+
+    def _digest(self, key: str) -> bytes:
+        """Return the blind index digest of ``key``."""
+        return hmac.new(self._index_key, key.encode(), hashlib.sha256).digest()
+
+    def _open(self) -> Any:
+        """Open the file and rebuild the index from record headers."""
+        exists = os.path.exists(self.path)
+        handle = open(self.path, "r+b" if exists else "w+b")
+        if not exists or os.path.getsize(self.path) == 0:
+            handle.write(MAGIC)
+            handle.flush()
+            os.fsync(handle.fileno())
+            return handle
+        if handle.read(len(MAGIC)) != MAGIC:
+            handle.close()
+            raise ValueError(f"Not an encrypted store: {self.path}")
+
+        offset = len(MAGIC)
+        size = os.path.getsize(self.path)
+        while offset + _RECORD.size <= size:
+            handle.seek(offset)
+            op, digest, length = _RECORD.unpack(handle.read(_RECORD.size))
+            end = offset + _RECORD.size + length
+            if op not in (OP_PUT, OP_DELETE) or end > size:
+                break
+            self._apply(op, digest, offset + _RECORD.size, length)
+            offset = end
+        if offset != size:
+            handle.seek(offset)
+            if not self._is_torn_tail(handle.read(), size - offset):
+                handle.close()
+                raise ValueError(
+                    f"Encrypted store is corrupt at offset {offset}: {self.path}"
+                )
+            handle.truncate(offset)
+        return handle
+
+    @staticmethod
+    def _is_torn_tail(tail: bytes, remaining: int) -> bool:
+        """Return whether ``tail`` is what an interrupted append leaves behind.
+
+        That is a partial record header, a record whose payload runs past
+        the end of the file, or zeros from a file extended but not written.
+        Anything else means a complete record is damaged, and truncating
+        would destroy the records after it.
+        """
+        if remaining < _RECORD.size or not tail.strip(b"\0"):
+            return True
+        op, _, length = _RECORD.unpack_from(tail)
+        return op in (OP_PUT, OP_DELETE) and _RECORD.size + length > remaining
+
+    def _apply(self, op: int, digest: bytes, payload_offset: int, length: int) -> None:
+        """Update the index for one record."""
+        previous = self._index.pop(digest, None)
+        if previous is not None:
+            self._dead_bytes += _RECORD.size + previous[1]
+        if op == OP_PUT:
+            self._index[digest] = (payload_offset, length)
+        else:
+            self._dead_bytes += _RECORD.size
+
+    def __len__(self) -> int:
+        """Return the number of live keys."""
+        return len(self._index)
+
+    def __enter__(self) -> "EncryptedKeyValueStore":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Close the store."""
+        self.close()
+
+    @property
+    def dead_bytes(self) -> int:
+        """Bytes occupied by superseded or deleted records."""
+        return self._dead_bytes
+
+    def _cache_put(self, digest: bytes, value: str, size: int) -> None:
+        """Insert a decrypted value's JSON text and enforce the cache bounds."""
+        self._cache_drop(digest)
+        self._cache[digest] = (value, size)
+        self._cached_bytes += size
+        while self._cache and (
+            len(self._cache) > self.cache_entries
+            or self._cached_bytes > self.cache_bytes
+        ):
+            _, (_, evicted_size) = self._cache.popitem(last=False)
+            self._cached_bytes -= evicted_size
+
+    def _cache_drop(self, digest: bytes) -> None:
+        """Remove one entry from the cache if present."""
+        entry = self._cache.pop(digest, None)
+        if entry is not None:
+            self._cached_bytes -= entry[1]
+
+    def evict(self, key: str) -> None:
+        """Drop ``key``'s decrypted value from the cache."""
+        with self._lock:
+            self._cache_drop(self._digest(key))
+
+    def clear_cache(self) -> None:
+        """Drop every decrypted value from the cache."""
+        with self._lock:
+            self._cache.clear()
+            self._cached_bytes = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value stored under ``key``, or ``default``.
+
+        Raises:
+            ValueError: If the stored record cannot be authenticated.
+        """
+        digest = self._digest(key)
+        with self._lock:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                self.cache_hits += 1
+                return json.loads(cached[0])
+            pending = self._pending_values.get(digest, _MISSING)
+            if pending is not _MISSING:
+                return default if pending is _DELETED else json.loads(pending)
+            location = self._index.get(digest)
+            if location is None:
+                return default
+            self.cache_misses += 1
+            offset, length = location
+            token = os.pread(self._file.fileno(), length, offset)
+            try:
+                document = json.loads(self._fernet.decrypt(token))
+            except InvalidToken as exc:
+                raise ValueError(
+                    f"Stored value for {key!r} failed authentication"
+                ) from exc
+            if document["k"] != key:
+                raise ValueError(f"Stored value for {key!r} belongs to another key")
+            self._cache_put(
+                digest, json.dumps(document["v"], separators=(",", ":")), length
+            )
+            return document["v"]
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable ``value`` under ``key``."""
+        digest = self._digest(key)
+        text = json.dumps(value, separators=(",", ":"))
+        token = self._fernet.encrypt(f'{{"k":{json.dumps(key)},"v":{text}}}'.encode())
+        with self._lock:
+            self._append(OP_PUT, digest, token, text)
+            self._cache_put(digest, text, len(token))
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` if present."""
+        digest = self._digest(key)
+        with self._lock:
+            if digest not in self._index and digest not in self._pending_values:
+                return
+            self._append(OP_DELETE, digest, b"", _DELETED)
+            self._cache_drop(digest)
+
+    def _append(self, op: int, digest: bytes, payload: bytes, value: Any) -> None:
+        """Queue a record in the current batch, or write it immediately."""
+        record = _RECORD.pack(op, digest, len(payload)) + payload
+        if self._pending is not None:
+            self._pending.append(record)
+            self._pending_values[digest] = value
+            return
+        self._write([record])
+
+    def _write(self, records: List[bytes]) -> None:
+        """Append records with one write and one fsync, then index them."""
+        handle = self._file
+        handle.seek(0, os.SEEK_END)
+        offset = handle.tell()
+        handle.write(b"".join(records))
+        handle.flush()
+        os.fsync(handle.fileno())
+        for record in records:
+            op, digest, length = _RECORD.unpack_from(record)
+            self._apply(op, digest, offset + _RECORD.size, length)
+            offset += len(record)
+
+    @contextmanager
+    def batch(self) -> Iterator["EncryptedKeyValueStore"]:
+        """Group writes so they are appended and synced once on exit.
+
+        Nested batches join the outermost one. If the block raises, its
+        writes are discarded.
+        """
+        with self._lock:
+            if self._pending is not None:
+                yield self
+                return
+            self._pending = []
+            try:
+                yield self
+                records = self._pending
+            except BaseException:
+                for digest in self._pending_values:
+                    self._cache_drop(digest)
+                raise
+            finally:
+                self._pending = None
+                self._pending_values = {}
+            if records:
+                self._write(records)
+
+    def compact(self) -> int:
+        """Rewrite the file with live records only.
+
+        Returns:
+            int: Number of bytes reclaimed.
+        """
+        with self._lock:
+            if self._pending is not None:
+                raise RuntimeError("Cannot compact inside a batch")
+            before = os.path.getsize(self.path)
+            temp_path = self.path + ".compact"
+            fileno = self._file.fileno()
+            index: Dict[bytes, Tuple[int, int]] = {}
+            with open(temp_path, "wb") as target:
+                target.write(MAGIC)
+                offset = len(MAGIC)
+                for digest, (payload_offset, length) in self._index.items():
+                    token = os.pread(fileno, length, payload_offset)
+                    target.write(_RECORD.pack(OP_PUT, digest, length) + token)
+                    index[digest] = (offset + _RECORD.size, length)
+                    offset += _RECORD.size + length
+                target.flush()
+                os.fsync(target.fileno())
+            os.replace(temp_path, self.path)
+            self._file.close()
+            self._file = open(self.path, "r+b")
+            self._index = index
+            self._dead_bytes = 0
+            return before - offset
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
@@ -1,27 +1,246 @@
 """Input validation layer for the application."""
 
-from typing import Any, Dict, Optional
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+Validator = Callable[[Any], bool]
+
+_CACHE_LIMIT = 256
+
+_TYPE_CHECKS: Dict[str, Validator] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float))
+    and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+    "null": lambda value: value is None,
+}
+
+_KEYWORDS = frozenset(
+    {
+        "type",
+        "properties",
+        "required",
+        "additionalProperties",
+        "items",
+        "minItems",
+        "maxItems",
+        "minLength",
+        "maxLength",
+        "pattern",
+        "minimum",
+        "maximum",
+        "enum",
+        "description",
+    }
+)
+
+# Control characters other than tab, newline and carriage return.
+_CONTROL_CHARACTERS = dict.fromkeys(
+    [code for code in range(32) if chr(code) not in "\t\n\r"] + [127]
+)
+
+
+def _all_of(checks: List[Validator]) -> Validator:
+    """Combine checks into one validator, avoiding a loop where possible."""
+    if not checks:
+        return lambda value: True
+    if len(checks) == 1:
+        return checks[0]
+    if len(checks) == 2:
+        first, second = checks
+        return lambda value: first(value) and second(value)
+
+    def validate(value: Any) -> bool:
+        for check in checks:
+            if not check(value):
+                return False
+        return True
+
+    return validate
+
+
+def _compile(schema: Dict[str, Any]) -> Validator:
+    """Compile one schema node into a validator closure."""
+    unknown = set(schema) - _KEYWORDS
+    if unknown:
+        raise ValueError(f"Unsupported schema keywords: {sorted(unknown)}")
+    checks: List[Validator] = []
+
+    if "type" in schema:
+        types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+        try:
+            type_checks = [_TYPE_CHECKS[name] for name in types]
+        except KeyError as exc:
+            raise ValueError(f"Unsupported schema type: {exc.args[0]}") from None
+        checks.append(
+            type_checks[0]
+            if len(type_checks) == 1
+            else lambda value: any(check(value) for check in type_checks)
+        )
+
+    if "enum" in schema:
+        options = schema["enum"]
+        try:
+            allowed = frozenset(options)
+            checks.append(lambda value: _hashable_in(value, allowed))
+        except TypeError:
+            checks.append(lambda value: value in options)
+
+    if "minimum" in schema or "maximum" in schema:
+        low, high = schema.get("minimum"), schema.get("maximum")
+        number = _TYPE_CHECKS["number"]
+        checks.append(
+            lambda value: not number(value)
+            or ((low is None or value >= low) and (high is None or value <= high))
+        )
+
+    if {"minLength", "maxLength", "pattern"} & schema.keys():
+        min_length = schema.get("minLength", 0)
+        max_length = schema.get("maxLength")
+        search = re.compile(schema["pattern"]).search if "pattern" in schema else None
+
+        def check_string(value: Any) -> bool:
+            if not isinstance(value, str):
+                return True
+            if len(value) < min_length or (
+                max_length is not None and len(value) > max_length
+            ):
+                return False
+            return search is None or search(value) is not None
+
+        checks.append(check_string)
+
+    if {"items", "minItems", "maxItems"} & schema.keys():
+        item = _compile(schema["items"]) if "items" in schema else None
+        min_items = schema.get("minItems", 0)
+        max_items = schema.get("maxItems")
+
+        def check_array(value: Any) -> bool:
+            if not isinstance(value, list):
+                return True
+            if len(value) < min_items or (
+                max_items is not None and len(value) > max_items
+            ):
+                return False
+            return item is None or all(map(item, value))
+
+        checks.append(check_array)
+
+    if {"properties", "required", "additionalProperties"} & schema.keys():
+        properties: Tuple[Tuple[str, Validator], ...] = tuple(
+            (name, _compile(node))
+            for name, node in schema.get("properties", {}).items()
+        )
+        required = tuple(schema.get("required", ()))
+        closed = schema.get("additionalProperties", True) is False
+        known = frozenset(name for name, _ in properties)
+
+        def check_object(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return True
+            for name in required:
+                if name not in value:
+                    return False
+            for name, validate in properties:
+                if name in value and not validate(value[name]):
+                    return False
+            return not closed or value.keys() <= known
+
+        checks.append(check_object)
+
+    return _all_of(checks)
+
+
+def _hashable_in(value: Any, allowed: frozenset) -> bool:
+    """Membership test that treats unhashable values as absent."""
+    try:
+        return value in allowed
+    except TypeError:
+        return False
 
 
 class InputValidationLayer:
-    """Input validation layer implementation."""
+    """Input validation layer implementation.
 
-    @staticmethod
-    def validate_input(data: Dict[str, Any], schema: Dict[str, Any]) -> bool:
+    Schemas use a JSON Schema subset: ``type``, ``enum``, ``minimum``,
+    ``maximum``, ``minLength``, ``maxLength``, ``pattern``, ``items``,
+    ``minItems``, ``maxItems``, ``properties``, ``required`` and
+    ``additionalProperties``. Each schema is compiled once into nested
+    validator closures and cached, first by object identity and then by
+    its canonical JSON, so repeated and bulk validation only run the
+    specialized checks. Schemas must not be mutated after first use.
+    """
+
+    _by_identity: Dict[int, Tuple[Dict[str, Any], Validator]] = {}
+    _by_content: Dict[str, Validator] = {}
+
+    @classmethod
+    def compile_schema(cls, schema: Dict[str, Any]) -> Validator:
+        """Return the cached validator for ``schema``, compiling it if needed.
+
+        Raises:
+            ValueError: If the schema uses unsupported keywords or types.
+        """
+        cached = cls._by_identity.get(id(schema))
+        if cached is not None and cached[0] is schema:
+            return cached[1]
+        canonical = json.dumps(schema, sort_keys=True, default=str)
+        validator = cls._by_content.get(canonical)
+        if validator is None:
+            validator = _compile(schema)
+            if len(cls._by_content) >= _CACHE_LIMIT:
+                cls._by_content.clear()
+            cls._by_content[canonical] = validator
+        if len(cls._by_identity) >= _CACHE_LIMIT:
+            cls._by_identity.clear()
+        cls._by_identity[id(schema)] = (schema, validator)
+        return validator
+
+    @classmethod
+    def validate_input(cls, data: Any, schema: Dict[str, Any]) -> bool:
         """Validate input data against a schema."""
-        # TODO: Implement validation logic
-        return True
+        return cls.compile_schema(schema)(data)
+
+    @classmethod
+    def validate_many(cls, items: Iterable[Any], schema: Dict[str, Any]) -> List[bool]:
+        """Validate every item against one schema, compiling it once."""
+        return list(map(cls.compile_schema(schema), items))
 
     @staticmethod
     def sanitize_input(data: Dict[str, Any]) -> Dict[str, Any]:
-        """Sanitize input data."""
-        # TODO: Implement sanitization logic
-        return data
+        """Sanitize input data.
+
+        Strings, including keys, are stripped of surrounding whitespace and
+        control characters; nested dicts and lists are sanitized
+        recursively. Other values are returned unchanged.
+        """
+
+        def clean(value: Any) -> Any:
+            if isinstance(value, str):
+                return value.translate(_CONTROL_CHARACTERS).strip()
+            if isinstance(value, dict):
+                return {clean(key): clean(item) for key, item in value.items()}
+            if isinstance(value, list):
+                return [clean(item) for item in value]
+            return value
+
+        return clean(data)
 
     @staticmethod
     def check_boundaries(
         value: Any, min_value: Optional[Any] = None, max_value: Optional[Any] = None
     ) -> bool:
-        """Check if value is within boundaries."""
-        # TODO: Implement boundary checking
-        return True
+        """Check if value is within boundaries (inclusive).
+
+        Values that cannot be compared with the bounds are out of bounds.
+        """
+        try:
+            return (min_value is None or value >= min_value) and (
+                max_value is None or value <= max_value
+            )
+        except TypeError:
+            return False
@@ -0,0 +1,256 @@
+"""Guard that keeps cleanup operations away from protected locations."""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from src.shared.paths import CASE_INSENSITIVE
+
+ALLOW = "allow"
+DENY = "deny"
+
+# System locations whose entire subtree must never be removed.
+SYSTEM_PATHS = (
+    "/System",
+    "/Library",
+    "/Applications",
+    "/bin",
+    "/sbin",
+    "/usr",
+    "/etc",
+    "/lib",
+    "/lib64",
+    "/boot",
+    "/dev",
+    "/proc",
+    "/sys",
+    "/private/etc",
+    "/private/var",
+)
+
+_CACHE_LIMIT = 65536
+
+
+class _Node:
+    """One path component of the rule trie."""
+
+    __slots__ = ("children", "rule", "rule_path", "exact", "guarded_below")
+
+    def __init__(self) -> None:
+        """Create a node without rules."""
+        self.children: Dict[str, "_Node"] = {}
+        self.rule: Optional[str] = None
+        self.rule_path = ""
+        self.exact = False
+        self.guarded_below = False
+
+
+# Per-directory state: canonical directory, its trie node (None once the
+# path leaves the trie), and the nearest enclosing subtree rule.
+_DirectoryState = Tuple[str, Optional[_Node], Optional[_Node]]
+
+
+class PathGuard:
+    """Decide whether a path may be deleted, in O(depth) or better.
+
+    Rules are compiled into a trie of path components:
+
+    * ``deny`` paths protect their whole subtree,
+    * ``allow`` paths re-open a subtree below a denied one,
+    * ``exact`` paths (e.g. mount roots, the home directory) may not be
+      deleted themselves, but their contents may.
+
+    The nearest enclosing subtree rule wins. A directory is also refused
+    when a denied or exact path lies beneath it, since removing it would
+    remove the protected path.
+
+    Targets are canonicalized by resolving symlinks in their parent
+    directory only: deleting a symlink removes the link, not its target.
+    The resolved directory and its trie position are memoized per parent
+    directory, so checking the files of one directory costs one dict
+    lookup and one trie step each.
+
+    ``realpath`` keeps the case it was given, so on case-insensitive
+    volumes rules and targets are matched with their case folded. That
+    errs toward refusing on the rare case-sensitive volume of such a
+    platform, where ``/USR`` would be a different directory.
+    """
+
+    def __init__(
+        self,
+        deny: Iterable[str] = (),
+        allow: Iterable[str] = (),
+        exact: Iterable[str] = (),
+        cache_limit: int = _CACHE_LIMIT,
+        case_insensitive: bool = CASE_INSENSITIVE,
+    ) -> None:
+        """Compile the rules; every rule path is resolved once.
+
+        Args:
+            deny: Paths whose subtrees may not be deleted.
+            allow: Paths that may be deleted even below a denied path.
+            exact: Paths that may not be deleted themselves.
+            cache_limit: Most resolved directories remembered.
+            case_insensitive: Match path components regardless of case;
+                defaults to the platform's default volume behavior.
+        """
+        self._root = _Node()
+        self.cache_limit = cache_limit
+        self.case_insensitive = case_insensitive
+        self._directories: Dict[str, _DirectoryState] = {}
+        for path in deny:
+            self._add(path, DENY)
+        for path in allow:
+            self._add(path, ALLOW)
+        for path in exact:
+            self._add(path, None)
+
+    @classmethod
+    def default(
+        cls,
+        pins: Iterable[str] = (),
+        allow: Iterable[str] = (),
+        case_insensitive: bool = CASE_INSENSITIVE,
+    ) -> "PathGuard":
+        """Build a guard for system paths, mount roots and user pins.
+
+        Args:
+            pins: User-configured paths whose subtrees must be kept.
+            allow: Paths that may be cleaned even below a protected path.
+            case_insensitive: Match path components regardless of case.
+        """
+        mounts = [partition.mountpoint for partition in psutil.disk_partitions()]
+        return cls(
+            deny=[*SYSTEM_PATHS, *pins],
+            allow=allow,
+            exact=[os.sep, os.path.expanduser("~"), *mounts],
+            case_insensitive=case_insensitive,
+        )
+
+    def _components(self, path: str) -> List[str]:
+        """Split an absolute path into trie keys."""
+        if self.case_insensitive:
+            path = path.casefold()
+        return [part for part in path.split(os.sep) if part]
+
+    def _add(self, path: str, rule: Optional[str]) -> None:
+        """Insert one rule into the trie."""
+        real = os.path.realpath(os.path.expanduser(path))
+        node = self._root
+        ancestors = [node]
+        for part in self._components(real):
+            node = node.children.setdefault(part, _Node())
+            ancestors.append(node)
+        if rule is None:
+            node.exact = True
+        else:
+            node.rule = rule
+            node.rule_path = real
+        if rule != ALLOW:
+            for ancestor in ancestors[:-1]:
+                ancestor.guarded_below = True
+        self._directories.clear()
+
+    def _directory_state(self, directory: str) -> _DirectoryState:
+        """Return the memoized canonical state of ``directory``."""
+        state = self._directories.get(directory)
+        if state is not None:
+            return state
+        real = os.path.realpath(directory)
+        node: Optional[_Node] = self._root
+        enclosing = self._root if self._root.rule else None
+        for part in self._components(real):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.rule is not None:
+                enclosing = node
+        if len(self._directories) >= self.cache_limit:
+            self._directories.clear()
+        state = self._directories[directory] = (real, node, enclosing)
+        return state
+
+    def clear_cache(self) -> None:
+        """Forget resolved directories, e.g. after symlinks changed."""
+        self._directories.clear()
+
+    def resolve(self, path: str) -> Tuple[str, Optional[str]]:
+        """Return the canonical form of ``path`` and why it must not be deleted.
+
+        The parent directory is resolved by ``realpath`` as the kernel
+        would, so ``..`` after a symlink climbs out of the link's target,
+        not out of the link. The final component is kept as is: deleting a
+        symlink removes the link. Callers must delete the returned path,
+        which is the one that was checked.
+        """
+        if path[:1] != os.sep:
+            path = os.path.join(os.getcwd(), path)
+        path = path.rstrip(os.sep) or os.sep
+        directory, _, name = path.rpartition(os.sep)
+        if name in (".", ".."):
+            directory, _, name = os.path.realpath(path).rpartition(os.sep)
+        real_directory, node, enclosing = self._directory_state(directory or os.sep)
+        if not name:
+            # Only the filesystem root has no final component.
+            return os.sep, self._reason(real_directory, os.sep, node, enclosing)
+        canonical = os.path.join(real_directory, name)
+        if node is not None:
+            node = node.children.get(name.casefold() if self.case_insensitive else name)
+            if node is not None and node.rule is not None:
+                enclosing = node
+        return canonical, self._reason(real_directory, name, node, enclosing)
+
+    @staticmethod
+    def _reason(
+        real_directory: str,
+        name: str,
+        node: Optional[_Node],
+        enclosing: Optional[_Node],
+    ) -> Optional[str]:
+        """Return why entry ``name`` of ``real_directory`` is protected."""
+        if enclosing is not None and enclosing.rule == DENY:
+            return f"inside protected path {enclosing.rule_path}"
+        if node is not None:
+            if node.exact:
+                return f"protected location {os.path.join(real_directory, name)}"
+            if node.guarded_below:
+                return "contains protected paths"
+        return None
+
+    def check(self, path: str) -> Optional[str]:
+        """Return why ``path`` must not be deleted, or None if it may be."""
+        return self.resolve(path)[1]
+
+    def is_allowed(self, path: str) -> bool:
+        """Whether ``path`` may be deleted."""
+        return self.check(path) is None
+
+    def require_allowed(self, path: str) -> str:
+        """Return the canonical path to delete; raise if it is protected.
+
+        Raises:
+            PermissionError: If the path is protected.
+        """
+        canonical, reason = self.resolve(path)
+        if reason is not None:
+            raise PermissionError(f"Refusing to delete {path}: {reason}")
+        return canonical
+
+    def partition(
+        self, paths: Iterable[str]
+    ) -> Tuple[List[str], List[Tuple[str, str]]]:
+        """Split ``paths`` into deletable paths and ``(path, reason)`` pairs.
+
+        Deletable paths are returned in canonical form; delete those.
+        """
+        allowed: List[str] = []
+        denied: List[Tuple[str, str]] = []
+        resolve = self.resolve
+        for path in paths:
+            canonical, reason = resolve(path)
+            if reason is None:
+                allowed.append(canonical)
+            else:
+                denied.append((path, reason))
+        return allowed, denied
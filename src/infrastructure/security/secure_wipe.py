@@ -0,0 +1,419 @@
+"""Overwrite-then-delete ("shred") of sensitive files."""
+
+import fcntl
+import mmap
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+
+import psutil
+
+from src.shared.spans import timed
+
+from .path_guard import PathGuard
+
+if TYPE_CHECKING:
+    from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
+
+DEFAULT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Filesystems that write modified blocks elsewhere, leaving the original
+# data in place: overwriting a file there does not destroy its contents.
+COPY_ON_WRITE_FILESYSTEMS = frozenset({"apfs", "btrfs", "bcachefs", "zfs"})
+
+# What to do with files on copy-on-write filesystems: delete them without
+# overwriting, or leave them in place and report them as ineffective.
+COW_DELETE = "delete"
+COW_SKIP = "skip"
+
+STATUS_WIPED = "wiped"
+STATUS_DELETED = "deleted"
+STATUS_INEFFECTIVE = "ineffective"
+STATUS_SKIPPED = "skipped"
+STATUS_ERROR = "error"
+
+_datasync = getattr(os, "fdatasync", os.fsync)
+_FULLFSYNC = getattr(fcntl, "F_FULLFSYNC", None)
+
+
+def _sync_data(fd: int) -> None:
+    """Make the data written to ``fd`` durable.
+
+    On macOS ``fsync`` only hands the data to the drive, which may keep it
+    in its volatile cache; ``F_FULLFSYNC`` also flushes that cache. Where
+    the filesystem does not support it, fall back to a plain sync.
+    """
+    if _FULLFSYNC is not None:
+        try:
+            fcntl.fcntl(fd, _FULLFSYNC)
+            return
+        except OSError:
+            pass
+    _datasync(fd)
+
+
+class _Skip(Exception):
+    """Internal signal that a file must not be overwritten."""
+
+
+@dataclass(frozen=True)
+class WipeResult:
+    """Outcome for one file."""
+
+    path: str
+    status: str
+    bytes_overwritten: int = 0
+    message: str = ""
+
+
+@dataclass
+class WipeReport:
+    """Outcome of one wipe run."""
+
+    results: List[WipeResult] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def _with_status(self, status: str) -> List[WipeResult]:
+        """Return the results with ``status``."""
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def wiped(self) -> List[WipeResult]:
+        """Files that were overwritten, synced and deleted."""
+        return self._with_status(STATUS_WIPED)
+
+    @property
+    def deleted(self) -> List[WipeResult]:
+        """Files on copy-on-write filesystems deleted without overwriting."""
+        return self._with_status(STATUS_DELETED)
+
+    @property
+    def ineffective(self) -> List[WipeResult]:
+        """Files left untouched because overwriting would not destroy them."""
+        return self._with_status(STATUS_INEFFECTIVE)
+
+    @property
+    def failed(self) -> List[WipeResult]:
+        """Files that were skipped or could not be wiped."""
+        return [
+            result
+            for result in self.results
+            if result.status in (STATUS_SKIPPED, STATUS_ERROR)
+        ]
+
+    @property
+    def bytes_overwritten(self) -> int:
+        """Total bytes written over file contents."""
+        return sum(result.bytes_overwritten for result in self.results)
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """Overwrite throughput in MB/s."""
+        return self.bytes_overwritten / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+class RateLimiter:
+    """Thread-safe token bucket limiting bytes per second.
+
+    A burst of up to one second of budget may be consumed at once.
+    """
+
+    def __init__(
+        self,
+        bytes_per_second: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a limiter with a full bucket."""
+        self.rate = bytes_per_second
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = bytes_per_second
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: int) -> None:
+        """Block until ``amount`` bytes may be written."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.rate, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            self._sleep(delay)
+
+
+class _SyncBatch:
+    """Overwritten files waiting for a shared flush before deletion."""
+
+    def __init__(self, max_files: int, max_bytes: int) -> None:
+        """Create an empty batch."""
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._pending: List[Tuple[int, str, int]] = []
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, fd: int, path: str, size: int) -> List[WipeResult]:
+        """Queue an overwritten file; flush if the batch is full."""
+        with self._lock:
+            self._pending.append((fd, path, size))
+            self._bytes += size
+            if len(self._pending) < self.max_files and self._bytes < self.max_bytes:
+                return []
+            pending, self._pending, self._bytes = self._pending, [], 0
+        return self._flush(pending)
+
+    def drain(self) -> List[WipeResult]:
+        """Flush everything still queued."""
+        with self._lock:
+            pending, self._pending, self._bytes = self._pending, [], 0
+        return self._flush(pending)
+
+    @staticmethod
+    def _flush(pending: List[Tuple[int, str, int]]) -> List[WipeResult]:
+        """Sync each file's data, then delete and close it.
+
+        All overwrites of the batch are already queued in the page cache,
+        so the syncs are issued back to back and the filesystem can
+        coalesce them. A file is only deleted after its data is durable:
+        unlinking first would let the kernel discard the dirty pages.
+        """
+        results = []
+        for fd, path, size in pending:
+            try:
+                _sync_data(fd)
+                os.unlink(path)
+                results.append(WipeResult(path, STATUS_WIPED, size))
+            except OSError as exc:
+                results.append(WipeResult(path, STATUS_ERROR, size, str(exc)))
+            finally:
+                os.close(fd)
+        return results
+
+
+class SecureWiper:
+    """Overwrite files with random data, sync them in batches, then delete.
+
+    One page-aligned random buffer is allocated per wiper and written
+    repeatedly with ``os.pwrite``, so no memory is allocated per write.
+    Files are overwritten concurrently by a thread pool (the writes
+    release the GIL), and every ``sync_batch_files`` files or
+    ``sync_batch_bytes`` bytes are synced together before being unlinked.
+    An optional ``bytes_per_second`` budget throttles the overwrite I/O.
+
+    Overwriting a file on a copy-on-write filesystem (APFS, Btrfs, ZFS,
+    bcachefs) writes new blocks and leaves the old ones in place, so it
+    would only consume I/O. Such files are never overwritten: with the
+    ``COW_SKIP`` policy they are left untouched and reported as
+    ``ineffective``; with ``COW_DELETE`` they are deleted and reported as
+    ``deleted``. Either way their contents are only protected by full-disk
+    encryption (FileVault on macOS, where APFS is the default).
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        workers: Optional[int] = None,
+        passes: int = 1,
+        sync_batch_files: int = 64,
+        sync_batch_bytes: int = 256 * 1024 * 1024,
+        bytes_per_second: Optional[float] = None,
+        filesystem_of: Optional[Callable[[str], str]] = None,
+        guard: Optional[PathGuard] = None,
+        error_handler: Optional["ErrorHandlingSystem"] = None,
+        copy_on_write: str = COW_SKIP,
+    ) -> None:
+        """Initialize the wiper.
+
+        Args:
+            buffer_size: Bytes per write; rounded up to a page multiple.
+            workers: Files overwritten concurrently (default: core count).
+            passes: Overwrite passes per file.
+            sync_batch_files: Files synced together per batch.
+            sync_batch_bytes: Bytes synced together per batch.
+            bytes_per_second: Overwrite I/O budget, or None for unlimited.
+            filesystem_of: Returns the filesystem type of a path; defaults
+                to a lookup in the mounted partitions.
+            guard: Protected-path guard consulted before touching any file.
+            error_handler: Its per-mount circuit breakers are consulted
+                before each file, and it receives I/O errors.
+            copy_on_write: ``COW_SKIP`` or ``COW_DELETE``, the policy for
+                files on copy-on-write filesystems.
+
+        Raises:
+            ValueError: If ``copy_on_write`` is not a known policy.
+        """
+        if copy_on_write not in (COW_DELETE, COW_SKIP):
+            raise ValueError(f"Unknown copy-on-write policy: {copy_on_write}")
+        page = mmap.PAGESIZE
+        self.buffer_size = max(page, -(-buffer_size // page) * page)
+        self.workers = workers or os.cpu_count() or 1
+        self.passes = passes
+        self.sync_batch_files = sync_batch_files
+        self.sync_batch_bytes = sync_batch_bytes
+        self.limiter = RateLimiter(bytes_per_second) if bytes_per_second else None
+        self.filesystem_of = filesystem_of or self._mounted_filesystem_of
+        self.guard = guard
+        self.error_handler = error_handler
+        self.copy_on_write = copy_on_write
+        self._buffer = mmap.mmap(-1, self.buffer_size)
+        self._buffer.write(os.urandom(self.buffer_size))
+        self._view = memoryview(self._buffer)
+        self._mounts: Optional[List[Tuple[str, str]]] = None
+
+    def close(self) -> None:
+        """Release the overwrite buffer."""
+        self._view.release()
+        self._buffer.close()
+
+    def __enter__(self) -> "SecureWiper":
+        """Enter the runtime context."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Release the overwrite buffer."""
+        self.close()
+
+    def _mounted_filesystem_of(self, path: str) -> str:
+        """Return the filesystem type of the mount containing ``path``."""
+        if self._mounts is None:
+            self._mounts = sorted(
+                (
+                    (partition.mountpoint, partition.fstype.lower())
+                    for partition in psutil.disk_partitions(all=True)
+                ),
+                key=lambda mount: len(mount[0]),
+                reverse=True,
+            )
+        real = os.path.realpath(path)
+        for mountpoint, fstype in self._mounts:
+            if real == mountpoint or real.startswith(
+                mountpoint.rstrip(os.sep) + os.sep
+            ):
+                return fstype
+        return ""
+
+    def is_overwrite_effective(self, path: str) -> bool:
+        """Whether overwriting ``path`` in place destroys its old contents."""
+        return self.filesystem_of(path) not in COPY_ON_WRITE_FILESYSTEMS
+
+    def _overwrite(self, path: str, batch: _SyncBatch) -> List[WipeResult]:
+        """Overwrite one file and queue it for syncing and deletion."""
+        try:
+            fd = os.open(path, os.O_WRONLY | getattr(os, "O_NOFOLLOW", 0))
+        except OSError as exc:
+            return self._failed(path, exc)
+        try:
+            info = os.fstat(fd)
+            if not stat.S_ISREG(info.st_mode):
+                raise _Skip("not a regular file")
+            if info.st_nlink > 1:
+                raise _Skip("file has other hard links")
+            size = info.st_size
+            view, chunk = self._view, self.buffer_size
+            for _ in range(self.passes):
+                offset = 0
+                while offset < size:
+                    length = min(chunk, size - offset)
+                    if self.limiter is not None:
+                        self.limiter.acquire(length)
+                    offset += os.pwrite(fd, view[:length], offset)
+        except _Skip as skip:
+            os.close(fd)
+            if self.error_handler is not None:
+                self.error_handler.record_success(path)
+            return [WipeResult(path, STATUS_SKIPPED, message=str(skip))]
+        except OSError as exc:
+            os.close(fd)
+            return self._failed(path, exc)
+        if self.error_handler is not None:
+            self.error_handler.record_success(path)
+        return batch.add(fd, path, size * self.passes)
+
+    def _delete(self, path: str) -> List[WipeResult]:
+        """Delete a file on a copy-on-write filesystem without overwriting."""
+        try:
+            if not stat.S_ISREG(os.lstat(path).st_mode):
+                raise _Skip("not a regular file")
+            os.unlink(path)
+        except _Skip as skip:
+            if self.error_handler is not None:
+                self.error_handler.record_success(path)
+            return [WipeResult(path, STATUS_SKIPPED, message=str(skip))]
+        except OSError as exc:
+            return self._failed(path, exc)
+        if self.error_handler is not None:
+            self.error_handler.record_success(path)
+        return [
+            WipeResult(
+                path,
+                STATUS_DELETED,
+                message="copy-on-write filesystem; deleted without overwriting",
+            )
+        ]
+
+    def _failed(self, path: str, error: OSError) -> List[WipeResult]:
+        """Report an I/O error on ``path``."""
+        if self.error_handler is not None:
+            self.error_handler.handle_error(error, {"path": path})
+        return [WipeResult(path, STATUS_ERROR, message=str(error))]
+
+    @timed("cleanup.secure_wipe")
+    def wipe(self, paths: Iterable[str]) -> WipeReport:
+        """Securely wipe ``paths`` and report the outcome of each file."""
+        start = time.perf_counter()
+        report = WipeReport()
+        batch = _SyncBatch(self.sync_batch_files, self.sync_batch_bytes)
+        effective: Dict[str, bool] = {}
+        targets = []
+        copy_on_write = []
+        for path in paths:
+            if self.guard is not None:
+                canonical, reason = self.guard.resolve(path)
+                if reason is not None:
+                    report.results.append(
+                        WipeResult(path, STATUS_SKIPPED, message=reason)
+                    )
+                    continue
+                # Wipe the path that was checked, not one re-resolved later.
+                path = canonical
+            if self.error_handler is not None and not self.error_handler.allows(path):
+                report.results.append(
+                    WipeResult(path, STATUS_SKIPPED, message="mount unavailable")
+                )
+                continue
+            directory = os.path.dirname(os.path.abspath(path))
+            if directory not in effective:
+                effective[directory] = self.is_overwrite_effective(directory)
+            if effective[directory]:
+                targets.append(path)
+            elif self.copy_on_write == COW_DELETE:
+                copy_on_write.append(path)
+            else:
+                if self.error_handler is not None:
+                    self.error_handler.release(path)
+                report.results.append(
+                    WipeResult(
+                        path,
+                        STATUS_INEFFECTIVE,
+                        message="copy-on-write filesystem; overwrite would not "
+                        "reach the original blocks",
+                    )
+                )
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            for results in pool.map(lambda path: self._overwrite(path, batch), targets):
+                report.results.extend(results)
+        report.results.extend(batch.drain())
+        for path in copy_on_write:
+            report.results.extend(self._delete(path))
+        report.seconds = time.perf_counter() - start
+        return report
@@ -0,0 +1,233 @@
+"""Chunked authenticated encryption of files with constant memory use."""
+
+import os
+import struct
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Deque, Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from src.shared.spans import timed
+
+MAGIC = b"MCFE"
+VERSION = 2
+TAG_SIZE = 16
+SALT_SIZE = 16
+NONCE_PREFIX_SIZE = 7
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+_PREAMBLE = struct.Struct(">4sB")
+_HEADER = struct.Struct(">4sBI16s7s")
+HEADER_SIZE = _HEADER.size
+_NONCE_SUFFIX = struct.Struct(">IB")
+
+
+@dataclass(frozen=True)
+class FileCryptoResult:
+    """Outcome of encrypting or decrypting one file."""
+
+    bytes_in: int
+    bytes_out: int
+    seconds: float
+
+    @property
+    def throughput_mb_s(self) -> float:
+        """Plaintext throughput in MB/s."""
+        plaintext = min(self.bytes_in, self.bytes_out)
+        return plaintext / 1e6 / self.seconds if self.seconds > 0 else 0.0
+
+
+def derive_file_key(master_key: bytes) -> bytes:
+    """Derive the AES-256-GCM file key from a Fernet master key."""
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"mac_cleaner file encryption v1",
+    ).derive(master_key)
+
+
+class StreamingFileCipher:
+    """Encrypt and decrypt files as a sequence of independent AEAD chunks.
+
+    File layout: a 32-byte header (magic, version, chunk size, random salt,
+    random nonce prefix) followed by chunks of ``chunk_size + 16`` bytes;
+    only the final chunk may be shorter. Each file is encrypted under its
+    own subkey, derived from the key and the salt, so nonces never need to
+    be unique across files. Each chunk's nonce is the prefix, its sequence
+    number and a final-chunk flag, and the header is authenticated with
+    every chunk. Reordered, dropped, truncated or appended chunks therefore
+    fail authentication.
+
+    At most ``2 * workers`` chunks are in flight, so memory use is bounded
+    by the chunk size regardless of file size. AES-GCM releases the GIL, so
+    chunks are processed in parallel by a thread pool.
+    """
+
+    def __init__(
+        self,
+        key: bytes,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Initialize with a 32-byte AES key.
+
+        Raises:
+            ValueError: If ``chunk_size`` is not between 1 and
+                ``MAX_CHUNK_SIZE``.
+        """
+        _check_chunk_size(chunk_size)
+        AESGCM(key)  # Validates the key length.
+        self._key = key
+        self.chunk_size = chunk_size
+        self.workers = workers or min(8, os.cpu_count() or 1)
+
+    def _file_aead(self, salt: bytes) -> AESGCM:
+        """Return the cipher for the file whose header holds ``salt``."""
+        return AESGCM(
+            HKDF(
+                algorithm=hashes.SHA256(),
+                length=32,
+                salt=salt,
+                info=b"mac_cleaner file chunk key v2",
+            ).derive(self._key)
+        )
+
+    @staticmethod
+    def _nonce(prefix: bytes, sequence: int, final: bool) -> bytes:
+        """Build the nonce of chunk ``sequence``."""
+        return prefix + _NONCE_SUFFIX.pack(sequence, final)
+
+    def _pipeline(
+        self,
+        source: BinaryIO,
+        target: BinaryIO,
+        read_size: int,
+        transform: Callable[[bytes, int, bool], bytes],
+    ) -> int:
+        """Read chunks, transform them in parallel in order, write results."""
+        written = 0
+        window: Deque["Future[bytes]"] = deque()
+        with ThreadPoolExecutor(self.workers) as pool:
+            sequence = 0
+            chunk = source.read(read_size)
+            while True:
+                following = source.read(read_size) if chunk else b""
+                final = not following
+                window.append(pool.submit(transform, chunk, sequence, final))
+                if len(window) >= 2 * self.workers:
+                    written += target.write(window.popleft().result())
+                if final:
+                    break
+                chunk = following
+                sequence += 1
+            while window:
+                written += target.write(window.popleft().result())
+        return written
+
+    @timed("crypto.encrypt_file")
+    def encrypt_file(self, source_path: str, target_path: str) -> FileCryptoResult:
+        """Encrypt ``source_path`` into ``target_path``."""
+        start = time.perf_counter()
+        salt = os.urandom(SALT_SIZE)
+        prefix = os.urandom(NONCE_PREFIX_SIZE)
+        header = _HEADER.pack(MAGIC, VERSION, self.chunk_size, salt, prefix)
+        aead = self._file_aead(salt)
+
+        def encrypt(chunk: bytes, sequence: int, final: bool) -> bytes:
+            return aead.encrypt(self._nonce(prefix, sequence, final), chunk, header)
+
+        with open(source_path, "rb") as source:
+            with _AtomicOutput(target_path) as target:
+                target.write(header)
+                written = len(header) + self._pipeline(
+                    source, target, self.chunk_size, encrypt
+                )
+        return FileCryptoResult(
+            os.path.getsize(source_path), written, time.perf_counter() - start
+        )
+
+    @timed("crypto.decrypt_file")
+    def decrypt_file(self, source_path: str, target_path: str) -> FileCryptoResult:
+        """Decrypt ``source_path`` into ``target_path``.
+
+        The target is only created once every chunk has authenticated.
+
+        Raises:
+            ValueError: If the file is not in this format or was modified.
+        """
+        start = time.perf_counter()
+        with open(source_path, "rb") as source:
+            header = source.read(_PREAMBLE.size)
+            if len(header) != _PREAMBLE.size:
+                raise ValueError("Not an encrypted file: header too short")
+            magic, version = _PREAMBLE.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("Not an encrypted file: unknown format")
+            if version != VERSION:
+                raise ValueError(f"Unsupported encrypted file version: {version}")
+            header += source.read(HEADER_SIZE - _PREAMBLE.size)
+            if len(header) != HEADER_SIZE:
+                raise ValueError("Not an encrypted file: header too short")
+            _, _, chunk_size, salt, prefix = _HEADER.unpack(header)
+            aead = self._file_aead(salt)
+            # The header is only authenticated along with the chunks,
+            # so bound the read size before trusting it.
+            _check_chunk_size(chunk_size)
+
+            def decrypt(chunk: bytes, sequence: int, final: bool) -> bytes:
+                try:
+                    return aead.decrypt(
+                        self._nonce(prefix, sequence, final), chunk, header
+                    )
+                except InvalidTag as exc:
+                    raise ValueError(
+                        f"Encrypted file is corrupt or was modified (chunk {sequence})"
+                    ) from exc
+
+            with _AtomicOutput(target_path) as target:
+                written = self._pipeline(source, target, chunk_size + TAG_SIZE, decrypt)
+        return FileCryptoResult(
+            os.path.getsize(source_path), written, time.perf_counter() - start
+        )
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    """Reject chunk sizes that are empty or would need huge buffers."""
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError(
+            f"Chunk size must be between 1 and {MAX_CHUNK_SIZE} bytes: {chunk_size}"
+        )
+
+
+class _AtomicOutput:
+    """Write to a temporary file that replaces ``path`` only on success."""
+
+    def __init__(self, path: str) -> None:
+        """Prepare a temporary file next to ``path``."""
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self.temp_path = tempfile.mkstemp(
+            dir=directory, prefix=".mc-", suffix=".tmp"
+        )
+        self.file = os.fdopen(fd, "wb", buffering=DEFAULT_CHUNK_SIZE)
+
+    def __enter__(self) -> BinaryIO:
+        """Return the temporary file."""
+        return self.file
+
+    def __exit__(self, exc_type: object, *exc_info: object) -> None:
+        """Publish the file on success, discard it on error."""
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.temp_path, self.path)
+        else:
+            os.unlink(self.temp_path)
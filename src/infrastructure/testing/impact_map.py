@@ -0,0 +1,240 @@
+"""Map source lines to the tests that execute them, for test selection."""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Mapping, Optional, Set
+
+from coverage import CoverageData
+
+# pytest-cov's ``--cov-context=test`` labels contexts "<node id>|<phase>".
+_PHASE_SUFFIX = re.compile(r"\|(setup|run|teardown)$")
+_HUNK = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+Changes = Mapping[str, Optional[Iterable[int]]]
+
+
+def content_digest(content: bytes) -> str:
+    """Return the SHA-256 of ``content``."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """Return the SHA-256 of a file's contents."""
+    with open(path, "rb") as handle:
+        return content_digest(handle.read())
+
+
+def context_test_id(context: str) -> str:
+    """Strip the pytest phase from a coverage context label."""
+    return _PHASE_SUFFIX.sub("", context)
+
+
+def parse_diff_lines(diff: str) -> Dict[str, Set[int]]:
+    """Return the changed lines of each file in a ``git diff -U0``.
+
+    Line numbers refer to the old version, which is what the impact map
+    was recorded against. A pure insertion is attributed to the lines
+    around it.
+    """
+    changes: Dict[str, Set[int]] = {}
+    current: Optional[Set[int]] = None
+    for line in diff.splitlines():
+        if line.startswith("--- "):
+            path = line[4:]
+            current = None
+            if path != "/dev/null":
+                current = changes.setdefault(
+                    path[2:] if path[:2] == "a/" else path, set()
+                )
+        elif line.startswith("+++ ") and current is None:
+            path = line[4:]
+            changes.setdefault(path[2:] if path[:2] == "b/" else path, set())
+        elif current is not None:
+            match = _HUNK.match(line)
+            if match:
+                start = int(match.group(1))
+                count = 1 if match.group(2) is None else int(match.group(2))
+                if count:
+                    current.update(range(start, start + count))
+                else:
+                    current.update((start, start + 1))
+    return changes
+
+
+@dataclass
+class FileCoverage:
+    """Tests per line of one source file, for one version of its contents."""
+
+    digest: str
+    size: int
+    mtime_ns: int
+    lines: Dict[int, Set[str]] = field(default_factory=dict)
+
+    def tests(self) -> Set[str]:
+        """Return every test that executes any line of the file."""
+        return set().union(*self.lines.values()) if self.lines else set()
+
+
+class TestImpactMap:
+    """Persistent ``file -> line -> tests`` map built from coverage contexts.
+
+    Entries are keyed by the source file's content hash. Updating only
+    analyses the files measured by the latest run, and only the tests that
+    ran are replaced in them. Deciding whether a file changed compares its
+    size and mtime with the recorded ones and hashes only files that differ.
+    """
+
+    __test__ = False  # Not a pytest test class despite its name.
+
+    def __init__(self, path: str, root: str = ".") -> None:
+        """Load the map stored at ``path``; paths are relative to ``root``."""
+        self.path = path
+        self.root = os.path.abspath(root)
+        self.files: Dict[str, FileCoverage] = {}
+        if os.path.exists(path):
+            with open(path) as handle:
+                document = json.load(handle)
+            tests = document["tests"]
+            for name, entry in document["files"].items():
+                self.files[name] = FileCoverage(
+                    entry["digest"],
+                    entry["size"],
+                    entry["mtime_ns"],
+                    {
+                        int(line): {tests[index] for index in indexes}
+                        for line, indexes in entry["lines"].items()
+                    },
+                )
+
+    def _relative(self, filename: str) -> str:
+        """Return ``filename``, absolute or relative to the root, relative to it."""
+        return os.path.relpath(os.path.join(self.root, filename), self.root)
+
+    def _snapshot(self, name: str, lines: Dict[int, Set[str]]) -> FileCoverage:
+        """Record the current version of a file."""
+        path = os.path.join(self.root, name)
+        info = os.stat(path)
+        return FileCoverage(file_digest(path), info.st_size, info.st_mtime_ns, lines)
+
+    def is_current(self, name: str) -> bool:
+        """Whether ``name`` still has the contents the map was recorded for."""
+        entry = self.files.get(name)
+        if entry is None:
+            return False
+        path = os.path.join(self.root, name)
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            return False
+        if info.st_size == entry.size and info.st_mtime_ns == entry.mtime_ns:
+            return True
+        if info.st_size != entry.size or file_digest(path) != entry.digest:
+            return False
+        entry.mtime_ns = info.st_mtime_ns
+        return True
+
+    def update(self, data: CoverageData, tests_run: Optional[Set[str]] = None) -> int:
+        """Merge per-test contexts from a coverage run.
+
+        Args:
+            data: Coverage data recorded with per-test contexts.
+            tests_run: Tests executed by the run; their old entries are
+                replaced. Defaults to every test seen in ``data``.
+
+        Returns:
+            int: Number of files analysed.
+        """
+        measured = {}
+        seen: Set[str] = set()
+        for filename in data.measured_files():
+            lines: Dict[int, Set[str]] = {}
+            for line, contexts in data.contexts_by_lineno(filename).items():
+                tests = {context_test_id(context) for context in contexts if context}
+                if tests:
+                    lines[line] = tests
+                    seen |= tests
+            measured[self._relative(filename)] = lines
+        replaced = seen if tests_run is None else tests_run
+
+        for name, lines in measured.items():
+            previous = self.files.get(name)
+            if previous is not None:
+                # Tests that did not run keep their lines; if the file was
+                # edited these may be slightly off until they run again.
+                for line, tests in previous.lines.items():
+                    kept = tests - replaced
+                    if kept:
+                        lines.setdefault(line, set()).update(kept)
+            self.files[name] = self._snapshot(name, lines)
+        for name, entry in self.files.items():
+            if name not in measured:
+                for line in list(entry.lines):
+                    entry.lines[line] -= replaced
+                    if not entry.lines[line]:
+                        del entry.lines[line]
+        return len(measured)
+
+    def save(self) -> None:
+        """Write the map atomically, storing each test id once."""
+        tests = sorted(
+            set().union(*(entry.tests() for entry in self.files.values()))
+            if self.files
+            else set()
+        )
+        index = {test: position for position, test in enumerate(tests)}
+        document = {
+            "version": 1,
+            "tests": tests,
+            "files": {
+                name: {
+                    "digest": entry.digest,
+                    "size": entry.size,
+                    "mtime_ns": entry.mtime_ns,
+                    "lines": {
+                        str(line): sorted(index[test] for test in line_tests)
+                        for line, line_tests in sorted(entry.lines.items())
+                    },
+                }
+                for name, entry in sorted(self.files.items())
+            },
+        }
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as handle:
+            json.dump(document, handle, separators=(",", ":"))
+        os.replace(temp_path, self.path)
+
+    def tests_for(
+        self, changes: Changes, base_digests: Optional[Mapping[str, str]] = None
+    ) -> Set[str]:
+        """Return the tests affected by ``changes``.
+
+        Args:
+            changes: Changed files mapped to changed line numbers in their
+                base version, or to None when any line may have changed.
+            base_digests: Content hashes of the base versions. Without
+                them, the files on disk are taken as the base.
+
+        Line numbers are only trusted when the base version is the one the
+        map was recorded for; otherwise every test touching the file is
+        selected. Files the map does not know select nothing, since no
+        recorded test executes them.
+        """
+        selected: Set[str] = set()
+        for filename, lines in changes.items():
+            name = self._relative(filename)
+            entry = self.files.get(name)
+            if entry is None:
+                continue
+            if base_digests is None:
+                trusted = self.is_current(name)
+            else:
+                trusted = base_digests.get(name) == entry.digest
+            if lines is None or not trusted:
+                selected |= entry.tests()
+                continue
+            for line in lines:
+                selected |= entry.lines.get(line, set())
+        return selected
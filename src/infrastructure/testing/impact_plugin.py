@@ -0,0 +1,159 @@
+"""Pytest plugin that records and uses the test impact map.
+
+Enable with ``-p src.infrastructure.testing.impact_plugin``.
+
+Recording: run with ``--cov-context=test --impact-map=PATH``; once
+pytest-cov has saved its data, the per-test contexts are merged into the
+map. Selecting: add ``--impact-since=REF`` to run only the tests covering
+lines changed since ``REF``, plus every test in changed or new test
+files. If a changed file is one the map has never seen (a conftest,
+``pyproject.toml``, a fixture or data file, a new module), nothing can
+say which tests depend on it, so every test runs.
+"""
+
+import os
+import subprocess
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import pytest
+from coverage import CoverageData
+
+from .impact_map import TestImpactMap, content_digest, parse_diff_lines
+
+_ITEMS_RUN = "_impact_items_run"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register the impact map options."""
+    group = parser.getgroup("impact", "test impact selection")
+    group.addoption("--impact-map", default=None, help="impact map file")
+    group.addoption(
+        "--impact-since",
+        default=None,
+        metavar="REF",
+        help="only run tests affected by changes since git REF",
+    )
+
+
+def _git(root: str, *args: str) -> subprocess.CompletedProcess:
+    """Run a git command in ``root``."""
+    return subprocess.run(["git", *args], cwd=root, capture_output=True, check=False)
+
+
+def base_digests(root: str, ref: str, names: Iterable[str]) -> Dict[str, str]:
+    """Return the content hash of each file as of ``ref``."""
+    digests = {}
+    for name in names:
+        shown = _git(root, "show", f"{ref}:{name}")
+        if shown.returncode == 0:
+            digests[name] = content_digest(shown.stdout)
+    return digests
+
+
+def changed_since(root: str, ref: str) -> Dict[str, Optional[Set[int]]]:
+    """Return files changed since ``ref``, with their changed base lines.
+
+    Untracked files that are not ignored count as changed throughout,
+    since ``git diff`` does not list them.
+
+    Raises:
+        pytest.UsageError: If git cannot diff against ``ref``.
+    """
+    diff = _git(root, "diff", "-U0", ref, "--")
+    if diff.returncode != 0:
+        raise pytest.UsageError(diff.stderr.decode(errors="replace").strip())
+    changes: Dict[str, Optional[Set[int]]] = dict(
+        parse_diff_lines(diff.stdout.decode(errors="replace"))
+    )
+    untracked = _git(root, "ls-files", "--others", "--exclude-standard", "-z")
+    for name in untracked.stdout.decode(errors="replace").split("\0"):
+        if name:
+            changes[name] = None
+    return changes
+
+
+def unmapped_changes(
+    changes: Iterable[str], mapped: Set[str], test_files: Set[str]
+) -> List[str]:
+    """Return changed files that neither the map nor a test file accounts for."""
+    return sorted(
+        name for name in changes if name not in mapped and name not in test_files
+    )
+
+
+def select(
+    node_ids: Iterable[str], affected: Set[str], changed_files: Set[str]
+) -> Tuple[List[str], List[str]]:
+    """Split ``node_ids`` into selected and deselected tests.
+
+    A test is selected when the map says it covers a change, or when its
+    own file changed.
+    """
+    selected, deselected = [], []
+    for node_id in node_ids:
+        if node_id in affected or node_id.split("::", 1)[0] in changed_files:
+            selected.append(node_id)
+        else:
+            deselected.append(node_id)
+    return selected, deselected
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: List[pytest.Item]
+) -> None:
+    """Deselect tests not affected by changes since ``--impact-since``."""
+    path = config.getoption("impact_map")
+    ref = config.getoption("impact_since")
+    if path and ref and os.path.exists(path):
+        root = str(config.rootpath)
+        changes = changed_since(root, ref)
+        impact_map = TestImpactMap(path, root)
+        test_files = {item.nodeid.split("::", 1)[0] for item in items}
+        unmapped = unmapped_changes(changes, set(impact_map.files), test_files)
+        if unmapped:
+            reporter = config.pluginmanager.get_plugin("terminalreporter")
+            if reporter is not None:
+                reporter.write_line(
+                    "impact map does not cover changed files, running all tests: "
+                    + ", ".join(unmapped[:5])
+                )
+        else:
+            affected = impact_map.tests_for(
+                changes,
+                base_digests(root, ref, impact_map.files.keys() & changes.keys()),
+            )
+            _, deselected = select(
+                (item.nodeid for item in items), affected, set(changes)
+            )
+            dropped = set(deselected)
+            if dropped:
+                config.hook.pytest_deselected(
+                    items=[item for item in items if item.nodeid in dropped]
+                )
+                items[:] = [item for item in items if item.nodeid not in dropped]
+    setattr(config, _ITEMS_RUN, {item.nodeid for item in items})
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_unconfigure(config: pytest.Config) -> None:
+    """Merge the saved per-test coverage contexts into the impact map."""
+    path = config.getoption("impact_map")
+    data_file = _coverage_data_file(config)
+    if not path or data_file is None or not os.path.exists(data_file):
+        return
+    data = CoverageData(data_file)
+    data.read()
+    impact_map = TestImpactMap(path, str(config.rootpath))
+    impact_map.update(data, getattr(config, _ITEMS_RUN, None))
+    impact_map.save()
+
+
+def _coverage_data_file(config: pytest.Config) -> Optional[str]:
+    """Return pytest-cov's data file when it recorded per-test contexts.
+
+    Like coverage itself, this honors ``COVERAGE_FILE``.
+    """
+    if getattr(config.option, "cov_context", None) != "test":
+        return None
+    data_file = os.environ.get("COVERAGE_FILE") or ".coverage"
+    return os.path.join(str(config.rootpath), data_file)
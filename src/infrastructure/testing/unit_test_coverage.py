@@ -1,20 +1,73 @@
 """Unit test coverage system for monitoring test coverage."""
 
 import os
-from typing import Dict, List, Optional, Sequence
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional, Sequence, Set
 
 from coverage import Coverage
 
+from .impact_map import Changes, TestImpactMap, parse_diff_lines
+
 
 class UnitTestCoverage:
     """System for managing unit test coverage."""
 
-    def __init__(self, source_dir: str) -> None:
-        """Initialize the coverage system."""
+    def __init__(
+        self, source_dir: str, impact_map_path: Optional[str] = None, root: str = "."
+    ) -> None:
+        """Initialize the coverage system.
+
+        Args:
+            source_dir: Directory whose code is measured.
+            impact_map_path: Where to persist the per-test impact map.
+            root: Directory that impact map paths are relative to.
+        """
         self.source_dir = source_dir
+        self.impact_map = (
+            TestImpactMap(impact_map_path, root) if impact_map_path else None
+        )
+        self.tests_run: Set[str] = set()
         self.coverage = Coverage(source=[source_dir], branch=False)
         self.coverage.start()
 
+    @contextmanager
+    def test_context(self, test_id: str) -> Iterator[None]:
+        """Attribute the code executed inside the block to ``test_id``."""
+        self.tests_run.add(test_id)
+        self.coverage.switch_context(test_id)
+        try:
+            yield
+        finally:
+            self.coverage.switch_context("")
+
+    def update_impact_map(self) -> int:
+        """Merge the tests run so far into the impact map and save it.
+
+        Returns:
+            int: Number of source files analysed.
+        """
+        impact_map = self._require_impact_map()
+        analysed = impact_map.update(self.coverage.get_data(), set(self.tests_run))
+        impact_map.save()
+        self.tests_run.clear()
+        return analysed
+
+    def tests_for_changes(
+        self, changes: Changes, base_digests: Optional[Mapping[str, str]] = None
+    ) -> Set[str]:
+        """Return the tests covering the changed files or lines."""
+        return self._require_impact_map().tests_for(changes, base_digests)
+
+    def tests_for_diff(self, diff: str) -> Set[str]:
+        """Return the tests covering the lines changed by a ``git diff -U0``."""
+        return self.tests_for_changes(parse_diff_lines(diff))
+
+    def _require_impact_map(self) -> TestImpactMap:
+        """Return the impact map, which must have been configured."""
+        if self.impact_map is None:
+            raise ValueError("No impact map configured")
+        return self.impact_map
+
     def stop_coverage(self) -> None:
         """Stop collecting coverage data."""
         self.coverage.stop()
@@ -0,0 +1 @@
+"""Presentation layer package."""
@@ -0,0 +1,425 @@
+"""Command line interface.
+
+Only click is imported at startup. Each command imports the services it
+needs when it runs, so ``--help`` and simple queries do not pay for
+pydantic, cryptography, rich or psutil. Queries go to the resident
+daemon when one is listening and are computed locally otherwise.
+"""
+
+import os
+from typing import Any, Iterable, Iterator, Optional, Tuple
+
+import click
+
+UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+def format_bytes(size: float) -> str:
+    """Format a byte count with a binary unit."""
+    for unit in UNITS[:-1]:
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} {UNITS[-1]}"
+
+
+def _walk_files(paths: Iterable[str]) -> Iterator[str]:
+    """Yield the given files and the files below the given directories."""
+    for path in paths:
+        if os.path.isdir(path) and not os.path.islink(path):
+            for directory, _, files in os.walk(path):
+                for name in files:
+                    yield os.path.join(directory, name)
+        else:
+            yield path
+
+
+def _error_handler(ctx: click.Context) -> Any:
+    """Return the error handler shared by every service of this invocation."""
+    settings = ctx.find_root().obj
+    handler = settings.get("error_handler")
+    if handler is None:
+        from src.infrastructure.error.error_handling_system import (
+            ErrorHandlingSystem,
+        )
+
+        handler = settings["error_handler"] = ErrorHandlingSystem()
+        ctx.find_root().call_on_close(handler.flush_error_summary)
+    return handler
+
+
+def _query(ctx: click.Context, op: str, **params: Any) -> Any:
+    """Answer a query through the daemon if one is running, else locally."""
+    settings = ctx.find_root().obj
+    if settings["use_daemon"]:
+        import socket
+
+        from src.infrastructure.ipc.client import DaemonClient
+        from src.infrastructure.ipc.protocol import (
+            DaemonRequestError,
+            DaemonUnavailableError,
+            ProtocolError,
+        )
+
+        client = settings.get("client")
+        if client is None:
+            client = settings["client"] = DaemonClient(settings["socket_path"])
+            ctx.call_on_close(client.close)
+        try:
+            return client.request(op, **params)
+        except DaemonUnavailableError:
+            settings["use_daemon"] = False
+        except DaemonRequestError as error:
+            raise click.ClickException(str(error)) from error
+        except socket.timeout as error:
+            # The daemon is still working on it; computing the same
+            # answer here would only compete with it.
+            raise click.ClickException(
+                f"The daemon did not answer within {client.timeout:.0f} s; "
+                "try again later or use --no-daemon"
+            ) from error
+        except (ProtocolError, OSError) as error:
+            click.echo(f"Daemon request failed ({error}); computing locally", err=True)
+            settings["use_daemon"] = False
+
+    from src.application.query_service import QueryService
+
+    service = settings.get("service")
+    if service is None:
+        service = settings["service"] = QueryService(error_handler=_error_handler(ctx))
+    try:
+        return service.handle(op, params)
+    except (ValueError, OSError) as error:
+        raise click.ClickException(str(error)) from error
+
+
+@click.group()
+@click.option(
+    "--profile",
+    "profile_dir",
+    envvar="MAC_CLEANER_PROFILE",
+    type=click.Path(file_okay=False),
+    help="Profile the command and write reports to this directory.",
+)
+@click.option(
+    "--daemon/--no-daemon",
+    "use_daemon",
+    default=True,
+    help="Use a running daemon's warm caches (default) or compute locally.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    envvar="MAC_CLEANER_SOCKET",
+    type=click.Path(dir_okay=False),
+    help="Daemon socket path.",
+)
+@click.pass_context
+def main(
+    ctx: click.Context,
+    profile_dir: Optional[str],
+    use_daemon: bool,
+    socket_path: Optional[str],
+) -> None:
+    """Privacy-first system cleaning tool; everything runs locally."""
+    ctx.obj = {"use_daemon": use_daemon, "socket_path": socket_path}
+    if profile_dir:
+        from src.infrastructure.monitoring.instrumentation import profiling
+
+        os.makedirs(profile_dir, mode=0o700, exist_ok=True)
+        name = f"{ctx.invoked_subcommand}-{os.getpid()}"
+        ctx.with_resource(profiling(os.path.join(profile_dir, name)))
+
+
+@main.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.pass_context
+def disk(ctx: click.Context, paths: Tuple[str, ...]) -> None:
+    """Show disk usage of PATHS (default: all mounted disks)."""
+    disks = _query(ctx, "disk_usage", paths=[os.path.abspath(path) for path in paths])
+    click.echo(f"{'path':<30} {'total':>10} {'used':>10} {'free':>10} {'use%':>6}")
+    for info in disks:
+        click.echo(
+            f"{info['path']:<30} {format_bytes(info['total_space']):>10} "
+            f"{format_bytes(info['used_space']):>10} "
+            f"{format_bytes(info['free_space']):>10} {info['used_percentage']:>5.1f}%"
+        )
+
+
+@main.command()
+@click.option("--top", default=5, show_default=True, help="Processes to list.")
+@click.pass_context
+def memory(ctx: click.Context, top: int) -> None:
+    """Show system memory usage and the largest processes."""
+    usage = _query(ctx, "memory")
+    click.echo(
+        f"used {format_bytes(usage['used_bytes'])} of "
+        f"{format_bytes(usage['total_bytes'])} ({usage['used_percent']:.1f}%), "
+        f"{format_bytes(usage['available_bytes'])} available"
+    )
+    if top > 0:
+        click.echo(f"{'pid':>8} {'rss':>10} {'mem%':>6}  name")
+        for record in _query(ctx, "top_processes", limit=top):
+            click.echo(
+                f"{record['pid']:>8} {format_bytes(record['rss_bytes']):>10} "
+                f"{record['memory_percent']:>5.1f}%  {record['name']}"
+            )
+
+
+@main.command()
+@click.argument("root", type=click.Path(exists=True, file_okay=False))
+@click.option("--top", default=10, show_default=True, help="Directories to list.")
+@click.option("--refresh", is_flag=True, help="Rescan even if a scan is cached.")
+@click.option("--diff", is_flag=True, help="Show changes since the previous scan.")
+@click.option(
+    "--rescan",
+    is_flag=True,
+    help="Rescan only ROOT, updating a cached scan that contains it.",
+)
+@click.option("--apps", is_flag=True, help="List the applications using most space.")
+@click.pass_context
+def scan(
+    ctx: click.Context,
+    root: str,
+    top: int,
+    refresh: bool,
+    diff: bool,
+    rescan: bool,
+    apps: bool,
+) -> None:
+    """Total file sizes below ROOT and list the largest directories."""
+    root = os.path.abspath(root)
+    if rescan:
+        _query(ctx, "rescan", path=root)
+    if apps:
+        totals = _query(ctx, "app_sizes", root=root, top=top, refresh=refresh)
+        click.echo(
+            f"{format_bytes(totals['total_bytes'])} below {totals['root']} "
+            f"({totals['age_seconds']:.0f} s old scan)"
+        )
+        for app, size in totals["apps"]:
+            click.echo(f"{format_bytes(size):>10}  {app}")
+        return
+    if diff:
+        changes = _query(ctx, "diff", root=root, top=top)
+        if changes["baseline"]:
+            click.echo("No previous scan; recorded a baseline")
+            return
+        delta = changes["after_bytes"] - changes["before_bytes"]
+        click.echo(f"{'+' if delta >= 0 else '-'}{format_bytes(abs(delta))} in total")
+        for path, change in changes["changes"]:
+            sign = "+" if change >= 0 else "-"
+            click.echo(f"{sign}{format_bytes(abs(change)):>10}  {path}")
+        return
+
+    sizes = _query(ctx, "subtree_sizes", root=root, top=top, refresh=refresh)
+    click.echo(
+        f"{format_bytes(sizes['total_bytes'])} below {sizes['root']} "
+        f"(scan of {sizes['file_count']} files and {sizes['dir_count']} "
+        f"directories, {sizes['age_seconds']:.0f} s old)"
+    )
+    if sizes["error_count"]:
+        click.echo(f"{sizes['error_count']} entries could not be read", err=True)
+    for path, size in sizes["children"]:
+        click.echo(f"{format_bytes(size):>10}  {path}")
+
+
+@main.command()
+@click.option("--stop", is_flag=True, help="Stop the running daemon.")
+@click.pass_context
+def daemon(ctx: click.Context, stop: bool) -> None:
+    """Serve queries from warm caches over a local socket."""
+    from src.infrastructure.ipc.protocol import default_socket_path
+
+    socket_path = ctx.find_root().obj["socket_path"] or default_socket_path()
+    if stop:
+        from src.infrastructure.ipc.client import DaemonClient
+        from src.infrastructure.ipc.protocol import DaemonUnavailableError
+
+        try:
+            with DaemonClient(socket_path) as client:
+                client.request("shutdown")
+        except DaemonUnavailableError as error:
+            raise click.ClickException(str(error)) from error
+        click.echo("Daemon stopped")
+        return
+
+    from src.application.query_service import QueryService
+    from src.infrastructure.ipc.server import DaemonServer
+
+    service = QueryService(error_handler=_error_handler(ctx))
+    server = DaemonServer(socket_path, service.handle)
+    try:
+        server.bind()
+    except (FileExistsError, PermissionError) as error:
+        raise click.ClickException(str(error)) from error
+    click.echo(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.close()
+
+
+@main.command()
+@click.option("--fps", default=4.0, show_default=True, help="Most frames per second.")
+@click.option(
+    "--scan",
+    "scan_root",
+    type=click.Path(exists=True, file_okay=False),
+    help="Scan this directory and show its progress.",
+)
+@click.option("--top", default=10, show_default=True, help="Processes to list.")
+@click.option("--duration", type=float, help="Exit after this many seconds.")
+def dashboard(
+    fps: float, scan_root: Optional[str], top: int, duration: Optional[float]
+) -> None:
+    """Show a live view of memory, processes, disks and scan progress."""
+    from src.presentation.dashboard import default_dashboard
+
+    try:
+        view = default_dashboard(
+            scan_root=os.path.abspath(scan_root) if scan_root else None,
+            max_fps=fps,
+            top=top,
+        )
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    try:
+        view.run(duration)
+    except KeyboardInterrupt:
+        pass
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address.")
+@click.option(
+    "--port", default=9163, show_default=True, help="HTTP port; 0 disables HTTP."
+)
+@click.option(
+    "--textfile",
+    type=click.Path(dir_okay=False),
+    help="Also write metrics to this file for a textfile collector.",
+)
+@click.option(
+    "--scan",
+    "scan_root",
+    type=click.Path(exists=True, file_okay=False),
+    help="Scan this directory and export its progress.",
+)
+@click.option("--top", default=10, show_default=True, help="Processes to export.")
+@click.option("--duration", type=float, help="Exit after this many seconds.")
+def export(
+    host: str,
+    port: int,
+    textfile: Optional[str],
+    scan_root: Optional[str],
+    top: int,
+    duration: Optional[float],
+) -> None:
+    """Export metrics in Prometheus text format."""
+    import threading
+
+    from src.application.metrics_exporter import MetricsExporter
+    from src.application.samplers import default_sources
+    from src.infrastructure.monitoring.prometheus import MetricsServer, write_textfile
+
+    if port == 0 and not textfile:
+        raise click.UsageError("Give a --port or a --textfile to export to.")
+    exporter = MetricsExporter(
+        default_sources(os.path.abspath(scan_root) if scan_root else None, top),
+        on_render=(
+            (lambda payload: write_textfile(textfile, payload)) if textfile else None
+        ),
+    )
+    server = None
+    if port:
+        server = MetricsServer(exporter.current, host, port)
+        try:
+            server.start()
+        except OSError as error:
+            raise click.ClickException(str(error)) from error
+        bound_host, bound_port = server.address
+        click.echo(f"Serving http://{bound_host}:{bound_port}/metrics")
+    exporter.start()
+    try:
+        threading.Event().wait(duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if server is not None:
+            server.shutdown()
+        exporter.stop()
+
+
+@main.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--dry-run", is_flag=True, help="List what would be wiped.")
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation.")
+@click.option(
+    "--copy-on-write",
+    type=click.Choice(["delete", "skip"]),
+    default="delete",
+    show_default=True,
+    help="Files on copy-on-write filesystems such as APFS cannot be "
+    "overwritten in place: delete them without overwriting, or keep them.",
+)
+@click.pass_context
+def clean(
+    ctx: click.Context,
+    paths: Tuple[str, ...],
+    dry_run: bool,
+    yes: bool,
+    copy_on_write: str,
+) -> None:
+    """Securely wipe the files in PATHS; protected paths are never touched.
+
+    On copy-on-write filesystems, including APFS, the default on macOS,
+    overwriting cannot reach a file's old blocks; only full-disk
+    encryption such as FileVault protects them there.
+    """
+    from src.infrastructure.security.path_guard import PathGuard
+
+    guard = PathGuard.default()
+    allowed, denied = guard.partition(_walk_files(paths))
+    for path, reason in denied:
+        click.echo(f"skip {path}: {reason}", err=True)
+    if dry_run or not allowed:
+        for path in allowed:
+            click.echo(path)
+        click.echo(f"{len(allowed)} files would be wiped")
+        return
+    if not yes:
+        click.confirm(f"Securely wipe {len(allowed)} files?", abort=True)
+
+    from src.infrastructure.security.secure_wipe import SecureWiper
+
+    with SecureWiper(
+        guard=guard,
+        error_handler=_error_handler(ctx),
+        copy_on_write=copy_on_write,
+    ) as wiper:
+        report = wiper.wipe(allowed)
+    for result in report.results:
+        if result.status not in ("wiped", "deleted"):
+            click.echo(f"{result.status} {result.path}: {result.message}", err=True)
+    click.echo(
+        f"wiped {len(report.wiped)} files "
+        f"({format_bytes(report.bytes_overwritten)} overwritten)"
+    )
+    if report.deleted:
+        click.echo(
+            f"deleted {len(report.deleted)} files on copy-on-write filesystems "
+            "without overwriting; their old blocks are only protected by "
+            "full-disk encryption (FileVault)"
+        )
+    if report.ineffective:
+        click.echo(
+            f"kept {len(report.ineffective)} files on copy-on-write filesystems; "
+            "use --copy-on-write delete to remove them"
+        )
+    if report.failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Live terminal dashboard of memory, processes, disks and scan progress.
+
+Sampling and drawing are decoupled: background samplers publish
+snapshots at their own intervals, and the dashboard polls snapshot
+versions at most ``max_fps`` times per second. A frame is only drawn when
+some version changed, and only the panels whose version changed are
+rendered again; the others reuse their rendered lines.
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence
+
+from rich.console import (
+    Console,
+    ConsoleOptions,
+    Group,
+    RenderableType,
+    RenderResult,
+)
+from rich.layout import Layout
+from rich.live import Live
+from rich.panel import Panel
+from rich.progress_bar import ProgressBar
+from rich.segment import Segment
+from rich.table import Table
+from rich.text import Text
+
+from src.application.samplers import Snapshot, default_sources
+from src.presentation.cli import format_bytes
+
+Source = Any  # An object with a ``snapshot`` attribute and start()/stop().
+
+# Busiest processes listed in the CPU panel.
+CPU_PROCESSES = 5
+
+
+class DashboardPanel:
+    """One titled panel drawn from a source's latest snapshot.
+
+    The rendered lines are cached per snapshot version and size, so an
+    unchanged panel costs nothing to redraw.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        title: str,
+        source: Source,
+        render: Callable[[Any], RenderableType],
+        size: Optional[int] = None,
+    ) -> None:
+        """Initialize the panel.
+
+        Args:
+            name: Layout region name.
+            title: Panel title.
+            source: Provides the snapshot to draw.
+            render: Turns a snapshot value into a renderable.
+            size: Fixed height in rows; panels without one share the rest.
+        """
+        self.name = name
+        self.title = title
+        self.source = source
+        self.render = render
+        self.size = size
+        self.renders = 0
+        self._key: Optional[tuple] = None
+        self._lines: List[List[Segment]] = []
+
+    @property
+    def stale(self) -> bool:
+        """Return whether the source published since the last render."""
+        return self._key is None or self.source.snapshot.version != self._key[0]
+
+    def _body(self, snapshot: Snapshot) -> RenderableType:
+        """Return the panel contents for ``snapshot``."""
+        if snapshot.value is None and snapshot.error is None:
+            return Text("waiting for first sample", style="dim")
+        body = Text("") if snapshot.value is None else self.render(snapshot.value)
+        if snapshot.error is None:
+            return body
+        grid = Table.grid()
+        grid.add_row(body)
+        grid.add_row(Text(snapshot.error, style="red"))
+        return grid
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        """Yield the cached lines, rendering them first if stale."""
+        snapshot = self.source.snapshot
+        key = (snapshot.version, options.max_width, options.height)
+        if key != self._key:
+            panel = Panel(self._body(snapshot), title=self.title, title_align="left")
+            self._lines = console.render_lines(panel, options)
+            self._key = key
+            self.renders += 1
+        new_line = Segment.line()
+        for line in self._lines:
+            yield from line
+            yield new_line
+
+
+class Dashboard:
+    """Draw panels with ``rich.live`` at a capped frame rate."""
+
+    def __init__(
+        self,
+        panels: Sequence[DashboardPanel],
+        max_fps: float = 4.0,
+        console: Optional[Console] = None,
+    ) -> None:
+        """Initialize the dashboard.
+
+        Args:
+            panels: Panels from top to bottom.
+            max_fps: Most frames drawn per second.
+            console: Console to draw on.
+
+        Raises:
+            ValueError: If ``max_fps`` is not positive.
+        """
+        if max_fps <= 0:
+            raise ValueError("Frame rate must be positive")
+        self.panels = list(panels)
+        self.max_fps = max_fps
+        self.console = console or Console()
+        self.frames = 0
+        self._stop = threading.Event()
+        self.layout = Layout()
+        self.layout.split_column(
+            *(Layout(panel, name=panel.name, size=panel.size) for panel in self.panels)
+        )
+
+    def changed(self) -> bool:
+        """Return whether any panel has new data to draw."""
+        return any(panel.stale for panel in self.panels)
+
+    def stop(self) -> None:
+        """Make ``run`` return after the current frame."""
+        self._stop.set()
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """Start the sources and draw until stopped.
+
+        Args:
+            duration: Seconds to run for; runs until ``stop`` if omitted.
+        """
+        sources = {id(panel.source): panel.source for panel in self.panels}
+        for source in sources.values():
+            source.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        frame_interval = 1.0 / self.max_fps
+        try:
+            with Live(
+                self.layout,
+                console=self.console,
+                auto_refresh=False,
+                redirect_stdout=False,
+                redirect_stderr=False,
+            ) as live:
+                live.refresh()
+                self.frames += 1
+                while not self._stop.is_set():
+                    timeout = frame_interval
+                    if deadline is not None:
+                        timeout = min(timeout, deadline - time.monotonic())
+                        if timeout <= 0:
+                            break
+                    if self._stop.wait(timeout):
+                        break
+                    if self.changed():
+                        live.refresh()
+                        self.frames += 1
+        finally:
+            for source in sources.values():
+                source.stop(timeout=1.0)
+
+
+def render_memory(record: Any) -> RenderableType:
+    """Render a ``MemoryRecord``."""
+    grid = Table.grid(padding=(0, 1), expand=True)
+    grid.add_column(ratio=1)
+    grid.add_column(no_wrap=True)
+    grid.add_row(
+        ProgressBar(total=100, completed=record.used_percent),
+        f"{record.used_percent:5.1f}%",
+    )
+    grid.add_row(
+        f"used {format_bytes(record.used_bytes)} of "
+        f"{format_bytes(record.total_bytes)}, "
+        f"{format_bytes(record.available_bytes)} available"
+    )
+    return grid
+
+
+def render_cpu(sample: Any) -> RenderableType:
+    """Render a ``CpuSample`` with its busiest processes.
+
+    This panel changes on every sample, so it is drawn as plain text
+    lines, which render several times faster than a table.
+    """
+    cpu = sample.cpu
+    grid = Table.grid(padding=(0, 1), expand=True)
+    grid.add_column(ratio=1)
+    grid.add_column(no_wrap=True)
+    grid.add_row(
+        ProgressBar(total=100, completed=cpu.busy_percent),
+        f"{cpu.busy_percent:5.1f}% of {cpu.cpu_count} CPUs",
+    )
+    lines = [f"{'pid':>8} {'cpu%':>6} {'time':>8}  name"]
+    for record in sample.processes[:CPU_PROCESSES]:
+        lines.append(
+            f"{record.pid:>8} {record.cpu_percent:>6.1f} "
+            f"{record.cpu_seconds:>7.0f}s  {record.name}"
+        )
+    return Group(grid, Text("\n".join(lines), no_wrap=True, overflow="ellipsis"))
+
+
+def render_processes(records: Sequence[Any]) -> RenderableType:
+    """Render ``ProcessMemoryRecord`` values, largest first."""
+    table = Table(box=None, expand=True)
+    table.add_column("pid", justify="right")
+    table.add_column("rss", justify="right")
+    table.add_column("mem%", justify="right")
+    table.add_column("name", ratio=1, no_wrap=True)
+    for record in records:
+        table.add_row(
+            str(record.pid),
+            format_bytes(record.rss_bytes),
+            f"{record.memory_percent:.1f}",
+            record.name,
+        )
+    return table
+
+
+def render_disks(disks: Sequence[Any]) -> RenderableType:
+    """Render ``DiskInfo`` values."""
+    table = Table(box=None, expand=True)
+    table.add_column("path", ratio=1, no_wrap=True)
+    for column in ("total", "used", "free", "use%"):
+        table.add_column(column, justify="right")
+    for info in disks:
+        table.add_row(
+            info.path,
+            format_bytes(info.total_space),
+            format_bytes(info.used_space),
+            format_bytes(info.free_space),
+            f"{info.used_percentage:.1f}",
+        )
+    return table
+
+
+def render_scan(progress: Any) -> RenderableType:
+    """Render a ``ScanProgress``."""
+    state = "done" if progress.done else "scanning"
+    text = Text(f"{state} {progress.root}: ", style="bold" if progress.done else "")
+    text.append(
+        f"{format_bytes(progress.bytes)} in {progress.files:,} files, "
+        f"{progress.directories:,} directories"
+    )
+    if progress.errors:
+        text.append(f", {progress.errors:,} unreadable", style="yellow")
+    return text
+
+
+def default_dashboard(
+    scan_root: Optional[str] = None,
+    max_fps: float = 4.0,
+    top: int = 10,
+    console: Optional[Console] = None,
+) -> Dashboard:
+    """Build the standard dashboard over ``default_sources``."""
+    sources = default_sources(scan_root, top)
+    panels = [
+        DashboardPanel("memory", "Memory", sources["memory"], render_memory, size=4),
+        DashboardPanel(
+            "cpu",
+            "CPU",
+            sources["cpu"],
+            render_cpu,
+            size=min(top, CPU_PROCESSES) + 4,
+        ),
+        DashboardPanel(
+            "processes",
+            "Top processes",
+            sources["processes"],
+            render_processes,
+            size=top + 3,
+        ),
+        DashboardPanel("disks", "Disks", sources["disks"], render_disks),
+    ]
+    if "scan" in sources:
+        panels.append(
+            DashboardPanel("scan", "Scan", sources["scan"], render_scan, size=3)
+        )
+    return Dashboard(panels, max_fps=max_fps, console=console)
@@ -0,0 +1 @@
+"""Layer-neutral primitives usable from every layer."""
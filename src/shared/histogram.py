@@ -0,0 +1,106 @@
+"""Log-bucketed histograms with a fixed memory footprint."""
+
+import math
+
+SUB_BUCKETS = 32
+MIN_EXPONENT = -30
+MAX_EXPONENT = 50
+BUCKET_COUNT = (MAX_EXPONENT - MIN_EXPONENT) * SUB_BUCKETS + 1
+
+_EMPTY_BUCKETS = [0] * BUCKET_COUNT
+
+
+class LogHistogram:
+    """Fixed-size histogram with logarithmic buckets (HDR-style).
+
+    Each power of two is split into ``SUB_BUCKETS`` linear sub-buckets, so a
+    quantile is reported within about 3% of the true value over a range of
+    roughly 1e-9 to 1e15. Bucket 0 holds zero and negative values, and the
+    last bucket everything from its lower bound up to infinity. NaN is not
+    an observation and is ignored. All storage is allocated up front;
+    recording only updates existing slots.
+    """
+
+    __slots__ = ("buckets", "count", "total", "minimum", "maximum")
+
+    def __init__(self) -> None:
+        """Create an empty histogram."""
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    @staticmethod
+    def bucket_of(value: float) -> int:
+        """Return the bucket index for ``value``; NaN maps to bucket 0."""
+        if not value > 0:
+            return 0
+        if value == math.inf:
+            return BUCKET_COUNT - 1
+        mantissa, exponent = math.frexp(value)
+        if exponent <= MIN_EXPONENT:
+            return 1
+        if exponent > MAX_EXPONENT:
+            return BUCKET_COUNT - 1
+        return (
+            (exponent - MIN_EXPONENT - 1) * SUB_BUCKETS
+            + int((mantissa - 0.5) * 2 * SUB_BUCKETS)
+            + 1
+        )
+
+    @staticmethod
+    def bucket_value(index: int) -> float:
+        """Return the midpoint value represented by bucket ``index``."""
+        if index == 0:
+            return 0.0
+        exponent, sub = divmod(index - 1, SUB_BUCKETS)
+        return math.ldexp(
+            0.5 + (sub + 0.5) / (2 * SUB_BUCKETS), exponent + MIN_EXPONENT + 1
+        )
+
+    def record(self, value: float) -> None:
+        """Add one observation."""
+        if math.isnan(value):
+            return
+        self.buckets[self.bucket_of(value)] += 1
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add every observation of ``other`` to this histogram."""
+        if not other.count:
+            return
+        buckets = self.buckets
+        for index, count in enumerate(other.buckets):
+            if count:
+                buckets[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def reset(self) -> None:
+        """Forget every observation, keeping the bucket storage."""
+        self.buckets[:] = _EMPTY_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def quantile(self, fraction: float) -> float:
+        """Estimate the value below which ``fraction`` of observations fall."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                value = self.bucket_value(index)
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
@@ -0,0 +1,7 @@
+"""Platform facts about file paths."""
+
+import sys
+
+# macOS and Windows volumes are case-insensitive by default, so
+# "/usr/BIN" names the same file as "/usr/bin" there.
+CASE_INSENSITIVE = sys.platform in ("darwin", "win32")
@@ -0,0 +1,207 @@
+"""Lightweight spans for timing hot paths.
+
+Spans are off by default. While disabled, ``span`` returns a shared no-op
+context manager and ``timed`` wrappers make a single attribute check
+before calling through, so instrumented code costs next to nothing.
+Enabled spans record their duration into per-thread log histograms whose
+aggregates are available in-process through ``snapshot``.
+
+The module only depends on the standard library, so every layer,
+including the domain, may wrap its hot paths in spans.
+"""
+
+import functools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from src.shared.histogram import LogHistogram
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+@dataclass(frozen=True)
+class SpanSummary:
+    """Aggregate of every completed span with one name."""
+
+    name: str
+    count: int
+    errors: int
+    total_seconds: float
+    minimum: float
+    maximum: float
+    p50: float
+    p99: float
+
+    @property
+    def mean(self) -> float:
+        """Mean duration in seconds."""
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+class _SpanStats:
+    """Durations and failures of one span name in one thread."""
+
+    __slots__ = ("histogram", "errors")
+
+    def __init__(self) -> None:
+        """Create empty statistics."""
+        self.histogram = LogHistogram()
+        self.errors = 0
+
+
+class _Shard:
+    """Per-thread span storage guarded by an uncontended lock."""
+
+    __slots__ = ("lock", "spans")
+
+    def __init__(self) -> None:
+        """Create an empty shard."""
+        self.lock = threading.Lock()
+        self.spans: Dict[str, _SpanStats] = {}
+
+
+class _NoopSpan:
+    """Span returned while instrumentation is disabled."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        """Do nothing."""
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Do nothing."""
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _Span:
+    """Times the block it guards and records it on exit."""
+
+    __slots__ = ("_owner", "_name", "_start")
+
+    def __init__(self, owner: "Instrumentation", name: str) -> None:
+        """Prepare span ``name`` of ``owner``."""
+        self._owner = owner
+        self._name = name
+
+    def __enter__(self) -> "_Span":
+        """Start timing."""
+        self._start = self._owner.clock()
+        return self
+
+    def __exit__(self, exc_type: Optional[type], *exc_info: object) -> None:
+        """Record the duration, and a failure if the block raised."""
+        owner = self._owner
+        owner.record(self._name, owner.clock() - self._start, exc_type is not None)
+
+
+class Instrumentation:
+    """Registry of span timings."""
+
+    def __init__(
+        self, enabled: bool = False, clock: Callable[[], float] = time.perf_counter
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            enabled: Whether spans are recorded.
+            clock: Monotonic clock in seconds.
+        """
+        self.enabled = enabled
+        self.clock = clock
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._shards_lock = threading.Lock()
+
+    def span(self, name: str) -> Any:
+        """Return a context manager timing the block as span ``name``."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, name)
+
+    def timed(self, name: Optional[str] = None) -> Callable[[_F], _F]:
+        """Decorate a function so that each call is a span.
+
+        Args:
+            name: Span name; defaults to the function's qualified name.
+        """
+
+        def decorate(function: _F) -> _F:
+            span_name = name or function.__qualname__
+
+            @functools.wraps(function)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                with _Span(self, span_name):
+                    return function(*args, **kwargs)
+
+            return wrapper  # type: ignore[return-value]
+
+        return decorate
+
+    def _shard(self) -> _Shard:
+        """Return the calling thread's shard, registering it on first use."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard()
+            self._local.shard = shard
+            with self._shards_lock:
+                self._shards.append(shard)
+        return shard
+
+    def record(self, name: str, seconds: float, failed: bool = False) -> None:
+        """Record one completed span."""
+        shard = self._shard()
+        with shard.lock:
+            stats = shard.spans.get(name)
+            if stats is None:
+                stats = shard.spans[name] = _SpanStats()
+            stats.histogram.record(seconds)
+            if failed:
+                stats.errors += 1
+
+    def snapshot(self) -> Dict[str, SpanSummary]:
+        """Return the aggregate of each span name since the last reset."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        merged: Dict[str, _SpanStats] = {}
+        for shard in shards:
+            with shard.lock:
+                for name, stats in shard.spans.items():
+                    target = merged.get(name)
+                    if target is None:
+                        target = merged[name] = _SpanStats()
+                    target.histogram.merge(stats.histogram)
+                    target.errors += stats.errors
+        return {
+            name: SpanSummary(
+                name=name,
+                count=stats.histogram.count,
+                errors=stats.errors,
+                total_seconds=stats.histogram.total,
+                minimum=stats.histogram.minimum,
+                maximum=stats.histogram.maximum,
+                p50=stats.histogram.quantile(0.5),
+                p99=stats.histogram.quantile(0.99),
+            )
+            for name, stats in sorted(merged.items())
+        }
+
+    def reset(self) -> None:
+        """Discard every recorded span."""
+        with self._shards_lock:
+            shards = list(self._shards)
+        for shard in shards:
+            with shard.lock:
+                shard.spans = {}
+
+
+INSTRUMENTATION = Instrumentation()
+
+span = INSTRUMENTATION.span
+timed = INSTRUMENTATION.timed
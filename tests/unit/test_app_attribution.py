@@ -0,0 +1,174 @@
+"""Tests for per-application disk attribution."""
+
+import json
+
+import pytest
+
+from src.domain.services.app_attribution import (
+    RULES_ENV,
+    AppAttributor,
+    AttributionRule,
+)
+from src.domain.services.disk_analyzer import DiskAnalyzer
+
+
+def _write(root, relative, size):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+def _home(root):
+    """Create a home directory with a few applications' files."""
+    _write(root, "Library/Caches/com.spotify.client/data/a", 100)
+    _write(root, "Library/Caches/com.spotify.client/b", 10)
+    _write(root, "Library/Application Support/Spotify/c", 5)
+    _write(root, "Library/Application Support/Google/Chrome/d", 7)
+    _write(root, "Library/Application Support/Google/e", 3)
+    _write(root, "Library/Preferences/com.spotify.client.plist", 1)
+    _write(root, "Library/Preferences/notes", 2)
+    _write(root, "dev/project/node_modules/pkg/f", 50)
+    _write(root, "loose", 4)
+
+
+def test_rules_compile_to_exact_and_wildcard_lookups(tmp_path):
+    """Exact paths beat wildcards; earlier rules beat later ones."""
+    attributor = AppAttributor(
+        [
+            AttributionRule("~/cache/*.tmp", "temp"),
+            AttributionRule("~/cache/*"),
+            AttributionRule("~/cache/big.tmp", "big"),
+            AttributionRule("/opt/*.app", "{stem}"),
+        ],
+        aliases={"dl": "Downloader"},
+        home=str(tmp_path),
+    )
+    cache = str(tmp_path / "cache")
+    assert len(attributor.watched) == 2
+    assert attributor.watches(cache) and attributor.watches("/opt")
+    assert not attributor.watches(str(tmp_path))
+    assert attributor.match(cache, "x.tmp") == "temp"
+    assert attributor.match(cache, "big.tmp") == "big"
+    assert attributor.match(cache, "dl") == "Downloader"
+    assert attributor.match("/opt", "Tool.app") == "Tool"
+    assert attributor.match("/opt", "readme") is None
+    assert attributor.match(str(tmp_path), "cache") is None
+    assert attributor.match_path("/opt/Tool.app/") == "Tool"
+    assert attributor.match_path("/") is None
+
+    for bad in ("relative/path", "~/*/nested"):
+        with pytest.raises(ValueError):
+            AppAttributor([AttributionRule(bad)], home=str(tmp_path))
+    with pytest.raises(ValueError):
+        AppAttributor([AttributionRule("/x", "{version}")])
+
+
+def test_scan_totals_bytes_per_application(tmp_path):
+    """Nested rules split a tree; unmatched bytes belong to no application."""
+    _home(tmp_path)
+    attributor = AppAttributor.default(
+        [AttributionRule("~/dev/project/node_modules", "npm")], home=str(tmp_path)
+    )
+    index = DiskAnalyzer(attributor=attributor).scan_directory(str(tmp_path))
+    assert index.total_bytes == 182
+    assert index.app_sizes() == {
+        "Spotify": 116,
+        "Google": 3,
+        "Google Chrome": 7,
+        "npm": 50,
+    }
+    assert index.app_sizes(str(tmp_path / "Library" / "Caches")) == {"Spotify": 110}
+    assert DiskAnalyzer().scan_directory(str(tmp_path)).app_sizes() == {}
+
+    claimed = DiskAnalyzer(attributor=attributor).scan_directory(
+        str(tmp_path / "Library" / "Caches" / "com.spotify.client")
+    )
+    assert claimed.app_sizes() == {"Spotify": 110}
+
+
+def test_rescan_updates_sizes_incrementally(tmp_path):
+    """Rescanning subtrees gives the same totals as a full scan."""
+    _home(tmp_path)
+    attributor = AppAttributor.default(home=str(tmp_path))
+    analyzer = DiskAnalyzer(attributor=attributor)
+    before = analyzer.scan_directory(str(tmp_path))
+
+    _write(tmp_path, "Library/Caches/com.spotify.client/data/new", 1000)
+    _write(tmp_path, "Library/Application Support/Google/Chrome/g", 70)
+    _write(tmp_path, "Library/Application Support/Google/Drive/h", 9)
+    (tmp_path / "loose").unlink()
+    after = analyzer.rescan(
+        before, str(tmp_path / "Library" / "Caches" / "com.spotify.client" / "data")
+    )
+    after = analyzer.rescan(
+        after, str(tmp_path / "Library" / "Application Support" / "Google")
+    )
+    after = analyzer.rescan(after, str(tmp_path))
+    full = analyzer.scan_directory(str(tmp_path))
+
+    assert after.dir_sizes == full.dir_sizes
+    assert after.total_bytes == full.total_bytes == 1257
+    assert after.app_claims == full.app_claims
+    assert after.claim_bytes == full.claim_bytes
+    assert after.app_sizes()["Spotify"] == 1116
+    assert before.app_sizes()["Spotify"] == 116
+
+    with pytest.raises(ValueError):
+        analyzer.rescan(full, str(tmp_path / "loose"))
+
+
+def test_rules_file_extends_defaults(tmp_path, monkeypatch):
+    """A JSON rules file adds rules and aliases on top of the defaults."""
+    rules = tmp_path / "rules.json"
+    rules.write_text(
+        json.dumps(
+            {
+                "rules": [{"path": "~/dev/node_modules", "app": "npm"}],
+                "aliases": {"com.example.tool": "Tool"},
+            }
+        )
+    )
+    attributor = AppAttributor.from_file(str(rules), home=str(tmp_path))
+    assert attributor.match(str(tmp_path / "dev"), "node_modules") == "npm"
+    caches = str(tmp_path / "Library" / "Caches")
+    assert attributor.match(caches, "com.example.tool") == "Tool"
+    assert attributor.match(caches, "com.apple.Safari") == "Safari"
+
+    rules.write_text(json.dumps({"rules": [{"app": "no path"}]}))
+    with pytest.raises(ValueError):
+        AppAttributor.from_file(str(rules))
+
+    rules.write_text(json.dumps({"aliases": [1, 2]}))
+    with pytest.raises(ValueError):
+        AppAttributor.from_file(str(rules))
+
+    monkeypatch.setenv(RULES_ENV, str(tmp_path / "missing.json"))
+    with pytest.raises(ValueError, match="Cannot read"):
+        AppAttributor.from_environment()
+    with pytest.raises(ValueError, match="Cannot read"):
+        AppAttributor.from_file(str(tmp_path))
+    monkeypatch.delenv(RULES_ENV)
+    assert AppAttributor.from_environment().match("/Applications", "Xcode.app") == (
+        "Xcode"
+    )
+
+
+def test_rules_match_regardless_of_case_on_case_insensitive_volumes(tmp_path):
+    """Paths spelled with another case match where the volume ignores case."""
+    _write(tmp_path, "library/caches/COM.SPOTIFY.CLIENT/a", 100)
+    _write(tmp_path, "Library/Preferences/Notes.PLIST", 2)
+    attributor = AppAttributor.default(home=str(tmp_path), case_insensitive=True)
+    caches = str(tmp_path / "LIBRARY" / "CACHES")
+    assert attributor.watches(caches)
+    assert attributor.match(caches, "Com.Spotify.Client") == "Spotify"
+    assert attributor.match("/APPLICATIONS", "Xcode.APP") == "Xcode"
+
+    index = DiskAnalyzer(attributor=attributor).scan_directory(str(tmp_path))
+    assert index.app_sizes() == {"Spotify": 100, "Notes": 2}
+
+    strict = AppAttributor.default(home=str(tmp_path), case_insensitive=False)
+    assert not strict.watches(caches)
+    assert strict.match("/Applications", "Xcode.APP") is None
+    assert (
+        DiskAnalyzer(attributor=strict).scan_directory(str(tmp_path)).app_sizes() == {}
+    )
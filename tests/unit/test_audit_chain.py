@@ -0,0 +1,222 @@
+"""Tests for tamper-evident audit checkpoints."""
+
+import json
+import logging
+
+from src.infrastructure.logging.audit_chain import (
+    GENESIS,
+    AuditChainVerifier,
+    MerkleCheckpointer,
+    leaf_hash,
+    load_checkpoints,
+    merkle_root,
+)
+from src.infrastructure.logging.audit_event import AuditEvent
+from src.infrastructure.logging.audit_logging_system import AuditLoggingSystem
+from src.infrastructure.logging.jsonl_segments import JsonLinesSegmentHandler
+
+
+def _record(timestamp: float, index: int) -> logging.LogRecord:
+    """Build an audit record at a fixed time."""
+    event = AuditEvent("delete", "deleted {path}", {"path": f"/tmp/{index}"})
+    record = logging.LogRecord("audit", logging.INFO, "", 0, event, (), None)
+    record.created = timestamp
+    return record
+
+
+def _write(tmp_path, count: int, **options) -> JsonLinesSegmentHandler:
+    """Write ``count`` checkpointed records and close the handler."""
+    handler = JsonLinesSegmentHandler(str(tmp_path), checkpoint_every=10, **options)
+    records = [_record(1000.0 + index, index) for index in range(count)]
+    for start in range(0, count, 7):
+        handler.emit_batch(records[start : start + 7])
+    handler.close()
+    return handler
+
+
+def test_merkle_root():
+    """Test Merkle roots depend on every leaf and on leaf order."""
+    leaves = [leaf_hash(bytes([i])) for i in range(5)]
+    assert merkle_root(leaves) == merkle_root(list(leaves))
+    assert merkle_root(leaves) != merkle_root(leaves[::-1])
+    assert merkle_root(leaves[:1]) == leaves[0]
+    assert len(merkle_root([])) == 32
+
+
+def test_checkpointer_chains_seals():
+    """Test consecutive checkpoints link to each other."""
+    checkpointer = MerkleCheckpointer(every=2)
+    checkpointer.add(b"a\n", 1.0)
+    assert not checkpointer.due()
+    checkpointer.add(b"b\n", 2.0)
+    assert checkpointer.due()
+    first = checkpointer.seal(1, 4)
+    checkpointer.add(b"c\n", 3.0)
+    second = checkpointer.seal(1, 6)
+    assert first.previous == GENESIS
+    assert second.previous == first.chain
+    assert second.start_offset == 4
+    assert second.expected_chain() == second.chain
+    assert checkpointer.seal(1, 6) is None
+
+
+def test_untampered_log_verifies(tmp_path):
+    """Test an intact log verifies, including across rotated segments."""
+    handler = _write(tmp_path, 95, max_bytes=2000)
+    assert len(handler.segment_sequences()) > 1
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert report.ok, report.failures
+    assert report.records_verified == 95
+    assert report.unsealed_bytes == 0
+    assert report.head != GENESIS
+
+
+def test_modified_record_is_detected(tmp_path):
+    """Test altering a record breaks its checkpoint."""
+    _write(tmp_path, 40)
+    segment = tmp_path / "audit-000001.jsonl"
+    segment.write_bytes(segment.read_bytes().replace(b"/tmp/17", b"/tmp/71"))
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert not report.ok
+    assert len(report.failures) == 1
+
+
+def test_modified_checkpoint_is_detected(tmp_path):
+    """Test rewriting a checkpoint's root breaks the chain."""
+    _write(tmp_path, 40)
+    path = tmp_path / "audit-000001.chk"
+    lines = path.read_text().splitlines()
+    checkpoint = json.loads(lines[1])
+    checkpoint["count"] = 9
+    lines[1] = json.dumps(checkpoint)
+    path.write_text("\n".join(lines) + "\n")
+    assert not AuditChainVerifier(str(tmp_path)).verify().ok
+
+
+def test_removed_checkpoints_are_detected(tmp_path):
+    """Test deleting or truncating checkpoints does not pass as unsealed data."""
+    _write(tmp_path, 25)
+    path = tmp_path / "audit-000001.chk"
+    lines = path.read_bytes().splitlines(keepends=True)
+    assert len(lines) == 3
+
+    path.write_bytes(b"".join(lines[:-1]))
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert not report.ok and report.unsealed_bytes > 0
+    assert "checkpoints are missing" in report.failures[0]
+
+    path.unlink()
+    assert not AuditChainVerifier(str(tmp_path)).verify().ok
+
+    # Without the head file, a full batch of unsealed records still fails
+    # once the checkpoint interval is known.
+    (tmp_path / "audit.head").unlink()
+    assert AuditChainVerifier(str(tmp_path)).verify().ok
+    report = AuditChainVerifier(str(tmp_path), checkpoint_every=10).verify()
+    assert report.failures == [
+        "segment 1: 25 records after offset 0 are unsealed",
+    ]
+
+
+def test_removed_checkpoints_in_rotated_segment_are_detected(tmp_path):
+    """Test a closed segment must be sealed to its end."""
+    _write(tmp_path, 40, max_bytes=2000)
+    (tmp_path / "audit-000001.chk").unlink()
+    (tmp_path / "audit.head").unlink()
+    report = AuditChainVerifier(str(tmp_path), checkpoint_every=10).verify()
+    assert report.failures == [
+        "segment 1: records after offset 0 are unsealed",
+        "segment 2: checkpoint chain broken at offset 0",
+    ]
+
+
+def test_reopened_handler_does_not_reseal_removed_checkpoints(tmp_path):
+    """Test a restart after checkpoints were deleted keeps the gap visible."""
+    _write(tmp_path, 25)
+    (tmp_path / "audit-000001.chk").unlink()
+    _write(tmp_path, 5)
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert report.failures == ["segment 1: checkpoint chain broken at offset 0"]
+
+
+def test_deleted_oldest_segments_are_detected(tmp_path):
+    """Test removing whole segments from the front of the log fails."""
+    handler = _write(tmp_path, 95, max_bytes=2000, max_segments=2)
+    sequences = handler.segment_sequences()
+    assert sequences[0] > 1
+    (tmp_path / "audit-foo.jsonl").write_text("not a segment\n")
+    assert AuditChainVerifier(str(tmp_path)).verify().ok
+
+    for suffix in (".jsonl", ".idx", ".chk"):
+        (tmp_path / f"audit-{sequences[0]:06d}{suffix}").unlink()
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert report.failures == [
+        f"segments are missing: the oldest kept segment is {sequences[0]}, "
+        f"but the oldest present is {sequences[1]}"
+    ]
+
+    # A restarted writer keeps the recorded oldest segment.
+    _write(tmp_path, 1, max_bytes=2000, max_segments=2)
+    assert not AuditChainVerifier(str(tmp_path)).verify().ok
+
+
+def test_missing_first_segment_without_head_is_detected(tmp_path):
+    """Test a log without its head must still start at the first segment."""
+    _write(tmp_path, 60, max_bytes=1500)
+    (tmp_path / "audit.head").unlink()
+    assert AuditChainVerifier(str(tmp_path)).verify().ok
+    (tmp_path / "audit-000001.jsonl").unlink()
+    (tmp_path / "audit-000001.chk").unlink()
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert report.failures == [
+        "segments are missing: the oldest kept segment is 1, "
+        "but the oldest present is 2"
+    ]
+
+
+def test_range_verification_rehashes_only_overlapping(tmp_path):
+    """Test a time-range check only rehashes the matching checkpoints."""
+    _write(tmp_path, 100)
+    report = AuditChainVerifier(str(tmp_path)).verify(start=1025.0, end=1034.0)
+    assert report.ok
+    assert report.checkpoints_verified == 2
+    assert report.records_verified == 20
+
+
+def test_parallel_process_verification(tmp_path):
+    """Test verification with a process pool."""
+    _write(tmp_path, 60, max_bytes=1500)
+    report = AuditChainVerifier(str(tmp_path)).verify(max_workers=2, use_processes=True)
+    assert report.ok
+    assert report.records_verified == 60
+
+
+def test_reopened_handler_continues_chain(tmp_path):
+    """Test unsealed records are sealed after a restart, keeping the chain."""
+    handler = JsonLinesSegmentHandler(str(tmp_path), checkpoint_every=10)
+    handler.emit_batch([_record(1000.0 + i, i) for i in range(15)])
+    handler._close_files()  # simulate a crash before the tail is sealed
+    assert AuditChainVerifier(str(tmp_path)).verify().unsealed_bytes > 0
+
+    reopened = JsonLinesSegmentHandler(str(tmp_path), checkpoint_every=10)
+    reopened.emit_batch([_record(2000.0, 99)])
+    reopened.close()
+    checkpoints = load_checkpoints(reopened.checkpoint_path(1))
+    assert [c.count for c in checkpoints] == [10, 6]
+    report = AuditChainVerifier(str(tmp_path)).verify()
+    assert report.ok
+    assert report.unsealed_bytes == 0
+
+
+def test_audit_system_verify_integrity(tmp_path):
+    """Test the audit system exposes integrity verification."""
+    with AuditLoggingSystem(
+        log_dir=str(tmp_path), logger_name="audit.test.chain", checkpoint_every=4
+    ) as audit:
+        for index in range(10):
+            audit.log_operation("delete", "success", {"path": f"/tmp/{index}"})
+        report = audit.verify_integrity()
+        assert report.ok
+        assert report.records_verified == 8
+        assert report.unsealed_bytes > 0
+    assert AuditChainVerifier(str(tmp_path)).verify().records_verified == 10
@@ -0,0 +1,223 @@
+"""Tests for the audit logging system."""
+
+import gc
+import io
+import logging
+import queue
+import time
+import weakref
+from typing import List
+
+import pytest
+
+from src.infrastructure.logging import audit_logging_system
+from src.infrastructure.logging.audit_logging_system import AuditLoggingSystem
+from src.infrastructure.logging.audit_pipeline import (
+    _STOP,
+    OVERFLOW_DROP_NEWEST,
+    OVERFLOW_DROP_OLDEST,
+    AuditQueueHandler,
+    BatchingQueueListener,
+    BatchStreamHandler,
+)
+
+
+class CollectingHandler(logging.Handler):
+    """Handler that records every batch it receives."""
+
+    def __init__(self) -> None:
+        """Initialize with no batches."""
+        super().__init__()
+        self.batches: List[List[logging.LogRecord]] = []
+
+    def emit_batch(self, records):
+        """Record a batch."""
+        self.batches.append(list(records))
+
+    def emit(self, record):
+        """Record a single record as its own batch."""
+        self.batches.append([record])
+
+
+def _record(message: str) -> logging.LogRecord:
+    """Build a bare log record."""
+    return logging.LogRecord("audit", logging.INFO, __file__, 1, message, None, None)
+
+
+def test_events_are_written_in_batches():
+    """Test events reach the handler in batches after a flush."""
+    handler = CollectingHandler()
+    with AuditLoggingSystem(
+        handlers=[handler], logger_name="audit.test.batches", flush_interval=60
+    ) as audit:
+        for index in range(10):
+            audit.log_system_event(f"event {index}")
+        assert audit.flush(timeout=5)
+        assert len(handler.batches) == 1
+        assert [r.getMessage() for r in handler.batches[0]][
+            0
+        ] == "System Event: event 0"
+
+
+def test_batch_size_threshold():
+    """Test the writer emits a batch once it reaches batch_size."""
+    record_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+    handler = CollectingHandler()
+    listener = BatchingQueueListener(record_queue, [handler], batch_size=4)
+    for index in range(10):
+        record_queue.put(_record(str(index)))
+    listener.start()
+    listener.stop()
+    assert [len(batch) for batch in handler.batches] == [4, 4, 2]
+
+
+def test_time_threshold_flushes_partial_batch():
+    """Test a partial batch is written after the flush interval."""
+    handler = CollectingHandler()
+    audit = AuditLoggingSystem(
+        handlers=[handler], logger_name="audit.test.timer", flush_interval=0.01
+    )
+    audit.log_user_action("alice", "clean")
+    for _ in range(500):
+        if handler.batches:
+            break
+        time.sleep(0.01)
+    audit.shutdown()
+    assert handler.batches[0][0].getMessage() == "User Action: alice - clean"
+
+
+def test_shutdown_flushes_pending_events():
+    """Test shutdown writes every queued event."""
+    handler = CollectingHandler()
+    audit = AuditLoggingSystem(
+        handlers=[handler], logger_name="audit.test.shutdown", flush_interval=60
+    )
+    for index in range(100):
+        audit.log_security_event(f"event {index}", "low")
+    audit.shutdown()
+    assert sum(len(batch) for batch in handler.batches) == 100
+    assert audit.dropped_events == 0
+
+
+def test_drop_newest_policy():
+    """Test drop_newest discards the incoming record when full."""
+    record_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+    handler = AuditQueueHandler(record_queue, 2, OVERFLOW_DROP_NEWEST)
+    for index in range(4):
+        handler.handle(_record(str(index)))
+    assert handler.dropped == 2
+    assert [record_queue.get().msg for _ in range(2)] == ["0", "1"]
+
+
+def test_drop_oldest_policy():
+    """Test drop_oldest evicts queued records to make room."""
+    record_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+    handler = AuditQueueHandler(record_queue, 2, OVERFLOW_DROP_OLDEST)
+    for index in range(4):
+        handler.handle(_record(str(index)))
+    assert handler.dropped == 2
+    assert [record_queue.get().msg for _ in range(2)] == ["2", "3"]
+
+
+def test_block_policy_times_out():
+    """Test the block policy drops after its timeout."""
+    record_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+    handler = AuditQueueHandler(record_queue, 1, block_timeout=0.01)
+    handler.handle(_record("0"))
+    handler.handle(_record("1"))
+    assert handler.dropped == 1
+
+
+def test_drop_oldest_keeps_control_markers():
+    """Test drop_oldest never discards a queued flush request."""
+    record_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+    marker = object()
+    record_queue.put(marker)
+    handler = AuditQueueHandler(record_queue, 1, OVERFLOW_DROP_OLDEST)
+    handler.handle(_record("0"))
+    assert handler.dropped == 0
+    assert record_queue.get() is marker
+
+
+def test_drop_oldest_keeps_the_stop_marker_ahead_of_records():
+    """Test a dequeued stop marker is not requeued behind new records."""
+    record_queue: "queue.SimpleQueue[object]" = queue.SimpleQueue()
+    record_queue.put(_STOP)
+    record_queue.put(_record("late"))
+    flush = object()
+    record_queue.put(flush)
+    handler = AuditQueueHandler(record_queue, 1, OVERFLOW_DROP_OLDEST)
+    handler.handle(_record("later"))
+    assert handler.dropped == 2
+    assert record_queue.get() is _STOP
+    assert record_queue.get() is flush
+    assert record_queue.empty()
+
+
+def test_operation_details_are_snapshotted():
+    """Test changing ``details`` after logging does not change the event."""
+    collector = CollectingHandler()
+    system = AuditLoggingSystem(handlers=[collector])
+    details = {"files": 1}
+    system.log_operation("clean", "done", details)
+    details["files"] = 2
+    system.shutdown()
+    (record,) = [record for batch in collector.batches for record in batch]
+    assert record.msg.fields["details"] == {"files": 1}
+
+
+def test_unknown_policy_rejected():
+    """Test invalid overflow policies are rejected."""
+    with pytest.raises(ValueError):
+        AuditQueueHandler(queue.SimpleQueue(), 1, "explode")
+
+
+def test_batch_stream_handler_and_plain_handler():
+    """Test batch stream output and fallback for handlers without emit_batch."""
+    stream = io.StringIO()
+    plain_stream = io.StringIO()
+    with AuditLoggingSystem(
+        handlers=[BatchStreamHandler(stream), logging.StreamHandler(plain_stream)],
+        logger_name="audit.test.stream",
+    ) as audit:
+        audit.log_error(ValueError("boom"))
+        audit.log_system_event("started")
+    assert stream.getvalue() == "Error: boom\nSystem Event: started\n"
+    assert plain_stream.getvalue() == stream.getvalue()
+
+
+def test_instances_do_not_share_loggers():
+    """Test two systems with the same logger name keep their events apart."""
+    first, second = CollectingHandler(), CollectingHandler()
+    audit_a = AuditLoggingSystem(handlers=[first])
+    audit_b = AuditLoggingSystem(handlers=[second])
+    assert audit_a.logger is not audit_b.logger
+    assert audit_a.logger is not logging.getLogger("audit")
+    audit_a.log_system_event("only in a")
+    audit_a.shutdown()
+    audit_b.shutdown()
+    assert [r.getMessage() for b in first.batches for r in b] == [
+        "System Event: only in a"
+    ]
+    assert second.batches == []
+
+    audit_a.logger.setLevel(logging.ERROR)
+    assert not audit_a.logger.isEnabledFor(logging.INFO)
+    audit_a.logger.setLevel(logging.INFO)
+    assert audit_a.logger.isEnabledFor(logging.INFO)
+
+
+def test_shut_down_systems_are_not_kept_alive():
+    """Test only running systems are shut down at exit."""
+    audit = AuditLoggingSystem(handlers=[])
+    assert audit in audit_logging_system._RUNNING
+    audit.shutdown()
+    assert audit not in audit_logging_system._RUNNING
+    reference = weakref.ref(audit)
+    del audit
+    gc.collect()
+    assert reference() is None
+
+    running = AuditLoggingSystem(handlers=[CollectingHandler()])
+    audit_logging_system._shutdown_running()
+    assert running.listener._thread is None
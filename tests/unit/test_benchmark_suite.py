@@ -0,0 +1,89 @@
+"""Tests for the benchmark regression gate and its fixtures."""
+
+import json
+import os
+
+import psutil
+
+from benchmarks import suite
+from benchmarks.fixtures import TreeSpec, build_tree, mock_process_table
+
+
+def test_compare_flags_regressions_in_either_direction():
+    """Throughput must not drop and other metrics must not grow."""
+    baseline = {"scan": {"entries_per_s": 1000.0, "latency_ms_p50": 10.0}}
+    assert (
+        suite.compare(
+            {"scan": {"entries_per_s": 850.0, "latency_ms_p50": 11.9}}, baseline, 0.2
+        )
+        == []
+    )
+    regressions = suite.compare(
+        {"scan": {"entries_per_s": 700.0, "latency_ms_p50": 13.0}}, baseline, 0.2
+    )
+    assert regressions == [
+        "scan.entries_per_s: 700.00 vs baseline 1,000.00 (+30% worse)",
+        "scan.latency_ms_p50: 13.00 vs baseline 10.00 (+30% worse)",
+    ]
+
+
+def test_compare_reports_metrics_missing_from_baseline():
+    """New cases or metrics cannot pass unchecked; zero references are skipped."""
+    baseline = {"scan": {"entries_per_s": 1000.0, "idle_ms": 0.0}}
+    assert suite.compare(
+        {"scan": {"entries_per_s": 1000.0, "idle_ms": 5.0, "peak_rss_mb": 50.0}},
+        baseline,
+        0.2,
+    ) == ["scan.peak_rss_mb: not in the baseline"]
+    assert suite.compare({"other": {"x": 1.0}}, baseline, 0.2) == [
+        "other.x: not in the baseline"
+    ]
+
+
+def test_main_fails_without_baseline_and_gates_on_it(tmp_path, monkeypatch, capsys):
+    """The gate fails loudly with no baseline, then compares against one."""
+    results = {"entries_per_s": 1000.0}
+    monkeypatch.setattr(suite, "run_case", lambda name, quick: dict(results))
+    baseline = str(tmp_path / "baseline.json")
+    argv = ["--baseline", baseline, "disk_scan"]
+
+    assert suite.main(argv) == 1
+    assert "No baseline" in capsys.readouterr().err
+
+    assert suite.main([*argv, "--update-baseline"]) == 0
+    with open(baseline) as handle:
+        assert json.load(handle)["cases"] == {"disk_scan": results}
+    assert suite.main(argv) == 0
+    assert suite.main([*argv, "--quick"]) == 1
+
+    results["entries_per_s"] = 500.0
+    assert suite.main(argv) == 1
+    assert "REGRESSION disk_scan.entries_per_s" in capsys.readouterr().out
+
+
+def test_build_tree_is_deterministic(tmp_path):
+    """The same spec always yields the same tree."""
+    spec = TreeSpec(depth=2, fanout=2, files_per_dir=3, hardlink_ratio=0.3)
+    first = build_tree(str(tmp_path / "a"), spec)
+    second = build_tree(str(tmp_path / "b"), spec)
+    assert first.directories == 1 + 2 + 4
+    assert first.files == 7 * 3
+    assert first.hardlinks > 0
+    assert (first.bytes_written, first.hardlinks) == (
+        second.bytes_written,
+        second.hardlinks,
+    )
+    total = sum(os.path.getsize(path) for path in first.paths)
+    assert total == first.bytes_written
+
+
+def test_mock_process_table_replaces_process_iter():
+    """Fake processes are reproducible and answer the analyzers' calls."""
+    with mock_process_table(5) as processes:
+        listed = list(psutil.process_iter())
+        assert listed == processes
+        assert [p.pid for p in psutil.process_iter()] == [1, 2, 3, 4, 5]
+    with mock_process_table(5) as again:
+        assert [p.memory_info() for p in again] == [p.memory_info() for p in processes]
+    assert processes[0].name() == "proc-1"
+    assert 0 < processes[0].memory_percent() < 100
@@ -0,0 +1,288 @@
+"""Tests for the command line interface."""
+
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+from click.testing import CliRunner
+
+from src.application.query_service import QueryService
+from src.infrastructure.ipc.server import DaemonServer
+from src.presentation.cli import format_bytes, main
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+# Cumulative import time allowed for the CLI module, in microseconds.
+IMPORT_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("pydantic", "cryptography", "rich", "coverage", "psutil")
+
+_RUN_CLI = "from src.presentation.cli import main; main()"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _import_times(*args):
+    """Run the CLI under ``-X importtime`` and return ``{module: cumulative}``."""
+    env = {
+        key: value for key, value in os.environ.items() if not key.startswith("COV_")
+    }
+    env["PYTHONPATH"] = REPO_ROOT
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUN_CLI, *args],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+@pytest.mark.parametrize("args", [("--help",), ("disk", "."), ("scan", "src")])
+def test_startup_avoids_heavy_imports(args):
+    """Help and simple queries import neither heavy dependencies nor models."""
+    times = _import_times(*args)
+    assert "src.presentation.cli" in times
+    loaded = {name.split(".")[0] for name in times}
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_import_time_budget():
+    """Importing the CLI stays within its import-time budget."""
+    cumulative = _import_times("--help")["src.presentation.cli"]
+    assert cumulative < IMPORT_BUDGET_US, f"CLI import took {cumulative} us"
+
+
+def test_format_bytes():
+    """Byte counts use binary units."""
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(1536) == "1.5 KB"
+    assert format_bytes(3 * 1024**3) == "3.0 GB"
+    assert format_bytes(2 * 1024**6) == "2048.0 PB"
+
+
+def test_disk_and_scan(tmp_path):
+    """Disk and scan commands report sizes."""
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "file").write_bytes(b"x" * 2048)
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["--no-daemon", "disk", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert str(tmp_path) in result.output
+
+    result = runner.invoke(main, ["--no-daemon", "scan", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "2.0 KB below" in result.output
+    assert "scan of 1 files" in result.output
+    assert str(tmp_path / "sub") in result.output
+
+    result = runner.invoke(main, ["--no-daemon", "scan", "--diff", str(tmp_path)])
+    assert "recorded a baseline" in result.output
+
+    rules = tmp_path / "rules.json"
+    rules.write_text(
+        json.dumps({"rules": [{"path": str(tmp_path / "sub"), "app": "Sub"}]})
+    )
+    result = runner.invoke(
+        main,
+        ["--no-daemon", "scan", "--apps", "--rescan", str(tmp_path)],
+        env={"MAC_CLEANER_APP_RULES": str(rules)},
+    )
+    assert result.exit_code == 0, result.output
+    assert "2.0 KB  Sub" in result.output
+
+    result = runner.invoke(
+        main,
+        ["--no-daemon", "scan", str(tmp_path)],
+        env={"MAC_CLEANER_APP_RULES": str(tmp_path / "missing.json")},
+    )
+    assert result.exit_code == 1
+    assert "Cannot read attribution rules" in result.output
+
+
+def test_queries_use_running_daemon(tmp_path):
+    """With a daemon listening, scans are answered from its cache."""
+    (tmp_path / "tree" / "sub").mkdir(parents=True)
+    (tmp_path / "tree" / "sub" / "file").write_bytes(b"x" * 2048)
+    tree = str(tmp_path / "tree")
+    socket_path = str(tmp_path / "run" / "daemon.sock")
+    service = QueryService()
+    runner = CliRunner()
+    with DaemonServer(socket_path, service.handle):
+        args = ["--socket", socket_path]
+        assert runner.invoke(main, [*args, "scan", tree]).exit_code == 0
+        (tmp_path / "tree" / "sub" / "more").write_bytes(b"x" * 1024)
+        result = runner.invoke(main, [*args, "scan", tree])
+        assert "2.0 KB below" in result.output
+
+        result = runner.invoke(main, [*args, "scan", "--diff", tree])
+        assert "+1.0 KB in total" in result.output
+        assert os.path.join(tree, "sub") in result.output
+
+        result = runner.invoke(main, [*args, "memory", "--top", "1"])
+        assert result.exit_code == 0, result.output
+
+        result = runner.invoke(main, [*args, "daemon", "--stop"])
+        assert "Daemon stopped" in result.output
+
+    result = runner.invoke(main, ["--socket", socket_path, "daemon", "--stop"])
+    assert result.exit_code == 1
+    result = runner.invoke(main, ["--socket", socket_path, "scan", tree])
+    assert "3.0 KB below" in result.output
+
+
+def test_daemon_failures_fall_back_or_explain(tmp_path, monkeypatch):
+    """Broken replies fall back to local work; timeouts give an error."""
+    from src.infrastructure.ipc.client import DaemonClient
+    from src.infrastructure.ipc.protocol import ProtocolError
+
+    (tmp_path / "file").write_bytes(b"x" * 2048)
+    failures = [ProtocolError("Connection closed mid-frame")]
+
+    def request(self, op, **params):
+        raise failures[0]
+
+    monkeypatch.setattr(DaemonClient, "request", request)
+    args = ["--socket", str(tmp_path / "daemon.sock"), "scan", str(tmp_path)]
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 0, result.output
+    assert "2.0 KB below" in result.output
+    assert "computing locally" in result.output
+
+    failures[0] = socket.timeout("timed out")
+    result = CliRunner().invoke(main, args)
+    assert result.exit_code == 1
+    assert "did not answer within 120 s" in result.output
+    assert "Traceback" not in result.output
+
+
+def test_memory():
+    """Memory command lists the requested number of processes."""
+    result = CliRunner().invoke(main, ["--no-daemon", "memory", "--top", "2"])
+    assert result.exit_code == 0, result.output
+    assert "available" in result.output
+    assert len(result.output.splitlines()) <= 4
+
+
+def test_dashboard_runs_for_duration(tmp_path):
+    """The dashboard exits after --duration seconds."""
+    result = CliRunner().invoke(
+        main, ["dashboard", "--duration", "0.1", "--scan", str(tmp_path)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Memory" in result.output
+    result = CliRunner().invoke(main, ["dashboard", "--fps", "0"])
+    assert result.exit_code == 1 and "Frame rate" in result.output
+
+
+def test_export_writes_textfile(tmp_path):
+    """Metrics are written to the textfile; some output target is required."""
+    path = tmp_path / "mac_cleaner.prom"
+    result = CliRunner().invoke(
+        main,
+        ["export", "--port", "0", "--textfile", str(path), "--duration", "0.1"],
+    )
+    assert result.exit_code == 0, result.output
+    assert "mac_cleaner_memory_total_bytes" in path.read_text()
+    result = CliRunner().invoke(main, ["export", "--port", "0"])
+    assert result.exit_code == 2
+
+
+def test_clean_dry_run_confirm_and_wipe(tmp_path):
+    """Clean lists files on dry runs, asks before wiping, then wipes."""
+    (tmp_path / "a").write_bytes(b"secret")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "b").write_bytes(b"secret")
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["clean", "--dry-run", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "2 files would be wiped" in result.output
+
+    result = runner.invoke(main, ["clean", str(tmp_path)], input="n\n")
+    assert result.exit_code == 1
+    assert (tmp_path / "a").exists()
+
+    result = runner.invoke(main, ["clean", "--yes", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "wiped 2 files" in result.output
+    assert not (tmp_path / "a").exists()
+    assert not (tmp_path / "nested" / "b").exists()
+
+
+def test_clean_reports_copy_on_write_policy(tmp_path):
+    """Clean explains what happened to files it could not overwrite."""
+    (tmp_path / "a").write_bytes(b"secret")
+    runner = CliRunner()
+    with patch(
+        "src.infrastructure.security.secure_wipe.SecureWiper.is_overwrite_effective",
+        return_value=False,
+    ):
+        result = runner.invoke(
+            main, ["clean", "--yes", "--copy-on-write", "skip", str(tmp_path)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "kept 1 files on copy-on-write filesystems" in result.output
+        assert (tmp_path / "a").exists()
+
+        result = runner.invoke(main, ["clean", "--yes", str(tmp_path)])
+    assert result.exit_code == 0, result.output
+    assert "wiped 0 files" in result.output
+    assert "deleted 1 files on copy-on-write filesystems" in result.output
+    assert "FileVault" in result.output
+    assert not (tmp_path / "a").exists()
+
+
+def test_clean_skips_files_on_unavailable_mounts(tmp_path):
+    """Clean consults the mount circuit breakers before wiping."""
+    (tmp_path / "a").write_bytes(b"secret")
+    with patch(
+        "src.infrastructure.error.error_handling_system.ErrorHandlingSystem.allows",
+        return_value=False,
+    ):
+        result = CliRunner().invoke(main, ["clean", "--yes", str(tmp_path)])
+    assert result.exit_code == 1, result.output
+    assert "mount unavailable" in result.output
+    assert (tmp_path / "a").exists()
+
+
+def test_clean_never_touches_protected_paths():
+    """Protected paths are reported and skipped."""
+    result = CliRunner().invoke(main, ["clean", "--yes", "/bin/sh"])
+    assert result.exit_code == 0, result.output
+    assert "0 files would be wiped" in result.output
+    assert os.path.exists("/bin/sh")
+
+
+def test_profile_option_writes_reports(tmp_path):
+    """The --profile option profiles the command."""
+    profiles = tmp_path / "profiles"
+    result = CliRunner().invoke(
+        main, ["--no-daemon", "--profile", str(profiles), "scan", str(tmp_path)]
+    )
+    assert result.exit_code == 0, result.output
+    names = os.listdir(profiles)
+    assert any(name.startswith("scan-") and name.endswith(".txt") for name in names)
+
+
+def test_profile_directory_from_environment(tmp_path):
+    """MAC_CLEANER_PROFILE profiles commands like --profile."""
+    profiles = tmp_path / "profiles"
+    result = CliRunner().invoke(
+        main,
+        ["--no-daemon", "disk", str(tmp_path)],
+        env={"MAC_CLEANER_PROFILE": str(profiles)},
+    )
+    assert result.exit_code == 0, result.output
+    assert any(name.startswith("disk-") for name in os.listdir(profiles))
@@ -0,0 +1,143 @@
+"""Tests for the procfs CPU analyzer."""
+
+from collections import namedtuple
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.domain.models.cpu_info import CpuInfo, ProcessCpuInfo
+from src.domain.services.cpu_analyzer import (
+    CLOCK_TICKS,
+    CpuAnalyzer,
+    ProcessTickTable,
+    parse_process_stat,
+    parse_system_stat,
+)
+
+
+def _system_stat(user, idle, iowait=0, cpus=2):
+    """Build a ``/proc/stat`` with an aggregate line and per-CPU lines."""
+    lines = [f"cpu  {user} 0 {user // 4} {idle} {iowait} 0 0 0 0 0"]
+    lines += [f"cpu{n} 1 0 0 1 0 0 0 0 0 0" for n in range(cpus)]
+    return ("\n".join(lines) + "\nintr 1 2 3\n").encode()
+
+
+def _process_stat(pid, name, utime, stime, start):
+    """Build a ``/proc/<pid>/stat`` line."""
+    fields = ["S"] + ["0"] * 10 + [str(utime), str(stime)] + ["0"] * 6 + [str(start)]
+    return f"{pid} ({name}) {' '.join(fields)} 0 0 0\n".encode()
+
+
+def _write(root, pid, name, utime, stime, start):
+    (root / str(pid)).mkdir(exist_ok=True)
+    (root / str(pid) / "stat").write_bytes(
+        _process_stat(pid, name, utime, stime, start)
+    )
+
+
+def test_parsers():
+    """Names may contain spaces and parentheses; times are in seconds."""
+    name, start, cpu = parse_process_stat(_process_stat(7, "a (b) c", 30, 20, 900))
+    assert name == b"a (b) c"
+    assert start == 900 / CLOCK_TICKS
+    assert cpu == 50 / CLOCK_TICKS
+
+    (total, idle, user, system, iowait), cpus = parse_system_stat(
+        _system_stat(400, 500, iowait=100)
+    )
+    assert cpus == 2
+    assert total == pytest.approx(1100 / CLOCK_TICKS)
+    assert idle == pytest.approx(600 / CLOCK_TICKS)
+    assert (user, system, iowait) == pytest.approx(
+        (400 / CLOCK_TICKS, 100 / CLOCK_TICKS, 100 / CLOCK_TICKS)
+    )
+
+
+def test_tick_table_matches_processes_by_pid_and_start():
+    """Deltas use the previous sample unless the pid was reused or is new."""
+    table = ProcessTickTable()
+    deltas = table.advance([1, 5, 9], [0.0, 1.0, 2.0], [3.0, 4.0, 5.0])
+    assert list(deltas) == [3.0, 4.0, 5.0]
+    deltas = table.advance([1, 5, 7, 9], [0.0, 8.0, 3.0, 2.0], [3.5, 1.0, 2.0, 6.0])
+    assert list(deltas) == [0.5, 1.0, 2.0, 1.0]
+    assert len(table) == 4 and table.pids.itemsize == 8
+
+
+def test_sample_computes_percentages_from_deltas(tmp_path):
+    """CPU% compares two samples; 100% is one full core."""
+    (tmp_path / "stat").write_bytes(_system_stat(0, 0))
+    _write(tmp_path, 10, "idle", 5, 5, 100)
+    _write(tmp_path, 20, "busy", 50, 0, 200)
+    (tmp_path / "self").mkdir()
+    with CpuAnalyzer(proc_root=str(tmp_path)) as analyzer:
+        first = analyzer.sample()
+        assert [record.cpu_percent for record in first.processes] == [0.0, 0.0]
+
+        # Two CPUs for one second: 2 * CLOCK_TICKS ticks in total.
+        (tmp_path / "stat").write_bytes(
+            _system_stat(CLOCK_TICKS, CLOCK_TICKS - CLOCK_TICKS // 4)
+        )
+        _write(tmp_path, 20, "busy", 50 + CLOCK_TICKS, 0, 200)
+        _write(tmp_path, 30, "new", CLOCK_TICKS // 2, 0, 300)
+        (tmp_path / "10" / "stat").unlink()
+        (tmp_path / "10").rmdir()
+        sample = analyzer.sample(top=2)
+        assert sample.cpu.cpu_count == 2
+        assert sample.cpu.busy_percent == pytest.approx(62.5)
+        assert sample.cpu.user_percent == pytest.approx(50.0)
+        assert [(record.name, record.cpu_percent) for record in sample.processes] == [
+            ("busy", pytest.approx(100.0)),
+            ("new", pytest.approx(50.0)),
+        ]
+        assert list(analyzer._process_fds) == [20, 30]
+    assert analyzer._process_fds == {} and analyzer._stat_fd is None
+
+
+def test_sample_without_held_files_and_unreadable_entries(tmp_path):
+    """Files are reopened when none may be held; bad entries are skipped."""
+    (tmp_path / "stat").write_bytes(_system_stat(10, 10))
+    _write(tmp_path, 1, "init", 1, 1, 1)
+    (tmp_path / "2").mkdir()
+    (tmp_path / "2" / "stat").write_bytes(b"garbage")
+    (tmp_path / "3").mkdir()
+    analyzer = CpuAnalyzer(proc_root=str(tmp_path), max_open_files=0)
+    assert [record.pid for record in analyzer.sample().processes] == [1]
+    assert analyzer._process_fds == {}
+    analyzer.close()
+
+
+def test_held_files_are_capped(tmp_path):
+    """At most ``max_open_files`` stat files stay open between samples."""
+    (tmp_path / "stat").write_bytes(_system_stat(10, 10))
+    for pid in range(1, 6):
+        _write(tmp_path, pid, f"p{pid}", pid, 0, pid)
+    analyzer = CpuAnalyzer(proc_root=str(tmp_path), max_open_files=2)
+    assert len(analyzer.sample().processes) == 5
+    assert sorted(analyzer._process_fds) == [1, 2]
+    assert len(analyzer.sample().processes) == 5
+    assert len(analyzer._process_fds) == 2
+    analyzer.close()
+    with patch("resource.getrlimit", return_value=(64, 64)):
+        assert CpuAnalyzer(proc_root=str(tmp_path)).max_open_files == 8
+
+
+def test_api_models_and_psutil_fallback(tmp_path):
+    """Without procfs, psutil provides the counters."""
+    times = namedtuple("times", "user nice system idle iowait")
+    process = Mock(pid=4)
+    process.info = {
+        "name": "worker",
+        "create_time": 50.0,
+        "cpu_times": Mock(user=1.0, system=0.5),
+    }
+    denied = Mock(pid=5, info={"name": "x", "create_time": None, "cpu_times": None})
+    analyzer = CpuAnalyzer(proc_root=str(tmp_path))
+    assert not analyzer.use_procfs
+    cpu_times = patch("psutil.cpu_times", return_value=times(1.0, 0.0, 1.0, 2.0, 0.0))
+    processes = patch("psutil.process_iter", return_value=[denied, process])
+    with cpu_times, processes, patch("psutil.cpu_count", return_value=1):
+        usage = analyzer.get_cpu_usage()
+        (top,) = analyzer.get_top_cpu_processes(limit=3)
+    assert isinstance(usage, CpuInfo) and usage.busy_percent == pytest.approx(50.0)
+    assert isinstance(top, ProcessCpuInfo)
+    assert (top.pid, top.name, top.cpu_seconds) == (4, "worker", 1.5)
@@ -0,0 +1,174 @@
+"""Tests for the daemon socket protocol, server and client."""
+
+import os
+import socket
+import stat
+import threading
+
+import pytest
+
+from src.infrastructure.ipc import protocol
+from src.infrastructure.ipc.client import DaemonClient
+from src.infrastructure.ipc.protocol import (
+    DaemonRequestError,
+    DaemonUnavailableError,
+    ProtocolError,
+    encode_frame,
+    recv_frame,
+    send_frame,
+)
+from src.infrastructure.ipc.server import DaemonServer
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    """Return a socket path inside a private directory."""
+    return str(tmp_path / "run" / "daemon.sock")
+
+
+def test_frames_round_trip_and_reject_garbage():
+    """Frames carry JSON; truncated, oversized and invalid frames fail."""
+    left, right = socket.socketpair()
+    with left, right:
+        send_frame(left, {"op": "x", "params": {"n": [1, 2]}})
+        assert recv_frame(right) == {"op": "x", "params": {"n": [1, 2]}}
+
+        left.sendall(protocol.HEADER.pack(3) + b"{]!")
+        with pytest.raises(ProtocolError):
+            recv_frame(right)
+
+        left.sendall(protocol.HEADER.pack(protocol.MAX_FRAME + 1))
+        with pytest.raises(ProtocolError):
+            recv_frame(right)
+
+        left.sendall(encode_frame([1])[:-1])
+        left.shutdown(socket.SHUT_WR)
+        with pytest.raises(ProtocolError):
+            recv_frame(right)
+        assert recv_frame(right) is None
+
+
+def test_default_socket_path(monkeypatch):
+    """The socket path can be overridden from the environment."""
+    monkeypatch.setenv(protocol.SOCKET_ENV, "/run/custom.sock")
+    assert protocol.default_socket_path() == "/run/custom.sock"
+    monkeypatch.delenv(protocol.SOCKET_ENV)
+    assert protocol.default_socket_path().endswith(
+        os.path.join(f"mac_cleaner-{os.getuid()}", "daemon.sock")
+    )
+
+
+def test_requests_errors_and_shutdown(socket_path):
+    """Results and errors reach the client; shutdown removes the socket."""
+
+    def handler(op, params):
+        if op == "echo":
+            return params
+        raise ValueError(f"bad op {op}")
+
+    server = DaemonServer(socket_path, handler)
+    server.start()
+    mode = os.stat(socket_path).st_mode
+    assert stat.S_IMODE(mode) == 0o600
+    assert stat.S_IMODE(os.stat(os.path.dirname(socket_path)).st_mode) == 0o700
+
+    with DaemonClient(socket_path) as client:
+        assert client.is_running()
+        assert client.request("echo", a=1) == {"a": 1}
+        with pytest.raises(DaemonRequestError, match="bad op nope"):
+            client.request("nope")
+        assert client.request("echo") == {}
+        client.request("shutdown")
+    server.shutdown()
+    assert not os.path.exists(socket_path)
+    assert not DaemonClient(socket_path).is_running()
+
+
+def test_slow_requests_do_not_block_other_clients(socket_path):
+    """Each connection is served by its own thread."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def handler(op, params):
+        if op == "slow":
+            started.set()
+            release.wait(5)
+        return op
+
+    with DaemonServer(socket_path, handler):
+        slow_result = []
+        slow = threading.Thread(
+            target=lambda: slow_result.append(DaemonClient(socket_path).request("slow"))
+        )
+        slow.start()
+        assert started.wait(5)
+        with DaemonClient(socket_path, timeout=2) as client:
+            assert client.request("fast") == "fast"
+        release.set()
+        slow.join(5)
+    assert slow_result == ["slow"]
+
+
+def test_unavailable_stale_and_duplicate_daemons(socket_path, tmp_path):
+    """Stale sockets are replaced; live ones, files and shared dirs refused."""
+    with pytest.raises(DaemonUnavailableError):
+        DaemonClient(socket_path).request("ping")
+
+    os.makedirs(os.path.dirname(socket_path), mode=0o700)
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()
+    with DaemonServer(socket_path, lambda op, params: None):
+        with pytest.raises(FileExistsError):
+            DaemonServer(socket_path, lambda op, params: None).bind()
+
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    os.chmod(shared, 0o777)
+    with pytest.raises(PermissionError):
+        DaemonServer(str(shared / "d.sock"), lambda op, params: None).bind()
+
+    private_file = os.path.join(os.path.dirname(socket_path), "id_rsa")
+    with open(private_file, "w") as handle:
+        handle.write("secret")
+    with pytest.raises(FileExistsError):
+        DaemonServer(private_file, lambda op, params: None).bind()
+    with open(private_file) as handle:
+        assert handle.read() == "secret"
+
+
+def test_unsendable_results_become_error_replies(socket_path, monkeypatch):
+    """Results that cannot be encoded are reported; the connection survives."""
+    monkeypatch.setattr(protocol, "MAX_FRAME", 1024)
+
+    def handler(op, params):
+        if op == "object":
+            return object()
+        if op == "large":
+            return "x" * 2048
+        return params
+
+    server = DaemonServer(socket_path, handler)
+    server.start()
+    with DaemonClient(socket_path) as client:
+        with pytest.raises(DaemonRequestError, match="not JSON serializable"):
+            client.request("object")
+        with pytest.raises(DaemonRequestError, match="exceeds 1024"):
+            client.request("large")
+        assert client.request("echo", a=1) == {"a": 1}
+    server.shutdown()
+
+
+def test_malformed_requests_and_handler_crashes(socket_path):
+    """Malformed requests and unexpected exceptions become error replies."""
+
+    def handler(op, params):
+        raise RuntimeError("crash")
+
+    server = DaemonServer(socket_path, handler)
+    assert server.dispatch([1]) == {"ok": False, "error": "Malformed request"}
+    assert server.dispatch({"op": "x"}) == {
+        "ok": False,
+        "error": "RuntimeError: crash",
+    }
+    assert server.dispatch({"op": "ping"})["result"] == {"pid": os.getpid()}
@@ -0,0 +1,137 @@
+"""Tests for the live dashboard."""
+
+import io
+import threading
+
+import pytest
+from rich.console import Console
+
+from src.application.samplers import SnapshotCell
+from src.domain.models.cpu_info import CpuRecord, CpuSample, ProcessCpuRecord
+from src.domain.models.disk_info import DiskInfo, ScanProgress
+from src.domain.models.memory_info import MemoryRecord, ProcessMemoryRecord
+from src.presentation import dashboard as dashboard_module
+from src.presentation.dashboard import Dashboard, DashboardPanel
+
+
+class _Source:
+    """Snapshot source driven by the test."""
+
+    def __init__(self):
+        self.cell = SnapshotCell()
+        self.started = self.stopped = False
+
+    @property
+    def snapshot(self):
+        return self.cell.snapshot
+
+    def start(self):
+        self.started = True
+
+    def stop(self, timeout=None):
+        self.stopped = True
+
+
+def _console():
+    return Console(file=io.StringIO(), force_terminal=True, width=80, height=30)
+
+
+def test_only_changed_panels_are_rendered_again():
+    """Unchanged panels reuse their lines; versions decide what is stale."""
+    first, second = _Source(), _Source()
+    panels = [
+        DashboardPanel("one", "One", first, str, size=4),
+        DashboardPanel("two", "Two", second, str),
+    ]
+    view = Dashboard(panels, console=_console())
+    console = view.console
+
+    console.print(view.layout)
+    assert [panel.renders for panel in panels] == [1, 1]
+    assert not view.changed()
+    console.print(view.layout)
+    assert [panel.renders for panel in panels] == [1, 1]
+
+    first.cell.publish("hello")
+    second.cell.publish(None)
+    assert view.changed()
+    console.print(view.layout)
+    assert [panel.renders for panel in panels] == [2, 1]
+    assert "hello" in console.file.getvalue()
+
+    first.cell.fail(OSError("lost"))
+    console.print(view.layout)
+    assert "OSError: lost" in console.file.getvalue()
+
+
+def test_run_draws_only_when_data_changes():
+    """Frames are capped and skipped entirely while nothing changes."""
+    source = _Source()
+    view = Dashboard(
+        [DashboardPanel("one", "One", source, str)],
+        max_fps=100,
+        console=_console(),
+    )
+    view.run(duration=0.2)
+    assert source.started and source.stopped
+    assert view.frames == 1
+
+    publisher = threading.Timer(0.05, source.cell.publish, args=("new",))
+    publisher.start()
+    stopper = threading.Timer(0.3, view.stop)
+    stopper.start()
+    view.run()
+    publisher.join()
+    stopper.join()
+    assert view.frames == 3
+    with pytest.raises(ValueError):
+        Dashboard([], max_fps=0)
+
+
+def test_renderers():
+    """Each renderer shows its record's values."""
+    console = _console()
+    console.print(
+        dashboard_module.render_memory(MemoryRecord(2048, 1024, 1024, 50.0)),
+        dashboard_module.render_cpu(
+            CpuSample(
+                CpuRecord(12.5, 10.0, 2.5, 0.0, 8),
+                [ProcessCpuRecord(3, "compiler", 87.5, 42.0)],
+            )
+        ),
+        dashboard_module.render_processes(
+            [ProcessMemoryRecord(7, "editor", 1.5, 4096, 8192)]
+        ),
+        dashboard_module.render_disks([DiskInfo("/", 100, 40, 60)]),
+        dashboard_module.render_scan(ScanProgress("/tmp", 3, 9, 2048, 1)),
+        dashboard_module.render_scan(ScanProgress("/tmp", 3, 9, 2048, 0, True)),
+    )
+    output = console.file.getvalue()
+    for text in (
+        "50.0%",
+        "of 8 CPUs",
+        "compiler",
+        "87.5",
+        "editor",
+        "4.0 KB",
+        "60 B",
+        "scanning /tmp",
+        "done /tmp",
+    ):
+        assert text in output
+    assert "1 unreadable" in output
+
+
+def test_default_dashboard(tmp_path):
+    """The standard dashboard samples memory, processes, disks and a scan."""
+    view = dashboard_module.default_dashboard(scan_root=str(tmp_path), top=3)
+    assert [panel.name for panel in view.panels] == [
+        "memory",
+        "cpu",
+        "processes",
+        "disks",
+        "scan",
+    ]
+    processes = view.panels[2].source
+    processes.sample_once()
+    assert len(processes.snapshot.value) <= 3
@@ -1,5 +1,8 @@
 """Tests for data protection mechanisms."""
 
+import os
+from unittest.mock import patch
+
 import pytest
 
 from src.infrastructure.security.data_protection_mechanisms import (
@@ -29,3 +32,91 @@ def test_decryption():
     encrypted = protection.encrypt_data(test_data)
     decrypted = protection.decrypt_data(encrypted)
     assert decrypted == test_data
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_secure_store_round_trip(tmp_path, persistent):
+    """Test secure_store and secure_retrieve with and without a store file."""
+    path = str(tmp_path / "secure.db") if persistent else None
+    protection = DataProtectionMechanisms(store_path=path)
+    protection.secure_store("scan_state", {"root": "/tmp", "files": 3})
+    assert protection.secure_retrieve("scan_state") == {"root": "/tmp", "files": 3}
+    assert protection.secure_retrieve("missing") is None
+    protection.secure_delete("scan_state")
+    assert protection.secure_retrieve("scan_state") is None
+    protection.close()
+    if persistent:
+        assert b"scan_state" not in (tmp_path / "secure.db").read_bytes()
+
+
+def test_store_without_key_reopens_with_its_key_file(tmp_path):
+    """Test a store opened without a key can be read when reopened."""
+    path = str(tmp_path / "secure.db")
+    protection = DataProtectionMechanisms(store_path=path)
+    protection.secure_store("scan_state", {"files": 3})
+    protection.close()
+    assert (tmp_path / "secure.db.key").exists()
+    reopened = DataProtectionMechanisms(store_path=path)
+    assert reopened.key == protection.key
+    assert reopened.secure_retrieve("scan_state") == {"files": 3}
+    reopened.close()
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_bulk_encryption_preserves_order(workers):
+    """Test encrypt_many/decrypt_many and their streaming variants."""
+    protection = DataProtectionMechanisms()
+    records = [f"record-{index}" for index in range(100)]
+    tokens = protection.encrypt_many(records, workers=workers, chunk_size=7)
+    assert len(tokens) == 100
+    assert protection.decrypt_many(tokens, workers=workers, chunk_size=7) == records
+
+    stream = protection.iter_decrypt(
+        protection.iter_encrypt(iter(records), workers=workers, chunk_size=7),
+        workers=workers,
+        chunk_size=7,
+    )
+    assert next(stream) == "record-0"
+    assert list(stream) == records[1:]
+    assert protection.encrypt_many([], workers=workers) == []
+
+
+def test_key_persistence(tmp_path):
+    """Test keys can be persisted and reused by a new instance."""
+    path = str(tmp_path / "key")
+    key = DataProtectionMechanisms.load_or_create_key(path)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert DataProtectionMechanisms.load_or_create_key(path) == key
+
+    token = DataProtectionMechanisms(key=key).encrypt_data("secret")
+    assert DataProtectionMechanisms(key=key).decrypt_data(token) == "secret"
+
+    (tmp_path / "bad").write_bytes(b"not a key")
+    with pytest.raises(ValueError):
+        DataProtectionMechanisms.load_key(str(tmp_path / "bad"))
+
+
+def test_concurrent_key_creation_keeps_first_key(tmp_path):
+    """Test a process losing the creation race adopts the published key."""
+    path = str(tmp_path / "key")
+    first = DataProtectionMechanisms()
+    real_load = DataProtectionMechanisms.load_key
+    calls = []
+
+    def racing_load(key_path):
+        # Another process publishes its key between our miss and our write.
+        if not calls:
+            calls.append(key_path)
+            first.save_key(key_path, overwrite=False)
+            raise FileNotFoundError(key_path)
+        return real_load(key_path)
+
+    with patch.object(DataProtectionMechanisms, "load_key", racing_load):
+        assert DataProtectionMechanisms.load_or_create_key(path) == first.key
+    assert DataProtectionMechanisms.load_key(path) == first.key
+    assert os.listdir(tmp_path) == ["key"]
+
+    with pytest.raises(FileExistsError):
+        DataProtectionMechanisms().save_key(path, overwrite=False)
+    assert DataProtectionMechanisms.load_key(path) == first.key
+    assert os.listdir(tmp_path) == ["key"]
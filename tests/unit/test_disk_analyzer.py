@@ -6,8 +6,9 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from src.domain.models.disk_info import DiskInfo
+from src.domain.models.disk_info import DiskInfo, ScanProgress
 from src.domain.services.disk_analyzer import DiskAnalyzer
+from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
 
 
 def test_disk_info_model():
@@ -64,3 +65,94 @@ def test_invalid_path():
     analyzer = DiskAnalyzer()
     with pytest.raises(ValueError, match="Path does not exist"):
         analyzer.get_disk_usage("/nonexistent/path")
+
+
+def test_scan_directory(tmp_path):
+    """Test directory sizes are totalled bottom-up."""
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "top.bin").write_bytes(b"x" * 10)
+    (tmp_path / "a" / "mid.bin").write_bytes(b"x" * 20)
+    (tmp_path / "a" / "b" / "leaf.bin").write_bytes(b"x" * 30)
+    os.symlink(tmp_path / "a", tmp_path / "link")
+
+    index = DiskAnalyzer().scan_directory(str(tmp_path))
+    assert index.dir_count == 3
+    assert index.file_count == 4
+    assert index.size_of(str(tmp_path / "a")) == 50
+    assert index.size_of(str(tmp_path / "a" / "b")) == 30
+    assert index.total_bytes == 60 + os.lstat(tmp_path / "link").st_size
+    assert index.size_of("/not/scanned") == 0
+
+
+def test_scan_directory_reports_progress(tmp_path):
+    """Test progress is reported every N directories and when done."""
+    for name in "abcde":
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "f").write_bytes(b"x" * 10)
+    reports = []
+    index = DiskAnalyzer().scan_directory(
+        str(tmp_path), progress=reports.append, progress_every=2
+    )
+    assert [report.directories for report in reports] == [2, 4, 6, 6]
+    assert [report.done for report in reports] == [False] * 3 + [True]
+    assert reports[-1] == ScanProgress(str(tmp_path), 6, 5, 50, 0, done=True)
+    assert index.total_bytes == 50
+
+
+def test_scan_directory_routes_errors_to_handler(tmp_path):
+    """Test unreadable directories are counted and aggregated, not raised."""
+    for name in ("ok", "locked1", "locked2"):
+        (tmp_path / name).mkdir()
+    (tmp_path / "ok" / "f").write_bytes(b"x" * 5)
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if os.path.basename(path).startswith("locked"):
+            raise PermissionError(13, "Permission denied", path)
+        return real_scandir(path)
+
+    handler = ErrorHandlingSystem()
+    with patch("os.scandir", side_effect=scandir):
+        index = DiskAnalyzer(error_handler=handler).scan_directory(str(tmp_path))
+    assert index.error_count == 2
+    assert index.total_bytes == 5
+    assert sum(handler.error_counts().values()) == 2
+    # The second error was only counted; the scan summarized it on exit.
+    assert all(aggregate.unreported == 0 for aggregate in handler.aggregates.values())
+
+    for _ in range(handler.failure_threshold):
+        handler.breaker_for(str(tmp_path)).record_failure()
+    index = DiskAnalyzer(error_handler=handler).scan_directory(str(tmp_path))
+    assert index.skipped_dirs == 1 and index.dir_count == 0
+
+
+def test_scan_directory_keeps_partial_listings(tmp_path):
+    """Test a listing failing partway keeps the entries already read."""
+    for name in ("a", "b", "c"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "f").write_bytes(b"x" * 10)
+    (tmp_path / "g").write_bytes(b"x" * 1)
+    real_scandir = os.scandir
+
+    class Failing:
+        def __init__(self, path):
+            self.entries = sorted(real_scandir(path), key=lambda entry: entry.name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            return False
+
+        def __iter__(self):
+            yield from self.entries[:2]
+            raise OSError(5, "Input/output error")
+
+    def scandir(path):
+        return Failing(path) if path == str(tmp_path) else real_scandir(path)
+
+    with patch("os.scandir", side_effect=scandir):
+        index = DiskAnalyzer().scan_directory(str(tmp_path))
+    assert index.error_count == 1
+    assert index.total_bytes == 20
+    assert index.size_of(str(tmp_path / "b")) == 10
@@ -0,0 +1,150 @@
+"""Tests for the encrypted key-value store."""
+
+import os
+
+import pytest
+from cryptography.fernet import Fernet
+
+from src.infrastructure.security.encrypted_store import EncryptedKeyValueStore
+
+
+@pytest.fixture
+def key():
+    """Return a Fernet key."""
+    return Fernet.generate_key()
+
+
+def test_put_get_delete_and_reopen(tmp_path, key):
+    """Test values survive reopening and keys are not stored in clear."""
+    path = str(tmp_path / "store.db")
+    with EncryptedKeyValueStore(path, key) as store:
+        store.put("undo/1", {"paths": ["/a", "/b"]})
+        store.put("undo/2", [1, 2, 3])
+        store.put("undo/1", {"paths": ["/c"]})
+        store.delete("undo/2")
+        store.delete("never-stored")
+        assert store.get("undo/2", "gone") == "gone"
+
+    data = open(path, "rb").read()
+    assert b"undo" not in data and b"paths" not in data
+
+    with EncryptedKeyValueStore(path, key) as store:
+        assert len(store) == 1
+        assert store.get("undo/1") == {"paths": ["/c"]}
+        assert store.get("undo/2") is None
+        assert store.dead_bytes > 0
+
+    with EncryptedKeyValueStore(path, Fernet.generate_key()) as store:
+        assert store.get("undo/1") is None
+
+
+def test_cache_avoids_repeated_decryption(tmp_path, key):
+    """Test hot keys are served from the cache within its bounds."""
+    with EncryptedKeyValueStore(str(tmp_path / "s.db"), key, cache_entries=2) as store:
+        for name in ("a", "b", "c"):
+            store.put(name, name * 10)
+        store.clear_cache()
+
+        for _ in range(5):
+            assert store.get("a") == "a" * 10
+        assert (store.cache_misses, store.cache_hits) == (1, 4)
+
+        store.get("b")
+        store.get("c")
+        store.get("a")
+        assert store.cache_misses == 4
+
+        store.evict("a")
+        store.get("a")
+        assert store.cache_misses == 5
+
+
+def test_batch_syncs_once_and_discards_on_error(tmp_path, key, monkeypatch):
+    """Test a batch is written with one fsync and rolled back on error."""
+    path = str(tmp_path / "s.db")
+    with EncryptedKeyValueStore(path, key) as store:
+        syncs = []
+        real_fsync = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: syncs.append(fd) or real_fsync(fd))
+        with store.batch():
+            for index in range(50):
+                store.put(f"k{index}", index)
+            with store.batch():
+                store.delete("k0")
+            assert store.get("k0") is None
+            assert store.get("k49") == 49
+        assert len(syncs) == 1
+        assert len(store) == 49
+
+        with pytest.raises(RuntimeError):
+            with store.batch():
+                store.put("k1", "changed")
+                raise RuntimeError("abort")
+        assert store.get("k1") == 1
+
+
+def test_compaction_and_torn_tail(tmp_path, key):
+    """Test compaction reclaims space and a torn record is truncated."""
+    path = str(tmp_path / "s.db")
+    with EncryptedKeyValueStore(path, key) as store:
+        for round_ in range(5):
+            store.put("state", {"round": round_})
+        store.put("other", "x")
+        before = os.path.getsize(path)
+        reclaimed = store.compact()
+        assert reclaimed > 0
+        assert os.path.getsize(path) == before - reclaimed
+        assert store.dead_bytes == 0
+        store.clear_cache()
+        assert store.get("state") == {"round": 4}
+        size = os.path.getsize(path)
+
+    with open(path, "ab") as handle:
+        handle.write(b"\x01" + b"\x00" * 32 + b"\x00\x00\x10\x00partial")
+    with EncryptedKeyValueStore(path, key) as store:
+        assert os.path.getsize(path) == size
+        assert store.get("other") == "x"
+
+    with open(path, "ab") as handle:
+        handle.write(b"\x00" * 100)
+    with EncryptedKeyValueStore(path, key) as store:
+        assert os.path.getsize(path) == size
+
+    (tmp_path / "bad.db").write_bytes(b"not a store")
+    with pytest.raises(ValueError):
+        EncryptedKeyValueStore(str(tmp_path / "bad.db"), key)
+
+
+def test_damaged_record_before_the_tail_is_not_truncated(tmp_path, key):
+    """Test a corrupt record mid-file fails to open and keeps the data."""
+    path = str(tmp_path / "s.db")
+    with EncryptedKeyValueStore(path, key) as store:
+        store.put("first", 1)
+        store.put("second", 2)
+    with open(path, "r+b") as handle:
+        handle.seek(len(b"MCKV\x01"))
+        handle.write(b"\x07")
+    size = os.path.getsize(path)
+    with pytest.raises(ValueError, match="corrupt at offset 5"):
+        EncryptedKeyValueStore(path, key)
+    assert os.path.getsize(path) == size
+
+
+def test_values_are_copied_in_and_out(tmp_path, key):
+    """Mutating a value after put or get does not change the stored one."""
+    store = EncryptedKeyValueStore(str(tmp_path / "store.db"), key)
+    value = {"a": [1]}
+    store.put("k", value)
+    value["a"].append(2)
+    assert store.get("k") == {"a": [1]}
+    store.get("k")["a"].append(3)
+    assert store.get("k") == {"a": [1]}
+    store.clear_cache()
+    store.get("k")["a"].append(4)
+    assert store.get("k") == {"a": [1]}
+    with store.batch():
+        pending = ["x"]
+        store.put("p", pending)
+        pending.append("y")
+        assert store.get("p") == ["x"]
+    store.close()
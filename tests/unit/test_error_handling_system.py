@@ -1,7 +1,20 @@
 """Tests for error handling system."""
 
+import errno
+from unittest.mock import patch
+
 import pytest
 
+from src.domain.services.disk_analyzer import DiskAnalyzer
+from src.infrastructure.error.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitOpenError,
+    RetryPolicy,
+    is_unavailable,
+)
+from src.infrastructure.error import error_handling_system
 from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
 
 
@@ -25,3 +38,167 @@ def test_error_recovery():
     error = ValueError("Test error")
     result = system.recover_from_error(error)
     assert isinstance(result, bool)
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def _stale(*args):
+    """Simulate an operation on a stale network mount."""
+    raise OSError(errno.ESTALE, "Stale file handle")
+
+
+def test_retry_with_backoff_for_transient_errors():
+    """Test transient errors are retried with bounded, jittered backoff."""
+    sleeps = []
+    system = ErrorHandlingSystem(
+        retry_policy=RetryPolicy(max_attempts=4, base_delay=0.1, max_delay=0.3),
+        sleep=sleeps.append,
+        rng=lambda: 1.0,
+    )
+    outcomes = [OSError(errno.EAGAIN, "busy"), InterruptedError(errno.EINTR, "x")]
+
+    def flaky():
+        if outcomes:
+            raise outcomes.pop(0)
+        return "ok"
+
+    assert system.call("/", flaky) == "ok"
+    assert sleeps == [pytest.approx(0.1), pytest.approx(0.2)]
+
+    sleeps.clear()
+    with pytest.raises(OSError):
+        system.call("/", lambda: (_ for _ in ()).throw(OSError(errno.EBUSY, "busy")))
+    assert sleeps == [pytest.approx(0.1), pytest.approx(0.2), pytest.approx(0.3)]
+    assert system.recover_from_error(OSError(errno.EAGAIN, "again"))
+    assert not system.recover_from_error(FileNotFoundError(errno.ENOENT, "gone"))
+
+
+def test_circuit_breaker_opens_fails_fast_and_probes():
+    """Test the per-mount breaker opens, fails fast and closes after a probe."""
+    clock = FakeClock()
+    system = ErrorHandlingSystem(failure_threshold=3, reset_timeout=10, clock=clock)
+    mount = system.mount_of("/")
+    for _ in range(3):
+        with pytest.raises(OSError):
+            system.call("/", _stale)
+    assert system.breaker_for("/").state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        system.call("/", calls.append, 1)
+    assert calls == []
+    assert not system.allows("/")
+
+    clock.now = 10
+    assert system.breaker_states() == [(mount, HALF_OPEN)]
+    assert system.allows("/")
+    assert not system.allows("/")
+    system.handle_error(OSError(errno.ETIMEDOUT, "timed out"), {"path": "/"})
+    assert system.breaker_for("/").state == OPEN
+
+    clock.now = 20
+    assert system.call("/", lambda: "probe") == "probe"
+    assert system.breaker_for("/").state == CLOSED
+
+
+def test_mount_points_come_from_proc_or_psutil(tmp_path, monkeypatch):
+    """Test mount points are parsed from /proc with psutil as the fallback."""
+    mounts = tmp_path / "mounts"
+    mounts.write_text("/dev/a / ext4 rw 0 0\n/dev/b /mnt/my\\040disk ext4 rw 0 0\n")
+    monkeypatch.setattr(error_handling_system, "_PROC_MOUNTS", str(mounts))
+    system = ErrorHandlingSystem()
+    assert system.mount_of("/mnt/my disk/file") == "/mnt/my disk"
+    assert system.mount_of("/mnt/my") == "/"
+
+    monkeypatch.setattr(error_handling_system, "_PROC_MOUNTS", str(tmp_path / "no"))
+    partition = type("Partition", (), {"mountpoint": "/data"})
+    with patch("psutil.disk_partitions", return_value=[partition]):
+        assert ErrorHandlingSystem().mount_of("/data/x") == "/data"
+
+
+def test_unreported_probes_are_released_or_expire(tmp_path):
+    """Test a half-open probe is not held forever by a silent caller."""
+    clock = FakeClock()
+    system = ErrorHandlingSystem(failure_threshold=1, reset_timeout=10, clock=clock)
+    path = str(tmp_path)
+    breaker = system.breaker_for(path)
+    breaker.record_failure()
+    clock.now = 10
+    assert system.allows(path) and not system.allows(path)
+    system.handle_error(PermissionError(errno.EACCES, "denied"), {"path": path})
+    assert system.allows(path) and not system.allows(path)
+    system.release(path)
+    assert system.allows(path)
+    clock.now = 19
+    assert not system.allows(path)
+    clock.now = 20
+    assert system.allows(path)
+    assert breaker.state == HALF_OPEN
+
+    system.release(path)
+    denied = PermissionError(errno.EACCES, "denied")
+    with patch("os.scandir", side_effect=denied):
+        DiskAnalyzer(error_handler=system).scan_directory(path)
+    assert system.allows(path)
+
+
+def test_non_device_errors_do_not_open_the_circuit():
+    """Test per-file errors leave the breaker closed."""
+    system = ErrorHandlingSystem(failure_threshold=1)
+    for _ in range(3):
+        with pytest.raises(FileNotFoundError):
+            system.call("/", open, "/definitely/missing/file")
+    system.handle_error(ValueError("bad value"), {"path": "/"})
+    assert system.breaker_for("/").state == CLOSED
+    assert is_unavailable(TimeoutError())
+    assert not is_unavailable(ValueError())
+
+
+def test_disk_analyzer_consults_breaker():
+    """Test the disk analyzer fails fast once the circuit is open."""
+    system = ErrorHandlingSystem(failure_threshold=1)
+    analyzer = DiskAnalyzer(error_handler=system)
+    assert analyzer.get_disk_usage("/").total_space > 0
+    system.breaker_for("/").record_failure()
+    with pytest.raises(CircuitOpenError):
+        analyzer.get_disk_usage("/")
+
+
+def test_errors_are_aggregated_with_lazy_traces(caplog):
+    """Test repeated errors are counted and summarized, not logged each time."""
+    clock = FakeClock()
+    system = ErrorHandlingSystem(clock=clock, summary_interval=5, prefix_depth=2)
+    caplog.set_level("WARNING", logger="error_handler")
+    for index in range(1000):
+        error = PermissionError(errno.EACCES, "Permission denied")
+        system.handle_error(error, {"path": f"/Users/me/Library/item{index}"})
+    system.handle_error(PermissionError(errno.EACCES, "denied"), {"path": "/opt/x"})
+    system.handle_error(ValueError("no path"))
+
+    assert len([r for r in caplog.records if r.levelname == "ERROR"]) == 3
+    counts = system.error_counts()
+    assert counts[("PermissionError", errno.EACCES, "/Users/me")] == 1000
+    assert counts[("ValueError", None, "")] == 1
+    aggregate = system.aggregates[("PermissionError", errno.EACCES, "/Users/me")]
+    assert aggregate.samples == [f"/Users/me/Library/item{i}" for i in range(3)]
+    assert "PermissionError" in aggregate.stack_trace
+
+    clock.now = 5
+    system.handle_error(PermissionError(errno.EACCES, "x"), {"path": "/Users/me/a"})
+    summaries = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert summaries == [
+        "1000 more PermissionError (errno 13) under /Users/me; 1001 in total, "
+        "e.g. /Users/me/Library/item0, /Users/me/Library/item1, "
+        "/Users/me/Library/item2"
+    ]
+    assert system.flush_error_summary() == []
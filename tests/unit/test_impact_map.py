@@ -0,0 +1,235 @@
+"""Tests for the per-test impact map."""
+
+import importlib.util
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+from coverage import Coverage, CoverageData
+
+from src.infrastructure.testing.impact_map import (
+    TestImpactMap,
+    context_test_id,
+    file_digest,
+    parse_diff_lines,
+)
+from src.infrastructure.testing.impact_plugin import (
+    _coverage_data_file,
+    changed_since,
+    select,
+    unmapped_changes,
+)
+from src.infrastructure.testing.unit_test_coverage import UnitTestCoverage
+
+MODULE = """\
+def add(a, b):
+    return a + b
+
+
+def sub(a, b):
+    return a - b
+"""
+
+
+def _load(path):
+    """Import the module at ``path`` under a unique name."""
+    name = f"impact_target_{abs(hash(str(path)))}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.modules.pop(name, None)
+    return module
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    """Record ``test_add`` and ``test_sub`` against a small module."""
+    source = tmp_path / "calc.py"
+    source.write_text(MODULE)
+    coverage = Coverage(source=[str(tmp_path)], data_file=None)
+    coverage.start()
+    try:
+        module = _load(source)
+        coverage.switch_context("tests/test_calc.py::test_add|run")
+        module.add(1, 2)
+        coverage.switch_context("tests/test_calc.py::test_sub|run")
+        module.sub(1, 2)
+    finally:
+        coverage.stop()
+    impact_map = TestImpactMap(str(tmp_path / "impact.json"), str(tmp_path))
+    assert impact_map.update(coverage.get_data()) == 1
+    impact_map.save()
+    return tmp_path, coverage.get_data()
+
+
+def test_helpers():
+    """Contexts lose their pytest phase; git hunks become old line numbers."""
+    assert context_test_id("t.py::test_a|setup") == "t.py::test_a"
+    assert context_test_id("t.py::test_a[x|y]") == "t.py::test_a[x|y]"
+    diff = (
+        "diff --git a/calc.py b/calc.py\n"
+        "--- a/calc.py\n"
+        "+++ b/calc.py\n"
+        "@@ -2 +2 @@ def add(a, b):\n"
+        "@@ -4,0 +5,2 @@\n"
+        "@@ -6,2 +7,0 @@\n"
+        "--- /dev/null\n"
+        "+++ b/new.py\n"
+        "@@ -0,0 +1 @@\n"
+    )
+    assert parse_diff_lines(diff) == {"calc.py": {2, 4, 5, 6, 7}, "new.py": set()}
+
+
+def test_tests_for_lines_and_files(recorded):
+    """Changed lines select the tests executing them; files select all."""
+    root, _ = recorded
+    impact_map = TestImpactMap(str(root / "impact.json"), str(root))
+    assert impact_map.tests_for({"calc.py": [2]}) == {"tests/test_calc.py::test_add"}
+    assert impact_map.tests_for({"calc.py": [6]}) == {"tests/test_calc.py::test_sub"}
+    assert impact_map.tests_for({"calc.py": [3]}) == set()
+    assert impact_map.tests_for({"calc.py": None}) == {
+        "tests/test_calc.py::test_add",
+        "tests/test_calc.py::test_sub",
+    }
+    assert impact_map.tests_for({"other.py": None}) == set()
+
+
+def test_edited_file_falls_back_to_file_level(recorded):
+    """Line numbers are only trusted for the recorded version of a file."""
+    root, _ = recorded
+    source = root / "calc.py"
+    impact_map = TestImpactMap(str(root / "impact.json"), str(root))
+    recorded_digest = file_digest(str(source))
+    assert impact_map.is_current("calc.py")
+
+    source.write_text("# header\n" + MODULE)
+    both = {"tests/test_calc.py::test_add", "tests/test_calc.py::test_sub"}
+    assert not impact_map.is_current("calc.py")
+    assert impact_map.tests_for({"calc.py": [2]}) == both
+    base = {"calc.py": recorded_digest}
+    assert impact_map.tests_for({"calc.py": [2]}, base) == {
+        "tests/test_calc.py::test_add"
+    }
+    assert impact_map.tests_for({"calc.py": [2]}, {"calc.py": "other"}) == both
+
+
+def test_touch_without_edit_stays_current(recorded):
+    """A changed mtime with the same contents rehashes once and is kept."""
+    root, _ = recorded
+    impact_map = TestImpactMap(str(root / "impact.json"), str(root))
+    os.utime(root / "calc.py", ns=(1, 1))
+    assert impact_map.is_current("calc.py")
+    assert impact_map.files["calc.py"].mtime_ns == 1
+
+
+def test_incremental_update_replaces_only_tests_run(recorded):
+    """Rerunning one test replaces its lines and keeps the others'."""
+    root, _ = recorded
+    impact_map = TestImpactMap(str(root / "impact.json"), str(root))
+    module = _load(root / "calc.py")
+    coverage = Coverage(source=[str(root)], data_file=None)
+    coverage.start()
+    try:
+        coverage.switch_context("tests/test_calc.py::test_add|run")
+        module.sub(3, 1)
+    finally:
+        coverage.stop()
+    impact_map.update(coverage.get_data(), {"tests/test_calc.py::test_add"})
+    assert impact_map.tests_for({"calc.py": [2]}) == set()
+    assert impact_map.tests_for({"calc.py": [6]}) == {
+        "tests/test_calc.py::test_add",
+        "tests/test_calc.py::test_sub",
+    }
+
+
+def test_unmeasured_files_drop_tests_that_ran(recorded):
+    """A rerun test that no longer executes a file is removed from it."""
+    root, _ = recorded
+    impact_map = TestImpactMap(str(root / "impact.json"), str(root))
+    empty = CoverageData(no_disk=True)
+    assert impact_map.update(empty, {"tests/test_calc.py::test_sub"}) == 0
+    assert impact_map.tests_for({"calc.py": None}) == {"tests/test_calc.py::test_add"}
+
+
+def test_unit_test_coverage_records_contexts(tmp_path):
+    """UnitTestCoverage attributes code to tests and answers queries."""
+    source = tmp_path / "calc.py"
+    source.write_text(MODULE)
+    map_path = str(tmp_path / "impact.json")
+    system = UnitTestCoverage(str(tmp_path), impact_map_path=map_path, root=tmp_path)
+    try:
+        module = _load(source)
+        with system.test_context("test_add"):
+            module.add(1, 2)
+    finally:
+        system.coverage.stop()
+    assert system.update_impact_map() == 1
+    assert system.tests_run == set()
+    assert os.path.exists(map_path)
+    assert system.tests_for_changes({str(source): [2]}) == {"test_add"}
+    diff = "--- a/calc.py\n+++ b/calc.py\n@@ -6 +6 @@\n"
+    assert system.tests_for_diff(diff) == set()
+
+
+def test_unit_test_coverage_requires_map(tmp_path):
+    """Impact queries need a configured map."""
+    system = UnitTestCoverage(str(tmp_path))
+    system.coverage.stop()
+    with pytest.raises(ValueError):
+        system.tests_for_changes({})
+
+
+def test_select_keeps_affected_and_changed_test_files():
+    """Tests in changed test files always run."""
+    selected, deselected = select(
+        ["t/a.py::one", "t/a.py::two", "t/b.py::three"],
+        {"t/a.py::one"},
+        {"t/b.py"},
+    )
+    assert selected == ["t/a.py::one", "t/b.py::three"]
+    assert deselected == ["t/a.py::two"]
+
+
+def test_changed_since_includes_untracked_files(tmp_path):
+    """New files count as changed; ignored ones do not."""
+
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    (tmp_path / ".gitignore").write_text(".coverage\n")
+    (tmp_path / "calc.py").write_text(MODULE)
+    git("add", ".")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-qm", "base")
+    (tmp_path / "calc.py").write_text(MODULE.replace("a - b", "b - a"))
+    (tmp_path / "test_new.py").write_text("def test_x():\n    pass\n")
+    (tmp_path / ".coverage").write_text("")
+    changes = changed_since(str(tmp_path), "HEAD")
+    assert changes == {"calc.py": {6}, "test_new.py": None}
+    with pytest.raises(pytest.UsageError):
+        changed_since(str(tmp_path), "no-such-ref")
+
+
+def test_unmapped_changes_force_a_full_run():
+    """Changed files unknown to the map and not tests are reported."""
+    changes = ["src/calc.py", "tests/test_new.py", "conftest.py", "pyproject.toml"]
+    assert unmapped_changes(changes, {"src/calc.py"}, {"tests/test_new.py"}) == [
+        "conftest.py",
+        "pyproject.toml",
+    ]
+    assert unmapped_changes(["src/calc.py"], {"src/calc.py"}, set()) == []
+
+
+def test_coverage_data_file_honors_environment(tmp_path, monkeypatch):
+    """The recorded data file follows COVERAGE_FILE."""
+    config = SimpleNamespace(
+        option=SimpleNamespace(cov_context="test"), rootpath=tmp_path
+    )
+    monkeypatch.delenv("COVERAGE_FILE", raising=False)
+    assert _coverage_data_file(config) == str(tmp_path / ".coverage")
+    monkeypatch.setenv("COVERAGE_FILE", "build/cov.data")
+    assert _coverage_data_file(config) == str(tmp_path / "build" / "cov.data")
+    config.option.cov_context = None
+    assert _coverage_data_file(config) is None
@@ -0,0 +1,104 @@
+"""Tests for the input validation layer."""
+
+import pytest
+
+from src.infrastructure.security.input_validation_layer import InputValidationLayer
+
+RULE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "minLength": 1, "maxLength": 20},
+        "path": {"type": "string", "pattern": "^/"},
+        "max_age_days": {"type": "integer", "minimum": 0, "maximum": 365},
+        "action": {"enum": ["delete", "shred", "archive"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "maxItems": 3},
+        "ratio": {"type": ["number", "null"]},
+    },
+    "required": ["name", "path"],
+    "additionalProperties": False,
+}
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"name": "caches", "path": "/tmp"}, True),
+        (
+            {
+                "name": "logs",
+                "path": "/var/log",
+                "max_age_days": 30,
+                "action": "shred",
+                "tags": ["a", "b"],
+                "ratio": None,
+            },
+            True,
+        ),
+        ({"name": "caches"}, False),
+        ({"name": "", "path": "/tmp"}, False),
+        ({"name": "x" * 21, "path": "/tmp"}, False),
+        ({"name": "caches", "path": "tmp"}, False),
+        ({"name": "caches", "path": "/tmp", "max_age_days": 400}, False),
+        ({"name": "caches", "path": "/tmp", "max_age_days": True}, False),
+        ({"name": "caches", "path": "/tmp", "action": "burn"}, False),
+        ({"name": "caches", "path": "/tmp", "action": ["delete"]}, False),
+        ({"name": "caches", "path": "/tmp", "tags": ["a", 1]}, False),
+        ({"name": "caches", "path": "/tmp", "tags": ["a"] * 4}, False),
+        ({"name": "caches", "path": "/tmp", "ratio": 0.5}, True),
+        ({"name": "caches", "path": "/tmp", "ratio": "half"}, False),
+        ({"name": "caches", "path": "/tmp", "extra": 1}, False),
+        (["not", "an", "object"], False),
+    ],
+)
+def test_validate_input(data, expected):
+    """Test validation against a representative rule schema."""
+    assert InputValidationLayer.validate_input(data, RULE_SCHEMA) is expected
+
+
+def test_validators_are_compiled_once_and_cached():
+    """Test schemas are cached by identity and by content."""
+    validator = InputValidationLayer.compile_schema(RULE_SCHEMA)
+    assert InputValidationLayer.compile_schema(RULE_SCHEMA) is validator
+    copy = {key: value for key, value in RULE_SCHEMA.items()}
+    assert InputValidationLayer.compile_schema(copy) is validator
+
+    items = [{"name": f"r{i}", "path": "/tmp"} for i in range(5)] + [{}]
+    assert InputValidationLayer.validate_many(items, RULE_SCHEMA) == [True] * 5 + [
+        False
+    ]
+    assert InputValidationLayer.validate_many([], {"minItems": 1}) == []
+    assert InputValidationLayer.validate_input([1], {"minItems": 1, "maxItems": 2})
+    assert not InputValidationLayer.validate_input([], {"minItems": 1})
+    assert InputValidationLayer.validate_input({"a": [1]}, {"enum": [{"a": [1]}]})
+
+
+@pytest.mark.parametrize("schema", [{"format": "email"}, {"type": "date"}])
+def test_unsupported_schemas_are_rejected(schema):
+    """Test unknown keywords and types raise ValueError."""
+    with pytest.raises(ValueError):
+        InputValidationLayer.compile_schema(schema)
+
+
+def test_sanitize_input():
+    """Test strings are stripped of whitespace and control characters."""
+    data = {" name\x00 ": "  cache\x1b[31m\n", "nested": [{"k": "\tv\x7f "}, 3]}
+    assert InputValidationLayer.sanitize_input(data) == {
+        "name": "cache[31m",
+        "nested": [{"k": "v"}, 3],
+    }
+
+
+@pytest.mark.parametrize(
+    "value, low, high, expected",
+    [
+        (5, 0, 10, True),
+        (0, 0, 10, True),
+        (11, 0, 10, False),
+        (-1, 0, None, False),
+        (99, None, None, True),
+        ("5", 0, 10, False),
+    ],
+)
+def test_check_boundaries(value, low, high, expected):
+    """Test inclusive boundary checks."""
+    assert InputValidationLayer.check_boundaries(value, low, high) is expected
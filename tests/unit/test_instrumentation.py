@@ -0,0 +1,117 @@
+"""Tests for spans and the profiling mode."""
+
+import os
+import pstats
+import stat
+import threading
+import tracemalloc
+
+import pytest
+
+from src.domain.services.disk_analyzer import DiskAnalyzer
+from src.infrastructure.monitoring.instrumentation import (
+    format_spans,
+    profiling,
+)
+from src.shared.spans import INSTRUMENTATION, Instrumentation
+
+
+def test_disabled_spans_record_nothing():
+    """Disabled instrumentation hands out the shared no-op span."""
+    registry = Instrumentation()
+    calls = []
+
+    @registry.timed()
+    def work(value):
+        calls.append(value)
+        return value * 2
+
+    with registry.span("block") as first, registry.span("other") as second:
+        pass
+    assert first is second
+    assert work(2) == 4 and calls == [2]
+    assert work.__name__ == "work"
+    assert registry.snapshot() == {}
+
+
+def test_enabled_spans_aggregate_durations_and_errors():
+    """Spans record durations per name and count the ones that raised."""
+    now = [0.0]
+    registry = Instrumentation(enabled=True, clock=lambda: now[0])
+
+    @registry.timed("op")
+    def op(seconds, fail=False):
+        now[0] += seconds
+        if fail:
+            raise OSError("boom")
+
+    op(0.001)
+    op(0.003)
+    with pytest.raises(OSError):
+        op(0.002, fail=True)
+    with registry.span("block"):
+        now[0] += 1.0
+
+    summaries = registry.snapshot()
+    assert list(summaries) == ["block", "op"]
+    summary = summaries["op"]
+    assert (summary.count, summary.errors) == (3, 1)
+    assert summary.total_seconds == pytest.approx(0.006)
+    assert summary.mean == pytest.approx(0.002)
+    assert summary.minimum == pytest.approx(0.001)
+    assert summary.maximum == pytest.approx(0.003)
+    assert summary.p50 == pytest.approx(0.002, rel=0.05)
+    assert "op" in format_spans(summaries)
+
+    registry.reset()
+    assert registry.snapshot() == {}
+
+
+def test_spans_from_threads_are_merged():
+    """Each thread records into its own shard; snapshots merge them."""
+    registry = Instrumentation(enabled=True)
+
+    def work():
+        for _ in range(100):
+            with registry.span("threaded"):
+                pass
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert registry.snapshot()["threaded"].count == 400
+
+
+def test_analyzers_are_instrumented(tmp_path):
+    """Hot paths record spans on the default registry when enabled."""
+    (tmp_path / "file").write_bytes(b"x" * 10)
+    INSTRUMENTATION.reset()
+    INSTRUMENTATION.enabled = True
+    try:
+        DiskAnalyzer().scan_directory(str(tmp_path))
+    finally:
+        INSTRUMENTATION.enabled = False
+    assert INSTRUMENTATION.snapshot()["disk.scan_directory"].count == 1
+    INSTRUMENTATION.reset()
+
+
+def test_profiling_writes_private_loadable_files(tmp_path):
+    """A profiling session writes pstats, tracemalloc and text reports."""
+    registry = Instrumentation()
+    prefix = str(tmp_path / "scan")
+    with profiling(prefix, instrumentation=registry) as result:
+        with registry.span("work"):
+            data = [bytes(1024) for _ in range(100)]
+    del data
+
+    assert not registry.enabled
+    assert not tracemalloc.is_tracing()
+    assert result.seconds > 0 and result.peak_memory_bytes > 0
+    for path in (result.stats_path, result.memory_path, result.report_path):
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert pstats.Stats(result.stats_path).total_calls > 0
+    assert tracemalloc.Snapshot.load(result.memory_path).traces
+    report = open(result.report_path).read()
+    assert "work" in report and "largest allocation sites" in report
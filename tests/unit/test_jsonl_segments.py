@@ -0,0 +1,152 @@
+"""Tests for JSON-lines audit segments and their time index."""
+
+import json
+import logging
+from datetime import datetime, timezone
+
+import pytest
+
+from src.infrastructure.logging.audit_event import AuditEvent
+from src.infrastructure.logging.audit_logging_system import AuditLoggingSystem
+from src.infrastructure.logging.jsonl_segments import (
+    JsonLinesSegmentHandler,
+    SegmentIndex,
+)
+
+
+def _record(timestamp: float, index: int) -> logging.LogRecord:
+    """Build an audit record at a fixed time."""
+    event = AuditEvent("test", "event {index}", {"index": index})
+    record = logging.LogRecord("audit", logging.INFO, "", 0, event, (), None)
+    record.created = timestamp
+    return record
+
+
+def _fill(handler: JsonLinesSegmentHandler, count: int) -> None:
+    """Write ``count`` records one second apart, in batches of ten."""
+    records = [_record(1000.0 + index, index) for index in range(count)]
+    for start in range(0, count, 10):
+        handler.emit_batch(records[start : start + 10])
+
+
+def test_records_are_json_lines(tmp_path):
+    """Test each record becomes one JSON object with ts first."""
+    handler = JsonLinesSegmentHandler(str(tmp_path))
+    _fill(handler, 3)
+    handler.close()
+    lines = (tmp_path / "audit-000001.jsonl").read_text().splitlines()
+    assert len(lines) == 3
+    assert lines[0].startswith('{"ts":1000.0,')
+    assert json.loads(lines[2]) == {
+        "ts": 1002.0,
+        "level": "INFO",
+        "type": "test",
+        "index": 2,
+    }
+
+
+def test_rotation_and_sparse_index(tmp_path):
+    """Test segments rotate by size and carry sparse index entries."""
+    handler = JsonLinesSegmentHandler(str(tmp_path), max_bytes=2000, index_interval=300)
+    _fill(handler, 200)
+    handler.close()
+
+    sequences = handler.segment_sequences()
+    assert len(sequences) > 5
+    for sequence in sequences[:-1]:
+        assert (tmp_path / f"audit-{sequence:06d}.jsonl").stat().st_size <= 2000
+    index = SegmentIndex.load(handler.index_path(sequences[0]))
+    assert 1 < len(index) < 20
+    assert index.offsets[0] == 0
+
+
+def test_read_range_across_segments(tmp_path):
+    """Test time-range queries return exactly the requested events."""
+    handler = JsonLinesSegmentHandler(str(tmp_path), max_bytes=2000, index_interval=300)
+    _fill(handler, 200)
+
+    events = list(handler.read_range(1050.0, 1120.0))
+    assert [event["index"] for event in events] == list(range(50, 121))
+    assert list(handler.read_range(5000.0, 6000.0)) == []
+    assert [e["index"] for e in handler.read_range(0.0, 1002.0)] == [0, 1, 2]
+    handler.close()
+
+
+def test_timestamps_are_clamped_monotonic(tmp_path):
+    """Test out-of-order records get a non-decreasing timestamp."""
+    handler = JsonLinesSegmentHandler(str(tmp_path))
+    handler.emit_batch([_record(10.0, 0), _record(9.5, 1), _record(11.0, 2)])
+    assert [e["ts"] for e in handler.read_range(0.0, 100.0)] == [10.0, 10.0, 11.0]
+    handler.close()
+
+
+def test_reopen_continues_segment(tmp_path):
+    """Test a new handler appends to the newest existing segment."""
+    handler = JsonLinesSegmentHandler(str(tmp_path))
+    _fill(handler, 5)
+    handler.close()
+    reopened = JsonLinesSegmentHandler(str(tmp_path))
+    reopened.emit_batch([_record(2000.0, 99)])
+    assert [e["index"] for e in reopened.read_range(1000.0, 3000.0)] == [
+        0,
+        1,
+        2,
+        3,
+        4,
+        99,
+    ]
+    reopened.close()
+
+
+def test_max_segments_retention(tmp_path):
+    """Test old segments are deleted beyond max_segments."""
+    handler = JsonLinesSegmentHandler(str(tmp_path), max_bytes=1000, max_segments=2)
+    _fill(handler, 100)
+    handler.close()
+    assert len(handler.segment_sequences()) == 2
+
+
+def test_plain_records_are_serialized(tmp_path):
+    """Test records that are not audit events still produce JSON."""
+    handler = JsonLinesSegmentHandler(str(tmp_path))
+    record = logging.LogRecord("x", logging.WARNING, "", 0, "hi %s", ("there",), None)
+    handler.emit(record)
+    event = next(handler.read_range(0.0, record.created + 1))
+    assert event["message"] == "hi there"
+    assert event["level"] == "WARNING"
+    handler.close()
+
+
+def test_audit_system_structured_events(tmp_path):
+    """Test audit methods write structured events that can be queried."""
+    start = datetime.now(timezone.utc)
+    with AuditLoggingSystem(
+        log_dir=str(tmp_path), logger_name="audit.test.structured"
+    ) as audit:
+        audit.log_operation("delete", "success", {"path": "/tmp/x", "bytes": 10})
+        audit.log_user_action("alice", "scan")
+        events = list(audit.query_events(start.timestamp() - 1, datetime.now()))
+
+    assert [event["type"] for event in events] == [
+        "operation",
+        "user_action",
+    ]
+    assert events[0]["details"] == {"path": "/tmp/x", "bytes": 10}
+    assert events[1]["user"] == "alice"
+
+
+def test_disabled_level_builds_nothing(tmp_path):
+    """Test nothing is queued when the audit level is disabled."""
+    audit = AuditLoggingSystem(handlers=[], logger_name="audit.test.disabled")
+    audit.logger.setLevel(logging.CRITICAL)
+    audit.log_system_event("ignored")
+    assert audit.queue.qsize() == 0
+    audit.shutdown()
+
+
+def test_query_requires_log_dir():
+    """Test querying without a log directory is rejected."""
+    audit = AuditLoggingSystem(handlers=[], logger_name="audit.test.nodir")
+    with pytest.raises(RuntimeError):
+        audit.query_events(0.0, 1.0)
+    audit.shutdown()
@@ -0,0 +1,176 @@
+"""Tests for the maintenance scheduler and idle detection."""
+
+import threading
+
+from src.application.maintenance_scheduler import (
+    CPU,
+    DISK,
+    MaintenanceJob,
+    MaintenanceScheduler,
+)
+from src.domain.services.idle_detector import IdleDetector
+
+
+def test_jobs_run_by_priority_and_duplicates_merge():
+    """Waiting duplicates merge into one run at the more urgent priority."""
+    order = []
+    scheduler = MaintenanceScheduler(limits={DISK: 1})
+    assert scheduler.submit(MaintenanceJob("scan", "/a", lambda: order.append("a1"), 5))
+    assert scheduler.submit(MaintenanceJob("scan", "/b", lambda: order.append("b"), 1))
+    assert not scheduler.submit(
+        MaintenanceJob("scan", "/a", lambda: order.append("a2"), 0)
+    )
+    assert not scheduler.submit(
+        MaintenanceJob("scan", "/a", lambda: order.append("a3"), 9)
+    )
+    assert scheduler.pending_count == 2
+
+    scheduler.start()
+    assert scheduler.wait_until_done(5)
+    scheduler.stop(5)
+    assert order == ["a3", "b"]
+    first = scheduler.history[0]
+    assert (first.path, first.coalesced, first.ok) == ("/a", 2, True)
+    assert scheduler.timings()["maintenance.scan"].count == 2
+
+
+def test_concurrency_is_limited_per_resource_class():
+    """Disk-bound jobs run one at a time while CPU-bound jobs overlap."""
+    lock = threading.Lock()
+    running = {DISK: 0, CPU: 0}
+    peak = {DISK: 0, CPU: 0}
+    cpu_overlap = threading.Barrier(2, timeout=5)
+
+    def work(resource):
+        def action():
+            with lock:
+                running[resource] += 1
+                peak[resource] = max(peak[resource], running[resource])
+            if resource == CPU:
+                cpu_overlap.wait()
+            else:
+                threading.Event().wait(0.02)
+            with lock:
+                running[resource] -= 1
+
+        return action
+
+    scheduler = MaintenanceScheduler(limits={DISK: 1, CPU: 2})
+    for index in range(3):
+        scheduler.submit(MaintenanceJob("wipe", f"/d{index}", work(DISK)))
+    for index in range(2):
+        scheduler.submit(
+            MaintenanceJob("compact", f"/c{index}", work(CPU), resource=CPU)
+        )
+    scheduler.start()
+    assert scheduler.wait_until_done(5)
+    scheduler.stop(5)
+    assert peak == {DISK: 1, CPU: 2}
+    assert all(record.ok for record in scheduler.history)
+
+
+def test_heavy_jobs_wait_for_an_idle_host():
+    """Light jobs run at once; heavy ones start only once the host is idle."""
+    idle = threading.Event()
+    checks = []
+
+    class Detector:
+        def is_idle(self):
+            checks.append(idle.is_set())
+            return idle.is_set()
+
+    ran = []
+    scheduler = MaintenanceScheduler(
+        limits={DISK: 2}, idle_detector=Detector(), idle_check_interval=0.01
+    )
+    scheduler.submit(
+        MaintenanceJob("scan", "/", lambda: ran.append("heavy"), 0, heavy=True)
+    )
+    scheduler.submit(MaintenanceJob("scan", "/tmp", lambda: ran.append("light"), 5))
+    scheduler.start()
+    assert not scheduler.wait_until_done(0.1)
+    assert ran == ["light"] and scheduler.pending_count == 1
+    idle.set()
+    assert scheduler.wait_until_done(5)
+    scheduler.stop(5)
+    assert ran == ["light", "heavy"]
+    assert checks[0] is False and checks[-1] is True
+
+
+def test_idle_checks_do_not_hold_the_scheduler_lock():
+    """A slow idle detector never blocks submitters."""
+    locked = []
+
+    class Detector:
+        def is_idle(self):
+            def probe():
+                acquired = scheduler._condition.acquire(timeout=5)
+                locked.append(not acquired)
+                if acquired:
+                    scheduler._condition.release()
+
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            return True
+
+    ran = []
+    scheduler = MaintenanceScheduler(idle_detector=Detector())
+    scheduler.submit(MaintenanceJob("scan", "/", lambda: ran.append(1), 0, heavy=True))
+    scheduler.start()
+    assert scheduler.wait_until_done(5)
+    scheduler.stop(5)
+    assert ran == [1] and locked == [False]
+
+
+def test_failures_are_recorded():
+    """A raising job is recorded as failed and does not stop the scheduler."""
+
+    def fail():
+        raise OSError("disk gone")
+
+    scheduler = MaintenanceScheduler()
+    scheduler.start()
+    scheduler.start()
+    scheduler.submit(MaintenanceJob("cleanup", "/x", fail))
+    scheduler.submit(MaintenanceJob("cleanup", "/y", lambda: None))
+    assert scheduler.wait_until_done(5)
+    scheduler.stop(5)
+    records = {record.path: record for record in scheduler.history}
+    assert records["/x"].error == "OSError: disk gone"
+    assert records["/y"].ok
+    timing = scheduler.timings()
+    assert timing["maintenance.cleanup"].errors == 1
+    assert timing["maintenance.cleanup.wait"].count == 2
+
+
+def test_idle_detector_checks_load_and_disk_throughput():
+    """Load per CPU and bytes per second between checks must both be low."""
+    load = [(1.0, 0.0, 0.0)]
+    io = [0]
+    now = [0.0]
+    detector = IdleDetector(
+        max_load_per_cpu=0.5,
+        max_io_bytes_per_second=1000,
+        load_average=lambda: load[0],
+        io_bytes=lambda: io[0],
+        cpu_count=4,
+        clock=lambda: now[0],
+    )
+    assert detector.is_idle() and detector.load_per_cpu == 0.25
+
+    now[0], io[0] = 2.0, 10_000
+    assert not detector.is_idle()
+    assert detector.io_bytes_per_second == 5000
+
+    now[0], io[0] = 4.0, 11_000
+    assert detector.is_idle()
+    load[0] = (3.0, 0.0, 0.0)
+    now[0] = 5.0
+    assert not detector.is_idle()
+
+    unknown_io = IdleDetector(
+        load_average=lambda: (0.0, 0.0, 0.0), io_bytes=lambda: None
+    )
+    assert unknown_io.is_idle() and unknown_io.io_bytes_per_second == 0.0
+    assert isinstance(IdleDetector().is_idle(), bool)
@@ -7,7 +7,14 @@ import psutil
 import pytest
 from pydantic import BaseModel
 
-from src.domain.models.memory_info import MemoryInfo, ProcessMemoryInfo
+from src.domain.models.memory_info import (
+    MemoryInfo,
+    MemoryRecord,
+    ProcessMemoryInfo,
+    ProcessMemoryRecord,
+    dump_many,
+    dump_many_json,
+)
 from src.domain.services.memory_analyzer import MemoryAnalyzer
 
 
@@ -228,3 +235,38 @@ def test_get_top_memory_processes_with_errors():
     processes = analyzer.get_top_memory_processes(limit=0)
     assert isinstance(processes, list)
     assert len(processes) == 0
+
+
+def test_process_memory_record_to_model():
+    """Test lazy conversion of a lightweight record to the API model."""
+    record = ProcessMemoryRecord(1234, "test", 5.0, 1000, 2000)
+    model = record.to_model()
+    assert isinstance(model, ProcessMemoryInfo)
+    assert model.pid == 1234
+    assert model.rss_bytes == 1000
+
+
+def test_memory_record_to_model():
+    """Test lazy conversion of a system memory record."""
+    model = MemoryRecord(16000, 8000, 8000, 50.0).to_model()
+    assert isinstance(model, MemoryInfo)
+    assert model.used_percent == 50.0
+
+
+def test_dump_many_records_and_models():
+    """Test bulk serialization of records and models."""
+    records = [ProcessMemoryRecord(pid, "p", 1.0, 10, 20) for pid in range(3)]
+    models = [record.to_model() for record in records]
+    assert dump_many(records) == dump_many(models)
+    assert dump_many(records)[2]["pid"] == 2
+    assert dump_many_json(records) == dump_many_json(models)
+    assert dump_many([]) == []
+    assert dump_many_json([]) == b"[]"
+
+
+def test_sample_process_memory_returns_records():
+    """Test bulk sampling returns lightweight records."""
+    analyzer = MemoryAnalyzer()
+    records = analyzer.sample_process_memory()
+    assert records
+    assert all(isinstance(record, ProcessMemoryRecord) for record in records)
@@ -0,0 +1,161 @@
+"""Tests for memory pressure sampling and alerting."""
+
+import mmap
+from unittest.mock import Mock, patch
+
+import pytest
+
+from src.domain.models.memory_alert import RateRule, ThresholdRule
+from src.domain.models.memory_info import MemoryPressureInfo, MemoryPressureRecord
+from src.domain.services.memory_alerts import MemoryAlertEngine
+from src.domain.services.memory_analyzer import MemoryAnalyzer
+from src.domain.services.memory_pressure import (
+    MemoryPressureReader,
+    parse_meminfo,
+    parse_psi,
+    parse_vmstat_swap,
+)
+
+MEMINFO = b"""MemTotal:       16000000 kB
+MemAvailable:    8000000 kB
+Buffers:           10000 kB
+Cached:          2000000 kB
+Active(file):     500000 kB
+Inactive(file):  1000000 kB
+Dirty:               100 kB
+SwapTotal:       4000000 kB
+SwapFree:        3000000 kB
+SReclaimable:     250000 kB
+"""
+
+PSI = b"""some avg10=1.50 avg60=0.75 avg300=0.10 total=12345
+full avg10=0.50 avg60=0.25 avg300=0.00 total=678
+"""
+
+
+def _write_proc(root, pswpin: int, pswpout: int) -> None:
+    """Write a fake procfs tree."""
+    (root / "pressure").mkdir(exist_ok=True)
+    (root / "meminfo").write_bytes(MEMINFO)
+    (root / "vmstat").write_bytes(
+        f"nr_free_pages 1\npswpin {pswpin}\npswpout {pswpout}\n".encode()
+    )
+    (root / "pressure" / "memory").write_bytes(PSI)
+
+
+def test_parse_meminfo():
+    """Test meminfo parsing converts kB to bytes."""
+    values = parse_meminfo(MEMINFO)
+    assert values[b"Cached"] == 2000000 * 1024
+    assert values[b"SReclaimable"] == 250000 * 1024
+    assert b"MemTotal" not in values
+
+
+def test_parse_vmstat_and_psi():
+    """Test swap counter and PSI parsing."""
+    assert parse_vmstat_swap(b"a 1\npswpin 7\npswpout 9\n") == (7, 9)
+    assert parse_vmstat_swap(b"a 1\n") == (0, 0)
+    assert parse_psi(PSI) == (1.5, 0.75, 0.5, 0.25)
+
+
+def test_reader_samples_procfs(tmp_path):
+    """Test a sample combines meminfo, vmstat and PSI."""
+    _write_proc(tmp_path, 0, 0)
+    with MemoryPressureReader(str(tmp_path)) as reader:
+        assert reader.has_psi
+        first = reader.sample()
+        _write_proc(tmp_path, 100, 50)
+        second = reader.sample()
+
+    assert first.swap_in_bytes_per_sec == 0.0
+    assert first.cached_bytes == 2000000 * 1024
+    assert first.reclaimable_bytes == (500000 + 1000000 + 250000) * 1024
+    assert first.swap_free_bytes == 3000000 * 1024
+    assert first.psi_some_avg10 == 1.5
+    assert second.swap_in_bytes_per_sec > 0
+    assert second.swap_out_bytes_per_sec == pytest.approx(
+        second.swap_in_bytes_per_sec / 2
+    )
+    assert isinstance(second.to_model(), MemoryPressureInfo)
+
+
+@patch("psutil.swap_memory")
+@patch("psutil.virtual_memory")
+def test_reader_falls_back_without_procfs(mock_vm, mock_swap, tmp_path):
+    """Test psutil fallback when procfs is unavailable."""
+    mock_vm.return_value = Mock(available=10, cached=5, buffers=1, inactive=3)
+    mock_swap.return_value = Mock(total=100, free=80, sin=0, sout=mmap.PAGESIZE)
+    reader = MemoryPressureReader(str(tmp_path / "missing"))
+    record = reader.sample()
+    assert not reader.has_psi
+    assert record.available_bytes == 10
+    assert record.reclaimable_bytes == 3
+    assert record.psi_some_avg10 is None
+
+
+def _sample(timestamp: float, **values: float) -> MemoryPressureRecord:
+    """Build a pressure record with defaults."""
+    fields = dict(
+        available_bytes=1000,
+        cached_bytes=0,
+        buffers_bytes=0,
+        reclaimable_bytes=0,
+        dirty_bytes=0,
+        swap_total_bytes=0,
+        swap_free_bytes=0,
+        swap_in_bytes_per_sec=0.0,
+        swap_out_bytes_per_sec=0.0,
+        psi_some_avg10=0.0,
+    )
+    fields.update(values)
+    return MemoryPressureRecord(timestamp=timestamp, **fields)
+
+
+def test_threshold_rule_hysteresis():
+    """Test a threshold alert raises once and clears only below clear_at."""
+    engine = MemoryAlertEngine([ThresholdRule("psi", "psi_some_avg10", 10.0, 5.0)])
+
+    assert engine.evaluate(_sample(0.0, psi_some_avg10=4.0)) == []
+    raised = engine.evaluate(_sample(0.1, psi_some_avg10=12.0))
+    assert [alert.active for alert in raised] == [True]
+    assert engine.evaluate(_sample(0.2, psi_some_avg10=8.0)) == []
+    assert engine.evaluate(_sample(0.3, psi_some_avg10=11.0)) == []
+    assert engine.active_rules == ["psi"]
+    cleared = engine.evaluate(_sample(0.4, psi_some_avg10=5.0))
+    assert [alert.active for alert in cleared] == [False]
+    assert engine.active_rules == []
+
+
+def test_threshold_rule_below():
+    """Test alerts for metrics where low values are bad."""
+    engine = MemoryAlertEngine(
+        [ThresholdRule("low", "available_bytes", 100, 200, below=True)]
+    )
+    assert engine.evaluate(_sample(0.0, available_bytes=50))[0].active
+    assert engine.evaluate(_sample(0.1, available_bytes=150)) == []
+    assert not engine.evaluate(_sample(0.2, available_bytes=250))[0].active
+
+
+def test_rate_rule():
+    """Test a rate-of-change alert on a falling metric."""
+    engine = MemoryAlertEngine(
+        [RateRule("drain", "available_bytes", -1000.0, -100.0, below=True)]
+    )
+    assert engine.evaluate(_sample(0.0, available_bytes=10000)) == []
+    alerts = engine.evaluate(_sample(0.5, available_bytes=9000))
+    assert alerts[0].active
+    assert alerts[0].value == pytest.approx(-2000.0)
+    assert not engine.evaluate(_sample(1.0, available_bytes=9000))[0].active
+
+
+def test_rule_validation():
+    """Test rules whose clear level is on the wrong side are rejected."""
+    with pytest.raises(ValueError):
+        MemoryAlertEngine([ThresholdRule("bad", "psi_some_avg10", 10.0, 20.0)])
+
+
+def test_analyzer_memory_pressure():
+    """Test the analyzer exposes memory pressure information."""
+    info = MemoryAnalyzer().get_memory_pressure()
+    assert isinstance(info, MemoryPressureInfo)
+    assert info.available_bytes > 0
@@ -0,0 +1,168 @@
+"""Tests for in-process metric aggregation."""
+
+import math
+import random
+import threading
+from datetime import datetime
+from typing import Dict, List
+
+import pytest
+
+from src.infrastructure.logging.audit_logging_system import AuditLoggingSystem
+from src.infrastructure.logging.metrics_aggregator import (
+    MetricsAggregator,
+    MetricSummary,
+)
+from src.shared.histogram import BUCKET_COUNT, LogHistogram
+
+
+class CollectingSink:
+    """Sink that keeps every flushed summary."""
+
+    def __init__(self) -> None:
+        """Initialize with nothing flushed."""
+        self.summaries: List[MetricSummary] = []
+        self.counters: List[Dict[str, float]] = []
+
+    def __call__(self, summaries, counters):
+        """Collect one flush."""
+        self.summaries.extend(summaries)
+        self.counters.append(counters)
+
+
+def test_bucket_boundaries():
+    """Test bucket indexes cover zero, tiny and huge values."""
+    assert LogHistogram.bucket_of(0.0) == 0
+    assert LogHistogram.bucket_of(-5.0) == 0
+    assert LogHistogram.bucket_of(1e-300) == 1
+    assert LogHistogram.bucket_of(1e300) == BUCKET_COUNT - 1
+    for value in (0.001, 1.0, 3.7, 12345.0):
+        estimate = LogHistogram.bucket_value(LogHistogram.bucket_of(value))
+        assert estimate == pytest.approx(value, rel=0.02)
+
+
+def test_non_finite_values():
+    """Test infinities are clamped to the edge buckets and NaN is ignored."""
+    assert LogHistogram.bucket_of(math.inf) == BUCKET_COUNT - 1
+    assert LogHistogram.bucket_of(-math.inf) == 0
+    assert LogHistogram.bucket_of(math.nan) == 0
+    histogram = LogHistogram()
+    for value in (1.0, math.nan, math.inf):
+        histogram.record(value)
+    assert histogram.count == 2
+    assert histogram.maximum == math.inf
+    assert histogram.quantile(1.0) == LogHistogram.bucket_value(BUCKET_COUNT - 1)
+
+
+def test_quantiles_are_within_bucket_precision():
+    """Test p50/p99 estimates against exact values."""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(0, 1) for _ in range(10000)]
+    histogram = LogHistogram()
+    for value in values:
+        histogram.record(value)
+    ordered = sorted(values)
+    assert histogram.quantile(0.5) == pytest.approx(ordered[4999], rel=0.03)
+    assert histogram.quantile(0.99) == pytest.approx(ordered[9899], rel=0.03)
+    assert histogram.minimum == ordered[0]
+    assert histogram.maximum == ordered[-1]
+    assert LogHistogram().quantile(0.5) == 0.0
+
+
+def test_merge():
+    """Test merging histograms adds their observations."""
+    first, second = LogHistogram(), LogHistogram()
+    first.record(1.0)
+    second.record(100.0)
+    first.merge(second)
+    first.merge(LogHistogram())
+    assert first.count == 2
+    assert first.maximum == 100.0
+
+
+def test_concurrent_recording_and_flush():
+    """Test many threads record into one aggregator without losing values."""
+    sink = CollectingSink()
+    aggregator = MetricsAggregator(sink)
+
+    def work() -> None:
+        for index in range(1000):
+            aggregator.record("latency", index / 1000)
+            aggregator.increment("files")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summaries = aggregator.flush()
+
+    assert len(summaries) == 1
+    assert summaries[0].count == 8000
+    assert summaries[0].maximum == pytest.approx(0.999)
+    assert sink.counters == [{"files": 8000}]
+    assert aggregator.flush() == []
+
+
+def test_flush_reuses_histograms_and_drops_dead_shards():
+    """Test windows reset histograms in place and exited threads are pruned."""
+    sink = CollectingSink()
+    aggregator = MetricsAggregator(sink)
+
+    def histograms():
+        shard = aggregator._shard()
+        return {id(h) for h in (*shard.histograms.values(), *shard.spare.values())}
+
+    for window in range(4):
+        aggregator.record("latency", float(window + 1))
+        aggregator.increment("files")
+        summary = aggregator.flush()[0]
+        assert (summary.count, summary.maximum) == (1, window + 1)
+        if window == 1:
+            allocated = histograms()
+    assert histograms() == allocated
+    assert sink.counters == [{"files": 1}] * 4
+
+    thread = threading.Thread(target=aggregator.record, args=("latency", 9.0))
+    thread.start()
+    thread.join()
+    assert len(aggregator._shards) == 2
+    assert aggregator.flush()[0].maximum == 9.0
+    assert len(aggregator._shards) == 1
+    assert aggregator.flush() == []
+
+
+def test_periodic_flush():
+    """Test the background thread flushes on its interval."""
+    sink = CollectingSink()
+    aggregator = MetricsAggregator(sink, flush_interval=0.01)
+    aggregator.start()
+    aggregator.record("x", 1.0)
+    for _ in range(500):
+        if sink.summaries:
+            break
+        threading.Event().wait(0.01)
+    aggregator.stop()
+    assert sink.summaries[0].name == "x"
+
+
+def test_audit_system_writes_metric_summaries(tmp_path):
+    """Test performance metrics become summary events instead of lines."""
+    now = datetime.now()
+    with AuditLoggingSystem(
+        log_dir=str(tmp_path), logger_name="audit.test.metrics", metrics_interval=60
+    ) as audit:
+        for index in range(1, 101):
+            audit.log_performance_metric("scan_seconds", float(index), now)
+        assert list(audit.query_events(0, now.timestamp() + 60)) == []
+    reader = AuditLoggingSystem(
+        log_dir=str(tmp_path), logger_name="audit.test.metrics.read"
+    )
+    events = list(reader.query_events(0, datetime.now().timestamp() + 60))
+    reader.shutdown()
+    assert len(events) == 1
+    assert events[0]["type"] == "metric_summary"
+    assert events[0]["count"] == 100
+    assert events[0]["min"] == 1.0
+    assert events[0]["max"] == 100.0
+    assert events[0]["p50"] == pytest.approx(50, rel=0.03)
@@ -0,0 +1,111 @@
+"""Tests for the Prometheus metrics exporter."""
+
+import threading
+
+import pytest
+
+from src.application.metrics_exporter import MetricsExporter
+from src.application.samplers import SnapshotCell
+from src.domain.models.cpu_info import CpuRecord, CpuSample, ProcessCpuRecord
+from src.domain.models.disk_info import DiskInfo, ScanProgress
+from src.domain.models.memory_info import MemoryRecord, ProcessMemoryRecord
+
+
+class _Source:
+    """Snapshot source driven by the test."""
+
+    def __init__(self):
+        self.cell = SnapshotCell()
+        self.running = False
+
+    @property
+    def snapshot(self):
+        return self.cell.snapshot
+
+    def start(self):
+        self.running = True
+
+    def stop(self, timeout=None):
+        self.running = False
+
+
+def test_payload_is_rendered_only_when_snapshots_change():
+    """Scrapes read a prebuilt payload; rendering follows the samplers."""
+    names = ("memory", "cpu", "processes", "disks", "scan")
+    sources = {name: _Source() for name in names}
+    written = []
+    exporter = MetricsExporter(sources, on_render=written.append, clock=lambda: 12.5)
+    assert exporter.current() == b""
+
+    sources["memory"].cell.publish(MemoryRecord(100, 60, 40, 40.0))
+    sources["cpu"].cell.publish(
+        CpuSample(
+            CpuRecord(25.0, 20.0, 5.0, 0.0, 4),
+            [ProcessCpuRecord(9, "worker", 99.5, 12.0)],
+        )
+    )
+    sources["processes"].cell.publish(
+        [ProcessMemoryRecord(9, 'we"ird', 1.0, 2048, 4096)]
+    )
+    sources["disks"].cell.publish([DiskInfo("/", 100, 30, 70)])
+    sources["scan"].cell.publish(ScanProgress("/data", 2, 5, 512, 0, done=True))
+    assert exporter.refresh() is True
+    payload = exporter.current().decode()
+    for line in (
+        "mac_cleaner_memory_used_bytes 40",
+        "mac_cleaner_cpu_busy_percent 25.0",
+        'mac_cleaner_process_cpu_percent{pid="9",name="worker"} 99.5',
+        'mac_cleaner_process_resident_bytes{pid="9",name="we\\"ird"} 2048',
+        'mac_cleaner_disk_free_bytes{path="/"} 70',
+        'mac_cleaner_scan_done{root="/data"} 1',
+        'mac_cleaner_source_up{source="disks"} 1',
+        "mac_cleaner_last_update_timestamp_seconds 12.5",
+    ):
+        assert line in payload.splitlines()
+    assert written == [exporter.current()]
+
+    assert exporter.refresh() is False
+    sources["memory"].cell.publish(MemoryRecord(100, 60, 40, 40.0))
+    assert exporter.refresh() is False
+    sources["disks"].cell.fail(OSError("unmounted"))
+    assert exporter.refresh() is True
+    assert 'mac_cleaner_source_up{source="disks"} 0' in exporter.current().decode()
+    assert exporter.renders == 2 and len(written) == 2
+
+
+def test_start_stop_and_unknown_sources():
+    """Starting renders at once and runs the sources; unknown names fail."""
+    source = _Source()
+    exporter = MetricsExporter({"memory": source}, interval=0.01)
+    exporter.start()
+    assert source.running and exporter.renders == 1
+    assert b"mac_cleaner_memory" not in exporter.current()
+    exporter.stop()
+    assert not source.running
+    with pytest.raises(ValueError, match="gpu"):
+        MetricsExporter({"gpu": source})
+
+
+def test_failed_render_callback_is_logged_and_retried(caplog):
+    """An on_render failure does not stop the refresh thread."""
+    source = _Source()
+    calls = []
+    retried = threading.Event()
+
+    def on_render(payload):
+        calls.append(payload)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        if len(calls) == 3:
+            retried.set()
+
+    exporter = MetricsExporter(
+        {"memory": source}, interval=0.01, on_render=on_render, clock=lambda: 1.0
+    )
+    exporter.start()
+    source.cell.publish(MemoryRecord(100, 60, 40, 40.0))
+    assert retried.wait(5)
+    exporter.stop()
+    assert calls[1] == calls[2]
+    assert "Metrics refresh failed" in caplog.text
+    assert "disk full" in caplog.text
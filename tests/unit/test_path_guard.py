@@ -0,0 +1,150 @@
+"""Tests for the protected-path guard."""
+
+import os
+
+import pytest
+
+from src.infrastructure.security.path_guard import PathGuard
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """Create a small tree with a symlinked directory."""
+    for directory in ("system/lib", "home/user/Library/Caches", "home/user/Pinned"):
+        (tmp_path / directory).mkdir(parents=True)
+    os.symlink(tmp_path / "system", tmp_path / "home/user/link")
+    return tmp_path
+
+
+@pytest.fixture
+def guard(tree):
+    """Build a guard over the tree."""
+    return PathGuard(
+        deny=[tree / "system", tree / "home/user/Library", tree / "home/user/Pinned"],
+        allow=[tree / "home/user/Library/Caches"],
+        exact=[tree / "home/user", tree / "home"],
+    )
+
+
+@pytest.mark.parametrize(
+    "relative, reason",
+    [
+        ("system", "inside protected path"),
+        ("system/lib/libc.so", "inside protected path"),
+        ("home/user/Pinned/notes.txt", "inside protected path"),
+        ("home/user/Library/Preferences/x.plist", "inside protected path"),
+        ("home/user/Library/Caches/app/data", None),
+        ("home/user/Library/Caches", None),
+        ("home/user", "protected location"),
+        ("home", "protected location"),
+        ("home/user/Downloads/file.zip", None),
+        ("home/user/link/lib/libc.so", "inside protected path"),
+        ("home/user/link", None),
+        ("home/user/Downloads/../Pinned/a", "inside protected path"),
+        ("home/user/Library/Caches/", None),
+    ],
+)
+def test_check(tree, guard, relative, reason):
+    """Test subtree, exception, exact and symlinked-parent rules."""
+    result = guard.check(os.path.join(str(tree), relative))
+    if reason is None:
+        assert result is None
+    else:
+        assert result.startswith(reason)
+
+
+def test_directories_containing_protected_paths_are_refused(tree, guard):
+    """Test deleting an ancestor of a protected path is refused."""
+    assert guard.check(str(tree)) == "contains protected paths"
+    assert guard.check(os.sep) == "contains protected paths"
+    with pytest.raises(PermissionError):
+        guard.require_allowed(str(tree / "home/user/Library"))
+    guard.require_allowed(str(tree / "home/user/Library/Caches/x"))
+
+
+def test_partition_and_cache(tree, guard):
+    """Test partitioning a batch and invalidating resolved directories."""
+    caches = tree / "home/user/Library/Caches"
+    paths = [str(caches / f"f{index}") for index in range(100)]
+    paths.append(str(tree / "system/lib/x"))
+    allowed, denied = guard.partition(paths)
+    assert len(allowed) == 100
+    assert [path for path, _ in denied] == [str(tree / "system/lib/x")]
+
+    target = tree / "home/user/Downloads"
+    target.mkdir()
+    assert guard.is_allowed(str(target / "file"))
+    target.rmdir()
+    os.symlink(tree / "system", target)
+    assert guard.is_allowed(str(target / "file"))
+    guard.clear_cache()
+    assert not guard.is_allowed(str(target / "file"))
+
+
+def test_dot_dot_after_symlink_resolves_in_the_target(tmp_path):
+    """Test ``link/..`` climbs out of the link target, as the kernel does."""
+    (tmp_path / "protected/sub").mkdir(parents=True)
+    (tmp_path / "home").mkdir()
+    os.symlink(tmp_path / "protected/sub", tmp_path / "home/link")
+    guard = PathGuard(deny=[tmp_path / "protected"])
+    path = str(tmp_path / "home/link/../sub/f")
+    assert guard.check(path).startswith("inside protected path")
+    assert guard.partition([path]) == ([], [(path, guard.check(path))])
+    with pytest.raises(PermissionError):
+        guard.require_allowed(path)
+    canonical = str(tmp_path / "home/other/f")
+    (tmp_path / "home/other").mkdir()
+    assert guard.require_allowed(str(tmp_path / "home/./other/f")) == canonical
+    assert guard.partition([str(tmp_path / "home/link/../../home/other/f")]) == (
+        [canonical],
+        [],
+    )
+
+
+def test_cache_limit_and_relative_paths(tree, monkeypatch):
+    """Test the directory cache stays bounded and relative paths resolve."""
+    guard = PathGuard(deny=[tree / "system"], cache_limit=2)
+    for index in range(5):
+        guard.check(str(tree / f"d{index}" / "file"))
+    assert len(guard._directories) <= 2
+    monkeypatch.chdir(tree / "system")
+    assert not guard.is_allowed("lib")
+
+
+def test_default_guard_protects_system_and_home():
+    """Test the default guard covers system paths, mounts and home."""
+    guard = PathGuard.default(pins=["~/Pinned"])
+    assert not guard.is_allowed("/usr/bin/python3")
+    assert not guard.is_allowed("/")
+    assert not guard.is_allowed(os.path.expanduser("~"))
+    assert not guard.is_allowed(os.path.expanduser("~/Pinned/file"))
+    assert guard.is_allowed(os.path.expanduser("~/some-cache-file"))
+
+
+def test_case_insensitive_matching(tree):
+    """Test differently cased paths match rules on case-insensitive volumes."""
+    rules = {
+        "deny": [tree / "system", tree / "home/user/Library"],
+        "allow": [tree / "home/user/Library/Caches"],
+        "exact": [tree / "home/user"],
+    }
+    folded = PathGuard(**rules, case_insensitive=True)
+    assert not folded.is_allowed(str(tree / "SYSTEM/lib/x"))
+    assert not folded.is_allowed(str(tree / "home/user/library/Preferences/x"))
+    assert not folded.is_allowed(str(tree / "home/USER"))
+    assert folded.is_allowed(str(tree / "home/user/LIBRARY/caches/x"))
+    exact = PathGuard(**rules, case_insensitive=False)
+    assert exact.is_allowed(str(tree / "SYSTEM/lib/x"))
+
+
+def test_default_guard_covers_macos_system_locations():
+    """Test /Library, /Applications and /private/var are protected."""
+    guard = PathGuard.default(case_insensitive=True)
+    for path in (
+        "/Library/Preferences/x",
+        "/Applications/Safari.app",
+        "/private/var/log/x",
+        "/system/library/x",
+        "/USR/bin/ls",
+    ):
+        assert not guard.is_allowed(path), path
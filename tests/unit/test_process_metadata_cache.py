@@ -0,0 +1,89 @@
+"""Tests for the process metadata cache."""
+
+from unittest.mock import Mock, patch
+
+import psutil
+
+from src.domain.services.memory_analyzer import MemoryAnalyzer
+from src.domain.services.process_metadata_cache import ProcessMetadataCache
+
+
+def _mock_process(pid: int, create_time: float, name: str = "proc") -> Mock:
+    """Build a mock process with static attributes."""
+    process = Mock()
+    process.pid = pid
+    process.create_time.return_value = create_time
+    process.name.return_value = name
+    process.exe.return_value = f"/usr/bin/{name}"
+    process.cmdline.return_value = [name, "--flag"]
+    process.username.return_value = "user"
+    process.memory_info.return_value = Mock(rss=100, vms=200)
+    process.memory_percent.return_value = 1.0
+    return process
+
+
+def test_cache_hit_and_miss():
+    """Test static attributes are fetched once per process."""
+    cache = ProcessMetadataCache()
+    process = _mock_process(10, 1.0)
+
+    first = cache.get(process)
+    second = cache.get(process)
+
+    assert first is second
+    assert first.exe == "/usr/bin/proc"
+    assert first.cmdline == ["proc", "--flag"]
+    assert process.name.call_count == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "size": 1}
+
+
+def test_cache_distinguishes_recycled_pid():
+    """Test a reused PID with a new create time is a different process."""
+    cache = ProcessMetadataCache()
+    cache.get(_mock_process(10, 1.0, "old"))
+    metadata = cache.get(_mock_process(10, 2.0, "new"))
+    assert metadata.name == "new"
+    assert cache.misses == 2
+
+
+def test_cache_tolerates_access_denied_fields():
+    """Test optional attributes fall back when access is denied."""
+    cache = ProcessMetadataCache()
+    process = _mock_process(10, 1.0)
+    process.exe.side_effect = psutil.AccessDenied(10)
+    process.cmdline.side_effect = psutil.AccessDenied(10)
+    metadata = cache.get(process)
+    assert metadata.exe is None
+    assert metadata.cmdline == []
+    assert metadata.username == "user"
+
+
+def test_cache_retain_evicts_exited_processes():
+    """Test entries are evicted once their process disappears."""
+    cache = ProcessMetadataCache()
+    alive, gone = _mock_process(1, 1.0), _mock_process(2, 1.0)
+    cache.get(alive)
+    cache.get(gone)
+    assert cache.retain([cache.key_for(alive)]) == 1
+    assert len(cache) == 1
+    assert cache.evictions == 1
+
+
+@patch("psutil.process_iter")
+def test_sampling_cycles_reuse_metadata(mock_process_iter):
+    """Test repeated sampling only fetches names on the first cycle."""
+    processes = [_mock_process(1, 1.0), _mock_process(2, 1.0)]
+    mock_process_iter.return_value = processes
+    analyzer = MemoryAnalyzer()
+
+    analyzer.get_top_memory_processes()
+    analyzer.get_top_memory_processes()
+
+    assert all(process.name.call_count == 1 for process in processes)
+    assert analyzer.metadata_cache_stats()["hits"] == 2
+    assert analyzer.metadata_cache_stats()["misses"] == 2
+
+    mock_process_iter.return_value = processes[:1]
+    analyzer.get_top_memory_processes()
+    assert analyzer.metadata_cache_stats()["evictions"] == 1
+    assert analyzer.metadata_cache_stats()["size"] == 1
@@ -0,0 +1,86 @@
+"""Tests for Prometheus text formatting, serving and textfiles."""
+
+import math
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.infrastructure.monitoring.prometheus import (
+    CONTENT_TYPE,
+    MetricsServer,
+    format_family,
+    write_textfile,
+)
+
+
+def test_format_family_escapes_labels():
+    """Families have HELP and TYPE lines; label values are escaped."""
+    text = format_family(
+        "files_total",
+        "gauge",
+        "Files seen.",
+        [({}, 3), ({"path": 'a"b\\c\nd'}, 1.5), ({"ok": "x"}, True)],
+    )
+    assert text == (
+        "# HELP files_total Files seen.\n"
+        "# TYPE files_total gauge\n"
+        "files_total 3\n"
+        'files_total{path="a\\"b\\\\c\\nd"} 1.5\n'
+        'files_total{ok="x"} 1\n'
+    )
+
+
+def test_format_family_non_finite_values_and_help_escapes():
+    """Non-finite values use Prometheus spellings; HELP text is escaped."""
+    text = format_family(
+        "latency_seconds",
+        "gauge",
+        "Worst case\\path\nsecond line",
+        [({"q": "max"}, math.inf), ({"q": "min"}, -math.inf), ({}, math.nan)],
+    )
+    assert text == (
+        "# HELP latency_seconds Worst case\\\\path\\nsecond line\n"
+        "# TYPE latency_seconds gauge\n"
+        'latency_seconds{q="max"} +Inf\n'
+        'latency_seconds{q="min"} -Inf\n'
+        "latency_seconds NaN\n"
+    )
+
+
+def test_write_textfile_replaces_atomically(tmp_path):
+    """The textfile is replaced whole and no temporary file is left."""
+    path = tmp_path / "mac_cleaner.prom"
+    write_textfile(str(path), b"a 1\n")
+    write_textfile(str(path), b"a 2\n")
+    assert path.read_bytes() == b"a 2\n"
+    assert [entry.name for entry in tmp_path.iterdir()] == ["mac_cleaner.prom"]
+
+
+def test_write_textfile_removes_temporary_file_on_failure(tmp_path):
+    """A failed replace leaves neither a temporary file nor a partial target."""
+    target = tmp_path / "directory.prom"
+    target.mkdir()
+    (target / "entry").write_bytes(b"")
+    with pytest.raises(OSError):
+        write_textfile(str(target), b"a 1\n")
+    assert sorted(entry.name for entry in tmp_path.iterdir()) == ["directory.prom"]
+
+
+def test_server_returns_the_current_payload():
+    """Scrapes get the payload as it is at scrape time; other paths 404."""
+    payloads = iter([b"x 1\n", b"x 2\n"])
+    server = MetricsServer(lambda: next(payloads), port=0)
+    server.start()
+    host, port = server.address
+    try:
+        for expected in (b"x 1\n", b"x 2\n"):
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics") as reply:
+                assert reply.headers["Content-Type"] == CONTENT_TYPE
+                assert reply.read() == expected
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"http://{host}:{port}/")
+        assert error.value.code == 404
+    finally:
+        server.shutdown()
+    assert host == "127.0.0.1"
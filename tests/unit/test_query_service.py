@@ -0,0 +1,206 @@
+"""Tests for the cached query service."""
+
+import os
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.application.query_service import QueryService
+from src.domain.models.memory_info import MemoryRecord, ProcessMemoryRecord
+from src.domain.services.app_attribution import AppAttributor, AttributionRule
+from src.domain.services.disk_analyzer import DiskAnalyzer
+from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
+
+
+class _Clock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def _tree(root):
+    """Create ``root/a`` (3000 bytes, with a subdirectory) and ``root/b``."""
+    (root / "a" / "deep").mkdir(parents=True)
+    (root / "a" / "deep" / "f").write_bytes(b"x" * 2000)
+    (root / "a" / "g").write_bytes(b"x" * 1000)
+    (root / "b").mkdir()
+    (root / "b" / "h").write_bytes(b"x" * 10)
+
+
+def test_subtree_sizes_reuse_fresh_scans(tmp_path):
+    """Scans are cached per root and reused for paths inside it."""
+    _tree(tmp_path)
+    clock = _Clock()
+    analyzer = DiskAnalyzer()
+    analyzer.scan_directory = MagicMock(wraps=analyzer.scan_directory)
+    service = QueryService(disk_analyzer=analyzer, max_scan_age=60, clock=clock)
+
+    sizes = service.subtree_sizes(str(tmp_path))
+    assert sizes["total_bytes"] == 3010
+    assert sizes["children"] == [
+        [str(tmp_path / "a"), 3000],
+        [str(tmp_path / "b"), 10],
+    ]
+    nested = service.subtree_sizes(str(tmp_path / "a"), top=1)
+    assert nested["total_bytes"] == 3000
+    assert nested["scan_root"] == str(tmp_path)
+    assert nested["children"] == [[str(tmp_path / "a" / "deep"), 2000]]
+    assert analyzer.scan_directory.call_count == 1
+
+    clock.now += 60
+    service.subtree_sizes(str(tmp_path))
+    assert analyzer.scan_directory.call_count == 2
+    service.subtree_sizes(str(tmp_path), refresh=True)
+    assert analyzer.scan_directory.call_count == 3
+
+
+def test_concurrent_scans_of_one_root_are_coalesced(tmp_path):
+    """Requests arriving during a scan wait for it instead of rescanning."""
+    _tree(tmp_path)
+    started = threading.Event()
+    release = threading.Event()
+    analyzer = DiskAnalyzer()
+    real_scan = analyzer.scan_directory
+    calls = []
+
+    def slow_scan(root):
+        calls.append(root)
+        started.set()
+        release.wait(5)
+        return real_scan(root)
+
+    analyzer.scan_directory = slow_scan
+    service = QueryService(disk_analyzer=analyzer)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(service.subtree_sizes(str(tmp_path)))
+        )
+        for _ in range(3)
+    ]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert [result["total_bytes"] for result in results] == [3010] * 3
+
+
+def test_diff_reports_size_changes(tmp_path):
+    """Diffs compare a fresh scan with the cached one."""
+    _tree(tmp_path)
+    clock = _Clock()
+    service = QueryService(clock=clock)
+    assert service.diff(str(tmp_path))["baseline"] is True
+
+    (tmp_path / "b" / "h").write_bytes(b"x" * 510)
+    (tmp_path / "a" / "g").unlink()
+    clock.now += 1
+    diff = service.diff(str(tmp_path))
+    assert diff["baseline"] is False
+    assert (diff["before_bytes"], diff["after_bytes"]) == (3010, 2510)
+    assert diff["changes"] == [
+        [str(tmp_path / "a"), -1000],
+        [str(tmp_path / "b"), 500],
+    ]
+
+
+def test_expired_scans_are_dropped_but_diff_baselines_kept(tmp_path):
+    """Only fresh scans stay cached; a few diff baselines outlive them."""
+    _tree(tmp_path)
+    other = tmp_path / "b"
+    clock = _Clock()
+    service = QueryService(max_scan_age=60, max_diff_baselines=1, clock=clock)
+    service.subtree_sizes(str(other))
+    assert service.diff(str(tmp_path))["baseline"] is True
+    assert set(service._scans) == {str(other), str(tmp_path)}
+
+    clock.now += 60
+    (tmp_path / "b" / "h").write_bytes(b"x" * 20)
+    service.subtree_sizes(str(tmp_path / "a"))
+    assert set(service._scans) == {str(tmp_path / "a")}
+    assert set(service._scan_locks) == {str(tmp_path / "a")}
+    assert service.diff(str(tmp_path))["changes"] == [[str(other), 10]]
+
+    assert service.diff(str(other))["baseline"] is True
+    assert list(service._baselines) == [str(other)]
+
+
+def test_app_sizes_and_incremental_rescans(tmp_path):
+    """Application totals come from the cached scan and follow rescans."""
+    _tree(tmp_path)
+    attributor = AppAttributor(
+        [
+            AttributionRule(str(tmp_path / "a" / "deep"), "Deep"),
+            AttributionRule(str(tmp_path / "b"), "Bee"),
+        ]
+    )
+    analyzer = DiskAnalyzer(attributor=attributor)
+    analyzer.scan_directory = MagicMock(wraps=analyzer.scan_directory)
+    service = QueryService(disk_analyzer=analyzer, clock=_Clock())
+
+    apps = service.handle("app_sizes", {"root": str(tmp_path)})
+    assert apps["apps"] == [["Deep", 2000], ["Bee", 10]]
+    assert service.app_sizes(str(tmp_path / "b"))["apps"] == [["Bee", 10]]
+
+    (tmp_path / "a" / "deep" / "f").write_bytes(b"x" * 5)
+    result = service.rescan(str(tmp_path / "a"))
+    assert (result["scan_root"], result["total_bytes"]) == (str(tmp_path), 1005)
+    assert service.app_sizes(str(tmp_path))["apps"] == [["Bee", 10], ["Deep", 5]]
+    assert service.subtree_sizes(str(tmp_path))["total_bytes"] == 1015
+    assert analyzer.scan_directory.call_count == 1
+
+    other = tmp_path / "b"
+    assert QueryService(disk_analyzer=analyzer).rescan(str(other))["total_bytes"] == 10
+
+
+def test_missing_root_and_unknown_queries(tmp_path):
+    """Invalid requests raise ValueError."""
+    service = QueryService()
+    with pytest.raises(ValueError):
+        service.subtree_sizes(str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        service.handle("format_disk", {})
+
+
+def test_memory_queries_sample_at_most_once_per_ttl():
+    """The process table is sampled once per TTL and sorted by RSS."""
+    clock = _Clock()
+    analyzer = MagicMock()
+    analyzer.sample_memory.return_value = MemoryRecord(100, 40, 60, 60.0)
+    analyzer.sample_process_memory.side_effect = lambda: [
+        ProcessMemoryRecord(1, "small", 1.0, 10, 20),
+        ProcessMemoryRecord(2, "large", 5.0, 50, 90),
+    ]
+    service = QueryService(memory_analyzer=analyzer, clock=clock)
+
+    assert service.handle("memory", {})["used_bytes"] == 60
+    assert [p["name"] for p in service.top_processes(limit=1)] == ["large"]
+    assert service.handle("top_processes", {"limit": 5})[1]["pid"] == 1
+    assert analyzer.sample_process_memory.call_count == 1
+    clock.now += 1
+    service.top_processes()
+    assert analyzer.sample_process_memory.call_count == 2
+
+
+def test_disk_usage():
+    """Disk usage is reported as plain values."""
+    (usage,) = QueryService().disk_usage([os.getcwd()])
+    assert usage["path"] == os.getcwd()
+    assert usage["total_space"] >= usage["free_space"]
+    assert isinstance(QueryService().disk_usage(), list)
+
+
+def test_default_disk_analyzer_uses_the_error_handler():
+    """The default disk analyzer routes its I/O through the given handler."""
+    handler = ErrorHandlingSystem()
+    service = QueryService(error_handler=handler)
+    assert service.disk_analyzer.error_handler is handler
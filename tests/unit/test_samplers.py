@@ -0,0 +1,80 @@
+"""Tests for the background samplers and snapshot cells."""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.application.samplers import Sampler, ScanTask, Snapshot, SnapshotCell
+
+
+def test_versions_only_change_with_the_value():
+    """Publishing an equal value keeps the version; failures keep the value."""
+    cell = SnapshotCell(clock=lambda: 5.0)
+    assert cell.snapshot == Snapshot()
+    cell.publish([1, 2])
+    cell.publish([1, 2])
+    assert cell.snapshot == Snapshot(1, 5.0, [1, 2], None)
+    cell.fail(OSError("gone"))
+    assert cell.snapshot == Snapshot(2, 5.0, [1, 2], "OSError: gone")
+    cell.publish([1, 2])
+    assert cell.snapshot.version == 3 and cell.snapshot.error is None
+
+
+def test_sampler_publishes_from_its_thread():
+    """Samples are taken in the background until the sampler stops."""
+    values = iter(range(1000))
+    sampled = threading.Event()
+
+    def sample():
+        value = next(values)
+        if value == 2:
+            sampled.set()
+        return value
+
+    sampler = Sampler(sample, 0.001, name="counter")
+    sampler.start()
+    sampler.start()
+    assert sampled.wait(5)
+    sampler.stop(5)
+    version = sampler.snapshot.version
+    assert version >= 3 and sampler.snapshot.value == version - 1
+
+
+def test_sampler_records_errors():
+    """A failing sample keeps the last value and records the error."""
+    results = [1, RuntimeError("denied")]
+
+    def sample():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    sampler = Sampler(sample, 1.0)
+    sampler.sample_once()
+    sampler.sample_once()
+    assert (sampler.snapshot.value, sampler.snapshot.error) == (
+        1,
+        "RuntimeError: denied",
+    )
+    with pytest.raises(ValueError):
+        Sampler(sample, 0)
+
+
+def test_scan_task_publishes_progress(tmp_path):
+    """Scans run in the background and end with a final progress report."""
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "f").write_bytes(b"x" * 7)
+    task = ScanTask(str(tmp_path), progress_every=1)
+    task.start()
+    task.stop(5)
+    progress = task.snapshot.value
+    assert progress.done and progress.bytes == 7
+    assert task.index.total_bytes == 7
+
+    analyzer = MagicMock()
+    analyzer.scan_directory.side_effect = PermissionError("denied")
+    failed = ScanTask(str(tmp_path), analyzer)
+    failed.run()
+    assert failed.snapshot.error == "PermissionError: denied"
@@ -0,0 +1,190 @@
+"""Tests for the secure wipe executor."""
+
+import os
+
+import pytest
+
+from src.infrastructure.error.error_handling_system import ErrorHandlingSystem
+from src.infrastructure.security import secure_wipe
+from src.infrastructure.security.path_guard import PathGuard
+from src.infrastructure.security.secure_wipe import RateLimiter, SecureWiper
+
+
+def _make_files(directory, sizes):
+    """Create files of the given sizes filled with a known byte."""
+    paths = []
+    for index, size in enumerate(sizes):
+        path = directory / f"file{index}"
+        path.write_bytes(b"S" * size)
+        paths.append(str(path))
+    return paths
+
+
+def test_wipe_overwrites_syncs_in_batches_and_deletes(tmp_path, monkeypatch):
+    """Test contents are replaced before deletion with batched syncs."""
+    sizes = [0, 1, 5000, 3 * 4096 + 7, 100_000]
+    paths = _make_files(tmp_path, sizes)
+    contents = {}
+    syncs = []
+    real_sync = secure_wipe._datasync
+
+    def fake_unlink(path):
+        contents[path] = open(path, "rb").read()
+        os.remove(path)
+
+    monkeypatch.setattr(
+        secure_wipe, "_datasync", lambda fd: syncs.append(fd) or real_sync(fd)
+    )
+    monkeypatch.setattr(secure_wipe.os, "unlink", fake_unlink)
+    with SecureWiper(
+        buffer_size=4096, workers=2, sync_batch_files=2, filesystem_of=lambda p: "ext4"
+    ) as wiper:
+        report = wiper.wipe(paths)
+
+    assert len(report.wiped) == 5 and not report.failed
+    assert report.bytes_overwritten == sum(sizes)
+    assert len(syncs) == 5
+    for path, size in zip(paths, sizes):
+        assert not os.path.exists(path)
+        assert len(contents[path]) == size
+        assert size < 2 or contents[path] != b"S" * size
+    assert report.throughput_mb_s >= 0
+
+
+def test_wipe_reports_ineffective_and_skipped_files(tmp_path):
+    """Test copy-on-write, linked, symlinked and missing files are reported."""
+    cow = tmp_path / "cow"
+    plain = tmp_path / "plain"
+    cow.mkdir()
+    plain.mkdir()
+    (cow_file,) = _make_files(cow, [10])
+    (target,) = _make_files(plain, [10])
+    os.link(target, str(plain / "hardlink"))
+    os.symlink(target, str(plain / "symlink"))
+
+    def filesystem_of(path):
+        return "btrfs" if path.startswith(str(cow)) else "ext4"
+
+    with SecureWiper(filesystem_of=filesystem_of, workers=1) as wiper:
+        report = wiper.wipe(
+            [
+                cow_file,
+                target,
+                str(plain / "symlink"),
+                str(plain / "missing"),
+            ]
+        )
+    statuses = {r.path: r.status for r in report.results}
+    assert statuses == {
+        cow_file: "ineffective",
+        target: "skipped",
+        str(plain / "symlink"): "error",
+        str(plain / "missing"): "error",
+    }
+    assert os.path.exists(cow_file)
+    assert os.path.exists(target)
+    assert len(report.failed) == 3
+
+
+def test_wipe_deletes_copy_on_write_files_by_policy(tmp_path, monkeypatch):
+    """Test the delete policy removes copy-on-write files without writing."""
+    paths = _make_files(tmp_path, [10, 20])
+    os.symlink(paths[0], str(tmp_path / "symlink"))
+    monkeypatch.setattr(secure_wipe.os, "pwrite", pytest.fail)
+    with SecureWiper(
+        filesystem_of=lambda p: "apfs", copy_on_write=secure_wipe.COW_DELETE
+    ) as wiper:
+        report = wiper.wipe([*paths, str(tmp_path / "symlink")])
+    assert [r.status for r in report.results] == ["deleted", "deleted", "skipped"]
+    assert len(report.deleted) == 2 and report.bytes_overwritten == 0
+    assert os.listdir(tmp_path) == ["symlink"]
+
+    with pytest.raises(ValueError):
+        SecureWiper(copy_on_write="overwrite")
+
+
+def test_sync_uses_full_fsync_where_available(monkeypatch):
+    """Test F_FULLFSYNC is preferred and a refusal falls back to fsync."""
+    calls = []
+
+    def fake_fcntl(fd, command):
+        calls.append(("fcntl", command))
+        if fd == 2:
+            raise OSError("not supported")
+
+    monkeypatch.setattr(secure_wipe, "_FULLFSYNC", 51)
+    monkeypatch.setattr(secure_wipe.fcntl, "fcntl", fake_fcntl)
+    monkeypatch.setattr(secure_wipe, "_datasync", lambda fd: calls.append(("sync", fd)))
+    secure_wipe._sync_data(1)
+    secure_wipe._sync_data(2)
+    assert calls == [("fcntl", 51), ("fcntl", 51), ("sync", 2)]
+
+
+def test_filesystem_detection_uses_mount_table():
+    """Test the default filesystem lookup matches the longest mount point."""
+    with SecureWiper(buffer_size=1) as wiper:
+        assert wiper.buffer_size == secure_wipe.mmap.PAGESIZE
+        fstype = wiper.filesystem_of(os.getcwd())
+        assert isinstance(fstype, str)
+        assert wiper.is_overwrite_effective(os.getcwd()) == (
+            fstype not in secure_wipe.COPY_ON_WRITE_FILESYSTEMS
+        )
+
+
+def test_rate_limiter_budget():
+    """Test the token bucket sleeps once the budget is exhausted."""
+    now = [0.0]
+    sleeps = []
+    limiter = RateLimiter(1000, clock=lambda: now[0], sleep=sleeps.append)
+    limiter.acquire(1000)
+    assert sleeps == []
+    limiter.acquire(500)
+    assert sleeps == [pytest.approx(0.5)]
+    now[0] = 2.0
+    limiter.acquire(800)
+    assert len(sleeps) == 1
+
+
+def test_wipe_consults_path_guard(tmp_path):
+    """Test protected files are skipped before any I/O."""
+    (protected,) = _make_files(tmp_path, [10])
+    guard = PathGuard(deny=[protected])
+    with SecureWiper(filesystem_of=lambda path: "ext4", guard=guard) as wiper:
+        report = wiper.wipe([protected])
+    assert report.results[0].status == "skipped"
+    assert report.results[0].message.startswith("inside protected path")
+    assert open(protected, "rb").read() == b"S" * 10
+
+
+def test_wipe_skips_unavailable_mounts(tmp_path):
+    """Test files on a mount with an open circuit are skipped."""
+    (path,) = _make_files(tmp_path, [10])
+    handler = ErrorHandlingSystem(failure_threshold=1)
+    with SecureWiper(filesystem_of=lambda p: "ext4", error_handler=handler) as wiper:
+        report = wiper.wipe([path, str(tmp_path / "missing")])
+        assert sorted(r.status for r in report.results) == ["error", "wiped"]
+        _make_files(tmp_path, [10])
+        handler.breaker_for(path).record_failure()
+        report = wiper.wipe([path])
+    assert report.results[0].message == "mount unavailable"
+    assert os.path.exists(path)
+
+
+def test_wipe_reports_probe_outcomes(tmp_path):
+    """Test half-open probes are released when no overwrite is attempted."""
+    (path,) = _make_files(tmp_path, [10])
+    now = [0.0]
+    handler = ErrorHandlingSystem(
+        failure_threshold=1, reset_timeout=10, clock=lambda: now[0]
+    )
+    handler.breaker_for(path).record_failure()
+    now[0] = 10.0
+    with SecureWiper(filesystem_of=lambda p: "btrfs", error_handler=handler) as wiper:
+        assert wiper.wipe([path]).results[0].status == "ineffective"
+    assert handler.allows(path)
+    handler.release(path)
+
+    os.link(path, str(tmp_path / "hardlink"))
+    with SecureWiper(filesystem_of=lambda p: "ext4", error_handler=handler) as wiper:
+        assert wiper.wipe([path]).results[0].status == "skipped"
+    assert handler.breaker_for(path).state == "closed"
@@ -0,0 +1,145 @@
+"""Tests for chunked streaming file encryption."""
+
+import os
+import struct
+
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from src.infrastructure.security.data_protection_mechanisms import (
+    DataProtectionMechanisms,
+)
+from src.infrastructure.security.streaming_cipher import (
+    HEADER_SIZE,
+    MAGIC,
+    MAX_CHUNK_SIZE,
+    TAG_SIZE,
+    StreamingFileCipher,
+)
+
+CHUNK = 1024
+
+
+@pytest.fixture
+def cipher() -> StreamingFileCipher:
+    """Cipher with small chunks so tests span many of them."""
+    return StreamingFileCipher(os.urandom(32), chunk_size=CHUNK, workers=2)
+
+
+@pytest.mark.parametrize("size", [0, 1, CHUNK, CHUNK * 3, CHUNK * 10 + 17])
+def test_round_trip(tmp_path, cipher, size):
+    """Test files of various sizes survive encryption and decryption."""
+    data = os.urandom(size)
+    (tmp_path / "plain").write_bytes(data)
+    encrypted = cipher.encrypt_file(str(tmp_path / "plain"), str(tmp_path / "enc"))
+    decrypted = cipher.decrypt_file(str(tmp_path / "enc"), str(tmp_path / "dec"))
+
+    assert (tmp_path / "dec").read_bytes() == data
+    assert size < 16 or data[:16] not in (tmp_path / "enc").read_bytes()
+    assert encrypted.bytes_in == size
+    assert decrypted.bytes_out == size
+    assert encrypted.throughput_mb_s >= 0
+
+
+def _encrypted(tmp_path, cipher, size: int = CHUNK * 4) -> bytes:
+    """Encrypt random data and return the ciphertext."""
+    (tmp_path / "plain").write_bytes(os.urandom(size))
+    cipher.encrypt_file(str(tmp_path / "plain"), str(tmp_path / "enc"))
+    return (tmp_path / "enc").read_bytes()
+
+
+def _assert_rejected(tmp_path, cipher, data: bytes) -> None:
+    """Assert decryption fails and leaves no output behind."""
+    (tmp_path / "bad").write_bytes(data)
+    with pytest.raises(ValueError):
+        cipher.decrypt_file(str(tmp_path / "bad"), str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_truncation_at_chunk_boundary_is_detected(tmp_path, cipher):
+    """Test dropping the final chunk fails the final-chunk flag check."""
+    data = _encrypted(tmp_path, cipher)
+    _assert_rejected(tmp_path, cipher, data[: -(CHUNK + TAG_SIZE)])
+
+
+def test_modified_chunk_is_detected(tmp_path, cipher):
+    """Test a flipped bit fails authentication."""
+    data = bytearray(_encrypted(tmp_path, cipher))
+    data[100] ^= 1
+    _assert_rejected(tmp_path, cipher, bytes(data))
+
+
+def test_reordered_chunks_are_detected(tmp_path, cipher):
+    """Test swapping two chunks fails the sequence check."""
+    data = _encrypted(tmp_path, cipher)
+    header, size = data[:HEADER_SIZE], CHUNK + TAG_SIZE
+    chunks = [
+        data[HEADER_SIZE + i * size : HEADER_SIZE + (i + 1) * size] for i in range(5)
+    ]
+    chunks[0], chunks[1] = chunks[1], chunks[0]
+    _assert_rejected(tmp_path, cipher, header + b"".join(chunks))
+
+
+def test_wrong_key_and_format_rejected(tmp_path, cipher):
+    """Test other keys and non-encrypted files are rejected."""
+    data = _encrypted(tmp_path, cipher)
+    other = StreamingFileCipher(os.urandom(32))
+    (tmp_path / "enc2").write_bytes(data)
+    with pytest.raises(ValueError):
+        other.decrypt_file(str(tmp_path / "enc2"), str(tmp_path / "out"))
+    _assert_rejected(tmp_path, cipher, b"plain text file contents")
+    _assert_rejected(tmp_path, cipher, b"MC")
+
+
+def test_each_file_gets_its_own_subkey(tmp_path):
+    """Test the same data and key encrypt differently under a per-file salt."""
+    key = os.urandom(32)
+    cipher = StreamingFileCipher(key, chunk_size=CHUNK)
+    (tmp_path / "plain").write_bytes(b"same" * 100)
+    cipher.encrypt_file(str(tmp_path / "plain"), str(tmp_path / "a"))
+    cipher.encrypt_file(str(tmp_path / "plain"), str(tmp_path / "b"))
+    first, second = (tmp_path / "a").read_bytes(), (tmp_path / "b").read_bytes()
+    assert first[5:9] == second[5:9] == CHUNK.to_bytes(4, "big")
+    assert first[9:25] != second[9:25]
+
+    # Replaying the salt and nonce prefix of another file does not let the
+    # raw key decrypt it: chunks are sealed under the derived subkey.
+    nonce = first[25:HEADER_SIZE] + struct.pack(">IB", 0, True)
+    with pytest.raises(InvalidTag):
+        AESGCM(key).decrypt(nonce, first[HEADER_SIZE:], first[:HEADER_SIZE])
+
+
+def test_other_versions_are_rejected(tmp_path, cipher):
+    """Test only files in the current format are accepted."""
+    data = bytearray(_encrypted(tmp_path, cipher))
+    data[4] = 1
+    (tmp_path / "old").write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="Unsupported encrypted file version: 1"):
+        cipher.decrypt_file(str(tmp_path / "old"), str(tmp_path / "out"))
+    assert not (tmp_path / "out").exists()
+
+
+def test_chunk_size_is_bounded(tmp_path, cipher):
+    """Test a crafted header cannot request huge read buffers."""
+    data = bytearray(_encrypted(tmp_path, cipher))
+    data[5:9] = (MAX_CHUNK_SIZE + 1).to_bytes(4, "big")
+    _assert_rejected(tmp_path, cipher, bytes(data))
+    data[5:9] = bytes(4)
+    _assert_rejected(tmp_path, cipher, bytes(data))
+    _assert_rejected(tmp_path, cipher, _encrypted(tmp_path, cipher)[:20])
+
+    for size in (0, MAX_CHUNK_SIZE + 1):
+        with pytest.raises(ValueError):
+            StreamingFileCipher(os.urandom(32), chunk_size=size)
+
+
+def test_data_protection_file_api(tmp_path):
+    """Test the DataProtectionMechanisms file helpers."""
+    protection = DataProtectionMechanisms()
+    (tmp_path / "plain").write_bytes(b"secret" * 1000)
+    protection.encrypt_file(str(tmp_path / "plain"), str(tmp_path / "enc"), 512)
+    result = protection.decrypt_file(str(tmp_path / "enc"), str(tmp_path / "dec"))
+    assert (tmp_path / "dec").read_bytes() == b"secret" * 1000
+    assert result.bytes_out == 6000